@@ -1,15 +1,20 @@
 from django.contrib import admin
 
 from api.features.finance.models import (
+    BalanceLedgerEntry,
+    BalanceSnapshot,
     Category,
     Expense,
     FinanceAccount,
+    FinanceArchive,
+    FinanceChangeLog,
     Paycheck,
     RecurringBill,
     SavingsAccount,
     SavingsRecurringDeposit,
     SavingsTransaction,
 )
+from api.features.jobs.models import Job
 from api.features.users.models import Profile
 
 admin.site.register(Profile)
@@ -21,3 +26,8 @@ admin.site.register(Category)
 admin.site.register(SavingsAccount)
 admin.site.register(SavingsRecurringDeposit)
 admin.site.register(SavingsTransaction)
+admin.site.register(FinanceChangeLog)
+admin.site.register(FinanceArchive)
+admin.site.register(BalanceLedgerEntry)
+admin.site.register(BalanceSnapshot)
+admin.site.register(Job)
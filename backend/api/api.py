@@ -17,6 +17,7 @@ from api.features.finance.controller import (
     SavingsRecurringDepositController,
     SavingsTransactionController,
 )
+from api.features.jobs.controller import JobArtifactController, JobController
 from api.features.users.controller import AuthController, UserController
 
 logger = logging.getLogger(__name__)
@@ -71,6 +72,8 @@ api.register_controllers(
     SavingsAccountController,
     SavingsRecurringDepositController,
     SavingsTransactionController,
+    JobController,
+    JobArtifactController,
 )
 
 
@@ -1,4 +1,5 @@
 from django.apps import AppConfig
+from django.db.backends.signals import connection_created
 
 
 class ApiConfig(AppConfig):
@@ -7,3 +8,6 @@ class ApiConfig(AppConfig):
 
     def ready(self):
         import api.features.finance.signals  # noqa
+        from core.sqlite import apply_sqlite_pragmas
+
+        connection_created.connect(apply_sqlite_pragmas, dispatch_uid="apply_sqlite_pragmas")
@@ -15,7 +15,7 @@ class CategoryController:
     @route.get("", response=List[CategorySchema])
     def list_categories(self, request):
         """List all categories for current user"""
-        return Category.objects.filter(user=request.user, is_deleted=False)
+        return Category.objects.filter(user=request.user)
 
     @route.get("/choices", response=CategoryChoicesSchema)
     def get_choices(self, request):
@@ -29,7 +29,7 @@ class CategoryController:
     @route.get("/{category_id}", response=CategorySchema)
     def get_category(self, request, category_id: int):
         """Get a specific category"""
-        return Category.objects.get(id=category_id, user=request.user, is_deleted=False)
+        return Category.objects.get(id=category_id, user=request.user)
 
     @route.post("", response={201: CategorySchema, 400: dict})
     def create_category(self, request, data: CategorySchema):
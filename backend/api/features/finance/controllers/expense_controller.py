@@ -1,11 +1,19 @@
 import logging
-from typing import List
+from datetime import date
+from typing import Optional
 
 from ninja_extra import api_controller, route
 from ninja_jwt.authentication import JWTAuth
 
 from api.features.finance.models import Category, Expense, FinanceAccount
-from api.features.finance.schemas import ExpenseSchema
+from api.features.finance.schemas import (
+    ExpenseBulkResultSchema,
+    ExpenseBulkSchema,
+    ExpensePageSchema,
+    ExpenseSchema,
+)
+from api.features.finance.services.bulk_service import BulkService
+from api.features.finance.services.page_service import PageService
 from api.features.users.permissons import IsApproved
 
 logger = logging.getLogger(__name__)
@@ -13,22 +21,61 @@ logger = logging.getLogger(__name__)
 
 @api_controller("/finance/expenses", auth=JWTAuth(), tags=["Expenses"], permissions=[IsApproved])
 class ExpenseController:
-    @route.get("", response=List[ExpenseSchema])
-    def list_expenses(self, request):
-        """List all expenses for current user"""
+    def __init__(self):
+        self.bulk_service = BulkService()
+        self.page_service = PageService()
+
+    @route.get("", response={200: ExpensePageSchema, 400: dict})
+    def list_expenses(
+        self,
+        request,
+        cursor: Optional[str] = None,
+        limit: Optional[int] = None,
+        date_from: Optional[date] = None,
+        date_to: Optional[date] = None,
+        category_id: Optional[int] = None,
+        related_bill_id: Optional[int] = None,
+    ):
+        """List the current user's expenses, newest first, one page at a time"""
         logger.debug(f"User {request.user} listing expenses")
-        return Expense.objects.filter(user=request.user, is_deleted=False).select_related(
-            "category"
+        try:
+            return self.page_service.page(
+                Expense.objects.filter(user=request.user).select_related("category"),
+                "date",
+                cursor,
+                limit,
+                date_from=date_from,
+                date_to=date_to,
+                sum_field="amount",
+                category_id=category_id,
+                related_bill_id=related_bill_id,
+            )
+        except ValueError as e:
+            return 400, {"error": str(e)}
+
+    @route.post("/bulk", response={200: ExpenseBulkResultSchema, 400: dict})
+    def bulk_expenses(self, request, data: ExpenseBulkSchema):
+        """Create, update and soft delete many expenses in one transaction"""
+        logger.info(
+            f"User {request.user} bulk writing expenses: {len(data.create)} created, "
+            f"{len(data.update)} updated, {len(data.delete)} deleted"
         )
+        try:
+            result = self.bulk_service.apply(
+                request.user, Expense, data.create, data.update, data.delete
+            )
+        except ValueError as e:
+            logger.warning(f"Rejected bulk expense write for user {request.user}: {str(e)}")
+            return 400, {"error": str(e)}
+        logger.info(f"Successfully bulk wrote expenses for user {request.user}")
+        return result
 
     @route.get("/{expense_id}", response=ExpenseSchema)
     def get_expense(self, request, expense_id: int):
         """Get a specific expense"""
         logger.debug(f"User {request.user} getting expense {expense_id}")
         try:
-            return Expense.objects.select_related("category").get(
-                id=expense_id, user=request.user, is_deleted=False
-            )
+            return Expense.objects.select_related("category").get(id=expense_id, user=request.user)
         except Expense.DoesNotExist:
             logger.warning(f"Expense {expense_id} not found for user {request.user}")
             raise
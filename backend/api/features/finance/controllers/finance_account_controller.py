@@ -1,7 +1,12 @@
+from datetime import date
+from typing import Optional
+
 from ninja_extra import api_controller, route
 from ninja_jwt.authentication import JWTAuth
 
-from api.features.finance.schemas import FinanceAccountSchema
+from api.features.finance.models import BalanceLedgerEntry
+from api.features.finance.schemas import AccountBalanceSchema, FinanceAccountSchema
+from api.features.finance.services.ledger_service import LedgerService
 from api.features.finance.utils import get_or_create_finance_account
 from api.features.users.permissons import IsApproved
 
@@ -10,6 +15,9 @@ from api.features.users.permissons import IsApproved
     "/finance/account", auth=JWTAuth(), tags=["Finance Account"], permissions=[IsApproved]
 )
 class FinanceAccountController:
+    def __init__(self):
+        self.ledger_service = LedgerService()
+
     @route.get("", response=FinanceAccountSchema)
     def get_account(self, request):
         """Get current user's finance account"""
@@ -28,3 +36,10 @@ class FinanceAccountController:
             setattr(account, attr, value)
         account.save()
         return account
+
+    @route.get("/balance", response=AccountBalanceSchema)
+    def get_balance(self, request, asOfDate: Optional[date] = None):
+        """Balance from the ledger, now or at the end of `asOfDate`"""
+        account = BalanceLedgerEntry.Account.CHECKING
+        balance = self.ledger_service.balance(request.user.id, account, on=asOfDate)
+        return {"account": account, "asOfDate": asOfDate, "balance": balance}
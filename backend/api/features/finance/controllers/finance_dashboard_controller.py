@@ -1,13 +1,14 @@
 from typing import List
 
-from django.http import HttpResponse
-from ninja import File
+from django.http import StreamingHttpResponse
+from ninja import File, Form
 from ninja.files import UploadedFile
 from ninja_extra import api_controller, route
 from ninja_jwt.authentication import JWTAuth
 
 from api.features.finance.schemas import (
     BalanceProjectionRequestSchema,
+    BankStatementMappingSchema,
     CalendarDataRequestSchema,
     CalendarDaySchema,
     ExportCSVRequestSchema,
@@ -15,10 +16,16 @@ from api.features.finance.schemas import (
     MonthlySummaryRequestSchema,
     MonthlySummarySchema,
 )
+from api.features.finance.services.bank_import_service import BankStatementImportService
 from api.features.finance.services.calendar_service import CalendarService
 from api.features.finance.services.csv_service import CSVService
 from api.features.finance.services.finance_dashboard_service import FinanceDashboardService
+from api.features.finance.utils import report_database
+from api.features.jobs.models import Job
+from api.features.jobs.schemas import JobCreatedSchema
+from api.features.jobs.services import JobService
 from api.features.users.permissons import IsApproved
+from core.db_router import reading_from, streamed_from
 
 
 @api_controller(
@@ -29,66 +36,108 @@ class FinanceDashboardController:
         self.dashboard_service = FinanceDashboardService()
         self.calendar_service = CalendarService()
         self.csv_service = CSVService()
+        self.bank_import_service = BankStatementImportService()
+        self.job_service = JobService()
 
     @route.get("/data", response=FinanceDashboardDataSchema)
     def get_finance_data(self, request):
         """Get all finance data for the dashboard"""
-        return self.dashboard_service.get_complete_finance_data(request.user)
+        with reading_from(report_database(request.user)):
+            return self.dashboard_service.get_complete_finance_data(request.user)
 
     @route.post("/calendar", response=List[CalendarDaySchema])
     def generate_calendar_data(self, request, data: CalendarDataRequestSchema):
         """Generate calendar data with running balances"""
-        calendar_data = self.calendar_service.generate_calendar_data(
-            user=request.user,
-            start_date=data.startDate,
-            end_date=data.endDate,
-            months_to_show=data.monthsToShow,
-        )
+        with reading_from(report_database(request.user)):
+            calendar_data = self.calendar_service.generate_calendar_data(
+                user=request.user,
+                start_date=data.startDate,
+                end_date=data.endDate,
+                months_to_show=data.monthsToShow,
+            )
         return calendar_data
 
     @route.post("/summary", response=List[MonthlySummarySchema])
     def get_monthly_summary(self, request, data: MonthlySummaryRequestSchema):
         """Get summary data for specified months"""
-        summary = self.dashboard_service.get_monthly_summary(
-            user=request.user, start_date=data.startDate, months_count=data.monthsCount
-        )
+        with reading_from(report_database(request.user)):
+            summary = self.dashboard_service.get_monthly_summary(
+                user=request.user, start_date=data.startDate, months_count=data.monthsCount
+            )
         return summary
 
     @route.post("/export-csv")
     def export_csv(self, request, data: ExportCSVRequestSchema):
         """Export finance data as CSV"""
-        csv_content = self.csv_service.generate_export_csv(
+        csv_rows = self.csv_service.generate_export_csv(
             user=request.user,
             start_date=data.startDate,
             end_date=data.endDate,
             months_to_show=data.monthsToShow,
             include_all_days=data.includeAllDays,
+            summary_first=data.summaryFirst,
         )
 
-        response = HttpResponse(csv_content, content_type="text/csv")
+        response = StreamingHttpResponse(
+            streamed_from(report_database(request.user), csv_rows), content_type="text/csv"
+        )
         response["Content-Disposition"] = (
             f'attachment; filename="balance-report-{data.startDate}-to-{data.endDate}.csv"'
         )
         return response
 
+    @route.post("/export-csv/async", response={202: JobCreatedSchema})
+    def export_csv_async(self, request, data: ExportCSVRequestSchema):
+        """Queue a CSV export; the finished report is downloadable from /jobs/{id}/download"""
+        job = self.job_service.enqueue(
+            user=request.user, kind=Job.Kind.EXPORT_CSV, payload=data.model_dump(mode="json")
+        )
+        return 202, {"jobId": job.id, "status": job.status}
+
     @route.post("/import-csv", response={200: dict, 400: dict})
     def import_csv(self, request, file: UploadedFile = File(...)):
         """Import bills from CSV file"""
         try:
-            imported_bills = self.csv_service.import_bills_from_csv(file=file, user=request.user)
+            result = self.csv_service.import_bills_from_csv(file=file, user=request.user)
 
             return 200, {
                 "message": "Bills imported successfully",
-                "imported_count": len(imported_bills),
-                "bills": [bill.id for bill in imported_bills],
+                "imported_count": len(result["bills"]),
+                "bills": result["bills"],
+                "skipped_count": len(result["errors"]),
+                "errors": result["errors"],
             }
         except Exception as e:
             return 400, {"error": str(e)}
 
+    @route.post("/import-csv/async", response={202: JobCreatedSchema})
+    def import_csv_async(self, request, file: UploadedFile = File(...)):
+        """Queue a bill CSV import and return its job id immediately"""
+        job = self.job_service.enqueue(user=request.user, kind=Job.Kind.IMPORT_CSV, input_file=file)
+        return 202, {"jobId": job.id, "status": job.status}
+
+    @route.post("/import-bank-csv", response={200: dict, 400: dict})
+    def import_bank_csv(
+        self,
+        request,
+        mapping: Form[BankStatementMappingSchema],
+        file: UploadedFile = File(...),
+    ):
+        """Import a bank statement CSV as expenses and paychecks, skipping known rows"""
+        try:
+            result = self.bank_import_service.import_statement(
+                file=file, user=request.user, mapping=mapping
+            )
+
+            return 200, {"message": "Statement imported successfully", **result}
+        except Exception as e:
+            return 400, {"error": str(e)}
+
     @route.post("/balance-projection", response=List[dict])
     def get_balance_projection(self, request, data: BalanceProjectionRequestSchema):
         """Get balance projections for future dates"""
-        projections = self.calendar_service.get_balance_projections(
-            user=request.user, months=data.projectionMonths
-        )
+        with reading_from(report_database(request.user)):
+            projections = self.calendar_service.get_balance_projections(
+                user=request.user, months=data.projectionMonths
+            )
         return projections
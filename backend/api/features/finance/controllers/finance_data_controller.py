@@ -1,30 +1,67 @@
-from datetime import timedelta
+from datetime import date, timedelta
+from typing import Literal, Optional
 
-from django.db import transaction
+from django.http import FileResponse, StreamingHttpResponse
 from django.utils import timezone
+from ninja import File, Query
+from ninja.files import UploadedFile
 from ninja_extra import api_controller, route
 from ninja_jwt.authentication import JWTAuth
 
 from api.features.finance.models import (
-    Category,
     Expense,
-    FinanceAccount,
     Paycheck,
     RecurringBill,
-    SavingsAccount,
     SavingsRecurringDeposit,
     SavingsTransaction,
 )
-from api.features.finance.schemas import ExportDataSchema, FinanceDataSchema
+from api.features.finance.schemas import (
+    ArchiveRestoreRequestSchema,
+    ArchiveRestoreSchema,
+    ExportDataSchema,
+    FinanceChangeLogSchema,
+    FinanceChangesSchema,
+    FinanceDataSchema,
+)
+from api.features.finance.services.archive_service import ArchiveService
+from api.features.finance.services.change_log_service import ChangeLogService
+from api.features.finance.services.columnar_export_service import (
+    CONTENT_TYPES,
+    ColumnarExportService,
+)
+from api.features.finance.services.export_service import ExportService
 from api.features.finance.services.finance_dashboard_service import FinanceDashboardService
-from api.features.finance.utils import get_or_create_finance_account, get_or_create_savings_account
+from api.features.finance.services.import_service import (
+    DEFAULT_BATCH_SIZE,
+    MAX_BATCH_SIZE,
+    ImportService,
+)
+from api.features.finance.services.sqlite_snapshot_service import SqliteSnapshotService
+from api.features.finance.services.sync_service import SyncService
+from api.features.finance.utils import (
+    get_or_create_finance_account,
+    get_or_create_savings_account,
+    report_database,
+)
+from api.features.jobs.models import Job
+from api.features.jobs.schemas import JobCreatedSchema
+from api.features.jobs.services import JobService
 from api.features.users.permissons import IsApproved
+from core.db_router import reading_from, streamed_from
 
 
 @api_controller("/finance", auth=JWTAuth(), tags=["Finance Data"], permissions=[IsApproved])
 class FinanceDataController:
     def __init__(self):
         self.dashboard_service = FinanceDashboardService()
+        self.sync_service = SyncService()
+        self.change_log_service = ChangeLogService()
+        self.export_service = ExportService()
+        self.archive_service = ArchiveService()
+        self.columnar_export_service = ColumnarExportService()
+        self.import_service = ImportService()
+        self.snapshot_service = SqliteSnapshotService()
+        self.job_service = JobService()
 
     @route.get("", response=FinanceDataSchema)
     def get_all_finance_data(self, request):
@@ -32,11 +69,11 @@ class FinanceDataController:
         user = request.user
         account = get_or_create_finance_account(user=user)
         savings_account = get_or_create_savings_account(user=user)
-        recurring_bills = RecurringBill.objects.filter(user=user, is_deleted=False)
-        paychecks = Paycheck.objects.filter(user=user, is_deleted=False)
-        expenses = Expense.objects.filter(user=user, is_deleted=False)
-        recurring_savings = SavingsRecurringDeposit.objects.filter(user=user, is_deleted=False)
-        savings_transactions = SavingsTransaction.objects.filter(user=user, is_deleted=False)
+        recurring_bills = RecurringBill.objects.filter(user=user)
+        paychecks = Paycheck.objects.filter(user=user)
+        expenses = Expense.objects.filter(user=user)
+        recurring_savings = SavingsRecurringDeposit.objects.filter(user=user)
+        savings_transactions = SavingsTransaction.objects.filter(user=user)
 
         today = timezone.now().date()
         month_start = today.replace(day=1)
@@ -60,156 +97,193 @@ class FinanceDataController:
             "savings_transactions": savings_transactions,
         }
 
-    @route.get("/export", response=ExportDataSchema)
-    def export_finance_data(self, request):
-        """Export all finance data for current user including deleted items and categories"""
-        user = request.user
-        account = get_or_create_finance_account(user=user)
-        savings_account = get_or_create_savings_account(user=user)
+    @route.get("/changes", response=FinanceChangesSchema)
+    def get_finance_changes(self, request, since: int = 0):
+        """Get rows created, updated or soft-deleted after the given revision"""
+        return self.sync_service.get_changes(user=request.user, since=since)
 
+    @route.get("/changes/log", response=FinanceChangeLogSchema)
+    def get_finance_change_log(self, request, after: int = 0, limit: int = 500):
+        """Get change log entries after the given entry id, oldest first"""
+        limit = max(1, min(limit, 5000))
+        entries = self.change_log_service.entries(request.user.id, after=after, limit=limit)
         return {
-            "categories": Category.objects.filter(user=user),
-            "account": account,
-            "savings_account": savings_account,
-            "recurring_bills": RecurringBill.objects.filter(user=user),
-            "paychecks": Paycheck.objects.filter(user=user),
-            "expenses": Expense.objects.filter(user=user),
-            "savings_recurring_deposits": SavingsRecurringDeposit.objects.filter(user=user),
-            "savings_transactions": SavingsTransaction.objects.filter(user=user),
+            "entries": entries,
+            "cursor": entries[-1].id if entries else after,
+            "hasMore": len(entries) == limit,
         }
 
-    @route.post("/import")
-    @transaction.atomic
-    def import_finance_data(self, request, data: ExportDataSchema):
-        """Import all finance data for current user, wiping existing data first"""
-        user = request.user
-
-        # 1. Wipe existing data
-        # Ordering matters for delete to avoid FK constraints issues,
-        # but Django usually handles this. Still, let's go leaf to root where possible.
-        Expense.objects.filter(user=user).delete()
-        Paycheck.objects.filter(user=user).delete()
-        RecurringBill.objects.filter(user=user).delete()
-        SavingsTransaction.objects.filter(user=user).delete()
-        SavingsRecurringDeposit.objects.filter(user=user).delete()
-        Category.objects.filter(user=user).delete()
-        FinanceAccount.objects.filter(user=user).delete()
-        SavingsAccount.objects.filter(user=user).delete()
-
-        # 2. Re-create Categories
-        category_map = {}  # old_id -> new category object
-        for cat_data in data.categories:
-            cat = Category.objects.create(
-                user=user,
-                name=cat_data.name,
-                type=cat_data.type,
-                color=cat_data.color,
-                is_deleted=cat_data.isDeleted,
-                deleted_at=cat_data.deletedAt,
+    @route.get("/export", response=ExportDataSchema)
+    def export_finance_data(self, request, compress: bool = False, include_archived: bool = False):
+        """
+        Export all finance data for current user including deleted items and categories.
+        include_archived also streams rows moved to the cold archive.
+        """
+        alias = report_database(request.user)
+        with reading_from(alias):
+            chunks = self.export_service.stream_finance_data(
+                user=request.user, compress=compress, include_archived=include_archived
             )
-            category_map[cat_data.id] = cat
-
-        # 3. Accounts
-        account = FinanceAccount.objects.create(
-            user=user,
-            starting_balance=data.account.startingBalance,
-            current_balance=data.account.currentBalance,
-            balance_as_of_date=data.account.balanceAsOfDate,
-            is_deleted=data.account.isDeleted,
-            deleted_at=data.account.deletedAt,
+        response = StreamingHttpResponse(
+            streamed_from(alias, chunks), content_type="application/json"
         )
+        if compress:
+            response["Content-Encoding"] = "gzip"
+        return response
 
-        savings_account = SavingsAccount.objects.create(
-            user=user,
-            starting_balance=data.savingsAccount.startingBalance,
-            current_balance=data.savingsAccount.currentBalance,
-            balance_as_of_date=data.savingsAccount.balanceAsOfDate,
-            is_deleted=data.savingsAccount.isDeleted,
-            deleted_at=data.savingsAccount.deletedAt,
+    @route.post("/export/async", response={202: JobCreatedSchema})
+    def export_finance_data_async(
+        self, request, compress: bool = False, include_archived: bool = False
+    ):
+        """Queue a full export; poll /jobs/{id} and download the result when it finishes"""
+        job = self.job_service.enqueue(
+            user=request.user,
+            kind=Job.Kind.EXPORT,
+            payload={"compress": compress, "include_archived": include_archived},
         )
+        return 202, {"jobId": job.id, "status": job.status}
 
-        # 4. Recurring Bills
-        bill_map = {}
-        for bill_data in data.recurringBills:
-            cat = category_map.get(bill_data.category.id) if bill_data.category else None
-            bill = RecurringBill.objects.create(
-                user=user,
-                finance_account=account,
-                name=bill_data.name,
-                amount=bill_data.amount,
-                frequency=bill_data.frequency,
-                start_date=bill_data.startDate,
-                due_day=bill_data.dueDay,
-                day_of_week=bill_data.dayOfWeek,
-                category=cat,
-                total=bill_data.total,
-                amount_paid=bill_data.amountPaid,
-                is_deleted=bill_data.isDeleted,
-                deleted_at=bill_data.deletedAt,
-            )
-            bill_map[bill_data.id] = bill
-
-        # 5. Paychecks
-        for pc_data in data.paychecks:
-            cat = category_map.get(pc_data.category.id) if pc_data.category else None
-            Paycheck.objects.create(
-                user=user,
-                finance_account=account,
-                amount=pc_data.amount,
-                date=pc_data.date,
-                frequency=pc_data.frequency,
-                day_of_week=pc_data.dayOfWeek,
-                day_of_month=pc_data.dayOfMonth,
-                second_day_of_month=pc_data.secondDayOfMonth,
-                category=cat,
-                is_deleted=pc_data.isDeleted,
-                deleted_at=pc_data.deletedAt,
-            )
+    @route.get("/export/columnar/{table}", response={400: dict})
+    def export_columnar_table(
+        self,
+        request,
+        table: str,
+        format: Literal["arrow", "parquet"] = "arrow",
+        startDate: Optional[date] = None,
+        endDate: Optional[date] = None,
+    ):
+        """
+        Export one table as a typed Arrow IPC stream or Parquet file for analytics tools.
+        Tables: expenses, paychecks, recurring_bills, savings_transactions, calendar_days.
+        """
+        alias = report_database(request.user)
+        try:
+            with reading_from(alias):
+                chunks = self.columnar_export_service.stream_table(
+                    user=request.user,
+                    table=table,
+                    file_format=format,
+                    start_date=startDate,
+                    end_date=endDate,
+                )
+        except ValueError as e:
+            return 400, {"error": str(e)}
 
-        # 6. Expenses
-        for exp_data in data.expenses:
-            cat = category_map.get(exp_data.category.id) if exp_data.category else None
-            related_bill = bill_map.get(exp_data.relatedBillId) if exp_data.relatedBillId else None
-            Expense.objects.create(
-                user=user,
-                finance_account=account,
-                name=exp_data.name,
-                amount=exp_data.amount,
-                date=exp_data.date,
-                category=cat,
-                related_bill=related_bill,
-                is_deleted=exp_data.isDeleted,
-                deleted_at=exp_data.deletedAt,
-            )
+        extension = "arrows" if format == "arrow" else "parquet"
+        response = StreamingHttpResponse(
+            streamed_from(alias, chunks), content_type=CONTENT_TYPES[format]
+        )
+        response["Content-Disposition"] = f'attachment; filename="{table}.{extension}"'
+        return response
 
-        # 7. Savings Recurring Deposits
-        for srd_data in data.savingsRecurringDeposits:
-            SavingsRecurringDeposit.objects.create(
-                user=user,
-                savings_account=savings_account,
-                name=srd_data.name,
-                amount=srd_data.amount,
-                frequency=srd_data.frequency,
-                start_date=srd_data.startDate,
-                day_of_week=srd_data.dayOfWeek,
-                day_of_month=srd_data.dayOfMonth,
-                is_payroll_deposit=srd_data.isPayrollDeposit,
-                notes=srd_data.notes or "",
-                is_deleted=srd_data.isDeleted,
-                deleted_at=srd_data.deletedAt,
-            )
+    @route.get("/export/sqlite")
+    def export_sqlite_snapshot(self, request):
+        """Download all finance data for current user as a standalone SQLite database"""
+        with reading_from(report_database(request.user)):
+            snapshot = self.snapshot_service.export_snapshot(user=request.user)
+        return FileResponse(
+            snapshot,
+            as_attachment=True,
+            filename=f"finance-{request.user.username}.sqlite3",
+            content_type="application/vnd.sqlite3",
+        )
 
-        # 8. Savings Transactions
-        for st_data in data.savingsTransactions:
-            SavingsTransaction.objects.create(
-                user=user,
-                savings_account=savings_account,
-                transaction_type=st_data.transactionType,
-                amount=st_data.amount,
-                date=st_data.date,
-                notes=st_data.notes or "",
-                is_deleted=st_data.isDeleted,
-                deleted_at=st_data.deletedAt,
+    @route.post("/export/columnar/{table}/async", response={202: JobCreatedSchema})
+    def export_columnar_table_async(
+        self,
+        request,
+        table: str,
+        format: Literal["arrow", "parquet"] = "arrow",
+        startDate: Optional[date] = None,
+        endDate: Optional[date] = None,
+    ):
+        """Queue a columnar export of one table; download it from /jobs/{id} when done"""
+        job = self.job_service.enqueue(
+            user=request.user,
+            kind=Job.Kind.EXPORT_COLUMNAR,
+            payload={
+                "table": table,
+                "format": format,
+                "startDate": startDate.isoformat() if startDate else None,
+                "endDate": endDate.isoformat() if endDate else None,
+            },
+        )
+        return 202, {"jobId": job.id, "status": job.status}
+
+    @route.post("/archive/restore", response=ArchiveRestoreSchema)
+    def restore_archived(self, request, data: ArchiveRestoreRequestSchema):
+        """
+        Move archived rows back into the finance tables. They come back soft-deleted,
+        exactly as they were archived; rows that would clash with live data stay archived
+        and are listed in skippedRows with the reason.
+        """
+        return self.archive_service.restore(
+            user=request.user, collection=data.collection, ids=data.ids
+        )
+
+    @route.post("/import", response={200: dict, 400: dict})
+    def import_finance_data(
+        self,
+        request,
+        data: ExportDataSchema,
+        mode: Literal["replace", "merge"] = "replace",
+        batch_size: int = Query(DEFAULT_BATCH_SIZE, ge=1, le=MAX_BATCH_SIZE),
+    ):
+        """
+        Import all finance data for current user.
+        "replace" wipes existing data first, "merge" only writes the rows that differ.
+        """
+        try:
+            if mode == "merge":
+                stats = self.import_service.merge(
+                    user=request.user, data=data, batch_size=batch_size
+                )
+            else:
+                stats = self.import_service.restore(
+                    user=request.user, data=data, batch_size=batch_size
+                )
+        except ValueError as e:
+            return 400, {"error": str(e)}
+        return 200, {"success": True, "message": "Data imported successfully", **stats}
+
+    @route.post("/import/stream", response={200: dict, 400: dict})
+    def import_finance_data_stream(
+        self,
+        request,
+        file: UploadedFile = File(...),
+        batch_size: int = Query(DEFAULT_BATCH_SIZE, ge=1, le=MAX_BATCH_SIZE),
+    ):
+        """Import a backup file of any size, parsing and inserting it incrementally"""
+        try:
+            stats = self.import_service.restore_stream(
+                user=request.user, stream=file, batch_size=batch_size
             )
+        except ValueError as e:
+            return 400, {"error": str(e)}
+        return 200, {"success": True, "message": "Data imported successfully", **stats}
+
+    @route.post("/import/async", response={202: JobCreatedSchema})
+    def import_finance_data_async(
+        self,
+        request,
+        file: UploadedFile = File(...),
+        mode: Literal["replace", "merge"] = "replace",
+        batch_size: int = Query(DEFAULT_BATCH_SIZE, ge=1, le=MAX_BATCH_SIZE),
+    ):
+        """Queue an import of a backup file and return its job id immediately"""
+        job = self.job_service.enqueue(
+            user=request.user,
+            kind=Job.Kind.IMPORT,
+            payload={"mode": mode, "batch_size": batch_size},
+            input_file=file,
+        )
+        return 202, {"jobId": job.id, "status": job.status}
 
-        return {"success": True, "message": "Data imported successfully"}
+    @route.post("/import/sqlite", response={200: dict, 400: dict})
+    def import_sqlite_snapshot(self, request, file: UploadedFile = File(...)):
+        """Replace finance data for current user with a snapshot from /finance/export/sqlite"""
+        try:
+            stats = self.snapshot_service.import_upload(user=request.user, upload=file)
+        except ValueError as e:
+            return 400, {"error": str(e)}
+        return 200, {"success": True, "message": "Data imported successfully", **stats}
@@ -1,28 +1,65 @@
-from typing import List
+from datetime import date
+from typing import Optional
 
 from ninja_extra import api_controller, route
 from ninja_jwt.authentication import JWTAuth
 
 from api.features.finance.models import Category, FinanceAccount, Paycheck
-from api.features.finance.schemas import PaycheckSchema
+from api.features.finance.schemas import (
+    PaycheckBulkResultSchema,
+    PaycheckBulkSchema,
+    PaycheckPageSchema,
+    PaycheckSchema,
+)
+from api.features.finance.services.bulk_service import BulkService
+from api.features.finance.services.page_service import PageService
 from api.features.users.permissons import IsApproved
 
 
 @api_controller("/finance/paychecks", auth=JWTAuth(), tags=["Paychecks"], permissions=[IsApproved])
 class PaycheckController:
-    @route.get("", response=List[PaycheckSchema])
-    def list_paychecks(self, request):
-        """List all paychecks for current user"""
-        return Paycheck.objects.filter(user=request.user, is_deleted=False).select_related(
-            "category"
-        )
+    def __init__(self):
+        self.bulk_service = BulkService()
+        self.page_service = PageService()
+
+    @route.get("", response={200: PaycheckPageSchema, 400: dict})
+    def list_paychecks(
+        self,
+        request,
+        cursor: Optional[str] = None,
+        limit: Optional[int] = None,
+        date_from: Optional[date] = None,
+        date_to: Optional[date] = None,
+        category_id: Optional[int] = None,
+    ):
+        """List the current user's paychecks, newest first, one page at a time"""
+        try:
+            return self.page_service.page(
+                Paycheck.objects.filter(user=request.user).select_related("category"),
+                "date",
+                cursor,
+                limit,
+                date_from=date_from,
+                date_to=date_to,
+                category_id=category_id,
+            )
+        except ValueError as e:
+            return 400, {"error": str(e)}
+
+    @route.post("/bulk", response={200: PaycheckBulkResultSchema, 400: dict})
+    def bulk_paychecks(self, request, data: PaycheckBulkSchema):
+        """Create, update and soft delete many paychecks in one transaction"""
+        try:
+            return self.bulk_service.apply(
+                request.user, Paycheck, data.create, data.update, data.delete
+            )
+        except ValueError as e:
+            return 400, {"error": str(e)}
 
     @route.get("/{paycheck_id}", response=PaycheckSchema)
     def get_paycheck(self, request, paycheck_id: int):
         """Get a specific paycheck"""
-        return Paycheck.objects.select_related("category").get(
-            id=paycheck_id, user=request.user, is_deleted=False
-        )
+        return Paycheck.objects.select_related("category").get(id=paycheck_id, user=request.user)
 
     @route.post("", response={201: PaycheckSchema, 400: dict})
     def create_paycheck(self, request, data: PaycheckSchema):
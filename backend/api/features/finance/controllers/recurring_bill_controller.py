@@ -1,10 +1,18 @@
-from typing import List
+from datetime import date
+from typing import Optional
 
 from ninja_extra import api_controller, route
 from ninja_jwt.authentication import JWTAuth
 
 from api.features.finance.models import Category, FinanceAccount, RecurringBill
-from api.features.finance.schemas import RecurringBillSchema
+from api.features.finance.schemas import (
+    RecurringBillBulkResultSchema,
+    RecurringBillBulkSchema,
+    RecurringBillPageSchema,
+    RecurringBillSchema,
+)
+from api.features.finance.services.bulk_service import BulkService
+from api.features.finance.services.page_service import PageService
 from api.features.users.permissons import IsApproved
 
 
@@ -12,19 +20,48 @@ from api.features.users.permissons import IsApproved
     "/finance/recurring-bills", auth=JWTAuth(), tags=["Recurring Bills"], permissions=[IsApproved]
 )
 class RecurringBillController:
-    @route.get("", response=List[RecurringBillSchema])
-    def list_bills(self, request):
-        """List all recurring bills for current user"""
-        return RecurringBill.objects.filter(user=request.user, is_deleted=False).select_related(
-            "category"
-        )
+    def __init__(self):
+        self.bulk_service = BulkService()
+        self.page_service = PageService()
+
+    @route.get("", response={200: RecurringBillPageSchema, 400: dict})
+    def list_bills(
+        self,
+        request,
+        cursor: Optional[str] = None,
+        limit: Optional[int] = None,
+        date_from: Optional[date] = None,
+        date_to: Optional[date] = None,
+        category_id: Optional[int] = None,
+    ):
+        """List the current user's recurring bills by start date, newest first, one page at a time"""
+        try:
+            return self.page_service.page(
+                RecurringBill.objects.filter(user=request.user).select_related("category"),
+                "start_date",
+                cursor,
+                limit,
+                date_from=date_from,
+                date_to=date_to,
+                category_id=category_id,
+            )
+        except ValueError as e:
+            return 400, {"error": str(e)}
+
+    @route.post("/bulk", response={200: RecurringBillBulkResultSchema, 400: dict})
+    def bulk_bills(self, request, data: RecurringBillBulkSchema):
+        """Create, update and soft delete many recurring bills in one transaction"""
+        try:
+            return self.bulk_service.apply(
+                request.user, RecurringBill, data.create, data.update, data.delete
+            )
+        except ValueError as e:
+            return 400, {"error": str(e)}
 
     @route.get("/{bill_id}", response=RecurringBillSchema)
     def get_bill(self, request, bill_id: int):
         """Get a specific recurring bill"""
-        return RecurringBill.objects.select_related("category").get(
-            id=bill_id, user=request.user, is_deleted=False
-        )
+        return RecurringBill.objects.select_related("category").get(id=bill_id, user=request.user)
 
     @route.post("", response={201: RecurringBillSchema, 400: dict})
     def create_bill(self, request, data: RecurringBillSchema):
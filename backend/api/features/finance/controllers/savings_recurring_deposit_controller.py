@@ -1,10 +1,15 @@
-from typing import List
+from datetime import date
+from typing import Optional
 
 from ninja_extra import api_controller, route
 from ninja_jwt.authentication import JWTAuth
 
 from api.features.finance.models import SavingsRecurringDeposit
-from api.features.finance.schemas import SavingsRecurringDepositSchema
+from api.features.finance.schemas import (
+    SavingsRecurringDepositPageSchema,
+    SavingsRecurringDepositSchema,
+)
+from api.features.finance.services.page_service import PageService
 from api.features.finance.utils import get_or_create_savings_account
 from api.features.users.permissons import IsApproved
 
@@ -16,17 +21,35 @@ from api.features.users.permissons import IsApproved
     permissions=[IsApproved],
 )
 class SavingsRecurringDepositController:
-    @route.get("", response=List[SavingsRecurringDepositSchema])
-    def list_recurring_deposits(self, request):
-        """List all recurring savings deposits for the current user"""
-        return SavingsRecurringDeposit.objects.filter(user=request.user, is_deleted=False)
+    def __init__(self):
+        self.page_service = PageService()
+
+    @route.get("", response={200: SavingsRecurringDepositPageSchema, 400: dict})
+    def list_recurring_deposits(
+        self,
+        request,
+        cursor: Optional[str] = None,
+        limit: Optional[int] = None,
+        date_from: Optional[date] = None,
+        date_to: Optional[date] = None,
+    ):
+        """List the current user's recurring savings deposits by start date, newest first"""
+        try:
+            return self.page_service.page(
+                SavingsRecurringDeposit.objects.filter(user=request.user),
+                "start_date",
+                cursor,
+                limit,
+                date_from=date_from,
+                date_to=date_to,
+            )
+        except ValueError as e:
+            return 400, {"error": str(e)}
 
     @route.get("/{deposit_id}", response=SavingsRecurringDepositSchema)
     def get_recurring_deposit(self, request, deposit_id: int):
         """Retrieve a specific recurring savings deposit"""
-        return SavingsRecurringDeposit.objects.get(
-            id=deposit_id, user=request.user, is_deleted=False
-        )
+        return SavingsRecurringDeposit.objects.get(id=deposit_id, user=request.user)
 
     @route.post("", response={201: SavingsRecurringDepositSchema, 400: dict})
     def create_recurring_deposit(self, request, data: SavingsRecurringDepositSchema):
@@ -63,9 +86,7 @@ class SavingsRecurringDepositController:
         self, request, deposit_id: int, data: SavingsRecurringDepositSchema
     ):
         """Update an existing recurring savings deposit"""
-        recurring_deposit = SavingsRecurringDeposit.objects.get(
-            id=deposit_id, user=request.user, is_deleted=False
-        )
+        recurring_deposit = SavingsRecurringDeposit.objects.get(id=deposit_id, user=request.user)
         payload = data.dict(exclude_unset=True, by_alias=True, exclude={"id"})
 
         for attr, value in payload.items():
@@ -76,8 +97,6 @@ class SavingsRecurringDepositController:
     @route.delete("/{deposit_id}", response={204: None})
     def delete_recurring_deposit(self, request, deposit_id: int):
         """Soft delete a recurring savings deposit"""
-        recurring_deposit = SavingsRecurringDeposit.objects.get(
-            id=deposit_id, user=request.user, is_deleted=False
-        )
+        recurring_deposit = SavingsRecurringDeposit.objects.get(id=deposit_id, user=request.user)
         recurring_deposit.soft_delete()
         return 204, None
@@ -1,14 +1,14 @@
-from decimal import Decimal
-from typing import List
+from datetime import date
+from typing import Optional
 
 from ninja_extra import api_controller, route
 from ninja_jwt.authentication import JWTAuth
 
 from api.features.finance.models import SavingsTransaction
-from api.features.finance.schemas import SavingsTransactionSchema
-from api.features.finance.utils import (
-    get_or_create_finance_account,
-    get_or_create_savings_account,
+from api.features.finance.schemas import SavingsTransactionPageSchema, SavingsTransactionSchema
+from api.features.finance.services.page_service import PageService
+from api.features.finance.services.savings_transaction_service import (
+    SavingsTransactionService,
 )
 from api.features.users.permissons import IsApproved
 
@@ -20,92 +20,49 @@ from api.features.users.permissons import IsApproved
     permissions=[IsApproved],
 )
 class SavingsTransactionController:
-    @route.get("", response=List[SavingsTransactionSchema])
-    def list_transactions(self, request):
-        """List all savings transactions for the current user"""
-        return SavingsTransaction.objects.filter(user=request.user, is_deleted=False).order_by(
-            "-date", "-created_at"
-        )
+    def __init__(self):
+        self.savings_transaction_service = SavingsTransactionService()
+        self.page_service = PageService()
+
+    @route.get("", response={200: SavingsTransactionPageSchema, 400: dict})
+    def list_transactions(
+        self,
+        request,
+        cursor: Optional[str] = None,
+        limit: Optional[int] = None,
+        date_from: Optional[date] = None,
+        date_to: Optional[date] = None,
+    ):
+        """List the current user's savings transactions, newest first, one page at a time"""
+        try:
+            return self.page_service.page(
+                SavingsTransaction.objects.filter(user=request.user),
+                "date",
+                cursor,
+                limit,
+                date_from=date_from,
+                date_to=date_to,
+            )
+        except ValueError as e:
+            return 400, {"error": str(e)}
 
     @route.get("/{transaction_id}", response=SavingsTransactionSchema)
     def get_transaction(self, request, transaction_id: int):
         """Retrieve a specific savings transaction"""
-        return SavingsTransaction.objects.get(
-            id=transaction_id, user=request.user, is_deleted=False
-        )
+        return SavingsTransaction.objects.get(id=transaction_id, user=request.user)
 
     @route.post("", response={201: SavingsTransactionSchema, 400: dict})
     def create_transaction(self, request, data: SavingsTransactionSchema):
         """Create a new savings transaction"""
-        savings_account = get_or_create_savings_account(request.user)
-        finance_account = get_or_create_finance_account(request.user)
-
         payload = data.dict(exclude_unset=True, by_alias=True, exclude={"id"})
-        transaction_type = payload.get("transaction_type")
-        amount_value = payload.get("amount")
-
-        if amount_value is None:
-            return 400, {"error": "Amount is required."}
-
-        amount = Decimal(str(amount_value))
-        if amount <= 0:
-            return 400, {"error": "Amount must be greater than zero."}
-
-        if transaction_type == "deposit":
-            if (finance_account.current_balance or Decimal("0")) < amount:
-                return 400, {"error": "Insufficient checking balance for deposit."}
-            savings_account.current_balance = (
-                savings_account.current_balance or Decimal("0")
-            ) + amount
-            finance_account.current_balance = (
-                finance_account.current_balance or Decimal("0")
-            ) - amount
-        elif transaction_type == "transfer_to_checking":
-            if (savings_account.current_balance or Decimal("0")) < amount:
-                return 400, {"error": "Insufficient savings balance for transfer."}
-            savings_account.current_balance -= amount
-            finance_account.current_balance = (
-                finance_account.current_balance or Decimal("0")
-            ) + amount
-        else:
-            return 400, {"error": f"Unsupported transaction type: {transaction_type}"}
-
-        savings_account.save()
-        finance_account.save()
-
-        transaction = SavingsTransaction.objects.create(
-            user=request.user,
-            savings_account=savings_account,
-            **payload,
-        )
+        try:
+            transaction = self.savings_transaction_service.create(request.user, payload)
+        except ValueError as e:
+            return 400, {"error": str(e)}
         return 201, transaction
 
     @route.delete("/{transaction_id}", response={204: None})
     def delete_transaction(self, request, transaction_id: int):
         """Soft delete a savings transaction and revert its balance impact"""
-        transaction = SavingsTransaction.objects.get(
-            id=transaction_id, user=request.user, is_deleted=False
-        )
-        savings_account = get_or_create_savings_account(request.user)
-        finance_account = get_or_create_finance_account(request.user)
-
-        amount = transaction.amount
-        if transaction.transaction_type == "deposit":
-            savings_account.current_balance = (
-                savings_account.current_balance or Decimal("0")
-            ) - amount
-            finance_account.current_balance = (
-                finance_account.current_balance or Decimal("0")
-            ) + amount
-        elif transaction.transaction_type == "transfer_to_checking":
-            savings_account.current_balance = (
-                savings_account.current_balance or Decimal("0")
-            ) + amount
-            finance_account.current_balance = (
-                finance_account.current_balance or Decimal("0")
-            ) - amount
-
-        savings_account.save()
-        finance_account.save()
-        transaction.soft_delete()
+        self.savings_transaction_service.delete(request.user, transaction_id)
         return 204, None
@@ -1,27 +1,399 @@
+from datetime import date, datetime
+from decimal import Decimal
+from typing import Any, Dict, Iterable, List, Optional, Tuple, Union
+
 from django.contrib.auth.models import User
-from django.db import models
+from django.db import models, transaction
+from django.db.models import F, Q
 from django.utils import timezone
 
+from core.db_router import database_for_user
+
+
+def as_date(value: Union[date, datetime, str]) -> date:
+    if isinstance(value, datetime):
+        return value.date()
+    if isinstance(value, str):
+        return date.fromisoformat(value[:10])
+    return value
+
+
+class FinanceRevision(models.Model):
+    """
+    Per-user monotonically increasing change counter.
+    Every write to a finance row stamps it with the next revision so clients
+    can ask for "everything that changed since revision N".
+    """
+
+    user = models.OneToOneField(User, on_delete=models.CASCADE, related_name="finance_revision")
+    revision = models.BigIntegerField(default=0)
+    # Bumped when rows are hard-deleted (e.g. a wipe-and-restore import), so clients
+    # holding a replica older than this know they must resync from scratch
+    reset_revision = models.BigIntegerField(default=0)
+
+    def __str__(self):
+        return f"{self.user.username}'s Finance Revision ({self.revision})"
+
+    @classmethod
+    def allocate(cls, user_id: int, count: int = 1) -> int:
+        """Reserve `count` revisions for a user and return the highest one"""
+        database = database_for_user(user_id)
+        revisions = cls.objects.db_manager(database)
+        with transaction.atomic(using=database):
+            revisions.get_or_create(user_id=user_id)
+            revisions.filter(user_id=user_id).update(revision=F("revision") + count)
+            return revisions.filter(user_id=user_id).values_list("revision", flat=True).get()
+
+    @classmethod
+    def stamp(cls, user_id: int, rows) -> None:
+        """Assign fresh revisions to unsaved rows headed for bulk_create/bulk_update"""
+        if not rows:
+            return
+        top = cls.allocate(user_id, count=len(rows))
+        for offset, row in enumerate(rows, start=top - len(rows) + 1):
+            row.revision = offset
+
+    @classmethod
+    def current(cls, user_id: int) -> int:
+        revisions = cls.objects.db_manager(database_for_user(user_id))
+        return revisions.filter(user_id=user_id).values_list("revision", flat=True).first() or 0
+
+    @classmethod
+    def mark_reset(cls, user_id: int) -> int:
+        """Record that rows were hard-deleted, invalidating every replica up to now"""
+        revision = cls.allocate(user_id)
+        cls.objects.db_manager(database_for_user(user_id)).filter(user_id=user_id).update(
+            reset_revision=revision
+        )
+        FinanceChangeLog.objects.create(
+            user_id=user_id, operation=FinanceChangeLog.Operation.RESET, revision=revision
+        )
+        return revision
+
+    @classmethod
+    def expire_before(cls, user_id: int, revision: int) -> None:
+        """
+        Make replicas older than `revision` resync from scratch without logging a reset,
+        e.g. after tombstones up to it were archived and can no longer be synced
+        """
+        cls.objects.db_manager(database_for_user(user_id)).filter(
+            user_id=user_id, reset_revision__lt=revision
+        ).update(reset_revision=revision)
+
+
+class FinanceChangeLog(models.Model):
+    """
+    Append-only outbox of finance mutations, written in the same transaction as the row.
+    Downstream maintenance reads it in id order from its own FinanceChangeCursor, so
+    each consumer only processes entries it has not seen yet.
+    """
+
+    class Operation(models.TextChoices):
+        CREATE = "create", "Create"
+        UPDATE = "update", "Update"
+        DELETE = "delete", "Delete"
+        RESTORE = "restore", "Restore"
+        # Rows were hard-deleted (wipe-and-restore import); consumers rebuild from scratch
+        RESET = "reset", "Reset"
+
+    user = models.ForeignKey(User, on_delete=models.CASCADE, related_name="finance_changes")
+    model = models.CharField(max_length=32, blank=True)
+    object_id = models.BigIntegerField(null=True, blank=True)
+    operation = models.CharField(max_length=8, choices=Operation.choices)
+    revision = models.BigIntegerField(default=0)
+    # Dates the change can affect; None means unbounded on that side
+    date_from = models.DateField(null=True, blank=True)
+    date_to = models.DateField(null=True, blank=True)
+    # Change in the row's effective amount (deleted rows count as 0); None if unknown
+    amount_delta = models.DecimalField(max_digits=14, decimal_places=2, null=True, blank=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        indexes = [models.Index(fields=["user", "id"])]
+
+    def __str__(self):
+        return f"{self.user.username}'s {self.operation} of {self.model or 'all rows'} #{self.id}"
+
+    @classmethod
+    def build(
+        cls, row: "SoftDeleteModel", operation: str, previous: Optional[Dict[str, Any]] = None
+    ) -> "FinanceChangeLog":
+        """
+        Describe a write to `row`, given its change_state() before the write
+        (None for rows that did not exist yet). The entry is not saved.
+        """
+        current = row.change_state()
+        states = [state for state in (previous, current) if state]
+
+        dates = []
+        if row.change_date_field:
+            dates = [as_date(s[row.change_date_field]) for s in states if s[row.change_date_field]]
+        # A recurring row affects every occurrence from its start date onwards
+        open_ended = row.change_recurring and any(s["frequency"] != "once" for s in states)
+
+        amount_delta = None
+        if row.change_amount_field and (previous or operation == cls.Operation.CREATE):
+            amount_delta = row.effective_amount(current) - row.effective_amount(previous)
+
+        return cls(
+            user_id=row.user_id,
+            model=row._meta.model_name,
+            object_id=row.pk,
+            operation=operation,
+            revision=row.revision,
+            date_from=min(dates) if dates else None,
+            date_to=max(dates) if dates and not open_ended else None,
+            amount_delta=amount_delta,
+        )
+
+    @classmethod
+    def record_bulk(
+        cls, changes: Iterable[Tuple["SoftDeleteModel", str, Optional[Dict[str, Any]]]]
+    ) -> List["FinanceChangeLog"]:
+        """Log rows written with bulk_create/bulk_update, as (row, operation, previous) tuples"""
+        entries = [cls.build(row, operation, previous) for row, operation, previous in changes]
+        if entries:
+            cls.objects.db_manager(database_for_user(entries[0].user_id)).bulk_create(entries)
+        return entries
+
+
+class FinanceChangeCursor(models.Model):
+    """How far a named consumer has processed a user's FinanceChangeLog"""
+
+    user = models.ForeignKey(User, on_delete=models.CASCADE, related_name="finance_change_cursors")
+    consumer = models.CharField(max_length=64)
+    position = models.BigIntegerField(default=0)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        unique_together = ("user", "consumer")
+
+    def __str__(self):
+        return f"{self.user.username}'s {self.consumer} cursor ({self.position})"
+
+
+class CalendarPushBaseline(models.Model):
+    """
+    Content hash of each calendar day as last pushed to a user's websockets. Kept in
+    the database so every process diffs against what the client was actually sent.
+    """
+
+    user = models.OneToOneField(
+        User, on_delete=models.CASCADE, related_name="calendar_push_baseline"
+    )
+    # FinanceRevision the pushed days were rendered at; an older render is never sent
+    revision = models.BigIntegerField(default=0)
+    # iso date -> content hash
+    digests = models.JSONField(default=dict)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    def __str__(self):
+        return f"{self.user.username}'s calendar push baseline ({self.revision})"
+
+
+class BalanceLedgerEntry(models.Model):
+    """
+    Append-only ledger of account balance changes. An account's balance is the sum of
+    its entries; current_balance on the account is a cache of it, and BalanceSnapshot
+    rows checkpoint the running sum so no query has to scan the whole history.
+    """
+
+    class Account(models.TextChoices):
+        CHECKING = "checking", "Checking"
+        SAVINGS = "savings", "Savings"
+
+    class Kind(models.TextChoices):
+        OPENING = "opening", "Opening balance"
+        # The balance was set directly: an account edit or an import
+        ADJUSTMENT = "adjustment", "Adjustment"
+        TRANSFER = "transfer", "Transfer"
+        REVERSAL = "reversal", "Reversal"
+
+    user = models.ForeignKey(User, on_delete=models.CASCADE, related_name="balance_ledger")
+    account = models.CharField(max_length=8, choices=Account.choices)
+    kind = models.CharField(max_length=10, choices=Kind.choices)
+    amount = models.DecimalField(max_digits=14, decimal_places=2)
+    # The row that caused the entry, e.g. a savings transaction; blank for edits
+    model = models.CharField(max_length=32, blank=True)
+    object_id = models.BigIntegerField(null=True, blank=True)
+    created_at = models.DateTimeField(default=timezone.now)
+
+    class Meta:
+        indexes = [models.Index(fields=["user", "account", "id"])]
+
+    def __str__(self):
+        return f"{self.user.username}'s {self.account} {self.kind} of {self.amount}"
+
+    @classmethod
+    def build(
+        cls, account: "SoftDeleteModel", amount: Decimal, kind: str, source=None
+    ) -> "BalanceLedgerEntry":
+        """Describe a change of `amount` to an account's balance. The entry is not saved."""
+        return cls(
+            user_id=account.user_id,
+            account=account.ledger_account,
+            kind=kind,
+            amount=amount,
+            model=source._meta.model_name if source is not None else "",
+            object_id=source.pk if source is not None else None,
+        )
+
+    @classmethod
+    def record(cls, entries: Iterable["BalanceLedgerEntry"]) -> None:
+        entries = list(entries)
+        if entries:
+            cls.objects.db_manager(database_for_user(entries[0].user_id)).bulk_create(entries)
+
+
+class BalanceSnapshot(models.Model):
+    """Running balance of an account over every ledger entry up to `last_entry_id`"""
+
+    user = models.ForeignKey(User, on_delete=models.CASCADE, related_name="balance_snapshots")
+    account = models.CharField(max_length=8, choices=BalanceLedgerEntry.Account.choices)
+    last_entry_id = models.BigIntegerField()
+    balance = models.DecimalField(max_digits=14, decimal_places=2)
+    # created_at of the last entry covered, so historical lookups can find the snapshot
+    as_of = models.DateTimeField()
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        unique_together = ("user", "account", "last_entry_id")
+        indexes = [models.Index(fields=["user", "account", "as_of"])]
+
+    def __str__(self):
+        return f"{self.user.username}'s {self.account} balance as of {self.as_of}"
+
+
+class LiveManager(models.Manager):
+    """Manager that hides soft-deleted rows"""
+
+    def get_queryset(self):
+        return super().get_queryset().filter(is_deleted=False)
+
+
+def revision_indexes(prefix: str) -> List[models.Index]:
+    """
+    Partial (user, revision) indexes for /finance/changes: one over live rows and one
+    over tombstones, so each half of a sync reads only the rows it returns
+    """
+    return [
+        models.Index(
+            fields=["user", "revision"],
+            name=f"{prefix}_live_rev_idx",
+            condition=Q(is_deleted=False),
+        ),
+        models.Index(
+            fields=["user", "revision"],
+            name=f"{prefix}_deleted_rev_idx",
+            condition=Q(is_deleted=True),
+        ),
+    ]
+
 
 class SoftDeleteModel(models.Model):
     is_deleted = models.BooleanField(default=False)
     deleted_at = models.DateTimeField(null=True, blank=True)
+    updated_at = models.DateTimeField(auto_now=True)
+    revision = models.BigIntegerField(default=0)
+
+    # Fields the change log takes the affected date and amount from
+    change_date_field: Optional[str] = None
+    change_amount_field: Optional[str] = None
+    # Rows with a frequency other than "once" affect every later occurrence too
+    change_recurring = False
+    # Accounts whose balance changes are posted to the BalanceLedgerEntry ledger
+    ledger_account: Optional[str] = None
+
+    # Declared first so it stays the default manager: admin, dumpdata, related lookups
+    # and the importers keep seeing deleted rows, while app code reads live ones
+    all_objects = models.Manager()
+    objects = LiveManager()
 
     class Meta:
         abstract = True
 
+    def save(self, *args, **kwargs):
+        operation = getattr(self, "_change_operation", None)
+        self._change_operation = None
+        # Set when the balance is being brought back in line with the ledger itself
+        post_to_ledger = not getattr(self, "_skip_ledger", False)
+        self._skip_ledger = False
+        if operation is None:
+            adding = self._state.adding
+            operation = (
+                FinanceChangeLog.Operation.CREATE if adding else FinanceChangeLog.Operation.UPDATE
+            )
+        previous = None if self._state.adding else self.stored_change_state()
+
+        update_fields = kwargs.get("update_fields")
+        if update_fields is not None:
+            kwargs["update_fields"] = {*update_fields, "revision", "updated_at"}
+
+        # allocate() locks the user's revision row until commit, so a user's log entries
+        # commit in id order and cursors never skip past one still in flight
+        with transaction.atomic(using=database_for_user(self.user_id)):
+            self.revision = FinanceRevision.allocate(self.user_id)
+            # Built before saving so post_save receivers can read the affected range
+            self._change_entry = FinanceChangeLog.build(self, operation, previous)
+            super().save(*args, **kwargs)
+            self._change_entry.object_id = self.pk
+            self._change_entry.save()
+            if self.ledger_account and post_to_ledger:
+                self.post_balance_change(previous)
+
     def soft_delete(self):
         self.is_deleted = True
         self.deleted_at = timezone.now()
+        self._change_operation = FinanceChangeLog.Operation.DELETE
         self.save()
 
     def restore(self):
         self.is_deleted = False
         self.deleted_at = None
+        self._change_operation = FinanceChangeLog.Operation.RESTORE
         self.save()
 
+    @classmethod
+    def change_fields(cls) -> Tuple[str, ...]:
+        fields = ("is_deleted", cls.change_date_field, cls.change_amount_field)
+        if cls.change_recurring:
+            fields += ("frequency",)
+        return tuple(field for field in fields if field)
+
+    def change_state(self) -> Dict[str, Any]:
+        """The fields the change log compares, as currently set on this instance"""
+        return {field: getattr(self, field) for field in self.change_fields()}
+
+    def stored_change_state(self) -> Optional[Dict[str, Any]]:
+        """The fields the change log compares, as currently stored in the database"""
+        rows = type(self).all_objects.using(database_for_user(self.user_id)).filter(pk=self.pk)
+        return rows.values(*self.change_fields()).first()
+
+    def post_balance_change(self, previous: Optional[Dict[str, Any]]) -> None:
+        """Add the change of a saved account's balance to the ledger"""
+        old = Decimal("0")
+        if previous and previous[self.change_amount_field] is not None:
+            old = Decimal(str(previous[self.change_amount_field]))
+        amount = Decimal(str(getattr(self, self.change_amount_field) or 0)) - old
+        if amount:
+            kind = (
+                BalanceLedgerEntry.Kind.ADJUSTMENT if previous else BalanceLedgerEntry.Kind.OPENING
+            )
+            BalanceLedgerEntry.record([BalanceLedgerEntry.build(self, amount, kind)])
+
+    def effective_amount(self, state: Optional[Dict[str, Any]]) -> Decimal:
+        if not state or state["is_deleted"] or state[self.change_amount_field] is None:
+            return Decimal("0")
+        return Decimal(str(state[self.change_amount_field]))
+
 
 class FinanceAccount(SoftDeleteModel):
+    change_amount_field = "current_balance"
+    ledger_account = BalanceLedgerEntry.Account.CHECKING
+
+    # A user has exactly one account, so lookups must find it even when soft-deleted
+    objects = models.Manager()
+
     user = models.OneToOneField(User, on_delete=models.CASCADE, related_name="finance_account")
     starting_balance = models.DecimalField(max_digits=14, decimal_places=2)
     current_balance = models.DecimalField(max_digits=14, decimal_places=2)
@@ -33,6 +405,12 @@ class FinanceAccount(SoftDeleteModel):
 
 
 class SavingsAccount(SoftDeleteModel):
+    change_amount_field = "current_balance"
+    ledger_account = BalanceLedgerEntry.Account.SAVINGS
+
+    # A user has exactly one account, so lookups must find it even when soft-deleted
+    objects = models.Manager()
+
     user = models.OneToOneField(User, on_delete=models.CASCADE, related_name="savings_account")
     starting_balance = models.DecimalField(max_digits=14, decimal_places=2, default=0)
     current_balance = models.DecimalField(max_digits=14, decimal_places=2, default=0)
@@ -54,6 +432,10 @@ SAVINGS_FREQUENCY_CHOICES = FREQUENCY_CHOICES
 
 
 class SavingsRecurringDeposit(SoftDeleteModel):
+    change_date_field = "start_date"
+    change_amount_field = "amount"
+    change_recurring = True
+
     user = models.ForeignKey(
         User, on_delete=models.CASCADE, related_name="savings_recurring_deposits"
     )
@@ -77,6 +459,17 @@ class SavingsRecurringDeposit(SoftDeleteModel):
     notes = models.CharField(max_length=255, blank=True)
     created_at = models.DateTimeField(auto_now_add=True)
 
+    class Meta:
+        indexes = [
+            # Keyset pages walk (start_date, id) within one user's live rows
+            models.Index(
+                fields=["user", "start_date", "id"],
+                name="savingsdeposit_live_date_idx",
+                condition=Q(is_deleted=False),
+            ),
+            *revision_indexes("savingsdeposit"),
+        ]
+
     def __str__(self):
         return f"{self.user.username}'s {self.name} Savings Deposit"
 
@@ -88,6 +481,9 @@ SAVINGS_TRANSACTION_TYPE_CHOICES = [
 
 
 class SavingsTransaction(SoftDeleteModel):
+    change_date_field = "date"
+    change_amount_field = "amount"
+
     user = models.ForeignKey(User, on_delete=models.CASCADE, related_name="savings_transactions")
     savings_account = models.ForeignKey(
         SavingsAccount,
@@ -100,6 +496,16 @@ class SavingsTransaction(SoftDeleteModel):
     notes = models.CharField(max_length=255, blank=True)
     created_at = models.DateTimeField(auto_now_add=True)
 
+    class Meta:
+        indexes = [
+            models.Index(
+                fields=["user", "date", "id"],
+                name="savingstx_live_date_id_idx",
+                condition=Q(is_deleted=False),
+            ),
+            *revision_indexes("savingstx"),
+        ]
+
     def __str__(self):
         return f"{self.user.username}'s {self.get_transaction_type_display()} on {self.date}"
 
@@ -153,12 +559,22 @@ class Category(SoftDeleteModel):
     class Meta:
         unique_together = ("user", "name")
         verbose_name_plural = "Categories"
+        indexes = [
+            models.Index(
+                fields=["user"], name="category_live_user_idx", condition=Q(is_deleted=False)
+            ),
+            *revision_indexes("category"),
+        ]
 
     def __str__(self):
         return f"{self.user.username}'s {self.name} ({self.get_type_display()})"
 
 
 class RecurringBill(SoftDeleteModel):
+    change_date_field = "start_date"
+    change_amount_field = "amount"
+    change_recurring = True
+
     user = models.ForeignKey(User, on_delete=models.CASCADE, related_name="recurring_bills")
     finance_account = models.ForeignKey(
         FinanceAccount,
@@ -197,11 +613,30 @@ class RecurringBill(SoftDeleteModel):
     total = models.DecimalField(max_digits=14, decimal_places=2, null=True, blank=True)
     amount_paid = models.DecimalField(max_digits=14, decimal_places=2, null=True, blank=True)
 
+    class Meta:
+        indexes = [
+            models.Index(
+                fields=["user", "start_date", "id"],
+                name="recurringbill_live_date_idx",
+                condition=Q(is_deleted=False),
+            ),
+            models.Index(
+                fields=["user", "category", "start_date", "id"],
+                name="recurringbill_live_cat_idx",
+                condition=Q(is_deleted=False),
+            ),
+            *revision_indexes("recurringbill"),
+        ]
+
     def __str__(self):
         return f"{self.user.username}'s {self.name}"
 
 
 class Paycheck(SoftDeleteModel):
+    change_date_field = "date"
+    change_amount_field = "amount"
+    change_recurring = True
+
     user = models.ForeignKey(User, on_delete=models.CASCADE, related_name="paychecks")
     finance_account = models.ForeignKey(
         FinanceAccount, on_delete=models.CASCADE, related_name="paychecks", null=True, blank=True
@@ -222,11 +657,29 @@ class Paycheck(SoftDeleteModel):
         help_text="The category this paycheck belongs to (e.g., Salary, Freelance).",
     )
 
+    class Meta:
+        indexes = [
+            models.Index(
+                fields=["user", "date", "id"],
+                name="paycheck_live_date_id_idx",
+                condition=Q(is_deleted=False),
+            ),
+            models.Index(
+                fields=["user", "category", "date", "id"],
+                name="paycheck_live_cat_date_idx",
+                condition=Q(is_deleted=False),
+            ),
+            *revision_indexes("paycheck"),
+        ]
+
     def __str__(self):
         return f"{self.user.username}'s Paycheck on {self.date}"
 
 
 class Expense(SoftDeleteModel):
+    change_date_field = "date"
+    change_amount_field = "amount"
+
     user = models.ForeignKey(User, on_delete=models.CASCADE, related_name="expenses")
     finance_account = models.ForeignKey(
         FinanceAccount, on_delete=models.CASCADE, related_name="expenses", null=True, blank=True
@@ -247,5 +700,74 @@ class Expense(SoftDeleteModel):
         RecurringBill, on_delete=models.SET_NULL, null=True, blank=True, related_name="expenses"
     )
 
+    class Meta:
+        indexes = [
+            models.Index(
+                fields=["user", "date", "id"],
+                name="expense_live_date_id_idx",
+                condition=Q(is_deleted=False),
+            ),
+            models.Index(
+                fields=["user", "category", "date", "id"],
+                name="expense_live_cat_date_idx",
+                condition=Q(is_deleted=False),
+            ),
+            models.Index(
+                fields=["user", "related_bill", "date", "id"],
+                name="expense_live_bill_date_idx",
+                condition=Q(is_deleted=False),
+            ),
+            *revision_indexes("expense"),
+        ]
+
     def __str__(self):
         return f"{self.user.username}'s {self.name} on {self.date}"
+
+
+class TransactionFingerprint(models.Model):
+    """
+    Per-user index of content hashes for transactions loaded from bank statements.
+    Lets the statement importer skip rows it has already imported with one
+    set-based lookup per batch.
+    """
+
+    user = models.ForeignKey(
+        User, on_delete=models.CASCADE, related_name="transaction_fingerprints"
+    )
+    fingerprint = models.CharField(max_length=64)
+    expense = models.ForeignKey(
+        Expense, on_delete=models.SET_NULL, null=True, blank=True, related_name="+"
+    )
+    paycheck = models.ForeignKey(
+        Paycheck, on_delete=models.SET_NULL, null=True, blank=True, related_name="+"
+    )
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        unique_together = ("user", "fingerprint")
+
+    def __str__(self):
+        return f"{self.user.username}'s transaction {self.fingerprint[:12]}"
+
+
+class FinanceArchive(models.Model):
+    """
+    Cold storage for rows soft-deleted long ago. The archive service moves them
+    here in bulk as plain field values, and can put them back on demand.
+    """
+
+    user = models.ForeignKey(User, on_delete=models.CASCADE, related_name="finance_archive")
+    # model_name of the archived row, e.g. "expense"
+    model = models.CharField(max_length=64)
+    object_id = models.BigIntegerField()
+    deleted_at = models.DateTimeField(null=True, blank=True)
+    archived_at = models.DateTimeField(auto_now_add=True)
+    # Field values as strings, keyed by attname (category_id, not category)
+    data = models.JSONField()
+
+    class Meta:
+        unique_together = ("model", "object_id")
+        indexes = [models.Index(fields=["user", "model", "object_id"])]
+
+    def __str__(self):
+        return f"{self.user.username}'s archived {self.model} {self.object_id}"
@@ -1,5 +1,5 @@
 from datetime import date, datetime
-from typing import List, Optional
+from typing import List, Literal, Optional
 
 from ninja import Schema
 from pydantic import Field
@@ -31,6 +31,13 @@ class SavingsAccountSchema(Schema):
         populate_by_name = True
 
 
+class AccountBalanceSchema(Schema):
+    account: Literal["checking", "savings"]
+    # End of the day the balance is for; None for the current balance
+    asOfDate: Optional[date] = None
+    balance: float
+
+
 class SavingsRecurringDepositSchema(Schema):
     id: Optional[int] = None
     name: str
@@ -129,6 +136,89 @@ class ExpenseSchema(Schema):
         populate_by_name = True
 
 
+class RecurringBillBulkSchema(Schema):
+    create: List[RecurringBillSchema] = []
+    update: List[RecurringBillSchema] = []
+    delete: List[int] = []
+
+
+class RecurringBillBulkResultSchema(Schema):
+    created: List[RecurringBillSchema]
+    updated: List[RecurringBillSchema]
+    deleted: List[int]
+
+
+class PaycheckBulkSchema(Schema):
+    create: List[PaycheckSchema] = []
+    update: List[PaycheckSchema] = []
+    delete: List[int] = []
+
+
+class PaycheckBulkResultSchema(Schema):
+    created: List[PaycheckSchema]
+    updated: List[PaycheckSchema]
+    deleted: List[int]
+
+
+class ExpenseBulkSchema(Schema):
+    create: List[ExpenseSchema] = []
+    update: List[ExpenseSchema] = []
+    delete: List[int] = []
+
+
+class ExpenseBulkResultSchema(Schema):
+    created: List[ExpenseSchema]
+    updated: List[ExpenseSchema]
+    deleted: List[int]
+
+
+class RecurringBillPageSchema(Schema):
+    items: List[RecurringBillSchema]
+    # Pass back as `cursor` for the next page; None on the last page
+    nextCursor: Optional[str] = None
+    hasMore: bool
+    # Matching rows across all pages; only counted for the first page
+    total: Optional[int] = None
+
+
+class PaycheckPageSchema(Schema):
+    items: List[PaycheckSchema]
+    # Pass back as `cursor` for the next page; None on the last page
+    nextCursor: Optional[str] = None
+    hasMore: bool
+    # Matching rows across all pages; only counted for the first page
+    total: Optional[int] = None
+
+
+class ExpensePageSchema(Schema):
+    items: List[ExpenseSchema]
+    # Pass back as `cursor` for the next page; None on the last page
+    nextCursor: Optional[str] = None
+    hasMore: bool
+    # Matching rows across all pages; only counted for the first page
+    total: Optional[int] = None
+    # Summed amount of those rows; likewise only for the first page
+    totalAmount: Optional[float] = None
+
+
+class SavingsRecurringDepositPageSchema(Schema):
+    items: List[SavingsRecurringDepositSchema]
+    # Pass back as `cursor` for the next page; None on the last page
+    nextCursor: Optional[str] = None
+    hasMore: bool
+    # Matching rows across all pages; only counted for the first page
+    total: Optional[int] = None
+
+
+class SavingsTransactionPageSchema(Schema):
+    items: List[SavingsTransactionSchema]
+    # Pass back as `cursor` for the next page; None on the last page
+    nextCursor: Optional[str] = None
+    hasMore: bool
+    # Matching rows across all pages; only counted for the first page
+    total: Optional[int] = None
+
+
 class FinanceDataSchema(Schema):
     account: FinanceAccountSchema
     recurringBills: List[RecurringBillSchema]
@@ -161,6 +251,87 @@ class ExportDataSchema(Schema):
         populate_by_name = True
 
 
+class TombstoneSchema(Schema):
+    id: int
+    revision: int
+    deletedAt: Optional[datetime] = Field(default=None, alias="deleted_at")
+
+    class Config:
+        populate_by_name = True
+
+
+class FinanceTombstonesSchema(Schema):
+    categories: List[TombstoneSchema] = []
+    recurringBills: List[TombstoneSchema] = []
+    paychecks: List[TombstoneSchema] = []
+    expenses: List[TombstoneSchema] = []
+    savingsRecurringDeposits: List[TombstoneSchema] = []
+    savingsTransactions: List[TombstoneSchema] = []
+
+
+class FinanceChangesSchema(Schema):
+    revision: int
+    reset: bool = False
+    account: Optional[FinanceAccountSchema] = None
+    savingsAccount: Optional[SavingsAccountSchema] = None
+    categories: List[CategorySchema]
+    recurringBills: List[RecurringBillSchema]
+    paychecks: List[PaycheckSchema]
+    expenses: List[ExpenseSchema]
+    savingsRecurringDeposits: List[SavingsRecurringDepositSchema]
+    savingsTransactions: List[SavingsTransactionSchema]
+    deleted: FinanceTombstonesSchema
+
+
+class FinanceChangeLogEntrySchema(Schema):
+    id: int
+    model: str
+    objectId: Optional[int] = Field(default=None, alias="object_id")
+    operation: str
+    revision: int
+    dateFrom: Optional[date] = Field(default=None, alias="date_from")
+    dateTo: Optional[date] = Field(default=None, alias="date_to")
+    amountDelta: Optional[float] = Field(default=None, alias="amount_delta")
+    createdAt: datetime = Field(alias="created_at")
+
+    class Config:
+        populate_by_name = True
+
+
+class FinanceChangeLogSchema(Schema):
+    entries: List[FinanceChangeLogEntrySchema]
+    cursor: int
+    hasMore: bool
+
+
+class ArchiveRestoreRequestSchema(Schema):
+    # Collection key as in exports (e.g. "expenses"); all collections when omitted
+    collection: Optional[
+        Literal[
+            "categories",
+            "recurringBills",
+            "paychecks",
+            "expenses",
+            "savingsRecurringDeposits",
+            "savingsTransactions",
+        ]
+    ] = None
+    # Archived row ids; every archived row of the collection when omitted
+    ids: Optional[List[int]] = None
+
+
+class ArchiveSkippedRowSchema(Schema):
+    collection: str
+    id: int
+    reason: str
+
+
+class ArchiveRestoreSchema(Schema):
+    restored: int
+    skipped: int
+    skippedRows: List[ArchiveSkippedRowSchema]
+
+
 class CalendarDataRequestSchema(Schema):
     startDate: Optional[date] = None
     endDate: Optional[date] = None
@@ -177,6 +348,25 @@ class ExportCSVRequestSchema(Schema):
     endDate: date
     monthsToShow: int = 3
     includeAllDays: bool = True
+    # Put the monthly summary before the daily rows; costs a second pass over the calendar
+    summaryFirst: bool = False
+
+
+class BankStatementMappingSchema(Schema):
+    """Describes which CSV columns (by header name) hold each transaction field"""
+
+    dateColumn: str
+    descriptionColumn: str
+    # Either a single signed amount column, or separate debit/credit columns
+    amountColumn: Optional[str] = None
+    debitColumn: Optional[str] = None
+    creditColumn: Optional[str] = None
+    dateFormat: str = "%Y-%m-%d"
+    delimiter: str = ","
+    # Most banks export money leaving the account as negative amounts
+    negativeIsExpense: bool = True
+    expenseCategoryId: Optional[int] = None
+    incomeCategoryId: Optional[int] = None
 
 
 class BalanceProjectionRequestSchema(Schema):
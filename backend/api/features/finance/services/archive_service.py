@@ -0,0 +1,229 @@
+from datetime import timedelta
+from typing import Any, Dict, Iterator, List, Optional, Type
+
+from django.contrib.auth.models import User
+from django.db import IntegrityError, models, transaction
+from django.db.models import Q, prefetch_related_objects
+from django.utils import timezone
+
+from api.features.finance.models import (
+    Category,
+    Expense,
+    FinanceAccount,
+    FinanceArchive,
+    FinanceRevision,
+    Paycheck,
+    RecurringBill,
+    SavingsAccount,
+    SavingsRecurringDeposit,
+    SavingsTransaction,
+    SoftDeleteModel,
+)
+from api.features.finance.utils import get_or_create_finance_account, get_or_create_savings_account
+from core.db_router import database_for_user, sharded_databases, using_shard, using_user_shard
+
+DEFAULT_BATCH_SIZE = 500
+
+# Collection key -> model, leaf tables first so rows referencing a category or bill
+# are archived before it. Accounts are never archived: a user always has exactly one.
+ARCHIVED_COLLECTIONS: Dict[str, Type[SoftDeleteModel]] = {
+    "expenses": Expense,
+    "paychecks": Paycheck,
+    "savingsTransactions": SavingsTransaction,
+    "savingsRecurringDeposits": SavingsRecurringDeposit,
+    "recurringBills": RecurringBill,
+    "categories": Category,
+}
+
+# Stand-ins for required account references whose original row no longer exists
+ACCOUNT_GETTERS = {
+    FinanceAccount: get_or_create_finance_account,
+    SavingsAccount: get_or_create_savings_account,
+}
+
+
+class ArchiveService:
+    """
+    Moves rows soft-deleted long ago out of the hot tables into FinanceArchive,
+    and puts them back on demand. Archived rows keep their ids, so a restored row
+    is the same row a client saw before.
+    """
+
+    def archive(
+        self,
+        older_than_days: int,
+        user_id: Optional[int] = None,
+        batch_size: int = DEFAULT_BATCH_SIZE,
+    ) -> Dict[str, int]:
+        """Archive rows soft-deleted more than `older_than_days` ago, one batch per transaction"""
+        cutoff = timezone.now() - timedelta(days=older_than_days)
+        stats: Dict[str, int] = dict.fromkeys(ARCHIVED_COLLECTIONS, 0)
+        databases = sharded_databases() if user_id is None else [database_for_user(user_id)]
+        for database in databases:
+            with using_shard(database):
+                for key, model in ARCHIVED_COLLECTIONS.items():
+                    candidates = self._candidates(model, cutoff, user_id)
+                    while True:
+                        ids = list(
+                            candidates.order_by("pk").values_list("pk", flat=True)[:batch_size]
+                        )
+                        if not ids:
+                            break
+                        stats[key] += self._archive_batch(model, candidates, ids, database)
+        return stats
+
+    def restore(
+        self, user: User, collection: Optional[str] = None, ids: Optional[List[int]] = None
+    ) -> Dict[str, Any]:
+        """
+        Put archived rows back into the hot tables, still soft-deleted, so they sync and
+        export again and can be undeleted like any other row. Categories and bills go
+        first so restored rows can point at them again. Rows that cannot come back stay
+        archived and are listed under skippedRows with the reason.
+        """
+        restored = 0
+        skipped: List[Dict[str, Any]] = []
+        with using_user_shard(user.id):
+            for key, model in reversed(ARCHIVED_COLLECTIONS.items()):
+                if collection and key != collection:
+                    continue
+                records = FinanceArchive.objects.filter(user=user, model=model._meta.model_name)
+                if ids is not None:
+                    records = records.filter(object_id__in=ids)
+                for record in records.order_by("object_id"):
+                    reason = self._restore_record(user, model, record)
+                    if reason is None:
+                        restored += 1
+                    else:
+                        skipped.append(
+                            {"collection": key, "id": record.object_id, "reason": reason}
+                        )
+        return {"restored": restored, "skipped": len(skipped), "skippedRows": skipped}
+
+    def instances(
+        self, user: User, model: Type[SoftDeleteModel], chunk_size: int = DEFAULT_BATCH_SIZE
+    ) -> Iterator[SoftDeleteModel]:
+        """Rebuild a user's archived rows of one model as unsaved instances, for exports"""
+        records = (
+            FinanceArchive.objects.filter(user=user, model=model._meta.model_name)
+            .order_by("object_id")
+            .iterator(chunk_size=chunk_size)
+        )
+        chunk = []
+        for record in records:
+            chunk.append(self._instance(model, record))
+            if len(chunk) >= chunk_size:
+                yield from self._with_categories(chunk)
+                chunk = []
+        yield from self._with_categories(chunk)
+
+    def _candidates(self, model: Type[SoftDeleteModel], cutoff, user_id: Optional[int]):
+        # Rows deleted by an import may have no deleted_at; their last write stands in for it
+        candidates = model.all_objects.filter(is_deleted=True).filter(
+            Q(deleted_at__lt=cutoff) | Q(deleted_at__isnull=True, updated_at__lt=cutoff)
+        )
+        if user_id is not None:
+            candidates = candidates.filter(user_id=user_id)
+
+        # Keep rows that rows staying in the hot tables still point at
+        for relation in model._meta.related_objects:
+            if relation.related_model not in ARCHIVED_COLLECTIONS.values():
+                continue
+            column = relation.field.attname
+            referenced = relation.related_model.all_objects.filter(
+                **{f"{column}__isnull": False}
+            ).values(column)
+            candidates = candidates.exclude(pk__in=referenced)
+        return candidates
+
+    def _archive_batch(
+        self, model: Type[SoftDeleteModel], candidates, ids: List[int], database: str
+    ) -> int:
+        fields = [
+            field
+            for field in model._meta.concrete_fields
+            if not field.primary_key and field.name != "user"
+        ]
+        with transaction.atomic(using=database):
+            # Rows undeleted or newly referenced since the batch was picked are left alone
+            rows = list(candidates.filter(pk__in=ids).select_for_update())
+            FinanceArchive.objects.bulk_create(
+                [
+                    FinanceArchive(
+                        user_id=row.user_id,
+                        model=model._meta.model_name,
+                        object_id=row.pk,
+                        deleted_at=row.deleted_at,
+                        data={field.attname: self._dump(field, row) for field in fields},
+                    )
+                    for row in rows
+                ]
+            )
+            model.all_objects.filter(pk__in=[row.pk for row in rows]).delete()
+
+            # Their tombstones are gone, so clients that never saw them have to resync
+            newest: Dict[int, int] = {}
+            for row in rows:
+                newest[row.user_id] = max(newest.get(row.user_id, 0), row.revision)
+            for user_id, revision in newest.items():
+                FinanceRevision.expire_before(user_id, revision)
+        return len(rows)
+
+    def _dump(self, field: models.Field, row: SoftDeleteModel) -> Optional[str]:
+        # value_to_string keeps full precision (unlike JSON's datetimes) and to_python reverses it
+        if field.value_from_object(row) is None:
+            return None
+        return field.value_to_string(row)
+
+    def _restore_record(
+        self, user: User, model: Type[SoftDeleteModel], record: FinanceArchive
+    ) -> Optional[str]:
+        """Restore one archived row; returns why it was left archived, or None"""
+        if model.all_objects.filter(pk=record.object_id).exists():
+            # Already back in the hot table; the archived copy is stale
+            return "A row with this id is already in the finance tables"
+
+        row = self._instance(model, record)
+        for field in model._meta.concrete_fields:
+            if not isinstance(field, models.ForeignKey) or field.name == "user":
+                continue
+            target = getattr(row, field.attname)
+            if target is None or field.related_model._base_manager.filter(pk=target).exists():
+                continue
+            # The referenced row was hard-deleted or is still archived
+            if field.null:
+                setattr(row, field.attname, None)
+            else:
+                setattr(row, field.attname, ACCOUNT_GETTERS[field.related_model](user).pk)
+
+        # Inserting stamps auto_now_add fields with the current time, so they are put back after
+        original_times = {
+            field.attname: getattr(row, field.attname)
+            for field in model._meta.concrete_fields
+            if getattr(field, "auto_now_add", False) and getattr(row, field.attname)
+        }
+        try:
+            with transaction.atomic(using=database_for_user(user.id)):
+                row.save(force_insert=True)
+                if original_times:
+                    model.all_objects.filter(pk=row.pk).update(**original_times)
+                record.delete()
+        except IntegrityError as e:
+            # e.g. a live category has taken the archived one's name since
+            return f"Conflicts with a live row: {e}"
+        return None
+
+    def _instance(self, model: Type[SoftDeleteModel], record: FinanceArchive) -> SoftDeleteModel:
+        fields = {field.attname: field for field in model._meta.concrete_fields}
+        values: Dict[str, Any] = {
+            attname: fields[attname].to_python(value)
+            for attname, value in record.data.items()
+            # Columns dropped since the row was archived are ignored
+            if attname in fields
+        }
+        return model(pk=record.object_id, user_id=record.user_id, **values)
+
+    def _with_categories(self, chunk: List[SoftDeleteModel]) -> List[SoftDeleteModel]:
+        if chunk and any(field.name == "category" for field in chunk[0]._meta.concrete_fields):
+            prefetch_related_objects(chunk, "category")
+        return chunk
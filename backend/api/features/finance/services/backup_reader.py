@@ -0,0 +1,134 @@
+import codecs
+import json
+from typing import IO, Any, Iterator, Tuple
+
+DEFAULT_READ_SIZE = 64 * 1024
+
+# A single row larger than this is treated as a malformed backup rather than buffered forever
+MAX_VALUE_SIZE = 4 * 1024 * 1024
+
+WHITESPACE = " \t\n\r"
+
+NUMBER_CHARS = "0123456789.eE+-"
+
+
+class BackupStreamReader:
+    """
+    Incremental reader for backup documents produced by /finance/export.
+
+    Walks the top-level object one section at a time and yields
+    ``(section, value)`` pairs. Array sections yield once per row, object
+    sections yield once with the whole object. Only the row currently being
+    decoded is held in memory, so arbitrarily large backups parse at flat memory.
+    """
+
+    def __init__(self, stream: IO[bytes], read_size: int = DEFAULT_READ_SIZE):
+        self.stream = stream
+        self.read_size = read_size
+        self.text_decoder = codecs.getincrementaldecoder("utf-8")()
+        self.json_decoder = json.JSONDecoder()
+        self.buffer = ""
+        self.pos = 0
+        self.eof = False
+
+    def __iter__(self) -> Iterator[Tuple[str, Any]]:
+        self._expect("{")
+        if self._peek() == "}":
+            self.pos += 1
+            return
+
+        while True:
+            key = self._decode_value()
+            if not isinstance(key, str):
+                raise ValueError("Backup section names must be strings")
+            self._expect(":")
+
+            if self._peek() == "[":
+                self.pos += 1
+                if self._peek() == "]":
+                    self.pos += 1
+                else:
+                    while True:
+                        yield key, self._decode_value()
+                        if self._next_delimiter(",]") == "]":
+                            break
+            else:
+                yield key, self._decode_value()
+
+            if self._next_delimiter(",}") == "}":
+                break
+
+    def _fill(self) -> bool:
+        """Read the next chunk from the stream, returning False once it is exhausted"""
+        if self.eof:
+            return False
+
+        # Drop everything already consumed so the buffer never grows past one row
+        if self.pos:
+            self.buffer = self.buffer[self.pos :]
+            self.pos = 0
+
+        chunk = self.stream.read(self.read_size)
+        if not chunk:
+            self.eof = True
+            self.buffer += self.text_decoder.decode(b"", final=True)
+            return False
+
+        self.buffer += self.text_decoder.decode(chunk)
+        return True
+
+    def _peek(self) -> str:
+        """Return the next non-whitespace character without consuming it"""
+        while True:
+            while self.pos < len(self.buffer) and self.buffer[self.pos] in WHITESPACE:
+                self.pos += 1
+            if self.pos < len(self.buffer):
+                return self.buffer[self.pos]
+            if not self._fill():
+                return ""
+
+    def _expect(self, char: str) -> None:
+        found = self._peek()
+        if found != char:
+            raise ValueError(f"Malformed backup: expected '{char}' but found '{found or 'EOF'}'")
+        self.pos += 1
+
+    def _next_delimiter(self, allowed: str) -> str:
+        found = self._peek()
+        if not found or found not in allowed:
+            raise ValueError(
+                f"Malformed backup: expected one of '{allowed}' but found '{found or 'EOF'}'"
+            )
+        self.pos += 1
+        return found
+
+    def _decode_value(self) -> Any:
+        self._peek()
+        while True:
+            try:
+                value, end = self.json_decoder.raw_decode(self.buffer, self.pos)
+            except json.JSONDecodeError as exc:
+                # Most likely the value is cut off at the end of the buffer
+                if self._grow():
+                    continue
+                raise ValueError(f"Malformed backup: {exc.msg}") from exc
+
+            # A number ending at the buffer edge, or cut off after a "." or an exponent
+            # marker, might continue in the next chunk
+            if self._may_continue(value, end) and self._grow():
+                continue
+
+            self.pos = end
+            return value
+
+    def _may_continue(self, value: Any, end: int) -> bool:
+        if end == len(self.buffer):
+            return True
+        if isinstance(value, bool) or not isinstance(value, (int, float)):
+            return False
+        return all(char in NUMBER_CHARS for char in self.buffer[end:])
+
+    def _grow(self) -> bool:
+        if len(self.buffer) - self.pos > MAX_VALUE_SIZE:
+            raise ValueError("Malformed backup: a single entry exceeds the maximum row size")
+        return self._fill()
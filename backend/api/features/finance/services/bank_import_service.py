@@ -0,0 +1,260 @@
+import csv
+import hashlib
+import io
+import re
+from collections import Counter
+from datetime import date, datetime
+from decimal import Decimal, InvalidOperation
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple
+
+from django.contrib.auth.models import User
+from django.db import transaction
+from ninja.files import UploadedFile
+
+from api.features.finance.models import (
+    Category,
+    Expense,
+    FinanceAccount,
+    FinanceChangeLog,
+    FinanceRevision,
+    Paycheck,
+    TransactionFingerprint,
+)
+from api.features.finance.schemas import BankStatementMappingSchema
+from api.features.finance.services.calendar_push_service import schedule_calendar_push
+from core.db_router import database_for_user
+
+BANK_IMPORT_BATCH_SIZE = 1000
+
+_NON_WORD = re.compile(r"[^a-z0-9]+")
+
+
+class ParsedTransaction:
+    __slots__ = ("line_number", "date", "amount", "description", "fingerprint")
+
+    def __init__(self, line_number: int, date: date, amount: Decimal, description: str):
+        self.line_number = line_number
+        self.date = date
+        self.amount = amount
+        self.description = description
+        self.fingerprint = ""
+
+
+class BankStatementImportService:
+    def import_statement(
+        self,
+        file: UploadedFile,
+        user: User,
+        mapping: BankStatementMappingSchema,
+        batch_size: int = BANK_IMPORT_BATCH_SIZE,
+    ) -> Dict[str, Any]:
+        """
+        Import a bank CSV export as one-off expenses and paychecks.
+        Each row is fingerprinted from its date, amount and normalized description
+        and checked against the user's fingerprint index one batch at a time, so
+        re-importing an overlapping statement only inserts the new rows.
+        """
+        if not mapping.amountColumn and not (mapping.debitColumn or mapping.creditColumn):
+            raise ValueError("Map either amountColumn or debitColumn/creditColumn")
+
+        finance_account = FinanceAccount.objects.get(user=user)
+        expense_category = self._resolve_category(user, mapping.expenseCategoryId)
+        income_category = self._resolve_category(user, mapping.incomeCategoryId)
+
+        stats = {"inserted_expenses": 0, "inserted_paychecks": 0, "skipped_duplicates": 0}
+        errors: List[Dict[str, Any]] = []
+        # Identical rows in one statement are distinct transactions, so number repeats
+        occurrences: Counter = Counter()
+        batch: List[ParsedTransaction] = []
+
+        def flush():
+            self._insert_batch(
+                user, finance_account, expense_category, income_category, batch, stats
+            )
+            batch.clear()
+
+        text_stream = io.TextIOWrapper(file.file, encoding="utf-8-sig", newline="")
+        try:
+            with transaction.atomic(using=database_for_user(user.id)):
+                for parsed, error in self._parse_rows(text_stream, mapping):
+                    if error:
+                        errors.append({"row": parsed, "error": error})
+                        continue
+
+                    base = self._fingerprint_base(parsed)
+                    occurrences[base] += 1
+                    parsed.fingerprint = hashlib.sha256(
+                        f"{base}|{occurrences[base]}".encode("utf-8")
+                    ).hexdigest()
+
+                    batch.append(parsed)
+                    if len(batch) >= batch_size:
+                        flush()
+
+                if batch:
+                    flush()
+        finally:
+            # Hand the underlying file back untouched instead of closing it with the wrapper
+            text_stream.detach()
+
+        if stats["inserted_expenses"] or stats["inserted_paychecks"]:
+            schedule_calendar_push(user.id)
+        return {
+            **stats,
+            "inserted_count": stats["inserted_expenses"] + stats["inserted_paychecks"],
+            "errors": errors,
+        }
+
+    def _insert_batch(
+        self,
+        user: User,
+        finance_account: FinanceAccount,
+        expense_category: Optional[Category],
+        income_category: Optional[Category],
+        batch: List[ParsedTransaction],
+        stats: Dict[str, int],
+    ) -> None:
+        # One set-based lookup per batch instead of one query per row
+        known = set(
+            TransactionFingerprint.objects.filter(
+                user=user, fingerprint__in=[txn.fingerprint for txn in batch]
+            ).values_list("fingerprint", flat=True)
+        )
+        fresh = [txn for txn in batch if txn.fingerprint not in known]
+        stats["skipped_duplicates"] += len(batch) - len(fresh)
+        if not fresh:
+            return
+
+        expenses: List[Tuple[ParsedTransaction, Expense]] = []
+        paychecks: List[Tuple[ParsedTransaction, Paycheck]] = []
+        for txn in fresh:
+            if txn.amount < 0:
+                expenses.append(
+                    (
+                        txn,
+                        Expense(
+                            user=user,
+                            finance_account=finance_account,
+                            name=txn.description[:255],
+                            amount=abs(txn.amount),
+                            date=txn.date,
+                            category=expense_category,
+                        ),
+                    )
+                )
+            else:
+                paychecks.append(
+                    (
+                        txn,
+                        Paycheck(
+                            user=user,
+                            finance_account=finance_account,
+                            amount=abs(txn.amount),
+                            date=txn.date,
+                            frequency="once",
+                            category=income_category,
+                        ),
+                    )
+                )
+
+        fingerprints = []
+        for model, pairs, field in (
+            (Expense, expenses, "expense"),
+            (Paycheck, paychecks, "paycheck"),
+        ):
+            objs = [obj for _, obj in pairs]
+            if not objs:
+                continue
+            # bulk_create skips save(), so revisions have to be stamped up front
+            FinanceRevision.stamp(user.id, objs)
+            model.objects.bulk_create(objs)
+            FinanceChangeLog.record_bulk(
+                (obj, FinanceChangeLog.Operation.CREATE, None) for obj in objs
+            )
+            fingerprints.extend(
+                TransactionFingerprint(user=user, fingerprint=txn.fingerprint, **{field: obj})
+                for txn, obj in pairs
+            )
+
+        TransactionFingerprint.objects.bulk_create(fingerprints)
+        stats["inserted_expenses"] += len(expenses)
+        stats["inserted_paychecks"] += len(paychecks)
+
+    def _parse_rows(
+        self, text_stream: Iterable[str], mapping: BankStatementMappingSchema
+    ) -> Iterator[Tuple[Any, Optional[str]]]:
+        """Yield (transaction, None) for valid rows and (line number, error) otherwise"""
+        reader = csv.DictReader(text_stream, delimiter=mapping.delimiter)
+
+        required = [mapping.dateColumn, mapping.descriptionColumn]
+        required += [
+            column
+            for column in (mapping.amountColumn, mapping.debitColumn, mapping.creditColumn)
+            if column
+        ]
+        missing = [column for column in required if column not in (reader.fieldnames or [])]
+        if missing:
+            raise ValueError(f"Columns not found in CSV header: {', '.join(missing)}")
+
+        for row in reader:
+            line_number = reader.line_num
+            if not any((value or "").strip() for value in row.values() if isinstance(value, str)):
+                continue
+
+            try:
+                txn_date = datetime.strptime(
+                    (row[mapping.dateColumn] or "").strip(), mapping.dateFormat
+                ).date()
+            except ValueError:
+                yield line_number, f"Invalid date: {row[mapping.dateColumn]}"
+                continue
+
+            try:
+                amount = self._row_amount(row, mapping)
+            except (ValueError, InvalidOperation):
+                yield line_number, "Invalid amount"
+                continue
+
+            if amount == 0:
+                yield line_number, "Amount is zero"
+                continue
+
+            description = " ".join((row[mapping.descriptionColumn] or "").split())
+            if not description:
+                yield line_number, "Description is required"
+                continue
+
+            yield ParsedTransaction(line_number, txn_date, amount, description), None
+
+    def _row_amount(self, row: Dict[str, str], mapping: BankStatementMappingSchema) -> Decimal:
+        """Signed amount where negative always means money leaving the account"""
+        if mapping.amountColumn:
+            amount = self._parse_amount(row[mapping.amountColumn])
+            if amount is None:
+                raise ValueError("Amount is required")
+            return amount if mapping.negativeIsExpense else -amount
+
+        # Separate columns: debits leave the account, credits arrive
+        debit = self._parse_amount(row[mapping.debitColumn]) if mapping.debitColumn else None
+        credit = self._parse_amount(row[mapping.creditColumn]) if mapping.creditColumn else None
+        outgoing = -abs(debit) if debit else Decimal("0")
+        incoming = abs(credit) if credit else Decimal("0")
+        return outgoing + incoming
+
+    def _parse_amount(self, raw: Optional[str]) -> Optional[Decimal]:
+        value = (raw or "").strip().replace("$", "").replace(",", "")
+        if not value:
+            return None
+        # Accounting notation: (12.34) means -12.34
+        if value.startswith("(") and value.endswith(")"):
+            value = "-" + value[1:-1]
+        return Decimal(value).quantize(Decimal("0.01"))
+
+    def _fingerprint_base(self, txn: ParsedTransaction) -> str:
+        description = _NON_WORD.sub(" ", txn.description.lower()).strip()
+        return f"{txn.date.isoformat()}|{txn.amount:.2f}|{description}"
+
+    def _resolve_category(self, user: User, category_id: Optional[int]) -> Optional[Category]:
+        if not category_id:
+            return None
+        return Category.objects.get(id=category_id, user=user)
@@ -0,0 +1,137 @@
+from typing import Any, Dict, List, Type
+
+from django.conf import settings
+from django.contrib.auth.models import User
+from django.db import transaction
+from django.utils import timezone
+from ninja import Schema
+
+from api.features.finance.models import (
+    Category,
+    FinanceAccount,
+    FinanceChangeLog,
+    FinanceRevision,
+    RecurringBill,
+    SoftDeleteModel,
+)
+from api.features.finance.services.calendar_push_service import schedule_calendar_push
+from core.db_router import database_for_user
+
+# Foreign keys a payload may set, and the model whose user-owned rows they must name
+REFERENCES = {"category_id": Category, "related_bill_id": RecurringBill}
+
+
+class BulkService:
+    """
+    Applies a batch of creates, updates and soft deletes to one finance model in a single
+    transaction. Referenced categories and bills are checked with one query each, rows
+    are written with bulk_create/bulk_update, and the change log and calendar push are
+    handled once for the whole batch rather than once per row.
+    """
+
+    def apply(
+        self,
+        user: User,
+        model: Type[SoftDeleteModel],
+        create: List[Schema],
+        update: List[Schema],
+        delete: List[int],
+    ) -> Dict[str, Any]:
+        """Apply the batch; raises ValueError, leaving every row untouched, if any item is invalid"""
+        if len(create) + len(update) + len(delete) > settings.FINANCE_BULK_MAX_ITEMS:
+            raise ValueError(f"A batch may hold at most {settings.FINANCE_BULK_MAX_ITEMS} items.")
+        if any(data.id is None for data in update):
+            raise ValueError("Every update needs an id.")
+        ids = [data.id for data in update] + list(delete)
+        if len(set(ids)) != len(ids):
+            raise ValueError("Each id may be updated or deleted only once per batch.")
+
+        created_payloads = [self._payload(data) for data in create]
+        updated_payloads = [self._payload(data) for data in update]
+        referenced = self._referenced(user, created_payloads + updated_payloads)
+
+        with transaction.atomic(using=database_for_user(user.id)):
+            rows = model.objects.select_related("category").filter(user=user)
+            existing = rows.in_bulk(ids) if ids else {}
+            missing = sorted(set(ids) - set(existing))
+            if missing:
+                raise ValueError(f"Unknown {model._meta.verbose_name} ids: {missing}")
+
+            created = []
+            if create:
+                finance_account = FinanceAccount.objects.get(user=user)
+                for payload in created_payloads:
+                    row = model(user=user, finance_account=finance_account)
+                    self._assign(row, payload, referenced)
+                    created.append(row)
+
+            now = timezone.now()
+            changes = []
+            fields = {"revision", "updated_at"}
+            for data, payload in zip(update, updated_payloads):
+                row = existing[data.id]
+                previous = row.change_state()
+                fields.update(self._assign(row, payload, referenced))
+                changes.append((row, FinanceChangeLog.Operation.UPDATE, previous))
+            for pk in delete:
+                row = existing[pk]
+                previous = row.change_state()
+                row.is_deleted = True
+                row.deleted_at = now
+                fields.update(("is_deleted", "deleted_at"))
+                changes.append((row, FinanceChangeLog.Operation.DELETE, previous))
+
+            # Bulk writes skip save(), so revisions are stamped here, from one allocation
+            changed = [row for row, _, _ in changes]
+            FinanceRevision.stamp(user.id, created + changed)
+            if created:
+                model.objects.bulk_create(created)
+            if changed:
+                for row in changed:
+                    row.updated_at = now
+                model.all_objects.bulk_update(changed, sorted(fields))
+
+            entries = FinanceChangeLog.record_bulk(
+                [(row, FinanceChangeLog.Operation.CREATE, None) for row in created] + changes
+            )
+            if entries:
+                # post_save does not fire either, so the batch asks for one push from its earliest date
+                starts = [entry.date_from for entry in entries]
+                schedule_calendar_push(user.id, None if None in starts else min(starts))
+
+        return {
+            "created": created,
+            "updated": [existing[data.id] for data in update],
+            "deleted": list(delete),
+        }
+
+    def _payload(self, data: Schema) -> Dict[str, Any]:
+        return data.dict(exclude_unset=True, by_alias=True, exclude={"id", "category"})
+
+    def _referenced(self, user: User, payloads: List[Dict[str, Any]]) -> Dict[str, Dict[int, Any]]:
+        """Load every row the payloads point at, one query per foreign key"""
+        referenced = {}
+        for field, target in REFERENCES.items():
+            wanted = {payload[field] for payload in payloads if payload.get(field)}
+            if not wanted:
+                continue
+            rows = target.objects.filter(user=user, id__in=wanted).in_bulk()
+            missing = sorted(wanted - set(rows))
+            if missing:
+                raise ValueError(f"Unknown {target._meta.verbose_name} ids: {missing}")
+            referenced[field] = rows
+        return referenced
+
+    def _assign(
+        self, row: SoftDeleteModel, payload: Dict[str, Any], referenced: Dict[str, Dict[int, Any]]
+    ) -> List[str]:
+        """Set the payload on `row` and return the names of the fields it touched"""
+        fields = []
+        for attr, value in payload.items():
+            if attr in REFERENCES:
+                # Setting the related object too saves a lookup per row when serializing
+                value = referenced.get(attr, {}).get(value)
+                attr = attr.removesuffix("_id")
+            setattr(row, attr, value)
+            fields.append(attr)
+        return fields
@@ -0,0 +1,189 @@
+import hashlib
+import json
+import logging
+import threading
+import time
+from datetime import date, timedelta
+from typing import Any, Dict, Optional, Tuple
+
+from django.contrib.auth.models import User
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db import connections, transaction
+from django.utils import timezone
+
+from api.features.finance.models import (
+    CalendarPushBaseline,
+    FinanceAccount,
+    FinanceRevision,
+    SavingsAccount,
+)
+from api.features.finance.schemas import CalendarDaySchema
+from api.features.finance.services.calendar_service import CalendarService
+from api.features.users.services import NotificationService
+from core.db_router import database_for_user, using_user_shard
+
+logger = logging.getLogger(__name__)
+
+# Wait this long after the last edit before recomputing, so bursts coalesce
+DEBOUNCE_SECONDS = 1.0
+# ...but never hold a push back longer than this while edits keep arriving
+MAX_DELAY_SECONDS = 5.0
+
+# Months of calendar (starting with the current one) kept in sync with the client
+PUSH_MONTHS = 3
+
+
+class CalendarPushService:
+    """
+    Debounced recompute of the calendar after finance edits.
+    Each burst of edits produces one "calendar_delta" update on the user's
+    websocket group containing only the days whose content or balances changed.
+    Debouncing is per process; the diff baseline is a CalendarPushBaseline row, so a
+    push from any process compares against what the client was last sent by any other.
+    The service is used as a module-level singleton.
+    """
+
+    def __init__(self):
+        self.calendar_service = CalendarService()
+        self.notification_service = NotificationService()
+        self.lock = threading.Lock()
+        # user id -> (earliest affected date or None for "everything", first edit, timer)
+        self.pending: Dict[int, Tuple[Optional[date], float, threading.Timer]] = {}
+
+    def schedule(self, user_id: int, affected_from: Optional[date] = None) -> None:
+        """Note that the user's data changed from affected_from onwards (None = all dates)"""
+        with self.lock:
+            now = time.monotonic()
+            entry = self.pending.get(user_id)
+            if entry:
+                since, first_edit, timer = entry
+                since = (
+                    None if since is None or affected_from is None else min(since, affected_from)
+                )
+                if now - first_edit >= MAX_DELAY_SECONDS:
+                    # Let the running timer fire; it will pick up the merged range
+                    self.pending[user_id] = (since, first_edit, timer)
+                    return
+                timer.cancel()
+            else:
+                since, first_edit = affected_from, now
+
+            timer = threading.Timer(DEBOUNCE_SECONDS, self._flush, args=(user_id,))
+            timer.daemon = True
+            self.pending[user_id] = (since, first_edit, timer)
+            timer.start()
+
+    def forget(self, user_id: int) -> None:
+        """Drop the diff baseline, e.g. when the user's websocket disconnects"""
+        CalendarPushBaseline.objects.using(database_for_user(user_id)).filter(
+            user_id=user_id
+        ).delete()
+
+    def _flush(self, user_id: int) -> None:
+        with self.lock:
+            entry = self.pending.pop(user_id, None)
+        if entry is None:
+            return
+
+        try:
+            # Timer threads run outside any request, so the user's shard is set explicitly
+            with using_user_shard(user_id):
+                self.push(user_id, entry[0])
+        except Exception as e:
+            logger.warning(f"Calendar push for user {user_id} failed: {e}")
+        finally:
+            # The timer thread ends here, so nothing would ever reuse its connections
+            connections.close_all()
+
+    def push(self, user_id: int, affected_from: Optional[date] = None) -> Optional[Dict[str, Any]]:
+        """Recompute the synced window and send the days that differ from the last push"""
+        window_start, window_end = self._window()
+        if affected_from and affected_from > window_end:
+            return None
+
+        user = User.objects.filter(id=user_id).first()
+        if user is None:
+            return None
+
+        # Read before rendering, so the days rendered are at least this recent
+        revision = FinanceRevision.current(user_id)
+        try:
+            days = self.calendar_service.iter_calendar_data(
+                user=user, start_date=window_start, end_date=window_end
+            )
+            rendered = {}
+            for day in days:
+                if affected_from and date.fromisoformat(day["date"]) < affected_from:
+                    continue
+                rendered[day["date"]] = CalendarDaySchema.model_validate(day).model_dump()
+        except ValueError:
+            # No finance account yet, so there is no calendar to push
+            return None
+
+        database = database_for_user(user_id)
+        baselines = CalendarPushBaseline.objects.using(database)
+        baselines.get_or_create(user_id=user_id)
+        with transaction.atomic(using=database):
+            # Writing first takes the row lock on PostgreSQL and the write lock on SQLite,
+            # so pushes for one user are compared and sent one process at a time
+            baselines.filter(user_id=user_id).update(updated_at=timezone.now())
+            baseline = baselines.get(user_id=user_id)
+            if baseline.revision > revision:
+                # Another process has already sent a newer render
+                return None
+
+            digests = baseline.digests
+            changed = []
+            for iso_date, day in rendered.items():
+                digest = hashlib.sha1(
+                    json.dumps(day, cls=DjangoJSONEncoder, sort_keys=True).encode("utf-8")
+                ).hexdigest()
+                if digests.get(iso_date) != digest:
+                    changed.append(day)
+                    digests[iso_date] = digest
+            # Keep only the current window so the baseline cannot grow forever
+            window_start_iso = window_start.isoformat()
+            baseline.digests = {d: h for d, h in digests.items() if d >= window_start_iso}
+            baseline.revision = revision
+            baseline.save(update_fields=["digests", "revision", "updated_at"])
+
+            if not changed:
+                return None
+
+            delta = {
+                "start": window_start.isoformat(),
+                "end": window_end.isoformat(),
+                "days": changed,
+                "balances": self._balances(user_id),
+            }
+            # Sent before the lock is released, so deltas reach the client in order
+            self.notification_service.send(user_id, "calendar_delta", delta)
+        return delta
+
+    def _window(self) -> Tuple[date, date]:
+        today = timezone.now().date()
+        start = today.replace(day=1)
+        end = start
+        for _ in range(PUSH_MONTHS):
+            end = (end + timedelta(days=32)).replace(day=1)
+        return start, end - timedelta(days=1)
+
+    def _balances(self, user_id: int) -> Dict[str, Any]:
+        account = FinanceAccount.objects.filter(user_id=user_id).first()
+        savings = SavingsAccount.objects.filter(user_id=user_id).first()
+        return {
+            "currentBalance": float(account.current_balance) if account else None,
+            "balanceAsOfDate": account.balance_as_of_date if account else None,
+            "savingsBalance": float(savings.current_balance) if savings else None,
+        }
+
+
+calendar_push_service = CalendarPushService()
+
+
+def schedule_calendar_push(user_id: int, affected_from: Optional[date] = None) -> None:
+    """Queue a calendar push for when the current transaction commits"""
+    transaction.on_commit(
+        lambda: calendar_push_service.schedule(user_id, affected_from),
+        using=database_for_user(user_id),
+    )
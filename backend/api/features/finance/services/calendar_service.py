@@ -1,6 +1,6 @@
 from datetime import date, datetime, timedelta
 from decimal import Decimal
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, Iterator, List, Optional
 
 from django.contrib.auth.models import User
 
@@ -24,6 +24,20 @@ class CalendarService:
         months_to_show: int = 3,
     ) -> List[Dict[str, Any]]:
         """Generate calendar data with running balances"""
+        return list(
+            self.iter_calendar_data(
+                user=user, start_date=start_date, end_date=end_date, months_to_show=months_to_show
+            )
+        )
+
+    def iter_calendar_data(
+        self,
+        user: User,
+        start_date: Optional[date] = None,
+        end_date: Optional[date] = None,
+        months_to_show: int = 3,
+    ) -> Iterator[Dict[str, Any]]:
+        """Yield calendar days with running balances one at a time"""
 
         # Get account
         try:
@@ -56,19 +70,11 @@ class CalendarService:
 
         # Get all data
 
-        bills = list(
-            RecurringBill.objects.filter(user=user, is_deleted=False).select_related("category")
-        )
-        paychecks = list(
-            Paycheck.objects.filter(user=user, is_deleted=False).select_related("category")
-        )
-        expenses = list(
-            Expense.objects.filter(user=user, is_deleted=False).select_related("category")
-        )
-        recurring_savings = list(
-            SavingsRecurringDeposit.objects.filter(user=user, is_deleted=False)
-        )
-        savings_transactions = list(SavingsTransaction.objects.filter(user=user, is_deleted=False))
+        bills = list(RecurringBill.objects.filter(user=user).select_related("category"))
+        paychecks = list(Paycheck.objects.filter(user=user).select_related("category"))
+        expenses = list(Expense.objects.filter(user=user).select_related("category"))
+        recurring_savings = list(SavingsRecurringDeposit.objects.filter(user=user))
+        savings_transactions = list(SavingsTransaction.objects.filter(user=user))
 
         # Track bill payments for bills with totals
         # Initialize with database values only
@@ -144,7 +150,6 @@ class CalendarService:
                 temp_date += timedelta(days=1)
 
         # Generate calendar days
-        calendar_days = []
         current_date = calc_start_date
 
         while current_date <= calc_end_date:
@@ -249,57 +254,53 @@ class CalendarService:
                     }
                 )
 
-            calendar_days.append(
-                {
-                    "date": current_date.isoformat(),
-                    "isCurrentMonth": True,
-                    "bills": [
-                        {
-                            "id": bill.id,
-                            "name": bill.name,
-                            "amount": bill.amount,
-                            "frequency": bill.frequency,
-                            "dueDay": bill.due_day,
-                            "category": bill.category,
-                            "total": bill.total,
-                            "amountPaid": (
-                                bill_payments.get(bill.id, Decimal("0.00")) if bill.total else None
-                            ),
-                        }
-                        for bill in day_bills
-                    ],
-                    "paychecks": [
-                        {
-                            "id": pc.id,
-                            "amount": pc.amount,
-                            "date": pc.date.isoformat(),
-                            "frequency": pc.frequency,
-                            "category": pc.category,
-                        }
-                        for pc in day_paychecks
-                    ],
-                    "expenses": [
-                        {
-                            "id": exp.id,
-                            "name": exp.name,
-                            "amount": exp.amount,
-                            "date": exp.date.isoformat(),
-                            "category": exp.category,
-                        }
-                        for exp in day_expenses
-                    ],
-                    "savingsTransactions": day_savings_entries,
-                    "runningBalance": (running_balance if should_update_balance else 0.00),
-                    "savingsRunningBalance": (
-                        savings_running_balance if should_update_balance else 0.00
-                    ),
-                }
-            )
+            yield {
+                "date": current_date.isoformat(),
+                "isCurrentMonth": True,
+                "bills": [
+                    {
+                        "id": bill.id,
+                        "name": bill.name,
+                        "amount": bill.amount,
+                        "frequency": bill.frequency,
+                        "dueDay": bill.due_day,
+                        "category": bill.category,
+                        "total": bill.total,
+                        "amountPaid": (
+                            bill_payments.get(bill.id, Decimal("0.00")) if bill.total else None
+                        ),
+                    }
+                    for bill in day_bills
+                ],
+                "paychecks": [
+                    {
+                        "id": pc.id,
+                        "amount": pc.amount,
+                        "date": pc.date.isoformat(),
+                        "frequency": pc.frequency,
+                        "category": pc.category,
+                    }
+                    for pc in day_paychecks
+                ],
+                "expenses": [
+                    {
+                        "id": exp.id,
+                        "name": exp.name,
+                        "amount": exp.amount,
+                        "date": exp.date.isoformat(),
+                        "category": exp.category,
+                    }
+                    for exp in day_expenses
+                ],
+                "savingsTransactions": day_savings_entries,
+                "runningBalance": (running_balance if should_update_balance else 0.00),
+                "savingsRunningBalance": (
+                    savings_running_balance if should_update_balance else 0.00
+                ),
+            }
 
             current_date += timedelta(days=1)
 
-        return calendar_days
-
     def _get_bills_for_date(
         self,
         bills: List[RecurringBill],
@@ -532,7 +533,7 @@ class CalendarService:
 
     def get_balance_projections(self, user: User, months: int = 24) -> List[Dict[str, Any]]:
         """Get balance projections for future months"""
-        calendar_data = self.generate_calendar_data(user=user, months_to_show=months)
+        calendar_data = self.iter_calendar_data(user=user, months_to_show=months)
 
         projections = []
         current_month = None
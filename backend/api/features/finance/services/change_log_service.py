@@ -0,0 +1,128 @@
+from datetime import timedelta
+from typing import Callable, Dict, List
+
+from django.db import transaction
+from django.db.models import Max, Min, OuterRef, Subquery
+from django.db.models.functions import Coalesce
+from django.utils import timezone
+
+from api.features.finance.models import FinanceChangeCursor, FinanceChangeLog
+from core.db_router import database_for_user, sharded_databases
+
+DEFAULT_BATCH_SIZE = 500
+
+
+class ChangeLogService:
+    """
+    Cursor-based reader over the FinanceChangeLog outbox.
+    Each consumer (a projection, rollup, cache...) keeps its own per-user position,
+    reads entries after it in id order and acknowledges them once processed.
+    Delivery is at-least-once: a consumer that fails before acknowledging sees
+    the same batch again.
+    """
+
+    def entries(
+        self, user_id: int, after: int = 0, limit: int = DEFAULT_BATCH_SIZE
+    ) -> List[FinanceChangeLog]:
+        return list(
+            FinanceChangeLog.objects.using(database_for_user(user_id))
+            .filter(user_id=user_id, id__gt=after)
+            .order_by("id")[:limit]
+        )
+
+    def position(self, user_id: int, consumer: str) -> int:
+        return (
+            FinanceChangeCursor.objects.using(database_for_user(user_id))
+            .filter(user_id=user_id, consumer=consumer)
+            .values_list("position", flat=True)
+            .first()
+            or 0
+        )
+
+    def pending(
+        self, user_id: int, consumer: str, limit: int = DEFAULT_BATCH_SIZE
+    ) -> List[FinanceChangeLog]:
+        """The next batch of entries the consumer has not acknowledged yet"""
+        return self.entries(user_id, after=self.position(user_id, consumer), limit=limit)
+
+    def acknowledge(self, user_id: int, consumer: str, position: int) -> None:
+        """Move the consumer's cursor up to `position`; cursors never move backwards"""
+        cursors = FinanceChangeCursor.objects.using(database_for_user(user_id))
+        with transaction.atomic(using=cursors.db):
+            cursor, created = cursors.get_or_create(
+                user_id=user_id, consumer=consumer, defaults={"position": position}
+            )
+            if not created:
+                cursors.filter(id=cursor.id, position__lt=position).update(
+                    position=position, updated_at=timezone.now()
+                )
+
+    def consume(
+        self,
+        user_id: int,
+        consumer: str,
+        handler: Callable[[List[FinanceChangeLog]], None],
+        batch_size: int = DEFAULT_BATCH_SIZE,
+    ) -> int:
+        """
+        Feed every unprocessed entry to handler in batches, acknowledging each batch
+        after the handler returns. Returns the number of entries handled.
+        """
+        handled = 0
+        position = self.position(user_id, consumer)
+        while True:
+            batch = self.entries(user_id, after=position, limit=batch_size)
+            if not batch:
+                return handled
+            handler(batch)
+            position = batch[-1].id
+            self.acknowledge(user_id, consumer, position)
+            handled += len(batch)
+            if len(batch) < batch_size:
+                return handled
+
+    def pending_users(self, consumer: str) -> List[int]:
+        """Ids of users with entries the consumer has not acknowledged yet"""
+        cursor = FinanceChangeCursor.objects.filter(
+            user_id=OuterRef("user_id"), consumer=consumer
+        ).values("position")
+        users: List[int] = []
+        for database in sharded_databases():
+            users.extend(
+                FinanceChangeLog.objects.using(database)
+                .values("user_id")
+                .annotate(last=Max("id"))
+                .filter(last__gt=Coalesce(Subquery(cursor), 0))
+                .values_list("user_id", flat=True)
+            )
+        return users
+
+    def prune(self, older_than_days: int) -> Dict[str, int]:
+        """
+        Delete entries older than the retention period that every consumer of the
+        user has already acknowledged.
+        """
+        cutoff = timezone.now() - timedelta(days=older_than_days)
+        deleted = 0
+        users = set()
+        for database in sharded_databases():
+            users.update(
+                FinanceChangeLog.objects.using(database)
+                .filter(created_at__lt=cutoff)
+                .values_list("user_id", flat=True)
+            )
+        for user_id in users:
+            database = database_for_user(user_id)
+            acknowledged = (
+                FinanceChangeCursor.objects.using(database)
+                .filter(user_id=user_id)
+                .aggregate(lowest=Min("position"))["lowest"]
+            )
+            entries = FinanceChangeLog.objects.using(database).filter(
+                user_id=user_id, created_at__lt=cutoff
+            )
+            if acknowledged is not None:
+                entries = entries.filter(id__lte=acknowledged)
+            count, _ = entries.delete()
+            deleted += count
+        return {"deleted": deleted}
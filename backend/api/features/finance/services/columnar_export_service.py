@@ -0,0 +1,248 @@
+from datetime import date
+from decimal import Decimal
+from typing import Any, Iterable, Iterator, List, Optional, Tuple
+
+from django.contrib.auth.models import User
+
+from api.features.finance.models import Expense, Paycheck, RecurringBill, SavingsTransaction
+from api.features.finance.services.calendar_service import CalendarService
+from api.features.finance.utils import get_or_create_finance_account
+
+# pyarrow is an optional extra; the export endpoint reports a clear error without it
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+except ImportError:  # pragma: no cover - depends on the deployment
+    pa = None
+    pq = None
+
+DEFAULT_BATCH_SIZE = 10_000
+
+CONTENT_TYPES = {
+    "arrow": "application/vnd.apache.arrow.stream",
+    "parquet": "application/vnd.apache.parquet",
+}
+
+CENTS = Decimal("0.01")
+
+# table name -> (model, [(column, queryset lookup, arrow type name)])
+QUERYSET_TABLES = {
+    "expenses": (
+        Expense,
+        [
+            ("id", "id", "int64"),
+            ("name", "name", "string"),
+            ("amount", "amount", "money"),
+            ("date", "date", "date"),
+            ("category_id", "category_id", "int64"),
+            ("category", "category__name", "string"),
+            ("related_bill_id", "related_bill_id", "int64"),
+        ],
+    ),
+    "paychecks": (
+        Paycheck,
+        [
+            ("id", "id", "int64"),
+            ("amount", "amount", "money"),
+            ("date", "date", "date"),
+            ("frequency", "frequency", "string"),
+            ("day_of_week", "day_of_week", "int32"),
+            ("day_of_month", "day_of_month", "int32"),
+            ("second_day_of_month", "second_day_of_month", "int32"),
+            ("category_id", "category_id", "int64"),
+            ("category", "category__name", "string"),
+        ],
+    ),
+    "recurring_bills": (
+        RecurringBill,
+        [
+            ("id", "id", "int64"),
+            ("name", "name", "string"),
+            ("amount", "amount", "money"),
+            ("frequency", "frequency", "string"),
+            ("start_date", "start_date", "date"),
+            ("due_day", "due_day", "int32"),
+            ("day_of_week", "day_of_week", "int32"),
+            ("category_id", "category_id", "int64"),
+            ("category", "category__name", "string"),
+            ("total", "total", "money"),
+            ("amount_paid", "amount_paid", "money"),
+        ],
+    ),
+    "savings_transactions": (
+        SavingsTransaction,
+        [
+            ("id", "id", "int64"),
+            ("transaction_type", "transaction_type", "string"),
+            ("amount", "amount", "money"),
+            ("date", "date", "date"),
+            ("notes", "notes", "string"),
+        ],
+    ),
+}
+
+CALENDAR_COLUMNS = [
+    ("date", "date"),
+    ("income", "money"),
+    ("bills", "money"),
+    ("expenses", "money"),
+    ("savings_deposits", "money"),
+    ("savings_withdrawals", "money"),
+    ("running_balance", "balance"),
+    ("savings_running_balance", "balance"),
+]
+
+TABLES = [*QUERYSET_TABLES, "calendar_days"]
+
+
+class ColumnarExportService:
+    def __init__(self):
+        self.calendar_service = CalendarService()
+
+    def is_available(self) -> bool:
+        return pa is not None
+
+    def stream_table(
+        self,
+        user: User,
+        table: str,
+        file_format: str = "arrow",
+        start_date: Optional[date] = None,
+        end_date: Optional[date] = None,
+        batch_size: int = DEFAULT_BATCH_SIZE,
+    ) -> Iterator[bytes]:
+        """
+        Stream one typed table as an Arrow IPC stream or a Parquet file.
+        Rows are converted into record batches of batch_size straight from the
+        queryset (or the calendar projection) and flushed after every batch.
+        """
+        if not self.is_available():
+            raise ValueError("Columnar export requires the optional 'pyarrow' package")
+        if table not in TABLES:
+            raise ValueError(f"Unknown table '{table}'. Choose one of: {', '.join(TABLES)}")
+        if file_format not in CONTENT_TYPES:
+            raise ValueError(f"Unknown format '{file_format}'. Choose 'arrow' or 'parquet'")
+
+        if table == "calendar_days":
+            # Create the account up front so the projection cannot fail mid-stream
+            get_or_create_finance_account(user=user)
+            schema = self._schema(CALENDAR_COLUMNS)
+            rows = self._calendar_rows(user, start_date, end_date)
+        else:
+            model, columns = QUERYSET_TABLES[table]
+            schema = self._schema([(name, kind) for name, _, kind in columns])
+            rows = (
+                model.objects.filter(user=user)
+                .order_by("id")
+                .values_list(*[lookup for _, lookup, _ in columns])
+                .iterator(chunk_size=batch_size)
+            )
+
+        return self._write(schema, self._record_batches(schema, rows, batch_size), file_format)
+
+    def _calendar_rows(
+        self, user: User, start_date: Optional[date], end_date: Optional[date]
+    ) -> Iterator[Tuple[Any, ...]]:
+        for day in self.calendar_service.iter_calendar_data(
+            user=user, start_date=start_date, end_date=end_date
+        ):
+            deposits = Decimal("0")
+            withdrawals = Decimal("0")
+            for txn in day["savingsTransactions"]:
+                if txn["transaction_type"] == "transfer_to_checking":
+                    withdrawals += Decimal(str(txn["amount"]))
+                else:
+                    deposits += Decimal(str(txn["amount"]))
+
+            yield (
+                date.fromisoformat(day["date"]),
+                sum((Decimal(str(pc["amount"])) for pc in day["paychecks"]), Decimal("0")),
+                sum((Decimal(str(bill["amount"])) for bill in day["bills"]), Decimal("0")),
+                sum((Decimal(str(exp["amount"])) for exp in day["expenses"]), Decimal("0")),
+                deposits,
+                withdrawals,
+                Decimal(str(day["runningBalance"])),
+                Decimal(str(day["savingsRunningBalance"])),
+            )
+
+    def _schema(self, columns: List[Tuple[str, str]]):
+        types = {
+            "int32": pa.int32(),
+            "int64": pa.int64(),
+            "string": pa.string(),
+            "date": pa.date32(),
+            "money": pa.decimal128(14, 2),
+            # Projected balances can run past the 14 digits stored on the models
+            "balance": pa.decimal128(28, 2),
+        }
+        return pa.schema([(name, types[kind]) for name, kind in columns])
+
+    def _record_batches(self, schema, rows: Iterable[Tuple[Any, ...]], batch_size: int):
+        decimal_columns = {
+            index for index, field in enumerate(schema) if pa.types.is_decimal(field.type)
+        }
+        buffer: List[Tuple[Any, ...]] = []
+        for row in rows:
+            buffer.append(row)
+            if len(buffer) >= batch_size:
+                yield self._to_batch(schema, buffer, decimal_columns)
+                buffer = []
+        if buffer:
+            yield self._to_batch(schema, buffer, decimal_columns)
+
+    def _to_batch(self, schema, rows: List[Tuple[Any, ...]], decimal_columns):
+        arrays = []
+        for index, field in enumerate(schema):
+            values = [row[index] for row in rows]
+            if index in decimal_columns:
+                values = [None if v is None else Decimal(v).quantize(CENTS) for v in values]
+            arrays.append(pa.array(values, type=field.type))
+        return pa.RecordBatch.from_arrays(arrays, schema=schema)
+
+    def _write(self, schema, batches, file_format: str) -> Iterator[bytes]:
+        sink = _ChunkSink()
+        if file_format == "parquet":
+            writer = pq.ParquetWriter(sink, schema)
+        else:
+            writer = pa.ipc.new_stream(sink, schema)
+
+        try:
+            for batch in batches:
+                writer.write_batch(batch)
+                yield from sink.drain()
+        finally:
+            writer.close()
+        yield from sink.drain()
+
+
+class _ChunkSink:
+    """Write-only file object that collects bytes until the response drains them"""
+
+    def __init__(self):
+        self.chunks: List[bytes] = []
+        self.closed = False
+        self.position = 0
+
+    def write(self, data) -> int:
+        chunk = bytes(data)
+        self.chunks.append(chunk)
+        self.position += len(chunk)
+        return len(chunk)
+
+    def tell(self) -> int:
+        return self.position
+
+    def flush(self) -> None:
+        pass
+
+    def close(self) -> None:
+        self.closed = True
+
+    def writable(self) -> bool:
+        return True
+
+    def drain(self) -> Iterator[bytes]:
+        if self.chunks:
+            data = b"".join(self.chunks)
+            self.chunks = []
+            yield data
@@ -1,38 +1,104 @@
 import csv
 import io
-from datetime import date, datetime
+from datetime import date
 from decimal import Decimal, InvalidOperation
-from typing import List
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple
 
 from django.contrib.auth.models import User
+from django.db import transaction
 from ninja.files import UploadedFile
 
-from api.features.finance.models import Category, FinanceAccount, RecurringBill
+from api.features.finance.models import (
+    Category,
+    FinanceAccount,
+    FinanceChangeLog,
+    FinanceRevision,
+    RecurringBill,
+)
+from api.features.finance.services.calendar_push_service import schedule_calendar_push
 from api.features.finance.services.calendar_service import CalendarService
+from core.db_router import database_for_user
+
+CSV_IMPORT_BATCH_SIZE = 1000
 
 
 class CSVService:
     def __init__(self):
         self.calendar_service = CalendarService()
 
-    def import_bills_from_csv(self, file: UploadedFile, user: User) -> List[RecurringBill]:
-        """Import bills from CSV file"""
+    def import_bills_from_csv(
+        self, file: UploadedFile, user: User, batch_size: int = CSV_IMPORT_BATCH_SIZE
+    ) -> Dict[str, Any]:
+        """
+        Import bills from CSV file.
+        The upload is decoded incrementally and rows are inserted in batches,
+        so memory stays bounded however many rows the file has.
+        """
 
-        default_category, _ = Category.objects.get_or_create(
+        default_category, _ = Category.all_objects.get_or_create(
             user=user, name="Other", defaults={"type": "bill", "color": "gray-500"}
         )
-
-        # Read CSV file
-        content = file.read().decode("utf-8")
-        csv_reader = csv.reader(io.StringIO(content))
+        finance_account = FinanceAccount.objects.get(user=user)
+
+        imported_ids: List[int] = []
+        errors: List[Dict[str, Any]] = []
+        batch: List[RecurringBill] = []
+
+        def flush():
+            # bulk_create skips save(), so revisions have to be stamped up front
+            FinanceRevision.stamp(user.id, batch)
+            RecurringBill.objects.bulk_create(batch)
+            FinanceChangeLog.record_bulk(
+                (bill, FinanceChangeLog.Operation.CREATE, None) for bill in batch
+            )
+            imported_ids.extend(bill.id for bill in batch)
+            batch.clear()
+
+        text_stream = io.TextIOWrapper(file.file, encoding="utf-8-sig", newline="")
+        try:
+            with transaction.atomic(using=database_for_user(user.id)):
+                for line_number, bill_data, error in self._parse_bill_rows(text_stream):
+                    if error:
+                        errors.append({"row": line_number, "error": error})
+                        continue
+
+                    batch.append(
+                        RecurringBill(
+                            user=user,
+                            finance_account=finance_account,
+                            category=default_category,
+                            **bill_data,
+                        )
+                    )
+                    if len(batch) >= batch_size:
+                        flush()
+
+                if batch:
+                    flush()
+        finally:
+            # Hand the underlying file back untouched instead of closing it with the wrapper
+            text_stream.detach()
+
+        if imported_ids:
+            schedule_calendar_push(user.id)
+        return {"bills": imported_ids, "errors": errors}
+
+    def _parse_bill_rows(
+        self, text_stream: Iterable[str]
+    ) -> Iterator[Tuple[int, Optional[Dict[str, Any]], Optional[str]]]:
+        """Yield (line number, bill fields, error) for each data row of the CSV"""
+        csv_reader = csv.reader(text_stream)
 
         # Skip header
         next(csv_reader, None)
 
-        imported_bills = []
-
         for row in csv_reader:
+            line_number = csv_reader.line_num
+            if not any(cell.strip() for cell in row):
+                continue
+
             if len(row) < 3:
+                yield line_number, None, "Expected at least 3 columns"
                 continue
 
             description = row[0].strip()
@@ -41,6 +107,7 @@ class CSVService:
             remaining = row[3].strip() if len(row) > 3 else ""
 
             if not description or not due_date or not monthly_cost:
+                yield line_number, None, "Description, due date and monthly cost are required"
                 continue
 
             # Parse due day
@@ -50,27 +117,25 @@ class CSVService:
                     due_day = int(parts[1] if len(parts) > 1 else parts[0])
                 else:
                     due_day = int(due_date)
-
-                if due_day < 1 or due_day > 31:
-                    continue
             except ValueError:
+                yield line_number, None, f"Invalid due date: {due_date}"
+                continue
+
+            if due_day < 1 or due_day > 31:
+                yield line_number, None, f"Due day out of range: {due_day}"
                 continue
 
             # Parse amount
             try:
                 amount = Decimal(monthly_cost)
             except (ValueError, InvalidOperation):
+                yield line_number, None, f"Invalid monthly cost: {monthly_cost}"
                 continue
 
-                # Create bill object
-            finance_account = FinanceAccount.objects.get(user=user)
-            bill_data = {
-                "user": user,
-                "finance_account": finance_account,
+            bill_data: Dict[str, Any] = {
                 "name": description,
                 "amount": amount,
                 "due_day": due_day,
-                "category": default_category,
             }
 
             # Add total if remaining amount exists
@@ -83,11 +148,7 @@ class CSVService:
                 except (ValueError, InvalidOperation):
                     pass
 
-            # Save bill
-            bill = RecurringBill.objects.create(**bill_data)
-            imported_bills.append(bill)
-
-        return imported_bills
+            yield line_number, bill_data, None
 
     def generate_export_csv(
         self,
@@ -96,103 +157,35 @@ class CSVService:
         end_date: date,
         months_to_show: int,
         include_all_days: bool = True,
-    ) -> str:
-        """Generate CSV export of finance data"""
-
-        # Get calendar data
-        calendar_data = self.calendar_service.generate_calendar_data(
-            user=user, start_date=start_date, end_date=end_date, months_to_show=months_to_show
-        )
-
-        # Filter to only days with activity if requested
-        if not include_all_days:
-            calendar_data = [
-                day
-                for day in calendar_data
-                if (
-                    len(day["paychecks"]) > 0
-                    or len(day["bills"]) > 0
-                    or len(day["expenses"]) > 0
-                    or len(day["savingsTransactions"]) > 0
-                )
-            ]
-
-        # Create CSV in memory
-        output = io.StringIO()
-        writer = csv.writer(output)
-
-        # Write summary section
-        writer.writerow(["MONTHLY SUMMARY"])
-        writer.writerow(["Month", "Income", "Bills", "Expenses", "Net Change", "End Balance"])
-
-        # Calculate monthly summaries
-        monthly_summaries = self._calculate_monthly_summaries(calendar_data)
-        for summary in monthly_summaries:
-            writer.writerow(
-                [
-                    summary["month"],
-                    f"{summary['income']:.2f}",
-                    f"{summary['bills']:.2f}",
-                    f"{summary['expenses']:.2f}",
-                    f"{summary['net']:.2f}",
-                    f"{summary['end_balance']:.2f}",
-                ]
-            )
-
-        # Empty row
-        writer.writerow([])
-
-        # Write daily breakdown
-        writer.writerow(["DAILY BREAKDOWN"])
-        if include_all_days:
-            writer.writerow(
-                [
-                    "Date",
-                    "Day of Week",
-                    "Income",
-                    "Bills",
-                    "Expenses",
-                    "Net Change",
-                    "Balance",
-                    "Details",
-                ]
-            )
-        else:
-            writer.writerow(
-                [
-                    "Date",
-                    "Day of Week",
-                    "Income",
-                    "Bills",
-                    "Expenses",
-                    "Net Change",
-                    "Balance",
-                    "Details",
-                ]
-            )
-            writer.writerow(["Note: Only showing days with transactions"])
-            writer.writerow([])
-            writer.writerow(
-                [
-                    "Date",
-                    "Day of Week",
-                    "Income",
-                    "Bills",
-                    "Expenses",
-                    "Net Change",
-                    "Balance",
-                    "Details",
-                ]
-            )
-
-        for day in calendar_data:
-            day_date = datetime.fromisoformat(day["date"])
-            day_of_week = day_date.strftime("%a")
-
-            total_income = sum(Decimal(str(pc["amount"])) for pc in day["paychecks"])
-            total_bills = sum(Decimal(str(bill["amount"])) for bill in day["bills"])
-            total_expenses = sum(Decimal(str(exp["amount"])) for exp in day["expenses"])
-            net_change = total_income - total_bills - total_expenses
+        summary_first: bool = False,
+    ) -> Iterator[str]:
+        """
+        Generate CSV export of finance data as a stream of rows.
+        Daily rows are written as the calendar produces them while monthly totals
+        accumulate alongside, so the summary lands in a trailing section. With
+        summary_first the calendar is walked twice instead of being held in memory.
+        """
+        writer = csv.writer(_EchoBuffer())
+
+        if summary_first:
+            summaries = _MonthlySummaryAccumulator()
+            for day, day_date in self._iter_report_days(
+                user, start_date, end_date, months_to_show, include_all_days
+            ):
+                summaries.add(day, day_date, self._day_totals(day))
+            yield from self._write_monthly_summary(writer, summaries)
+            yield writer.writerow([])
+
+        yield from self._write_daily_header(writer, include_all_days)
+
+        trailing_summaries = _MonthlySummaryAccumulator()
+        for day, day_date in self._iter_report_days(
+            user, start_date, end_date, months_to_show, include_all_days
+        ):
+            totals = self._day_totals(day)
+            trailing_summaries.add(day, day_date, totals)
+            income, bills, expenses = totals
+            net_change = income - bills - expenses
 
             # Create details string
             details = []
@@ -203,60 +196,118 @@ class CSVService:
             for exp in day["expenses"]:
                 details.append(f"-${exp['amount']:.2f} ({exp['name']})")
 
-            writer.writerow(
+            yield writer.writerow(
                 [
                     day["date"],
-                    day_of_week,
-                    f"{total_income:.2f}",
-                    f"{total_bills:.2f}",
-                    f"{total_expenses:.2f}",
+                    day_date.strftime("%a"),
+                    f"{income:.2f}",
+                    f"{bills:.2f}",
+                    f"{expenses:.2f}",
                     f"{net_change:.2f}",
                     f"{day['runningBalance']:.2f}",
                     "; ".join(details),
                 ]
             )
 
-        return output.getvalue()
+        if not summary_first:
+            yield writer.writerow([])
+            yield from self._write_monthly_summary(writer, trailing_summaries)
 
-    def _calculate_monthly_summaries(self, calendar_data: List[dict]) -> List[dict]:
-        """Calculate monthly summaries from calendar data"""
-        monthly_data = {}
+    def _iter_report_days(
+        self,
+        user: User,
+        start_date: date,
+        end_date: date,
+        months_to_show: int,
+        include_all_days: bool,
+    ) -> Iterator[Tuple[Dict[str, Any], date]]:
+        """Yield (calendar day, parsed date), dropping inactive days when requested"""
+        for day in self.calendar_service.iter_calendar_data(
+            user=user, start_date=start_date, end_date=end_date, months_to_show=months_to_show
+        ):
+            # Filter to only days with activity if requested
+            if not include_all_days and not (
+                day["paychecks"] or day["bills"] or day["expenses"] or day["savingsTransactions"]
+            ):
+                continue
+            yield day, date.fromisoformat(day["date"])
+
+    def _day_totals(self, day: Dict[str, Any]) -> Tuple[Decimal, Decimal, Decimal]:
+        total_income = sum((Decimal(str(pc["amount"])) for pc in day["paychecks"]), Decimal("0"))
+        total_bills = sum((Decimal(str(bill["amount"])) for bill in day["bills"]), Decimal("0"))
+        total_expenses = sum((Decimal(str(exp["amount"])) for exp in day["expenses"]), Decimal("0"))
+        return total_income, total_bills, total_expenses
+
+    def _write_monthly_summary(
+        self, writer, summaries: "_MonthlySummaryAccumulator"
+    ) -> Iterator[str]:
+        yield writer.writerow(["MONTHLY SUMMARY"])
+        yield writer.writerow(["Month", "Income", "Bills", "Expenses", "Net Change", "End Balance"])
+        for summary in summaries.results():
+            yield writer.writerow(
+                [
+                    summary["month"],
+                    f"{summary['income']:.2f}",
+                    f"{summary['bills']:.2f}",
+                    f"{summary['expenses']:.2f}",
+                    f"{summary['net']:.2f}",
+                    f"{summary['end_balance']:.2f}",
+                ]
+            )
 
-        for day in calendar_data:
-            day_date = datetime.fromisoformat(day["date"])
-            month_key = f"{day_date.year}-{day_date.month:02d}"
+    def _write_daily_header(self, writer, include_all_days: bool) -> Iterator[str]:
+        columns = [
+            "Date",
+            "Day of Week",
+            "Income",
+            "Bills",
+            "Expenses",
+            "Net Change",
+            "Balance",
+            "Details",
+        ]
+        yield writer.writerow(["DAILY BREAKDOWN"])
+        if not include_all_days:
+            yield writer.writerow(["Note: Only showing days with transactions"])
+            yield writer.writerow([])
+        yield writer.writerow(columns)
 
-            if month_key not in monthly_data:
-                monthly_data[month_key] = {
-                    "month": day_date.strftime("%B %Y"),
-                    "income": Decimal("0.00"),
-                    "bills": Decimal("0.00"),
-                    "expenses": Decimal("0.00"),
-                    "end_balance": Decimal("0.00"),
-                }
 
-            monthly_data[month_key]["income"] += sum(
-                Decimal(str(pc["amount"])) for pc in day["paychecks"]
-            )
+class _EchoBuffer:
+    """File-like object whose write() hands the rendered CSV row straight back"""
 
-            # Separate bills and bill-related expenses
-            total_bills = sum(Decimal(str(bill["amount"])) for bill in day["bills"])
-            total_bill_related_expenses = sum(
-                exp["amount"]
-                for exp in day["expenses"]
-                if hasattr(exp, "related_bill") and exp.related_bill
-            )
+    def write(self, value: str) -> str:
+        return value
 
-            monthly_data[month_key]["bills"] += total_bills - total_bill_related_expenses
-            monthly_data[month_key]["expenses"] += sum(
-                Decimal(str(exp["amount"])) for exp in day["expenses"]
-            )
 
-            monthly_data[month_key]["end_balance"] = day["runningBalance"]
+class _MonthlySummaryAccumulator:
+    """Builds per-month totals incrementally while the daily rows stream past"""
 
-        # Calculate net for each month
-        for month_key in monthly_data:
-            data = monthly_data[month_key]
-            data["net"] = data["income"] - data["bills"] - data["expenses"]
+    def __init__(self):
+        self.months: Dict[Tuple[int, int], Dict[str, Any]] = {}
+
+    def add(
+        self, day: Dict[str, Any], day_date: date, totals: Tuple[Decimal, Decimal, Decimal]
+    ) -> None:
+        month_key = (day_date.year, day_date.month)
+        if month_key not in self.months:
+            self.months[month_key] = {
+                "month": day_date.strftime("%B %Y"),
+                "income": Decimal("0.00"),
+                "bills": Decimal("0.00"),
+                "expenses": Decimal("0.00"),
+                "end_balance": Decimal("0.00"),
+            }
 
-        return list(monthly_data.values())
+        income, bills, expenses = totals
+        month = self.months[month_key]
+        month["income"] += income
+        month["bills"] += bills
+        month["expenses"] += expenses
+        month["end_balance"] = day["runningBalance"]
+
+    def results(self) -> List[Dict[str, Any]]:
+        summaries = []
+        for month in self.months.values():
+            summaries.append({**month, "net": month["income"] - month["bills"] - month["expenses"]})
+        return summaries
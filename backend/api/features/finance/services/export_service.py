@@ -0,0 +1,161 @@
+import json
+import zlib
+from itertools import chain
+from typing import Iterable, Iterator, Optional, Type
+
+from django.contrib.auth.models import User
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db.models import QuerySet
+from ninja import Schema
+
+from api.features.finance.models import (
+    Category,
+    Expense,
+    Paycheck,
+    RecurringBill,
+    SavingsRecurringDeposit,
+    SavingsTransaction,
+)
+from api.features.finance.schemas import (
+    CategorySchema,
+    ExpenseSchema,
+    FinanceAccountSchema,
+    PaycheckSchema,
+    RecurringBillSchema,
+    SavingsAccountSchema,
+    SavingsRecurringDepositSchema,
+    SavingsTransactionSchema,
+)
+from api.features.finance.services.archive_service import ArchiveService
+from api.features.finance.utils import get_or_create_finance_account, get_or_create_savings_account
+
+DEFAULT_CHUNK_SIZE = 500
+
+# Flush to the client once this many bytes of JSON have been buffered
+WRITE_BUFFER_SIZE = 64 * 1024
+
+
+class ExportService:
+    def __init__(self):
+        self.archive_service = ArchiveService()
+
+    def stream_finance_data(
+        self,
+        user: User,
+        chunk_size: int = DEFAULT_CHUNK_SIZE,
+        compress: bool = False,
+        include_archived: bool = False,
+    ) -> Iterator[bytes]:
+        """
+        Stream the same document as ExportDataSchema, one row at a time.
+        Each table is walked with a server-side iterator so memory stays bounded
+        by chunk_size no matter how much history the user has. With include_archived,
+        each table is followed by its rows from the cold archive.
+        """
+        # Resolve the accounts eagerly so a missing account is created before streaming starts
+        account = get_or_create_finance_account(user=user)
+        savings_account = get_or_create_savings_account(user=user)
+
+        pieces = self._render_document(
+            user, account, savings_account, chunk_size, user if include_archived else None
+        )
+        buffered = self._buffer(pieces)
+        if compress:
+            return self._gzip(buffered)
+        return buffered
+
+    def _render_document(
+        self, user, account, savings_account, chunk_size, archive_user
+    ) -> Iterator[str]:
+        # Keys and order mirror ExportDataSchema so existing backups stay compatible
+        yield '{"categories": '
+        yield from self._render_rows(
+            Category.all_objects.filter(user=user), CategorySchema, chunk_size, archive_user
+        )
+        yield ', "account": '
+        yield self._dumps(FinanceAccountSchema.from_orm(account))
+        yield ', "savingsAccount": '
+        yield self._dumps(SavingsAccountSchema.from_orm(savings_account))
+        yield ', "recurringBills": '
+        yield from self._render_rows(
+            RecurringBill.all_objects.filter(user=user).select_related("category"),
+            RecurringBillSchema,
+            chunk_size,
+            archive_user,
+        )
+        yield ', "paychecks": '
+        yield from self._render_rows(
+            Paycheck.all_objects.filter(user=user).select_related("category"),
+            PaycheckSchema,
+            chunk_size,
+            archive_user,
+        )
+        yield ', "expenses": '
+        yield from self._render_rows(
+            Expense.all_objects.filter(user=user).select_related("category"),
+            ExpenseSchema,
+            chunk_size,
+            archive_user,
+        )
+        yield ', "savingsRecurringDeposits": '
+        yield from self._render_rows(
+            SavingsRecurringDeposit.all_objects.filter(user=user),
+            SavingsRecurringDepositSchema,
+            chunk_size,
+            archive_user,
+        )
+        yield ', "savingsTransactions": '
+        yield from self._render_rows(
+            SavingsTransaction.all_objects.filter(user=user),
+            SavingsTransactionSchema,
+            chunk_size,
+            archive_user,
+        )
+        yield "}"
+
+    def _render_rows(
+        self,
+        queryset: QuerySet,
+        schema: Type[Schema],
+        chunk_size: int,
+        archive_user: Optional[User] = None,
+    ) -> Iterator[str]:
+        """Render a queryset (and its archived rows) as a JSON array without materializing it"""
+        rows = queryset.order_by("id").iterator(chunk_size=chunk_size)
+        if archive_user is not None:
+            rows = chain(
+                rows, self.archive_service.instances(archive_user, queryset.model, chunk_size)
+            )
+        yield "["
+        separator = ""
+        for row in rows:
+            yield separator
+            yield self._dumps(schema.from_orm(row))
+            separator = ", "
+        yield "]"
+
+    def _dumps(self, row: Schema) -> str:
+        return json.dumps(row.model_dump(), cls=DjangoJSONEncoder)
+
+    def _buffer(self, pieces: Iterable[str]) -> Iterator[bytes]:
+        """Coalesce many tiny JSON fragments into reasonably sized network writes"""
+        buffer = []
+        size = 0
+        for piece in pieces:
+            buffer.append(piece)
+            size += len(piece)
+            if size >= WRITE_BUFFER_SIZE:
+                yield "".join(buffer).encode("utf-8")
+                buffer = []
+                size = 0
+        if buffer:
+            yield "".join(buffer).encode("utf-8")
+
+    def _gzip(self, chunks: Iterable[bytes]) -> Iterator[bytes]:
+        # wbits=31 produces a gzip container rather than a raw zlib stream
+        compressor = zlib.compressobj(wbits=31)
+        for chunk in chunks:
+            compressed = compressor.compress(chunk)
+            if compressed:
+                yield compressed
+        yield compressor.flush()
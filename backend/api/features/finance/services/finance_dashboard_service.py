@@ -33,9 +33,9 @@ class FinanceDashboardService:
             },
         )
 
-        expenses = Expense.objects.filter(user=user, is_deleted=False).order_by("date")
-        paychecks = Paycheck.objects.filter(user=user, is_deleted=False).order_by("date")
-        bills = RecurringBill.objects.filter(user=user, is_deleted=False).order_by("due_day")
+        expenses = Expense.objects.filter(user=user).order_by("date")
+        paychecks = Paycheck.objects.filter(user=user).order_by("date")
+        bills = RecurringBill.objects.filter(user=user).order_by("due_day")
 
         # Calculate unaccounted spending for current month
         today = timezone.now().date()
@@ -47,12 +47,10 @@ class FinanceDashboardService:
 
         unaccounted_spending = self._calculate_unaccounted_spending(user, month_start, month_end)
 
-        recurring_savings = SavingsRecurringDeposit.objects.filter(
-            user=user, is_deleted=False
-        ).order_by("created_at")
-        savings_transactions = SavingsTransaction.objects.filter(
-            user=user, is_deleted=False
-        ).order_by("-date", "-created_at")
+        recurring_savings = SavingsRecurringDeposit.objects.filter(user=user).order_by("created_at")
+        savings_transactions = SavingsTransaction.objects.filter(user=user).order_by(
+            "-date", "-created_at"
+        )
 
         return {
             "account": {
@@ -166,14 +164,12 @@ class FinanceDashboardService:
 
     def _calculate_monthly_income(self, user: User, start_date: date, end_date: date) -> Decimal:
         """Calculate total income for a date range"""
-        paychecks = Paycheck.objects.filter(
-            user=user, date__gte=start_date, date__lte=end_date, is_deleted=False
-        )
+        paychecks = Paycheck.objects.filter(user=user, date__gte=start_date, date__lte=end_date)
         return sum(pc.amount for pc in paychecks) or Decimal("0.00")
 
     def _calculate_monthly_bills(self, user: User, start_date: date, end_date: date) -> Decimal:
         """Calculate total bills for a date range"""
-        bills = RecurringBill.objects.filter(user=user, is_deleted=False)
+        bills = RecurringBill.objects.filter(user=user)
         total = Decimal("0.00")
 
         # Calculate how many times each bill occurs in the date range
@@ -193,9 +189,7 @@ class FinanceDashboardService:
 
     def _calculate_monthly_expenses(self, user: User, start_date: date, end_date: date) -> Decimal:
         """Calculate total expenses for a date range"""
-        expenses = Expense.objects.filter(
-            user=user, date__gte=start_date, date__lte=end_date, is_deleted=False
-        )
+        expenses = Expense.objects.filter(user=user, date__gte=start_date, date__lte=end_date)
         return sum(exp.amount for exp in expenses) or Decimal("0.00")
 
     def _calculate_unaccounted_spending(
@@ -206,7 +200,6 @@ class FinanceDashboardService:
             user=user,
             date__gte=start_date,
             date__lte=end_date,
-            is_deleted=False,
             related_bill__isnull=True,
         )
         return sum(exp.amount for exp in expenses) or Decimal("0.00")
@@ -0,0 +1,619 @@
+import time
+from contextlib import contextmanager
+from typing import IO, Any, Callable, Dict, List, Optional
+
+from django.contrib.auth.models import User
+from django.db import IntegrityError, transaction
+from django.utils import timezone
+
+from api.features.finance.models import (
+    BalanceLedgerEntry,
+    BalanceSnapshot,
+    Category,
+    Expense,
+    FinanceAccount,
+    FinanceArchive,
+    FinanceChangeLog,
+    FinanceRevision,
+    Paycheck,
+    RecurringBill,
+    SavingsAccount,
+    SavingsRecurringDeposit,
+    SavingsTransaction,
+    TransactionFingerprint,
+)
+from api.features.finance.schemas import (
+    CategorySchema,
+    ExpenseSchema,
+    ExportDataSchema,
+    FinanceAccountSchema,
+    PaycheckSchema,
+    RecurringBillSchema,
+    SavingsAccountSchema,
+    SavingsRecurringDepositSchema,
+    SavingsTransactionSchema,
+)
+from api.features.finance.services.backup_reader import BackupStreamReader
+from api.features.finance.services.calendar_push_service import schedule_calendar_push
+from core.db_router import database_for_user
+
+DEFAULT_BATCH_SIZE = 500
+# Largest batch_size the import endpoints accept; bigger batches only cost memory
+MAX_BATCH_SIZE = 5000
+
+# Backup sections in the order they must be restored, with the schema validating each entry
+SECTIONS = {
+    "categories": CategorySchema,
+    "account": FinanceAccountSchema,
+    "savingsAccount": SavingsAccountSchema,
+    "recurringBills": RecurringBillSchema,
+    "paychecks": PaycheckSchema,
+    "expenses": ExpenseSchema,
+    "savingsRecurringDeposits": SavingsRecurringDepositSchema,
+    "savingsTransactions": SavingsTransactionSchema,
+}
+
+SECTION_MODELS = {
+    "categories": Category,
+    "recurringBills": RecurringBill,
+    "paychecks": Paycheck,
+    "expenses": Expense,
+    "savingsRecurringDeposits": SavingsRecurringDeposit,
+    "savingsTransactions": SavingsTransaction,
+}
+
+# Merge imports match rows by these content keys when ids don't line up,
+# and compare the tracked fields to decide whether a matched row needs an update
+MERGE_FIELDS = {
+    "categories": (("name",), ("name", "type", "color")),
+    "recurringBills": (
+        ("name", "frequency", "start_date"),
+        (
+            "name",
+            "amount",
+            "frequency",
+            "start_date",
+            "due_day",
+            "day_of_week",
+            "category_id",
+            "total",
+            "amount_paid",
+        ),
+    ),
+    "paychecks": (
+        ("date", "frequency", "amount"),
+        (
+            "amount",
+            "date",
+            "frequency",
+            "day_of_week",
+            "day_of_month",
+            "second_day_of_month",
+            "category_id",
+        ),
+    ),
+    "expenses": (
+        ("date", "name", "amount"),
+        ("name", "amount", "date", "category_id", "related_bill_id"),
+    ),
+    "savingsRecurringDeposits": (
+        ("name", "frequency", "start_date"),
+        (
+            "name",
+            "amount",
+            "frequency",
+            "start_date",
+            "day_of_week",
+            "day_of_month",
+            "is_payroll_deposit",
+            "notes",
+        ),
+    ),
+    "savingsTransactions": (
+        ("date", "transaction_type", "amount"),
+        ("transaction_type", "amount", "date", "notes"),
+    ),
+}
+
+# Sections whose content key is unique per user. Their rows are matched by key before
+# id, so a stored row is only ever renamed to a name no other stored row holds.
+KEY_FIRST_SECTIONS = {"categories"}
+
+# ExportDataSchema also accepts the snake_case aliases
+SECTION_ALIASES = {
+    "savings_account": "savingsAccount",
+    "recurring_bills": "recurringBills",
+    "savings_recurring_deposits": "savingsRecurringDeposits",
+    "savings_transactions": "savingsTransactions",
+}
+
+
+class RestoreContext:
+    """Mutable state shared by the row builders while a backup is restored"""
+
+    def __init__(self, user: User):
+        self.user = user
+        self.account: Optional[FinanceAccount] = None
+        self.savings_account: Optional[SavingsAccount] = None
+        # old id -> new id
+        self.category_ids: Dict[Any, int] = {}
+        self.bill_ids: Dict[Any, int] = {}
+        self.phases: List[Dict[str, Any]] = []
+
+    @contextmanager
+    def phase(self, name: str):
+        stats = {"phase": name, "rows": 0}
+        started = time.perf_counter()
+        yield stats
+        stats["seconds"] = round(time.perf_counter() - started, 4)
+        self.phases.append(stats)
+
+    def summary(self) -> Dict[str, Any]:
+        return {
+            "phases": self.phases,
+            "total_rows": sum(p["rows"] for p in self.phases if p["phase"] != "wipe"),
+            "total_seconds": round(sum(p["seconds"] for p in self.phases), 4),
+        }
+
+
+class ImportService:
+    def restore(
+        self, user: User, data: ExportDataSchema, batch_size: int = DEFAULT_BATCH_SIZE
+    ) -> Dict[str, Any]:
+        """
+        Replace the user's finance data with a backup using bulk inserts.
+        Tables are written in dependency order and old ids are remapped in memory,
+        so each phase costs one INSERT per batch instead of one per row.
+        """
+        ctx = RestoreContext(user)
+
+        with transaction.atomic(using=database_for_user(user.id)):
+            with ctx.phase("wipe") as stats:
+                stats["rows"] = self._wipe(user)
+
+            for section in SECTIONS:
+                value = getattr(data, section)
+                with ctx.phase(section) as stats:
+                    if isinstance(value, list):
+                        self._insert_rows(ctx, section, value, batch_size)
+                        stats["rows"] = len(value)
+                    else:
+                        self._restore_account(ctx, section, value)
+                        stats["rows"] = 1
+
+        return ctx.summary()
+
+    def restore_stream(
+        self,
+        user: User,
+        stream: IO[bytes],
+        batch_size: int = DEFAULT_BATCH_SIZE,
+        on_section: Optional[Callable[[str, int], None]] = None,
+    ) -> Dict[str, Any]:
+        """
+        Restore a backup straight from a file-like object.
+        Sections are parsed incrementally and rows are validated and inserted in
+        batches of batch_size, so memory stays flat regardless of backup size.
+        Sections must appear in export order, since later ones reference earlier ids.
+        on_section(section, rows) is called as each section finishes.
+        """
+        ctx = RestoreContext(user)
+        order = list(SECTIONS)
+
+        with transaction.atomic(using=database_for_user(user.id)):
+            with ctx.phase("wipe") as stats:
+                stats["rows"] = self._wipe(user)
+
+            current: Optional[str] = None
+            pending: List[Any] = []
+            started = 0.0
+            section_stats: Dict[str, Any] = {}
+
+            def finish_section():
+                if pending:
+                    self._insert_rows(ctx, current, pending, batch_size)
+                    pending.clear()
+                section_stats["seconds"] = round(time.perf_counter() - started, 4)
+                ctx.phases.append(section_stats)
+                if on_section:
+                    on_section(current, section_stats["rows"])
+
+            for key, value in BackupStreamReader(stream):
+                section = SECTION_ALIASES.get(key, key)
+                if section not in SECTIONS:
+                    continue
+
+                if section != current:
+                    if current is not None:
+                        if order.index(section) < order.index(current):
+                            raise ValueError(
+                                f"Backup section '{key}' must appear before '{current}'"
+                            )
+                        finish_section()
+                    current = section
+                    started = time.perf_counter()
+                    section_stats = {"phase": section, "rows": 0}
+
+                row = SECTIONS[section].model_validate(value)
+                section_stats["rows"] += 1
+
+                if section in ("account", "savingsAccount"):
+                    self._restore_account(ctx, section, row)
+                    continue
+
+                pending.append(row)
+                if len(pending) >= batch_size:
+                    self._insert_rows(ctx, section, pending, batch_size)
+                    pending.clear()
+
+            if current is not None:
+                finish_section()
+
+            if ctx.account is None or ctx.savings_account is None:
+                raise ValueError("Backup is missing the account or savingsAccount section")
+
+        return ctx.summary()
+
+    def merge(
+        self, user: User, data: ExportDataSchema, batch_size: int = DEFAULT_BATCH_SIZE
+    ) -> Dict[str, Any]:
+        """
+        Apply a backup on top of the user's existing data instead of wiping it.
+        Only rows that differ are written, and ids of matched rows are preserved.
+        """
+        ctx = RestoreContext(user)
+        diff: Dict[str, Dict[str, int]] = {}
+
+        with transaction.atomic(using=database_for_user(user.id)):
+            for section in SECTIONS:
+                value = getattr(data, section)
+                with ctx.phase(section) as stats:
+                    if isinstance(value, list):
+                        diff[section] = self._merge_rows(ctx, section, value, batch_size)
+                    else:
+                        diff[section] = self._merge_account(ctx, section, value)
+                    stats["rows"] = diff[section]["created"] + diff[section]["updated"]
+
+        schedule_calendar_push(user.id)
+        return {**ctx.summary(), "diff": diff}
+
+    def _wipe(self, user: User) -> int:
+        """Hard-delete the user's finance rows, leaf tables first"""
+        # Fingerprints would outlive the rows they point at (their keys are SET_NULL) and
+        # make a re-imported bank statement skip transactions the user no longer has
+        deleted, _ = TransactionFingerprint.objects.filter(user=user).delete()
+        for model in (
+            Expense,
+            Paycheck,
+            RecurringBill,
+            SavingsTransaction,
+            SavingsRecurringDeposit,
+            Category,
+            FinanceAccount,
+            SavingsAccount,
+        ):
+            count, _ = model.all_objects.filter(user=user).delete()
+            deleted += count
+        # The backup replaces everything the user had, archived rows included. The ledger
+        # starts over too: restored accounts post their balances as opening entries.
+        for model in (FinanceArchive, BalanceSnapshot, BalanceLedgerEntry):
+            count, _ = model.objects.filter(user=user).delete()
+            deleted += count
+        FinanceRevision.mark_reset(user.id)
+        # Bulk writes skip post_save, so the calendar push is requested explicitly
+        schedule_calendar_push(user.id)
+        return deleted
+
+    def _restore_account(self, ctx: RestoreContext, section: str, data) -> None:
+        model = FinanceAccount if section == "account" else SavingsAccount
+        account = model(
+            user=ctx.user,
+            starting_balance=data.startingBalance,
+            current_balance=data.currentBalance,
+            balance_as_of_date=data.balanceAsOfDate,
+            is_deleted=data.isDeleted,
+            deleted_at=data.deletedAt,
+        )
+        account.save()
+        if section == "account":
+            ctx.account = account
+        else:
+            ctx.savings_account = account
+
+    def _insert_rows(
+        self, ctx: RestoreContext, section: str, rows: List[Any], batch_size: int
+    ) -> None:
+        builder = self._builder(section)
+        objs = [builder(ctx, row) for row in rows]
+        if not objs:
+            return
+
+        # bulk_create skips save(), so revisions have to be stamped up front. The rows are
+        # not added to the change log: the wipe before a restore already logged a reset.
+        FinanceRevision.stamp(ctx.user.id, objs)
+        type(objs[0]).objects.bulk_create(objs, batch_size=batch_size)
+
+        if section == "categories":
+            ctx.category_ids.update((row.id, obj.pk) for row, obj in zip(rows, objs))
+        elif section == "recurringBills":
+            ctx.bill_ids.update((row.id, obj.pk) for row, obj in zip(rows, objs))
+
+    def _merge_account(self, ctx: RestoreContext, section: str, data) -> Dict[str, int]:
+        model = FinanceAccount if section == "account" else SavingsAccount
+        account = model.all_objects.filter(user=ctx.user).first()
+        if account is None:
+            self._restore_account(ctx, section, data)
+            return {"created": 1, "updated": 0, "deleted": 0, "unchanged": 0}
+
+        incoming = {
+            "starting_balance": data.startingBalance,
+            "current_balance": data.currentBalance,
+            "balance_as_of_date": data.balanceAsOfDate,
+            "is_deleted": data.isDeleted,
+        }
+        changed = False
+        for attr, value in incoming.items():
+            if self._normalize(account, attr, value) != self._normalize(
+                account, attr, getattr(account, attr)
+            ):
+                setattr(account, attr, value)
+                changed = True
+        if changed:
+            account.deleted_at = data.deletedAt if data.isDeleted else None
+            account.save()
+
+        if section == "account":
+            ctx.account = account
+        else:
+            ctx.savings_account = account
+        return {"created": 0, "updated": int(changed), "deleted": 0, "unchanged": int(not changed)}
+
+    def _merge_rows(
+        self, ctx: RestoreContext, section: str, rows: List[Any], batch_size: int
+    ) -> Dict[str, int]:
+        """
+        Reconcile one section against the rows already stored for the user.
+        Incoming rows are matched by id first and by content key second (the other way
+        round for KEY_FIRST_SECTIONS); matches are updated only if a tracked field
+        differs, leftovers are created, and stored rows missing from the backup are
+        soft-deleted. Raises ValueError if the result would break a unique constraint.
+        """
+        builder = self._builder(section)
+        key_fields, tracked_fields = MERGE_FIELDS[section]
+        model = SECTION_MODELS[section]
+
+        existing = {obj.pk: obj for obj in model.all_objects.filter(user=ctx.user).order_by("id")}
+        by_key: Dict[tuple, List[Any]] = {}
+        for obj in existing.values():
+            by_key.setdefault(self._key(obj, key_fields), []).append(obj)
+
+        matched_ids = set()
+        to_create, to_update = [], []
+        # (row, operation, state before the merge) for the change log
+        updates = []
+        created_rows = []
+        unchanged = 0
+        now = timezone.now()
+
+        def by_content(incoming):
+            candidates = by_key.get(self._key(incoming, key_fields), [])
+            return next((obj for obj in candidates if obj.pk not in matched_ids), None)
+
+        incoming_rows = [builder(ctx, row) for row in rows]
+        key_matches: Dict[int, Any] = {}
+        if section in KEY_FIRST_SECTIONS:
+            for index, incoming in enumerate(incoming_rows):
+                current = by_content(incoming)
+                if current is not None:
+                    key_matches[index] = current
+                    matched_ids.add(current.pk)
+
+        for index, (row, incoming) in enumerate(zip(rows, incoming_rows)):
+            current = key_matches.get(index)
+            if current is None:
+                current = existing.get(row.id) if row.id is not None else None
+                if current is None or current.pk in matched_ids:
+                    current = by_content(incoming)
+
+            if current is None:
+                to_create.append(incoming)
+                created_rows.append(row)
+                continue
+
+            matched_ids.add(current.pk)
+            self._remember_id(ctx, section, row.id, current.pk)
+
+            previous = current.change_state()
+            changed = False
+            for attr in tracked_fields:
+                value = getattr(incoming, attr)
+                if self._normalize(current, attr, value) != self._normalize(
+                    current, attr, getattr(current, attr)
+                ):
+                    setattr(current, attr, value)
+                    changed = True
+            # deleted_at loses precision in JSON, so only follow it when the flag flips
+            if current.is_deleted != incoming.is_deleted:
+                current.is_deleted = incoming.is_deleted
+                current.deleted_at = incoming.deleted_at or (now if incoming.is_deleted else None)
+                changed = True
+
+            if changed:
+                to_update.append(current)
+                updates.append((current, self._merge_operation(previous, current), previous))
+            else:
+                unchanged += 1
+
+        deleted = 0
+        for obj in existing.values():
+            if obj.pk not in matched_ids and not obj.is_deleted:
+                previous = obj.change_state()
+                obj.is_deleted = True
+                obj.deleted_at = now
+                to_update.append(obj)
+                updates.append((obj, FinanceChangeLog.Operation.DELETE, previous))
+                deleted += 1
+
+        try:
+            # Updates go first, so a created row may take a name a stored row gave up
+            if to_update:
+                # bulk_update skips save(), so stamp the sync columns by hand
+                FinanceRevision.stamp(ctx.user.id, to_update)
+                for obj in to_update:
+                    obj.updated_at = now
+                model.all_objects.bulk_update(
+                    to_update,
+                    [*tracked_fields, "is_deleted", "deleted_at", "revision", "updated_at"],
+                    batch_size=batch_size,
+                )
+                FinanceChangeLog.record_bulk(updates)
+
+            if to_create:
+                FinanceRevision.stamp(ctx.user.id, to_create)
+                model.objects.bulk_create(to_create, batch_size=batch_size)
+                FinanceChangeLog.record_bulk(
+                    (obj, FinanceChangeLog.Operation.CREATE, None) for obj in to_create
+                )
+                for row, obj in zip(created_rows, to_create):
+                    self._remember_id(ctx, section, row.id, obj.pk)
+        except IntegrityError as e:
+            # e.g. the backup names two categories alike
+            raise ValueError(f"Backup section '{section}' conflicts with the stored rows: {e}")
+
+        return {
+            "created": len(to_create),
+            "updated": len(to_update) - deleted,
+            "deleted": deleted,
+            "unchanged": unchanged,
+        }
+
+    def _remember_id(self, ctx: RestoreContext, section: str, old_id, new_id: int) -> None:
+        if old_id is None:
+            return
+        if section == "categories":
+            ctx.category_ids[old_id] = new_id
+        elif section == "recurringBills":
+            ctx.bill_ids[old_id] = new_id
+
+    def _merge_operation(self, previous: Dict[str, Any], obj) -> str:
+        if obj.is_deleted and not previous["is_deleted"]:
+            return FinanceChangeLog.Operation.DELETE
+        if previous["is_deleted"] and not obj.is_deleted:
+            return FinanceChangeLog.Operation.RESTORE
+        return FinanceChangeLog.Operation.UPDATE
+
+    def _key(self, obj, fields) -> tuple:
+        return tuple(self._normalize(obj, attr, getattr(obj, attr)) for attr in fields)
+
+    def _normalize(self, obj, attr: str, value):
+        # Backups carry amounts as floats; coerce both sides through the model field
+        return obj._meta.get_field(attr).to_python(value)
+
+    def _builder(self, section: str):
+        return {
+            "categories": self._build_category,
+            "recurringBills": self._build_bill,
+            "paychecks": self._build_paycheck,
+            "expenses": self._build_expense,
+            "savingsRecurringDeposits": self._build_savings_deposit,
+            "savingsTransactions": self._build_savings_transaction,
+        }[section]
+
+    def _require_account(self, ctx: RestoreContext, savings: bool = False):
+        account = ctx.savings_account if savings else ctx.account
+        if account is None:
+            name = "savingsAccount" if savings else "account"
+            raise ValueError(f"Backup section '{name}' must appear before the rows that use it")
+        return account
+
+    def _category_id(self, ctx: RestoreContext, category) -> Optional[int]:
+        return ctx.category_ids.get(category.id) if category else None
+
+    def _build_category(self, ctx: RestoreContext, cat_data: CategorySchema) -> Category:
+        return Category(
+            user=ctx.user,
+            name=cat_data.name,
+            type=cat_data.type,
+            color=cat_data.color,
+            is_deleted=cat_data.isDeleted,
+            deleted_at=cat_data.deletedAt,
+        )
+
+    def _build_bill(self, ctx: RestoreContext, bill_data: RecurringBillSchema) -> RecurringBill:
+        return RecurringBill(
+            user=ctx.user,
+            finance_account=self._require_account(ctx),
+            name=bill_data.name,
+            amount=bill_data.amount,
+            frequency=bill_data.frequency,
+            start_date=bill_data.startDate,
+            due_day=bill_data.dueDay,
+            day_of_week=bill_data.dayOfWeek,
+            category_id=self._category_id(ctx, bill_data.category),
+            total=bill_data.total,
+            amount_paid=bill_data.amountPaid,
+            is_deleted=bill_data.isDeleted,
+            deleted_at=bill_data.deletedAt,
+        )
+
+    def _build_paycheck(self, ctx: RestoreContext, pc_data: PaycheckSchema) -> Paycheck:
+        return Paycheck(
+            user=ctx.user,
+            finance_account=self._require_account(ctx),
+            amount=pc_data.amount,
+            date=pc_data.date,
+            frequency=pc_data.frequency,
+            day_of_week=pc_data.dayOfWeek,
+            day_of_month=pc_data.dayOfMonth,
+            second_day_of_month=pc_data.secondDayOfMonth,
+            category_id=self._category_id(ctx, pc_data.category),
+            is_deleted=pc_data.isDeleted,
+            deleted_at=pc_data.deletedAt,
+        )
+
+    def _build_expense(self, ctx: RestoreContext, exp_data: ExpenseSchema) -> Expense:
+        return Expense(
+            user=ctx.user,
+            finance_account=self._require_account(ctx),
+            name=exp_data.name,
+            amount=exp_data.amount,
+            date=exp_data.date,
+            category_id=self._category_id(ctx, exp_data.category),
+            related_bill_id=(
+                ctx.bill_ids.get(exp_data.relatedBillId) if exp_data.relatedBillId else None
+            ),
+            is_deleted=exp_data.isDeleted,
+            deleted_at=exp_data.deletedAt,
+        )
+
+    def _build_savings_deposit(
+        self, ctx: RestoreContext, srd_data: SavingsRecurringDepositSchema
+    ) -> SavingsRecurringDeposit:
+        return SavingsRecurringDeposit(
+            user=ctx.user,
+            savings_account=self._require_account(ctx, savings=True),
+            name=srd_data.name,
+            amount=srd_data.amount,
+            frequency=srd_data.frequency,
+            start_date=srd_data.startDate,
+            day_of_week=srd_data.dayOfWeek,
+            day_of_month=srd_data.dayOfMonth,
+            is_payroll_deposit=srd_data.isPayrollDeposit,
+            notes=srd_data.notes or "",
+            is_deleted=srd_data.isDeleted,
+            deleted_at=srd_data.deletedAt,
+        )
+
+    def _build_savings_transaction(
+        self, ctx: RestoreContext, st_data: SavingsTransactionSchema
+    ) -> SavingsTransaction:
+        return SavingsTransaction(
+            user=ctx.user,
+            savings_account=self._require_account(ctx, savings=True),
+            transaction_type=st_data.transactionType,
+            amount=st_data.amount,
+            date=st_data.date,
+            notes=st_data.notes or "",
+            is_deleted=st_data.isDeleted,
+            deleted_at=st_data.deletedAt,
+        )
@@ -0,0 +1,180 @@
+from datetime import date, datetime, time, timedelta
+from decimal import Decimal
+from typing import Any, Dict, List, Optional
+
+from django.conf import settings
+from django.db import transaction
+from django.db.models import Count, F, Max, Min, OuterRef, Subquery, Sum
+from django.db.models.functions import Coalesce
+from django.utils import timezone
+
+from api.features.finance.models import (
+    BalanceLedgerEntry,
+    BalanceSnapshot,
+    FinanceAccount,
+    FinanceRevision,
+    SavingsAccount,
+)
+from core.db_router import database_for_user, sharded_databases
+
+LEDGER_ACCOUNTS = {
+    BalanceLedgerEntry.Account.CHECKING: FinanceAccount,
+    BalanceLedgerEntry.Account.SAVINGS: SavingsAccount,
+}
+
+
+class LedgerService:
+    """
+    Balances derived from the BalanceLedgerEntry ledger. A balance at any point is the
+    latest BalanceSnapshot before it plus the entries after that snapshot, so every
+    lookup is one indexed range aggregate however long the history is.
+    """
+
+    def balance(self, user_id: int, account: str, on: Optional[date] = None) -> Decimal:
+        """The account's balance now, or at the end of day `on`"""
+        database = database_for_user(user_id)
+        entries = BalanceLedgerEntry.objects.using(database).filter(
+            user_id=user_id, account=account
+        )
+        snapshots = BalanceSnapshot.objects.using(database).filter(user_id=user_id, account=account)
+        if on is not None:
+            end = timezone.make_aware(datetime.combine(on + timedelta(days=1), time.min))
+            entries = entries.filter(created_at__lt=end)
+            snapshots = snapshots.filter(as_of__lt=end)
+
+        snapshot = snapshots.order_by("-last_entry_id").first()
+        if snapshot is not None:
+            entries = entries.filter(id__gt=snapshot.last_entry_id)
+        tail = entries.aggregate(total=Sum("amount"))["total"] or Decimal("0")
+        return (snapshot.balance if snapshot else Decimal("0")) + tail
+
+    def snapshot(self, user_id: Optional[int] = None, every: Optional[int] = None) -> int:
+        """
+        Checkpoint accounts with `every` or more entries since their last snapshot, and
+        close off each month that has ended. Returns the number of snapshots taken.
+        """
+        every = every or settings.FINANCE_LEDGER_SNAPSHOT_EVERY
+        month_start = timezone.localtime().replace(day=1, hour=0, minute=0, second=0, microsecond=0)
+        covered = (
+            BalanceSnapshot.objects.filter(user_id=OuterRef("user_id"), account=OuterRef("account"))
+            .order_by("-last_entry_id")
+            .values("last_entry_id")[:1]
+        )
+        databases = sharded_databases() if user_id is None else [database_for_user(user_id)]
+        taken = 0
+        for database in databases:
+            pending = (
+                BalanceLedgerEntry.objects.using(database)
+                .annotate(covered=Coalesce(Subquery(covered), 0))
+                .filter(id__gt=F("covered"))
+            )
+            if user_id is not None:
+                pending = pending.filter(user_id=user_id)
+            for row in pending.values("user_id", "account").annotate(
+                count=Count("id"), oldest=Min("created_at")
+            ):
+                if row["count"] >= every or row["oldest"] < month_start:
+                    taken += self._snapshot_account(
+                        database, row["user_id"], row["account"], every, month_start
+                    )
+        return taken
+
+    def reconcile(self, user_id: Optional[int] = None, fix: bool = False) -> List[Dict[str, Any]]:
+        """
+        Compare each account's current_balance with its ledger balance and return the
+        mismatches. With `fix`, the ledger wins and current_balance is rewritten.
+        """
+        databases = sharded_databases() if user_id is None else [database_for_user(user_id)]
+        mismatches = []
+        for database in databases:
+            for key, model in LEDGER_ACCOUNTS.items():
+                accounts = model.objects.using(database).order_by("user_id")
+                if user_id is not None:
+                    accounts = accounts.filter(user_id=user_id)
+                for account in accounts.iterator():
+                    with transaction.atomic(using=database):
+                        if fix:
+                            self._lock(database, account.user_id)
+                            account.refresh_from_db(fields=["current_balance"])
+                        ledger = self.balance(account.user_id, key)
+                        if ledger == account.current_balance:
+                            continue
+                        mismatches.append(
+                            {
+                                "user_id": account.user_id,
+                                "account": key,
+                                "current_balance": account.current_balance,
+                                "ledger_balance": ledger,
+                            }
+                        )
+                        if fix:
+                            account.current_balance = ledger
+                            account._skip_ledger = True
+                            account.save(update_fields=["current_balance"])
+        return mismatches
+
+    def open_accounts(self, user_id: int) -> None:
+        """Start the ledger from the stored balances, after accounts were written without save()"""
+        database = database_for_user(user_id)
+        BalanceLedgerEntry.record(
+            BalanceLedgerEntry.build(
+                account, account.current_balance, BalanceLedgerEntry.Kind.OPENING
+            )
+            for model in LEDGER_ACCOUNTS.values()
+            for account in model.objects.using(database).filter(user_id=user_id)
+            if account.current_balance
+        )
+
+    def _snapshot_account(
+        self, database: str, user_id: int, account: str, every: int, month_start: datetime
+    ) -> int:
+        entries = BalanceLedgerEntry.objects.using(database).filter(
+            user_id=user_id, account=account
+        )
+        taken = 0
+        with transaction.atomic(using=database):
+            self._lock(database, user_id)
+            last = (
+                BalanceSnapshot.objects.using(database)
+                .filter(user_id=user_id, account=account)
+                .order_by("-last_entry_id")
+                .first()
+            )
+            covered = last.last_entry_id if last else 0
+            balance = last.balance if last else Decimal("0")
+            while True:
+                tail = entries.filter(id__gt=covered).order_by("id")
+                first = tail.first()
+                if first is None:
+                    break
+                if first.created_at < month_start:
+                    # A month that has ended gets one snapshot, at its last entry
+                    opened = timezone.localtime(first.created_at).replace(day=1)
+                    boundary = (opened + timedelta(days=32)).replace(
+                        day=1, hour=0, minute=0, second=0, microsecond=0
+                    )
+                    cut = tail.filter(created_at__lt=boundary).aggregate(last=Max("id"))["last"]
+                else:
+                    cut = next(iter(tail.values_list("id", flat=True)[every - 1 : every]), None)
+                    if cut is None:
+                        break
+
+                covering = tail.filter(id__lte=cut).aggregate(
+                    total=Sum("amount"), as_of=Max("created_at")
+                )
+                balance += covering["total"]
+                covered = cut
+                BalanceSnapshot.objects.using(database).create(
+                    user_id=user_id,
+                    account=account,
+                    last_entry_id=cut,
+                    balance=balance,
+                    as_of=covering["as_of"],
+                )
+                taken += 1
+        return taken
+
+    def _lock(self, database: str, user_id: int) -> None:
+        # Every balance write allocates a revision first, which holds this row until
+        # commit, so taking it waits out (and holds off) the user's in-flight writes
+        list(FinanceRevision.objects.using(database).select_for_update().filter(user_id=user_id))
@@ -0,0 +1,81 @@
+from datetime import date
+from typing import Any, Dict, Optional, Tuple
+
+from django.conf import settings
+from django.db.models import Count, QuerySet, Sum
+
+MAX_ID = 2**63 - 1
+
+
+class PageService:
+    """
+    Keyset pagination over a user's rows, newest first by (date, id). A page ends with a
+    cursor naming its last row and the next page starts strictly after it, so each page
+    is one range scan of the (user, date, id) index however deep the client has paged,
+    and rows written meanwhile never shift a page or repeat one.
+    """
+
+    def page(
+        self,
+        rows: QuerySet,
+        date_field: str,
+        cursor: Optional[str] = None,
+        limit: Optional[int] = None,
+        date_from: Optional[date] = None,
+        date_to: Optional[date] = None,
+        sum_field: Optional[str] = None,
+        **filters: Any,
+    ) -> Dict[str, Any]:
+        """
+        One page of `rows` between date_from and date_to (both inclusive), narrowed by
+        the equality `filters` that are not None. The total, and with `sum_field` the
+        totalAmount of that field, are only computed for the first page; later pages
+        return None. Raises ValueError for a malformed cursor.
+        """
+        limit = max(1, min(limit or settings.FINANCE_PAGE_SIZE, settings.FINANCE_MAX_PAGE_SIZE))
+        if date_from is not None:
+            rows = rows.filter(**{f"{date_field}__gte": date_from})
+        if date_to is not None:
+            rows = rows.filter(**{f"{date_field}__lte": date_to})
+        rows = rows.filter(
+            **{field: value for field, value in filters.items() if value is not None}
+        )
+
+        aggregates = {"total": Count("id")}
+        if sum_field:
+            aggregates["totalAmount"] = Sum(sum_field)
+        if cursor is None:
+            totals = rows.aggregate(**aggregates)
+        else:
+            totals = dict.fromkeys(aggregates)
+            after_date, after_id = self._decode(cursor)
+            # The date bound keeps this a range scan; the exclude drops the rows of that
+            # date the previous page already returned
+            rows = rows.filter(**{f"{date_field}__lte": after_date}).exclude(
+                **{date_field: after_date, "id__gte": after_id}
+            )
+
+        items = list(rows.order_by(f"-{date_field}", "-id")[: limit + 1])
+        has_more = len(items) > limit
+        items = items[:limit]
+        last = items[-1] if has_more else None
+        return {
+            "items": items,
+            "nextCursor": self._encode(getattr(last, date_field), last.id) if last else None,
+            "hasMore": has_more,
+            **totals,
+        }
+
+    def _encode(self, row_date: date, row_id: int) -> str:
+        return f"{row_date.isoformat()}:{row_id}"
+
+    def _decode(self, cursor: str) -> Tuple[date, int]:
+        try:
+            row_date, row_id = cursor.split(":", 1)
+            row_date, row_id = date.fromisoformat(row_date), int(row_id)
+        except ValueError:
+            raise ValueError("Invalid cursor.")
+        # Ids are positive bigints; anything outside would overflow the query parameter
+        if not 0 < row_id <= MAX_ID:
+            raise ValueError("Invalid cursor.")
+        return row_date, row_id
@@ -0,0 +1,128 @@
+from decimal import Decimal
+from typing import Any, Dict, List, Tuple, Union
+
+from django.contrib.auth.models import User
+from django.db import transaction
+from django.db.models import F
+from django.utils import timezone
+
+from api.features.finance.models import (
+    BalanceLedgerEntry,
+    FinanceAccount,
+    FinanceChangeLog,
+    FinanceRevision,
+    SavingsAccount,
+    SavingsTransaction,
+)
+from api.features.finance.services.calendar_push_service import schedule_calendar_push
+from api.features.finance.utils import get_or_create_finance_account, get_or_create_savings_account
+from core.db_router import database_for_user
+
+Account = Union[FinanceAccount, SavingsAccount]
+
+INSUFFICIENT_FUNDS = {
+    "deposit": "Insufficient checking balance for deposit.",
+    "transfer_to_checking": "Insufficient savings balance for transfer.",
+}
+
+
+class SavingsTransactionService:
+    """
+    Moves money between a user's checking and savings accounts. Balances change through
+    conditional UPDATEs with F() expressions, so concurrent transfers can neither lose
+    an update nor overdraw the source account: the balance check is part of the WHERE
+    clause and is evaluated against the row as it is when the UPDATE runs.
+    """
+
+    def create(self, user: User, payload: Dict[str, Any]) -> SavingsTransaction:
+        """Record a transfer and move its amount; raises ValueError for invalid transfers"""
+        transaction_type = payload.get("transaction_type")
+        if payload.get("amount") is None:
+            raise ValueError("Amount is required.")
+        amount = Decimal(str(payload["amount"]))
+        if amount <= 0:
+            raise ValueError("Amount must be greater than zero.")
+        if transaction_type not in INSUFFICIENT_FUNDS:
+            raise ValueError(f"Unsupported transaction type: {transaction_type}")
+
+        with transaction.atomic(using=database_for_user(user.id)):
+            changes = self._transfer(user, transaction_type, amount)
+            savings_account = changes[1][0]
+            entry = SavingsTransaction.objects.create(
+                user=user, savings_account=savings_account, **payload
+            )
+            # Raising rolls the new row back along with any balance already moved
+            if not self._adjust_balances(
+                user, changes, BalanceLedgerEntry.Kind.TRANSFER, entry, guard=True
+            ):
+                raise ValueError(INSUFFICIENT_FUNDS[transaction_type])
+            return entry
+
+    def delete(self, user: User, transaction_id: int) -> None:
+        """Soft delete a transfer and move its amount back"""
+        with transaction.atomic(using=database_for_user(user.id)):
+            # Locked so two concurrent deletes cannot both revert the same transfer
+            entry = SavingsTransaction.objects.select_for_update().get(id=transaction_id, user=user)
+            changes = []
+            if entry.transaction_type in INSUFFICIENT_FUNDS:
+                changes = self._transfer(user, entry.transaction_type, -entry.amount)
+
+            # Reverting is never refused, even if it leaves a balance below zero
+            self._adjust_balances(
+                user, changes, BalanceLedgerEntry.Kind.REVERSAL, entry, guard=False
+            )
+            entry.soft_delete()
+
+    def _transfer(
+        self, user: User, transaction_type: str, amount: Decimal
+    ) -> List[Tuple[Account, Decimal]]:
+        """Balance deltas of a transfer, checking account first so locks are taken in order"""
+        sign = 1 if transaction_type == "transfer_to_checking" else -1
+        return [
+            (get_or_create_finance_account(user), sign * amount),
+            (get_or_create_savings_account(user), -sign * amount),
+        ]
+
+    def _adjust_balances(
+        self,
+        user: User,
+        changes: List[Tuple[Account, Decimal]],
+        kind: str,
+        source: SavingsTransaction,
+        guard: bool,
+    ) -> bool:
+        """
+        Add each delta to its account's balance in place and post it to the ledger.
+        With `guard`, an account is only debited if it holds enough; returns False (and
+        the caller's transaction must roll back) when it does not. Must run inside a
+        transaction.
+        """
+        if not changes:
+            return True
+
+        # update() skips save(), so revisions, change log and ledger entries are written here
+        top = FinanceRevision.allocate(user.id, count=len(changes))
+        now = timezone.now()
+        logged, posted = [], []
+        for revision, (account, delta) in enumerate(changes, start=top - len(changes) + 1):
+            rows = type(account).objects.filter(pk=account.pk)
+            if guard and delta < 0:
+                rows = rows.filter(current_balance__gte=-delta)
+            updated = rows.update(
+                current_balance=F("current_balance") + delta, revision=revision, updated_at=now
+            )
+            if not updated:
+                return False
+
+            # The logged delta is exact even if this copy of the balance is stale
+            previous = account.change_state()
+            account.current_balance += delta
+            account.revision = revision
+            logged.append((account, FinanceChangeLog.Operation.UPDATE, previous))
+            posted.append(BalanceLedgerEntry.build(account, delta, kind, source))
+
+        FinanceChangeLog.record_bulk(logged)
+        BalanceLedgerEntry.record(posted)
+        # Balances feed every calendar day, as with a saved account
+        schedule_calendar_push(user.id)
+        return True
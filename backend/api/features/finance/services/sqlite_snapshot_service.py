@@ -0,0 +1,349 @@
+import os
+import sqlite3
+import tempfile
+from datetime import date, datetime
+from datetime import timezone as dt_timezone
+from decimal import Decimal
+from typing import IO, Any, Dict, List, Optional
+
+from django.contrib.auth.models import User
+from django.db import connections, transaction
+from django.db.models import Max
+from django.utils import timezone
+
+from api.features.finance.models import (
+    Category,
+    Expense,
+    FinanceAccount,
+    FinanceArchive,
+    FinanceRevision,
+    Paycheck,
+    RecurringBill,
+    SavingsAccount,
+    SavingsRecurringDeposit,
+    SavingsTransaction,
+)
+from api.features.finance.services.import_service import ImportService
+from api.features.finance.services.ledger_service import LedgerService
+from core.db_router import database_for_user, id_floor, reserve_id_block
+
+SNAPSHOT_FORMAT = "finance-snapshot"
+SNAPSHOT_VERSION = "1"
+
+SQLITE_HEADER = b"SQLite format 3\x00"
+
+DEFAULT_BATCH_SIZE = 5000
+
+# Dependency order: every table only references tables listed before it
+SNAPSHOT_MODELS = [
+    FinanceAccount,
+    SavingsAccount,
+    Category,
+    RecurringBill,
+    Paycheck,
+    Expense,
+    SavingsRecurringDeposit,
+    SavingsTransaction,
+]
+
+INTEGER_TYPES = {
+    "AutoField",
+    "BigAutoField",
+    "BigIntegerField",
+    "BooleanField",
+    "ForeignKey",
+    "IntegerField",
+    "OneToOneField",
+}
+
+
+class SqliteSnapshotService:
+    def __init__(self):
+        self.import_service = ImportService()
+        self.ledger_service = LedgerService()
+
+    def write_snapshot(self, user: User, path: str, batch_size: int = DEFAULT_BATCH_SIZE) -> Dict:
+        """
+        Write the user's finance tables into a standalone SQLite file at path.
+        The snapshot is built in memory with executemany() and copied to disk in
+        one pass with the sqlite3 backup API, so readers never see a partial file.
+        """
+        counts: Dict[str, int] = {}
+        memory = sqlite3.connect(":memory:")
+        try:
+            memory.execute("CREATE TABLE snapshot_meta (key TEXT PRIMARY KEY, value TEXT)")
+            memory.executemany(
+                "INSERT INTO snapshot_meta (key, value) VALUES (?, ?)",
+                [
+                    ("format", SNAPSHOT_FORMAT),
+                    ("version", SNAPSHOT_VERSION),
+                    ("username", user.username),
+                    ("exported_at", timezone.now().isoformat()),
+                ],
+            )
+
+            for model in SNAPSHOT_MODELS:
+                fields = self._fields(model)
+                table = model._meta.db_table
+                columns = ", ".join(
+                    f'"{field.column}" {self._sqlite_type(field)}' for field in fields
+                )
+                memory.execute(f'CREATE TABLE "{table}" ({columns})')
+
+                insert = (
+                    f'INSERT INTO "{table}" ({", ".join(self._quoted(fields))}) '
+                    f"VALUES ({', '.join('?' for _ in fields)})"
+                )
+                rows = (
+                    model.all_objects.filter(user=user)
+                    .order_by("id")
+                    .values_list(*[field.attname for field in fields])
+                    .iterator(chunk_size=batch_size)
+                )
+                counts[table] = 0
+                batch: List[tuple] = []
+                for row in rows:
+                    batch.append(tuple(self._to_sqlite(value) for value in row))
+                    if len(batch) >= batch_size:
+                        memory.executemany(insert, batch)
+                        counts[table] += len(batch)
+                        batch = []
+                if batch:
+                    memory.executemany(insert, batch)
+                    counts[table] += len(batch)
+            memory.commit()
+
+            disk = sqlite3.connect(path)
+            try:
+                memory.backup(disk)
+            finally:
+                disk.close()
+        finally:
+            memory.close()
+
+        return {"tables": counts, "total_rows": sum(counts.values())}
+
+    def export_snapshot(self, user: User) -> IO[bytes]:
+        """Build a snapshot in a temporary file and return it opened for reading"""
+        fd, path = tempfile.mkstemp(suffix=".sqlite3")
+        os.close(fd)
+        try:
+            self.write_snapshot(user, path)
+            # The open handle keeps the data readable after the path is unlinked
+            return open(path, "rb")
+        finally:
+            os.unlink(path)
+
+    def import_upload(self, user: User, upload) -> Dict[str, Any]:
+        """Spool an uploaded snapshot to disk so SQLite can open it, then import it"""
+        fd, path = tempfile.mkstemp(suffix=".sqlite3")
+        try:
+            with os.fdopen(fd, "wb") as handle:
+                for chunk in upload.chunks():
+                    handle.write(chunk)
+            return self.import_snapshot(user, path)
+        finally:
+            os.unlink(path)
+
+    def import_snapshot(
+        self, user: User, path: str, batch_size: int = DEFAULT_BATCH_SIZE
+    ) -> Dict[str, Any]:
+        """
+        Replace the user's finance data with the rows in a snapshot file.
+        Ids are shifted past the current maximum of each table with set-based
+        arithmetic, so foreign keys stay consistent without a per-row id map.
+        On SQLite the file is attached and copied with INSERT ... SELECT.
+        """
+        self._validate(path)
+
+        connection = connections[database_for_user(user.id)]
+        if connection.vendor == "sqlite":
+            if connection.in_atomic_block:
+                raise ValueError("SQLite snapshots cannot be attached inside a transaction")
+            with connection.cursor() as cursor:
+                cursor.execute("ATTACH DATABASE %s AS snapshot", [path])
+            try:
+                return self._import(user, path, batch_size, attached=True)
+            finally:
+                with connection.cursor() as cursor:
+                    cursor.execute("DETACH DATABASE snapshot")
+
+        return self._import(user, path, batch_size, attached=False)
+
+    def _import(self, user: User, path: str, batch_size: int, attached: bool) -> Dict[str, Any]:
+        counts: Dict[str, int] = {}
+        connection = connections[database_for_user(user.id)]
+        source = sqlite3.connect(f"file:{path}?mode=ro", uri=True)
+        try:
+            with transaction.atomic(using=database_for_user(user.id)):
+                self.import_service._wipe(user)
+                revision = FinanceRevision.allocate(user.id)
+                offsets: Dict[Any, int] = {}
+
+                for model in SNAPSHOT_MODELS:
+                    table = model._meta.db_table
+                    fields = self._fields(model)
+                    available = {row[1] for row in source.execute(f'PRAGMA table_info("{table}")')}
+                    missing = [field.column for field in fields if field.column not in available]
+                    if missing:
+                        raise ValueError(
+                            f"Snapshot table {table} is missing columns: {', '.join(missing)}"
+                        )
+
+                    offsets[model] = self._id_offset(model, source, connection.alias)
+                    if attached:
+                        counts[table] = self._copy_attached(model, fields, user, revision, offsets)
+                    else:
+                        counts[table] = self._copy_rows(
+                            model, fields, user, revision, offsets, source, batch_size
+                        )
+
+                # Accounts were copied without save(), so their balances open the ledger here
+                self.ledger_service.open_accounts(user.id)
+        finally:
+            source.close()
+
+        return {"tables": counts, "total_rows": sum(counts.values())}
+
+    def _copy_attached(self, model, fields, user: User, revision: int, offsets) -> int:
+        columns = ["user_id"]
+        expressions = ["%s"]
+        params: List[Any] = [user.id]
+        for field in fields:
+            columns.append(field.column)
+            if field.name == "revision":
+                expressions.append("%s")
+                params.append(revision)
+            elif self._remapped(field, offsets):
+                expressions.append(f'"{field.column}" + %s')
+                params.append(offsets[self._target(field)])
+            else:
+                expressions.append(f'"{field.column}"')
+
+        table = model._meta.db_table
+        quoted_columns = ", ".join(f'"{column}"' for column in columns)
+        with connections[database_for_user(user.id)].cursor() as cursor:
+            cursor.execute(
+                f'INSERT INTO main."{table}" ({quoted_columns}) '
+                f'SELECT {", ".join(expressions)} FROM snapshot."{table}" ORDER BY "id"',
+                params,
+            )
+            return cursor.rowcount
+
+    def _copy_rows(
+        self, model, fields, user: User, revision: int, offsets, source, batch_size: int
+    ) -> int:
+        """Portable fallback for non-SQLite databases: stream rows through executemany()"""
+        connection = connections[database_for_user(user.id)]
+        table = model._meta.db_table
+        columns = ["user_id", *[field.column for field in fields]]
+        insert = (
+            f"INSERT INTO {connection.ops.quote_name(table)} "
+            f"({', '.join(connection.ops.quote_name(c) for c in columns)}) "
+            f"VALUES ({', '.join('%s' for _ in columns)})"
+        )
+
+        copied = 0
+        rows = source.execute(
+            f'SELECT {", ".join(self._quoted(fields))} FROM "{table}" ORDER BY "id"'
+        )
+        with connection.cursor() as cursor:
+            while True:
+                batch = rows.fetchmany(batch_size)
+                if not batch:
+                    break
+                values = []
+                for row in batch:
+                    converted = [user.id]
+                    for field, value in zip(fields, row):
+                        if field.name == "revision":
+                            value = revision
+                        elif value is not None and self._remapped(field, offsets):
+                            value += offsets[self._target(field)]
+                        converted.append(self._from_sqlite(field, value))
+                    values.append(converted)
+                cursor.executemany(insert, values)
+                copied += len(values)
+        return copied
+
+    def _id_offset(self, model, source, database: str) -> int:
+        """
+        Shift that moves every snapshot id into a block of fresh ids, past the largest
+        id ever used: by a live row, by an archived one, or by the sequence (rows the
+        wipe just removed included). The block is reserved before any row is copied, so
+        other users' inserts meanwhile cannot be handed the same ids.
+        """
+        table = model._meta.db_table
+        snapshot_min, snapshot_max = source.execute(
+            f'SELECT MIN("id"), MAX("id") FROM "{table}"'
+        ).fetchone()
+        if snapshot_min is None:
+            return 0
+        current_max = max(
+            model.all_objects.using(database).order_by("-id").values_list("id", flat=True).first()
+            or 0,
+            FinanceArchive.objects.using(database)
+            .filter(model=model._meta.model_name)
+            .aggregate(highest=Max("object_id"))["highest"]
+            or 0,
+            id_floor(database),
+        )
+        start = reserve_id_block(database, model, current_max, snapshot_max - snapshot_min + 1)
+        return start - snapshot_min
+
+    def _validate(self, path: str) -> None:
+        with open(path, "rb") as handle:
+            if handle.read(len(SQLITE_HEADER)) != SQLITE_HEADER:
+                raise ValueError("File is not a SQLite database")
+
+        try:
+            source = sqlite3.connect(f"file:{path}?mode=ro", uri=True)
+            try:
+                meta = dict(source.execute("SELECT key, value FROM snapshot_meta"))
+            finally:
+                source.close()
+        except sqlite3.DatabaseError as e:
+            raise ValueError(f"Invalid finance snapshot: {e}") from e
+
+        if meta.get("format") != SNAPSHOT_FORMAT:
+            raise ValueError("Invalid finance snapshot: unknown format")
+        if meta.get("version") != SNAPSHOT_VERSION:
+            raise ValueError(f"Unsupported finance snapshot version {meta.get('version')}")
+
+    def _fields(self, model) -> List[Any]:
+        # The owner is implied by the snapshot, so the user column is never stored
+        return [field for field in model._meta.concrete_fields if field.name != "user"]
+
+    def _quoted(self, fields) -> List[str]:
+        return [f'"{field.column}"' for field in fields]
+
+    def _remapped(self, field, offsets) -> bool:
+        return field.primary_key or (field.is_relation and self._target(field) in offsets)
+
+    def _target(self, field):
+        return field.model if field.primary_key else field.related_model
+
+    def _sqlite_type(self, field) -> str:
+        return "INTEGER" if field.get_internal_type() in INTEGER_TYPES else "TEXT"
+
+    def _to_sqlite(self, value: Any) -> Any:
+        """Store values the way Django's SQLite backend does, so copied rows compare equal"""
+        if isinstance(value, Decimal):
+            return str(value)
+        if isinstance(value, datetime):
+            if timezone.is_aware(value):
+                value = value.astimezone(dt_timezone.utc).replace(tzinfo=None)
+            return value.isoformat(sep=" ")
+        if isinstance(value, date):
+            return value.isoformat()
+        if isinstance(value, bool):
+            return int(value)
+        return value
+
+    def _from_sqlite(self, field, value: Any) -> Optional[Any]:
+        if value is None:
+            return None
+        value = field.to_python(value)
+        if isinstance(value, datetime) and timezone.is_naive(value):
+            value = timezone.make_aware(value, dt_timezone.utc)
+        return value
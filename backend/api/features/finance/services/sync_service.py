@@ -0,0 +1,65 @@
+from typing import Any, Dict
+
+from django.contrib.auth.models import User
+
+from api.features.finance.models import (
+    Category,
+    Expense,
+    FinanceAccount,
+    FinanceRevision,
+    Paycheck,
+    RecurringBill,
+    SavingsAccount,
+    SavingsRecurringDeposit,
+    SavingsTransaction,
+)
+
+# Response key -> (model, related fields to join)
+SYNCED_COLLECTIONS = {
+    "categories": (Category, ()),
+    "recurringBills": (RecurringBill, ("category",)),
+    "paychecks": (Paycheck, ("category",)),
+    "expenses": (Expense, ("category",)),
+    "savingsRecurringDeposits": (SavingsRecurringDeposit, ()),
+    "savingsTransactions": (SavingsTransaction, ()),
+}
+
+
+class SyncService:
+    def get_changes(self, user: User, since: int = 0) -> Dict[str, Any]:
+        """
+        Collect every finance row written after revision `since`.
+        Live rows are returned in full; soft-deleted rows only as tombstones.
+        """
+        tracker = FinanceRevision.objects.filter(user=user).first()
+        revision = tracker.revision if tracker else 0
+
+        # The replica predates a hard delete, so the client must rebuild from scratch
+        reset = bool(tracker) and since < tracker.reset_revision
+        if reset:
+            since = 0
+
+        changes: Dict[str, Any] = {
+            "revision": revision,
+            "reset": reset,
+            "account": FinanceAccount.objects.filter(
+                user=user, revision__gt=since, is_deleted=False
+            ).first(),
+            "savingsAccount": SavingsAccount.objects.filter(
+                user=user, revision__gt=since, is_deleted=False
+            ).first(),
+            "deleted": {},
+        }
+
+        for key, (model, related) in SYNCED_COLLECTIONS.items():
+            rows = model.all_objects.filter(user=user, revision__gt=since, revision__lte=revision)
+            changes[key] = (
+                rows.filter(is_deleted=False).select_related(*related).order_by("revision")
+            )
+            changes["deleted"][key] = (
+                rows.filter(is_deleted=True)
+                .order_by("revision")
+                .values("id", "revision", "deleted_at")
+            )
+
+        return changes
@@ -1,23 +1,64 @@
 from decimal import Decimal
 
 from django.contrib.auth.models import User
-from django.db.models.signals import post_save
+from django.db import DEFAULT_DB_ALIAS
+from django.db.models.signals import post_delete, post_save
 from django.dispatch import receiver
 from django.utils import timezone
 
-from .models import FinanceAccount, SavingsAccount
+from core.db_router import database_for_user, mirror_row, shard_aliases, shard_for
+
+from .models import (
+    Category,
+    Expense,
+    FinanceAccount,
+    Paycheck,
+    RecurringBill,
+    SavingsAccount,
+    SavingsRecurringDeposit,
+    SavingsTransaction,
+)
+from .services.calendar_push_service import schedule_calendar_push
+
+# Models whose edits change the calendar
+CALENDAR_MODELS = (
+    Expense,
+    Paycheck,
+    SavingsTransaction,
+    RecurringBill,
+    SavingsRecurringDeposit,
+    FinanceAccount,
+    SavingsAccount,
+    Category,
+)
+
+
+# Registered before create_finance_account, whose rows need the user in their shard
+@receiver(post_save, sender=User)
+def mirror_user_to_shard(sender, instance, using, **kwargs):
+    """Sharded finance rows reference auth_user, so each shard keeps copies of its users"""
+    if shard_aliases() and using == DEFAULT_DB_ALIAS:
+        mirror_row(instance, shard_for(instance.pk))
+
+
+@receiver(post_delete, sender=User)
+def delete_user_from_shard(sender, instance, using, **kwargs):
+    # Deleting the copy cascades to the user's finance rows in the shard
+    if shard_aliases() and using == DEFAULT_DB_ALIAS:
+        User._base_manager.using(shard_for(instance.pk)).filter(pk=instance.pk).delete()
 
 
 @receiver(post_save, sender=User)
 def create_finance_account(sender, instance, created, **kwargs):
     if created:
-        FinanceAccount.objects.create(
+        database = database_for_user(instance.pk)
+        FinanceAccount.objects.db_manager(database).create(
             user=instance,
             starting_balance=Decimal("0.00"),
             current_balance=Decimal("0.00"),
             balance_as_of_date=timezone.now().date(),
         )
-        SavingsAccount.objects.create(
+        SavingsAccount.objects.db_manager(database).create(
             user=instance,
             starting_balance=Decimal("0.00"),
             current_balance=Decimal("0.00"),
@@ -31,3 +72,14 @@ def save_finance_account(sender, instance, **kwargs):
         instance.finance_account.save()
     if hasattr(instance, "savings_account"):
         instance.savings_account.save()
+
+
+@receiver(post_save)
+def push_calendar_changes(sender, instance, **kwargs):
+    if sender not in CALENDAR_MODELS:
+        return
+
+    # The change log entry built by save() already knows the earliest affected date;
+    # None means the change can affect every day (balances, category names)
+    entry = getattr(instance, "_change_entry", None)
+    schedule_calendar_push(instance.user_id, entry.date_from if entry else None)
@@ -0,0 +1,166 @@
+from datetime import date, timedelta
+from decimal import Decimal
+
+from django.test import TestCase
+from django.utils import timezone
+
+from api.features.finance.models import (
+    Category,
+    Expense,
+    FinanceArchive,
+    FinanceRevision,
+    RecurringBill,
+    SavingsAccount,
+    SavingsTransaction,
+)
+from api.features.finance.services.archive_service import ArchiveService
+from api.features.finance.tests.utils import ApiClient, create_user
+from api.features.finance.utils import get_or_create_finance_account, get_or_create_savings_account
+
+
+class ArchiveTests(TestCase):
+    def setUp(self):
+        self.user = create_user()
+        self.client = ApiClient(self.user)
+        self.account = get_or_create_finance_account(self.user)
+        self.savings = get_or_create_savings_account(self.user)
+        self.category = Category.objects.create(user=self.user, name="Food", type="expense")
+        self.bill = RecurringBill.objects.create(
+            user=self.user,
+            name="Rent",
+            amount=Decimal("900.00"),
+            start_date=date(2026, 1, 1),
+            due_day=1,
+        )
+        self.expense = Expense.objects.create(
+            user=self.user,
+            finance_account=self.account,
+            name="Groceries",
+            amount=Decimal("42.50"),
+            date=date(2026, 1, 5),
+            category=self.category,
+            related_bill=self.bill,
+        )
+
+    def archive(self) -> dict:
+        # A negative age puts the cutoff in the future, so every deleted row qualifies
+        return ArchiveService().archive(older_than_days=-1, user_id=self.user.id)
+
+    def changes(self, since: int) -> dict:
+        response = self.client.get(f"/api/finance/changes?since={since}")
+        self.assertEqual(response.status_code, 200, response.content)
+        return response.json()
+
+    def restore(self, **data) -> dict:
+        response = self.client.post_json("/api/finance/archive/restore", data)
+        self.assertEqual(response.status_code, 200, response.content)
+        return response.json()
+
+    def test_archiving_tombstones_forces_stale_replicas_to_resync(self):
+        behind = self.changes(0)["revision"]
+        self.expense.soft_delete()
+        caught_up = self.changes(behind)
+        self.assertEqual([row["id"] for row in caught_up["deleted"]["expenses"]], [self.expense.pk])
+
+        self.assertEqual(self.archive()["expenses"], 1)
+
+        # The tombstone is gone, so a replica that never saw it must start over
+        stale = self.changes(behind)
+        self.assertTrue(stale["reset"])
+        self.assertEqual(stale["deleted"]["expenses"], [])
+        self.assertFalse(self.changes(caught_up["revision"])["reset"])
+
+    def test_expire_before_never_moves_the_reset_back(self):
+        FinanceRevision.expire_before(self.user.id, 10)
+        FinanceRevision.expire_before(self.user.id, 5)
+        self.assertEqual(FinanceRevision.objects.get(user=self.user).reset_revision, 10)
+        self.assertTrue(self.changes(9)["reset"])
+        self.assertFalse(self.changes(10)["reset"])
+
+    def test_round_trip_keeps_ids_and_times_and_falls_back_for_missing_references(self):
+        transfer = SavingsTransaction.objects.create(
+            user=self.user,
+            savings_account=self.savings,
+            transaction_type="deposit",
+            amount=Decimal("25.00"),
+            date=date(2026, 1, 6),
+        )
+        for row in (self.expense, transfer):
+            row.soft_delete()
+        created_at = timezone.now() - timedelta(days=400)
+        SavingsTransaction.all_objects.filter(pk=transfer.pk).update(created_at=created_at)
+        deleted_at = Expense.all_objects.get(pk=self.expense.pk).deleted_at
+
+        self.archive()
+        self.assertFalse(Expense.all_objects.filter(pk=self.expense.pk).exists())
+        self.assertFalse(SavingsTransaction.all_objects.filter(pk=transfer.pk).exists())
+        # The bill and the savings account disappear while their rows sit in the archive
+        RecurringBill.all_objects.filter(pk=self.bill.pk).delete()
+        SavingsAccount.objects.filter(pk=self.savings.pk).delete()
+
+        result = self.restore()
+
+        self.assertEqual(result, {"restored": 2, "skipped": 0, "skippedRows": []})
+        self.assertFalse(FinanceArchive.objects.filter(user=self.user).exists())
+        expense = Expense.all_objects.get(pk=self.expense.pk)
+        self.assertTrue(expense.is_deleted)
+        self.assertEqual(expense.deleted_at, deleted_at)
+        self.assertEqual(expense.amount, Decimal("42.50"))
+        self.assertEqual(expense.category_id, self.category.pk)
+        self.assertIsNone(expense.related_bill_id)
+        transfer = SavingsTransaction.all_objects.get(pk=transfer.pk)
+        self.assertEqual(transfer.created_at, created_at)
+        self.assertEqual(transfer.savings_account, SavingsAccount.objects.get(user=self.user))
+        self.assertNotEqual(transfer.savings_account_id, self.savings.pk)
+
+    def test_restore_reports_the_rows_it_skips(self):
+        self.expense.category = None
+        self.expense.save()
+        self.category.soft_delete()
+        self.expense.soft_delete()
+        self.archive()
+        # A live category has taken the archived one's name since
+        Category.objects.create(user=self.user, name="Food", type="expense")
+        # ...and a stale archived copy of a row that is live again
+        live = Expense.objects.create(
+            user=self.user, name="Live", amount=Decimal("1.00"), date=date(2026, 1, 7)
+        )
+        FinanceArchive.objects.create(user=self.user, model="expense", object_id=live.pk, data={})
+
+        result = self.restore()
+
+        self.assertEqual(result["restored"], 1)
+        self.assertEqual(result["skipped"], 2)
+        reasons = {(row["collection"], row["id"]): row["reason"] for row in result["skippedRows"]}
+        self.assertIn("Conflicts with a live row", reasons.pop(("categories", self.category.pk)))
+        self.assertIn("already in the finance tables", reasons.pop(("expenses", live.pk)))
+        self.assertEqual(reasons, {})
+        # Skipped rows stay archived, so they can be restored once the clash is resolved
+        self.assertTrue(FinanceArchive.objects.filter(object_id=self.category.pk).exists())
+
+    def test_rows_that_stop_qualifying_after_the_batch_is_picked_stay(self):
+        self.expense.category = None
+        self.expense.save()
+        self.expense.soft_delete()
+        self.category.soft_delete()
+        service = ArchiveService()
+        archive_batch = service._archive_batch
+
+        def change_then_archive(model, candidates, ids, database):
+            # Between picking each batch and locking it, the expense is undeleted
+            # and then takes the category back
+            if model is Expense:
+                Expense.all_objects.filter(pk=self.expense.pk).update(
+                    is_deleted=False, deleted_at=None
+                )
+            if model is Category:
+                Expense.objects.filter(pk=self.expense.pk).update(category=self.category)
+            return archive_batch(model, candidates, ids, database)
+
+        service._archive_batch = change_then_archive
+        stats = service.archive(older_than_days=-1, user_id=self.user.id)
+
+        self.assertEqual((stats["expenses"], stats["categories"]), (0, 0))
+        self.assertFalse(FinanceArchive.objects.exists())
+        self.assertTrue(Expense.objects.filter(pk=self.expense.pk).exists())
+        self.assertTrue(Category.all_objects.filter(pk=self.category.pk).exists())
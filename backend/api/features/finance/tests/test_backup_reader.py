@@ -0,0 +1,131 @@
+import io
+import json
+from typing import Any, List, Tuple
+from unittest import mock
+
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.test import SimpleTestCase, TestCase
+
+from api.features.finance.services import backup_reader
+from api.features.finance.services.backup_reader import BackupStreamReader
+from api.features.finance.tests.utils import ApiClient, create_user, sample_backup
+
+DOCUMENT = {
+    "categories": [
+        {"id": 1, "name": "Café ☕", "type": "expense", "color": "red-500"},
+        {"id": 2, "name": "Ramen 🍜 ñ", "type": "expense", "color": None},
+    ],
+    "account": {"startingBalance": 1000, "currentBalance": 1250.5, "tags": ["a", "ü"]},
+    "expenses": [
+        {"id": 123456789, "amount": -0.25, "rate": 1e3, "paid": True, "note": None},
+        {"id": 30, "amount": 12345.678, "paid": False, "note": 'quote " and \\ slash'},
+    ],
+    "emptyList": [],
+    "emptyObject": {},
+}
+
+
+def pairs(document: dict) -> List[Tuple[str, Any]]:
+    """What the reader should yield for `document`: one pair per row of an array section"""
+    expected = []
+    for key, value in document.items():
+        if isinstance(value, list):
+            expected += [(key, row) for row in value]
+        else:
+            expected.append((key, value))
+    return expected
+
+
+class BackupStreamReaderTests(SimpleTestCase):
+    def read(self, raw: bytes, read_size: int = 64 * 1024) -> List[Tuple[str, Any]]:
+        return list(BackupStreamReader(io.BytesIO(raw), read_size=read_size))
+
+    def test_values_split_across_chunks(self):
+        for indent in (None, 2):
+            raw = json.dumps(DOCUMENT, ensure_ascii=False, indent=indent).encode()
+            # A read size of 1 splits every number, string and multi-byte character
+            for read_size in (1, 2, 3, 5, 7, 64):
+                with self.subTest(indent=indent, read_size=read_size):
+                    self.assertEqual(self.read(raw, read_size), pairs(DOCUMENT))
+
+    def test_number_at_the_end_of_a_chunk_is_not_cut_short(self):
+        raw = b'{"account": 12345, "expenses": [1.5, 2e10, -70]}'
+        for read_size in range(1, len(raw) + 1):
+            self.assertEqual(
+                self.read(raw, read_size),
+                [("account", 12345), ("expenses", 1.5), ("expenses", 2e10), ("expenses", -70)],
+                read_size,
+            )
+
+    def test_empty_documents_and_sections(self):
+        self.assertEqual(self.read(b"{}"), [])
+        self.assertEqual(self.read(b" \n{ \t} "), [])
+        raw = b'{"categories": [ ], "account": {}, "expenses": [\n]}'
+        self.assertEqual(self.read(raw, read_size=1), [("account", {})])
+
+    def test_malformed_input_raises_value_error(self):
+        documents = [
+            b"",
+            b"[]",
+            b'{"account": {}',
+            b'{"expenses": [1, 2',
+            b'{"expenses": [1 2]}',
+            b'{"account" {}}',
+            b'{"account": {} "expenses": []}',
+            b"{1: []}",
+            b'{"account": tru}',
+            b'{"account": "unterminated}',
+            b'{"account": "\xff"}',
+        ]
+        for raw in documents:
+            for read_size in (1, 64):
+                with self.subTest(raw=raw, read_size=read_size):
+                    with self.assertRaises(ValueError):
+                        self.read(raw, read_size)
+
+    def test_oversized_value_is_rejected(self):
+        with mock.patch.object(backup_reader, "MAX_VALUE_SIZE", 100):
+            small = json.dumps({"expenses": ["x" * 50]}).encode()
+            self.assertEqual(self.read(small, read_size=8), [("expenses", "x" * 50)])
+
+            large = json.dumps({"expenses": ["x" * 500]}).encode()
+            with self.assertRaisesRegex(ValueError, "exceeds the maximum row size"):
+                self.read(large, read_size=8)
+
+
+class RestoreStreamTests(TestCase):
+    def export(self, client: ApiClient) -> dict:
+        response = client.get("/api/finance/export")
+        self.assertEqual(response.status_code, 200)
+        content = getattr(response, "streaming_content", None)
+        return json.loads(b"".join(content) if content is not None else response.content)
+
+    def without_ids(self, value: Any) -> Any:
+        """Two users' rows carry different ids and write times, so those are left out"""
+        if isinstance(value, dict):
+            return {
+                key: self.without_ids(item)
+                for key, item in value.items()
+                if key not in ("id", "createdAt", "updatedAt") and not key.endswith(("Id", "_id"))
+            }
+        if isinstance(value, list):
+            return [self.without_ids(item) for item in value]
+        return value
+
+    def test_stream_restore_matches_the_json_import(self):
+        data = sample_backup(7)
+        data["categories"][0]["name"] = "Café ☕"
+        data["expenses"][2]["name"] = "Ramen 🍜"
+
+        via_json = ApiClient(create_user())
+        response = via_json.post_json("/api/finance/import", data)
+        self.assertEqual(response.status_code, 200, response.content)
+
+        via_stream = ApiClient(create_user())
+        upload = SimpleUploadedFile("backup.json", json.dumps(data, ensure_ascii=False).encode())
+        response = via_stream.post("/api/finance/import/stream?batch_size=2", {"file": upload})
+        self.assertEqual(response.status_code, 200, response.content)
+
+        streamed = self.export(via_stream)
+        self.assertEqual(len(streamed["expenses"]), 7)
+        self.assertEqual(self.without_ids(streamed), self.without_ids(self.export(via_json)))
@@ -0,0 +1,45 @@
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.test import TestCase
+
+from api.features.finance.models import Expense, Paycheck, TransactionFingerprint
+from api.features.finance.tests.utils import ApiClient, create_user, sample_backup
+
+STATEMENT = b"""Date,Description,Amount
+2026-02-01,Coffee shop,-4.50
+2026-02-02,Coffee shop,-4.50
+2026-02-03,Employer payroll,1500.00
+"""
+MAPPING = {"dateColumn": "Date", "descriptionColumn": "Description", "amountColumn": "Amount"}
+
+
+class BankStatementReimportTests(TestCase):
+    def setUp(self):
+        self.user = create_user()
+        self.client = ApiClient(self.user)
+
+    def import_statement(self):
+        statement = SimpleUploadedFile("statement.csv", STATEMENT, content_type="text/csv")
+        response = self.client.post(
+            "/api/finance/dashboard/import-bank-csv", {**MAPPING, "file": statement}
+        )
+        self.assertEqual(response.status_code, 200, response.content)
+        return response.json()
+
+    def test_reimport_skips_known_rows(self):
+        self.assertEqual(self.import_statement()["inserted_count"], 3)
+        result = self.import_statement()
+        self.assertEqual(result["inserted_count"], 0)
+        self.assertEqual(result["skipped_duplicates"], 3)
+
+    def test_reimport_after_replace_import_inserts_rows_again(self):
+        self.import_statement()
+        response = self.client.post_json("/api/finance/import", sample_backup(expenses=0))
+        self.assertEqual(response.status_code, 200, response.content)
+        self.assertFalse(TransactionFingerprint.objects.filter(user=self.user).exists())
+
+        result = self.import_statement()
+        self.assertEqual(result["inserted_count"], 3)
+        self.assertEqual(result["skipped_duplicates"], 0)
+        self.assertEqual(Expense.objects.filter(user=self.user).count(), 2)
+        # The backup's own paycheck plus the statement's
+        self.assertEqual(Paycheck.objects.filter(user=self.user).count(), 2)
@@ -0,0 +1,116 @@
+from typing import Dict, List
+
+from django.test import TestCase
+
+from api.features.finance.models import Expense, FinanceChangeLog, FinanceRevision
+from api.features.finance.tests.utils import ApiClient, create_user
+from api.features.finance.utils import get_or_create_finance_account
+
+EXPENSES = [
+    {"name": "Lunch", "amount": 12.5, "date": "2026-03-01"},
+    {"name": "Fuel", "amount": 40, "date": "2026-03-04"},
+    {"name": "Books", "amount": 22, "date": "2026-03-09"},
+]
+UPDATE = {"name": "Lunch out", "amount": 15, "date": "2026-02-27"}
+
+
+class BulkWriteTests(TestCase):
+    """
+    A bulk write skips save(), so it must stamp revisions and log changes itself. The
+    same edits made row by row and through /bulk have to look alike to every reader.
+    """
+
+    def setUp(self):
+        self.single = create_user()
+        self.bulk = create_user()
+        for user in (self.single, self.bulk):
+            get_or_create_finance_account(user)
+
+    def revision(self, user) -> int:
+        return FinanceRevision.objects.get(user=user).revision
+
+    def write_single(self) -> int:
+        """Create, then update one row and delete another; returns the revision in between"""
+        client = ApiClient(self.single)
+        ids = []
+        for data in EXPENSES:
+            response = client.post_json("/api/finance/expenses", data)
+            self.assertEqual(response.status_code, 201, response.content)
+            ids.append(response.json()["id"])
+        between = self.revision(self.single)
+        response = client.patch_json(f"/api/finance/expenses/{ids[0]}", UPDATE)
+        self.assertEqual(response.status_code, 200, response.content)
+        response = client.delete(f"/api/finance/expenses/{ids[1]}")
+        self.assertEqual(response.status_code, 204, response.content)
+        return between
+
+    def write_bulk(self) -> int:
+        client = ApiClient(self.bulk)
+        response = client.post_json("/api/finance/expenses/bulk", {"create": EXPENSES})
+        self.assertEqual(response.status_code, 200, response.content)
+        ids = [row["id"] for row in response.json()["created"]]
+        between = self.revision(self.bulk)
+        response = client.post_json(
+            "/api/finance/expenses/bulk",
+            {"update": [{"id": ids[0], **UPDATE}], "delete": [ids[1]]},
+        )
+        self.assertEqual(response.status_code, 200, response.content)
+        return between
+
+    def log(self, user) -> List[tuple]:
+        entries = FinanceChangeLog.objects.filter(user=user).order_by("revision", "id")
+        return [
+            (entry.operation, entry.date_from, entry.date_to, entry.amount_delta)
+            for entry in entries
+        ]
+
+    def changes(self, user, since: int) -> Dict[str, list]:
+        """The sync response with ids and revisions left out, so two users' can be compared"""
+        response = ApiClient(user).get(f"/api/finance/changes?since={since}")
+        self.assertEqual(response.status_code, 200, response.content)
+        data = response.json()
+        return {
+            "expenses": [(row["name"], row["amount"], row["date"]) for row in data["expenses"]],
+            "deleted": len(data["deleted"]["expenses"]),
+        }
+
+    def test_bulk_write_advances_the_revision_once_per_row(self):
+        start = self.revision(self.bulk)
+        between = self.write_bulk()
+        self.assertEqual(between - start, len(EXPENSES))
+        self.assertEqual(self.revision(self.bulk) - between, 2)
+
+        # Every row carries a revision of its own, inside what was allocated
+        revisions = list(
+            Expense.all_objects.filter(user=self.bulk).values_list("revision", flat=True)
+        )
+        self.assertEqual(len(set(revisions)), len(revisions))
+        self.assertTrue(all(start < revision <= self.revision(self.bulk) for revision in revisions))
+
+    def test_bulk_write_logs_one_change_per_row(self):
+        self.write_bulk()
+        entries = FinanceChangeLog.objects.filter(user=self.bulk, model="expense")
+        self.assertEqual(
+            sorted(entries.values_list("operation", flat=True)),
+            sorted(["create"] * len(EXPENSES) + ["update", "delete"]),
+        )
+        rows = {row.pk: row for row in Expense.all_objects.filter(user=self.bulk)}
+        for entry in entries.filter(operation__in=["update", "delete"]):
+            self.assertEqual(entry.revision, rows[entry.object_id].revision)
+        self.assertEqual({entry.object_id for entry in entries}, set(rows))
+
+    def test_bulk_and_single_row_writes_look_alike(self):
+        single_between = self.write_single()
+        bulk_between = self.write_bulk()
+
+        self.assertEqual(self.log(self.bulk), self.log(self.single))
+        self.assertEqual(self.changes(self.bulk, 0), self.changes(self.single, 0))
+        self.assertEqual(
+            self.changes(self.bulk, bulk_between), self.changes(self.single, single_between)
+        )
+        self.assertEqual(
+            self.changes(self.bulk, bulk_between),
+            {"expenses": [("Lunch out", 15.0, "2026-02-27")], "deleted": 1},
+        )
+        caught_up = self.changes(self.bulk, self.revision(self.bulk))
+        self.assertEqual(caught_up, {"expenses": [], "deleted": 0})
@@ -0,0 +1,68 @@
+from decimal import Decimal
+from typing import List
+from unittest import mock
+
+from django.test import TestCase
+from django.utils import timezone
+
+from api.features.finance.models import CalendarPushBaseline, Expense, FinanceRevision
+from api.features.finance.services.calendar_push_service import CalendarPushService
+from api.features.finance.tests.utils import create_user
+from api.features.finance.utils import get_or_create_finance_account
+
+
+class CalendarPushBaselineTests(TestCase):
+    """Two service instances stand in for two server processes sharing the database"""
+
+    def setUp(self):
+        self.user = create_user()
+        get_or_create_finance_account(self.user)
+        self.today = timezone.now().date()
+        self.expense = Expense.objects.create(
+            user=self.user, name="Groceries", amount=Decimal("42.00"), date=self.today
+        )
+        self.first, self.second = CalendarPushService(), CalendarPushService()
+        for service in (self.first, self.second):
+            service.notification_service = mock.Mock()
+
+    def pushed_days(self, service: CalendarPushService) -> List[str]:
+        """Push as `service` and return the dates it sent"""
+        service.notification_service.send.reset_mock()
+        delta = service.push(self.user.id)
+        if delta is None:
+            service.notification_service.send.assert_not_called()
+            return []
+        service.notification_service.send.assert_called_once_with(
+            self.user.id, "calendar_delta", delta
+        )
+        return [day["date"] for day in delta["days"]]
+
+    def set_amount(self, amount: str) -> None:
+        self.expense.amount = Decimal(amount)
+        self.expense.save()
+
+    def test_processes_diff_against_what_the_client_was_last_sent(self):
+        self.assertIn(self.today.isoformat(), self.pushed_days(self.first))
+        self.assertEqual(self.pushed_days(self.second), [])
+
+        self.set_amount("50.00")
+        self.assertIn(self.today.isoformat(), self.pushed_days(self.second))
+        # The edit back is handled by the process that never saw 50.00 go out
+        self.set_amount("42.00")
+        self.assertIn(self.today.isoformat(), self.pushed_days(self.first))
+        self.assertEqual(self.pushed_days(self.second), [])
+
+    def test_forget_in_one_process_resends_the_window_from_another(self):
+        everything = self.pushed_days(self.first)
+        self.second.forget(self.user.id)
+        self.assertFalse(CalendarPushBaseline.objects.filter(user=self.user).exists())
+        self.assertEqual(self.pushed_days(self.first), everything)
+
+    def test_an_older_render_is_never_sent_after_a_newer_one(self):
+        self.pushed_days(self.first)
+        self.set_amount("50.00")
+        # Meanwhile another process has sent a render of a later revision
+        CalendarPushBaseline.objects.filter(user=self.user).update(
+            revision=FinanceRevision.current(self.user.id) + 1
+        )
+        self.assertEqual(self.pushed_days(self.second), [])
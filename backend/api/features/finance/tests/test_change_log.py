@@ -0,0 +1,119 @@
+from datetime import date, timedelta
+from decimal import Decimal
+from typing import List
+
+from django.test import TestCase
+from django.utils import timezone
+
+from api.features.finance.models import Expense, FinanceChangeLog
+from api.features.finance.services.change_log_service import ChangeLogService
+from api.features.finance.tests.utils import create_user
+
+
+class ChangeLogConsumerTests(TestCase):
+    def setUp(self):
+        self.user = create_user()
+        self.service = ChangeLogService()
+
+    def add_entries(self, count: int, user=None) -> List[int]:
+        """Ids of the change log entries `count` new expenses produced"""
+        user = user or self.user
+        before = FinanceChangeLog.objects.filter(user=user).count()
+        for n in range(count):
+            Expense.objects.create(
+                user=user, name=f"Expense {n}", amount=Decimal("1.00"), date=date(2026, 3, 1)
+            )
+        ids = list(
+            FinanceChangeLog.objects.filter(user=user).order_by("id").values_list("id", flat=True)
+        )
+        self.assertEqual(len(ids) - before, count)
+        return ids[before:]
+
+    def all_ids(self) -> List[int]:
+        return list(
+            FinanceChangeLog.objects.filter(user=self.user)
+            .order_by("id")
+            .values_list("id", flat=True)
+        )
+
+    def fail(self, batch):
+        raise AssertionError(f"Handled {len(batch)} entries again")
+
+    def test_cursors_never_move_backwards(self):
+        ids = self.add_entries(4)
+        self.service.acknowledge(self.user.id, "rollup", ids[2])
+        self.service.acknowledge(self.user.id, "rollup", ids[0])
+        self.assertEqual(self.service.position(self.user.id, "rollup"), ids[2])
+        self.assertEqual(
+            [entry.id for entry in self.service.pending(self.user.id, "rollup")], ids[3:]
+        )
+
+        # Each consumer keeps its own position
+        self.assertEqual(self.service.position(self.user.id, "cache"), 0)
+        self.assertEqual(len(self.service.pending(self.user.id, "cache")), len(self.all_ids()))
+
+    def test_batches_split_at_batch_size(self):
+        self.add_entries(5)
+        total = len(self.all_ids())
+        for batch_size in (1, 2, total, total + 1):
+            seen: List[List[int]] = []
+            handled = self.service.consume(
+                self.user.id,
+                f"consumer-{batch_size}",
+                lambda batch: seen.append([entry.id for entry in batch]),
+                batch_size=batch_size,
+            )
+            self.assertEqual(handled, total)
+            self.assertEqual(sum(seen, []), self.all_ids())
+            self.assertTrue(all(len(batch) == batch_size for batch in seen[:-1]), seen)
+            self.assertTrue(0 < len(seen[-1]) <= batch_size, seen)
+
+        # Nothing new, so nothing is handled
+        self.assertEqual(self.service.consume(self.user.id, "consumer-1", self.fail), 0)
+
+    def test_a_failed_batch_is_delivered_again(self):
+        self.add_entries(3)
+        ids = self.all_ids()
+        calls = []
+
+        def flaky(batch):
+            calls.append([entry.id for entry in batch])
+            if len(calls) == 2:
+                raise RuntimeError("projection unavailable")
+
+        with self.assertRaises(RuntimeError):
+            self.service.consume(self.user.id, "rollup", flaky, batch_size=2)
+        # The first batch was acknowledged, the failed one was not
+        self.assertEqual(self.service.position(self.user.id, "rollup"), ids[1])
+
+        handled = self.service.consume(self.user.id, "rollup", flaky, batch_size=2)
+        self.assertEqual(handled, len(ids) - 2)
+        self.assertEqual(calls[1], calls[2])
+        self.assertEqual(sum(calls[:1] + calls[2:], []), ids)
+        self.assertEqual(self.service.position(self.user.id, "rollup"), ids[-1])
+
+    def test_pending_users_lists_users_with_unacknowledged_entries(self):
+        other = create_user()
+        self.add_entries(2)
+        self.add_entries(2, user=other)
+        self.assertEqual(set(self.service.pending_users("rollup")), {self.user.id, other.id})
+
+        self.service.consume(self.user.id, "rollup", lambda batch: None)
+        self.assertEqual(self.service.pending_users("rollup"), [other.id])
+        self.add_entries(1)
+        self.assertEqual(set(self.service.pending_users("rollup")), {self.user.id, other.id})
+
+    def test_prune_keeps_entries_a_consumer_has_not_acknowledged(self):
+        self.add_entries(4)
+        ids = self.all_ids()
+        FinanceChangeLog.objects.update(created_at=timezone.now() - timedelta(days=60))
+        self.service.acknowledge(self.user.id, "rollup", ids[-1])
+        self.service.acknowledge(self.user.id, "cache", ids[1])
+
+        self.assertEqual(self.service.prune(older_than_days=30), {"deleted": 2})
+        self.assertEqual(self.all_ids(), ids[2:])
+        # Entries within the retention period stay even once everyone has acknowledged them
+        self.service.acknowledge(self.user.id, "cache", ids[-1])
+        FinanceChangeLog.objects.filter(id=ids[-1]).update(created_at=timezone.now())
+        self.assertEqual(self.service.prune(older_than_days=30), {"deleted": len(ids) - 3})
+        self.assertEqual(self.all_ids(), ids[-1:])
@@ -0,0 +1,65 @@
+import io
+from decimal import Decimal
+from unittest import mock, skipIf
+
+from django.test import TestCase
+
+from api.features.finance.services import columnar_export_service
+from api.features.finance.tests.utils import ApiClient, create_user, sample_backup
+
+pa = columnar_export_service.pa
+pq = columnar_export_service.pq
+
+
+@skipIf(pa is None, "pyarrow is not installed; install the 'columnar' extra")
+class ColumnarExportTests(TestCase):
+    def setUp(self):
+        self.user = create_user()
+        self.client = ApiClient(self.user)
+        response = self.client.post_json("/api/finance/import", sample_backup(expenses=4))
+        self.assertEqual(response.status_code, 200, response.content)
+
+    def export(self, table: str, file_format: str) -> bytes:
+        response = self.client.get(f"/api/finance/export/columnar/{table}?format={file_format}")
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(
+            response["Content-Type"], columnar_export_service.CONTENT_TYPES[file_format]
+        )
+        return b"".join(response.streaming_content)
+
+    def test_parquet_export_is_typed(self):
+        table = pq.read_table(io.BytesIO(self.export("expenses", "parquet")))
+        self.assertEqual(table.num_rows, 4)
+        self.assertEqual(table.schema.field("amount").type, pa.decimal128(14, 2))
+        self.assertEqual(table.schema.field("date").type, pa.date32())
+        self.assertEqual(
+            sorted(table.column("amount").to_pylist()), [Decimal(n) for n in (10, 11, 12, 13)]
+        )
+        self.assertEqual(set(table.column("category").to_pylist()), {"Food"})
+
+    def test_arrow_stream_export(self):
+        table = pa.ipc.open_stream(self.export("paychecks", "arrow")).read_all()
+        self.assertEqual(table.num_rows, 1)
+        self.assertEqual(table.column("frequency").to_pylist(), ["biweekly"])
+
+    def test_calendar_days_export(self):
+        response = self.client.get(
+            "/api/finance/export/columnar/calendar_days"
+            "?format=parquet&startDate=2026-01-01&endDate=2026-01-31"
+        )
+        self.assertEqual(response.status_code, 200)
+        table = pq.read_table(io.BytesIO(b"".join(response.streaming_content)))
+        self.assertEqual(table.num_rows, 31)
+
+    def test_unknown_table_is_rejected(self):
+        response = self.client.get("/api/finance/export/columnar/nope")
+        self.assertEqual(response.status_code, 400)
+
+
+class ColumnarExportWithoutPyarrowTests(TestCase):
+    def test_reports_missing_extra(self):
+        client = ApiClient(create_user())
+        with mock.patch.object(columnar_export_service, "pa", None):
+            response = client.get("/api/finance/export/columnar/expenses")
+        self.assertEqual(response.status_code, 400)
+        self.assertIn("pyarrow", response.json()["error"])
@@ -0,0 +1,107 @@
+from decimal import Decimal
+from unittest import mock
+
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.test import TestCase
+
+from api.features.finance.models import FinanceChangeLog, RecurringBill
+from api.features.finance.services.csv_service import CSVService
+from api.features.finance.tests.utils import ApiClient, create_user
+from api.features.finance.utils import get_or_create_finance_account
+
+HEADER = "Description,Due Date,Monthly Cost,Remaining\n"
+
+
+class BillCSVImportTests(TestCase):
+    def setUp(self):
+        self.user = create_user()
+        get_or_create_finance_account(self.user)
+
+    def upload(self, content: str, bom: bool = False) -> SimpleUploadedFile:
+        raw = content.encode()
+        return SimpleUploadedFile("bills.csv", b"\xef\xbb\xbf" + raw if bom else raw)
+
+    def import_csv(self, content: str, bom: bool = False, **kwargs) -> dict:
+        return CSVService().import_bills_from_csv(self.upload(content, bom), self.user, **kwargs)
+
+    def test_bad_rows_are_reported_by_line_and_the_rest_imported(self):
+        result = self.import_csv(
+            HEADER
+            + "Rent,1,900.00,\n"  # line 2
+            + "Broken\n"  # line 3
+            + ",5,10,\n"  # line 4
+            + "\n"  # line 5, blank and ignored
+            + "Gym,soon,30,\n"  # line 6
+            + "Phone,32,45,\n"  # line 7
+            + "Car,01/15,abc,\n"  # line 8
+            + '"Loan, car",03/15,250.50,5000\n'  # line 9
+        )
+
+        self.assertEqual(
+            result["errors"],
+            [
+                {"row": 3, "error": "Expected at least 3 columns"},
+                {"row": 4, "error": "Description, due date and monthly cost are required"},
+                {"row": 6, "error": "Invalid due date: soon"},
+                {"row": 7, "error": "Due day out of range: 32"},
+                {"row": 8, "error": "Invalid monthly cost: abc"},
+            ],
+        )
+        bills = {bill.name: bill for bill in RecurringBill.objects.filter(user=self.user)}
+        self.assertEqual(sorted(result["bills"]), sorted(bill.pk for bill in bills.values()))
+        self.assertEqual(set(bills), {"Rent", "Loan, car"})
+        self.assertEqual((bills["Rent"].due_day, bills["Rent"].total), (1, None))
+        loan = bills["Loan, car"]
+        self.assertEqual((loan.due_day, loan.amount, loan.total), (15, Decimal("250.50"), 5000))
+        self.assertEqual(loan.amount_paid, Decimal("0.00"))
+
+    def test_imports_with_and_without_a_byte_order_mark(self):
+        content = HEADER + "Rent,1,900,\n"
+        for bom in (False, True):
+            result = self.import_csv(content, bom)
+            self.assertEqual((len(result["bills"]), result["errors"]), (1, []), bom)
+        self.assertEqual(
+            list(RecurringBill.objects.filter(user=self.user).values_list("name", flat=True)),
+            ["Rent", "Rent"],
+        )
+
+    def test_byte_order_mark_does_not_unquote_the_header(self):
+        # Decoded as plain UTF-8, the mark would come before the quote and split the header in two
+        header = '"Bill\r\nname",Due,Cost\r\n'
+        result = self.import_csv(header + "Rent,1,900\r\n", bom=True)
+        self.assertEqual((len(result["bills"]), result["errors"]), (1, []))
+        self.assertEqual(RecurringBill.objects.get(user=self.user).name, "Rent")
+
+    def test_rows_are_inserted_in_batches(self):
+        rows = "".join(f"Bill {n},{n + 1},{n + 10},\n" for n in range(5))
+        bulk_create = RecurringBill.objects.bulk_create
+        sizes = []
+
+        def counted(bills, *args, **kwargs):
+            sizes.append(len(bills))
+            return bulk_create(bills, *args, **kwargs)
+
+        with mock.patch.object(RecurringBill.objects, "bulk_create", counted):
+            result = self.import_csv(HEADER + rows + "Bad,x,1,\n", batch_size=2)
+
+        self.assertEqual(sizes, [2, 2, 1])
+        self.assertEqual(len(result["bills"]), 5)
+        self.assertEqual(len(result["errors"]), 1)
+        # Every batch is stamped and logged like single-row writes
+        bills = RecurringBill.objects.filter(user=self.user)
+        revisions = list(bills.values_list("revision", flat=True))
+        self.assertEqual(len(set(revisions)), 5)
+        logged = FinanceChangeLog.objects.filter(user=self.user, model="recurringbill")
+        self.assertEqual(
+            set(logged.values_list("object_id", flat=True)), set(bills.values_list("pk", flat=True))
+        )
+
+    def test_endpoint_reports_the_skipped_rows(self):
+        response = ApiClient(self.user).post(
+            "/api/finance/dashboard/import-csv",
+            {"file": self.upload(HEADER + "Rent,1,900,\nBroken\n", bom=True)},
+        )
+        self.assertEqual(response.status_code, 200, response.content)
+        data = response.json()
+        self.assertEqual((data["imported_count"], data["skipped_count"]), (1, 1))
+        self.assertEqual(data["errors"], [{"row": 3, "error": "Expected at least 3 columns"}])
@@ -0,0 +1,107 @@
+import csv
+import io
+from datetime import date
+from decimal import Decimal
+from typing import Dict, List, Tuple
+
+from django.test import TestCase
+
+from api.features.finance.services.calendar_service import CalendarService
+from api.features.finance.services.csv_service import CSVService
+from api.features.finance.tests.utils import ApiClient, create_user, sample_backup
+
+START, END = date(2026, 1, 1), date(2026, 3, 31)
+
+
+class BalanceReportTests(TestCase):
+    def setUp(self):
+        self.user = create_user()
+        self.client = ApiClient(self.user)
+        response = self.client.post_json("/api/finance/import", sample_backup(40))
+        self.assertEqual(response.status_code, 200, response.content)
+
+    def report(self, **options) -> List[List[str]]:
+        data = {"startDate": str(START), "endDate": str(END), "monthsToShow": 3, **options}
+        response = self.client.post_json("/api/finance/dashboard/export-csv", data)
+        self.assertEqual(response.status_code, 200)
+        body = b"".join(response.streaming_content).decode()
+        return list(csv.reader(io.StringIO(body)))
+
+    def sections(self, rows: List[List[str]]) -> Tuple[List[List[str]], List[List[str]]]:
+        """Split a report into its monthly summary rows and its daily rows"""
+        summary_at = rows.index(["MONTHLY SUMMARY"])
+        daily_at = rows.index(["DAILY BREAKDOWN"])
+        summary_end = daily_at if summary_at < daily_at else len(rows)
+        daily_end = summary_at if daily_at < summary_at else len(rows)
+        summary = [row for row in rows[summary_at + 2 : summary_end] if row]
+        # Day rows start with their date; the column headings and notes do not
+        daily = [row for row in rows[daily_at + 1 : daily_end] if row and row[0][:1].isdigit()]
+        return summary, daily
+
+    def old_summary(self, include_all_days: bool) -> List[List[str]]:
+        """The monthly totals as the report computed them from the whole calendar in memory"""
+        days = CalendarService().generate_calendar_data(
+            user=self.user, start_date=START, end_date=END, months_to_show=3
+        )
+        if not include_all_days:
+            days = [
+                day
+                for day in days
+                if day["paychecks"] or day["bills"] or day["expenses"] or day["savingsTransactions"]
+            ]
+        months: Dict[str, dict] = {}
+        for day in days:
+            day_date = date.fromisoformat(day["date"])
+            month = months.setdefault(
+                day_date.strftime("%B %Y"),
+                {"income": Decimal("0"), "bills": Decimal("0"), "expenses": Decimal("0")},
+            )
+            month["income"] += sum(Decimal(str(pc["amount"])) for pc in day["paychecks"])
+            month["bills"] += sum(Decimal(str(bill["amount"])) for bill in day["bills"])
+            month["expenses"] += sum(Decimal(str(exp["amount"])) for exp in day["expenses"])
+            month["end_balance"] = day["runningBalance"]
+        return [
+            [
+                name,
+                f"{month['income']:.2f}",
+                f"{month['bills']:.2f}",
+                f"{month['expenses']:.2f}",
+                f"{month['income'] - month['bills'] - month['expenses']:.2f}",
+                f"{month['end_balance']:.2f}",
+            ]
+            for name, month in months.items()
+        ]
+
+    def test_monthly_totals_match_the_in_memory_summary(self):
+        for include_all_days in (True, False):
+            summary, daily = self.sections(self.report(includeAllDays=include_all_days))
+            self.assertEqual(summary, self.old_summary(include_all_days), include_all_days)
+            self.assertEqual(
+                [row[0] for row in summary], ["January 2026", "February 2026", "March 2026"]
+            )
+            self.assertTrue(any(Decimal(row[4]) for row in summary), summary)
+
+            # Each month's totals are the sums of its daily rows
+            for month in summary:
+                days = [
+                    row for row in daily if date.fromisoformat(row[0]).strftime("%B %Y") == month[0]
+                ]
+                for column, total in zip((2, 3, 4), month[1:4]):
+                    self.assertEqual(sum(Decimal(row[column]) for row in days), Decimal(total))
+                self.assertEqual(days[-1][6], month[5])
+
+    def test_summary_first_gives_the_same_rows_in_the_other_order(self):
+        for include_all_days in (True, False):
+            trailing = self.report(includeAllDays=include_all_days)
+            leading = self.report(includeAllDays=include_all_days, summaryFirst=True)
+            self.assertEqual(self.sections(leading), self.sections(trailing))
+            self.assertLess(leading.index(["MONTHLY SUMMARY"]), leading.index(["DAILY BREAKDOWN"]))
+            self.assertGreater(
+                trailing.index(["MONTHLY SUMMARY"]), trailing.index(["DAILY BREAKDOWN"])
+            )
+            self.assertEqual(sorted(leading), sorted(trailing))
+
+    def test_service_and_endpoint_agree(self):
+        rows = CSVService().generate_export_csv(self.user, START, END, 3, summary_first=True)
+        streamed = list(csv.reader(io.StringIO("".join(rows))))
+        self.assertEqual(streamed, self.report(summaryFirst=True))
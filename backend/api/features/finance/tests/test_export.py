@@ -0,0 +1,93 @@
+import gzip
+import json
+from unittest import mock
+
+from django.core.serializers.json import DjangoJSONEncoder
+from django.test import TestCase
+
+from api.features.finance.models import (
+    Category,
+    Expense,
+    FinanceAccount,
+    Paycheck,
+    RecurringBill,
+    SavingsAccount,
+    SavingsRecurringDeposit,
+    SavingsTransaction,
+)
+from api.features.finance.schemas import ExportDataSchema
+from api.features.finance.services import export_service
+from api.features.finance.services.export_service import ExportService
+from api.features.finance.tests.utils import ApiClient, create_user, sample_backup
+
+
+class StreamedExportTests(TestCase):
+    def setUp(self):
+        self.user = create_user()
+        self.client = ApiClient(self.user)
+        data = sample_backup(25)
+        data["categories"][0]["name"] = "Café ☕"
+        data["expenses"][3]["name"] = 'Ramen 🍜 "late" \\ night'
+        response = self.client.post_json("/api/finance/import", data)
+        self.assertEqual(response.status_code, 200, response.content)
+        # Deleted rows are exported too
+        Expense.objects.filter(user=self.user).order_by("id").first().soft_delete()
+        # Another user's rows never are
+        response = ApiClient(create_user()).post_json("/api/finance/import", sample_backup(2))
+        self.assertEqual(response.status_code, 200, response.content)
+
+    def expected(self) -> ExportDataSchema:
+        """The document built in memory from the user's rows, as JSON renders it"""
+        rows = {
+            key: list(model.all_objects.filter(user=self.user).order_by("id"))
+            for key, model in (
+                ("categories", Category),
+                ("recurringBills", RecurringBill),
+                ("paychecks", Paycheck),
+                ("expenses", Expense),
+                ("savingsRecurringDeposits", SavingsRecurringDeposit),
+                ("savingsTransactions", SavingsTransaction),
+            )
+        }
+        document = ExportDataSchema.model_validate(
+            {
+                **rows,
+                "account": FinanceAccount.objects.get(user=self.user),
+                "savingsAccount": SavingsAccount.objects.get(user=self.user),
+            }
+        )
+        # JSON keeps datetimes to the millisecond
+        rendered = json.dumps(document.model_dump(), cls=DjangoJSONEncoder)
+        return ExportDataSchema.model_validate_json(rendered)
+
+    def export(self, compress: bool) -> bytes:
+        response = self.client.get(f"/api/finance/export?compress={str(compress).lower()}")
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.get("Content-Encoding"), "gzip" if compress else None)
+        return b"".join(response.streaming_content)
+
+    def test_streamed_export_parses_back_to_the_same_document(self):
+        expected = self.expected()
+        self.assertEqual(len(expected.expenses), 25)
+        plain = self.export(compress=False)
+        compressed = self.export(compress=True)
+
+        self.assertEqual(ExportDataSchema.model_validate_json(plain), expected)
+        self.assertEqual(gzip.decompress(compressed), plain)
+        self.assertEqual(
+            ExportDataSchema.model_validate_json(gzip.decompress(compressed)), expected
+        )
+
+    def test_chunk_and_write_sizes_do_not_change_the_document(self):
+        expected = self.expected()
+        with mock.patch.object(export_service, "WRITE_BUFFER_SIZE", 7):
+            for compress in (False, True):
+                chunks = list(
+                    ExportService().stream_finance_data(self.user, chunk_size=2, compress=compress)
+                )
+                body = b"".join(chunks)
+                if compress:
+                    body = gzip.decompress(body)
+                else:
+                    self.assertGreater(len(chunks), 10)
+                self.assertEqual(ExportDataSchema.model_validate_json(body), expected, compress)
@@ -0,0 +1,149 @@
+import json
+
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.test import TestCase
+
+from api.features.finance.models import Category, Expense
+from api.features.finance.services.import_service import MAX_BATCH_SIZE
+from api.features.finance.tests.utils import ApiClient, create_user, sample_backup
+
+
+class ImportBatchSizeTests(TestCase):
+    def setUp(self):
+        self.user = create_user()
+        self.client = ApiClient(self.user)
+
+    def test_rejects_batch_sizes_out_of_range(self):
+        for batch_size in (0, -1, MAX_BATCH_SIZE + 1):
+            with self.subTest(batch_size=batch_size):
+                response = self.client.post_json(
+                    f"/api/finance/import?batch_size={batch_size}", sample_backup()
+                )
+                self.assertEqual(response.status_code, 422)
+        self.assertFalse(Expense.objects.filter(user=self.user).exists())
+
+    def test_stream_import_rejects_zero_batch_size(self):
+        backup = SimpleUploadedFile("backup.json", json.dumps(sample_backup()).encode())
+        response = self.client.post("/api/finance/import/stream?batch_size=0", {"file": backup})
+        self.assertEqual(response.status_code, 422)
+        self.assertIn("batch_size", response.content.decode())
+        self.assertFalse(Expense.objects.filter(user=self.user).exists())
+
+    def test_imports_with_smallest_batch_size(self):
+        response = self.client.post_json("/api/finance/import?batch_size=1", sample_backup(5))
+        self.assertEqual(response.status_code, 200, response.content)
+        self.assertEqual(Expense.objects.filter(user=self.user).count(), 5)
+
+    def test_merge_accepts_valid_batch_size(self):
+        response = self.client.post_json(
+            "/api/finance/import?mode=merge&batch_size=2", sample_backup(3)
+        )
+        self.assertEqual(response.status_code, 200, response.content)
+        self.assertEqual(Expense.objects.filter(user=self.user).count(), 3)
+
+
+class ImportMergeTests(TestCase):
+    def setUp(self):
+        self.user = create_user()
+        self.client = ApiClient(self.user)
+        self.assertEqual(self.import_backup(sample_backup()).status_code, 200)
+
+    def import_backup(self, data: dict, mode: str = "replace"):
+        return self.client.post_json(f"/api/finance/import?mode={mode}", data)
+
+    def merge(self, data: dict) -> dict:
+        response = self.import_backup(data, mode="merge")
+        self.assertEqual(response.status_code, 200, response.content)
+        return response.json()["diff"]
+
+    def export(self) -> dict:
+        """The user's data as /export has it, with the ids the rows are stored under"""
+        response = self.client.get("/api/finance/export")
+        self.assertEqual(response.status_code, 200)
+        content = getattr(response, "streaming_content", None)
+        return json.loads(b"".join(content) if content is not None else response.content)
+
+    def categories(self) -> dict:
+        return dict(Category.objects.filter(user=self.user).values_list("name", "type"))
+
+    def test_identical_backup_writes_nothing(self):
+        # The backup's ids are not the stored ones, so every row is matched by content
+        diff = self.merge(sample_backup())
+        for section, counts in diff.items():
+            with self.subTest(section=section):
+                self.assertEqual(counts["created"] + counts["updated"] + counts["deleted"], 0)
+                self.assertGreater(counts["unchanged"], 0)
+
+    def test_renames_a_category_by_id(self):
+        data = self.export()
+        food = next(c for c in data["categories"] if c["name"] == "Food")
+        food["name"] = "Groceries"
+
+        diff = self.merge(data)
+
+        self.assertEqual(
+            diff["categories"], {"created": 0, "updated": 1, "deleted": 0, "unchanged": 1}
+        )
+        self.assertEqual(Category.objects.get(pk=food["id"]).name, "Groceries")
+
+    def test_rename_next_to_a_new_row_taking_the_old_name(self):
+        data = self.export()
+        food = next(c for c in data["categories"] if c["name"] == "Food")
+        food["name"] = "Groceries"
+        data["categories"].append(
+            {"id": 999, "name": "Food", "type": "expense", "color": "red-500"}
+        )
+
+        self.merge(data)
+
+        self.assertEqual(
+            self.categories(), {"Food": "expense", "Groceries": "expense", "Salary": "income"}
+        )
+
+    def test_swapped_names_keep_each_row_under_its_name(self):
+        data = self.export()
+        food, salary = sorted(data["categories"], key=lambda c: c["name"])
+        food["name"], salary["name"] = "Salary", "Food"
+
+        self.merge(data)
+
+        # Matching by name first leaves both rows named as they were, with the types swapped
+        self.assertEqual(self.categories(), {"Food": "income", "Salary": "expense"})
+
+    def test_duplicate_names_are_rejected(self):
+        data = self.export()
+        data["categories"].append(
+            {"id": 998, "name": "Rent", "type": "expense", "color": "red-500"}
+        )
+        data["categories"].append(
+            {"id": 999, "name": "Rent", "type": "income", "color": "green-500"}
+        )
+        data["expenses"] = []
+
+        response = self.import_backup(data, mode="merge")
+
+        self.assertEqual(response.status_code, 400, response.content)
+        self.assertIn("categories", response.json()["error"])
+        # Nothing is written, not even the sections before the conflict
+        self.assertNotIn("Rent", self.categories())
+        self.assertEqual(Expense.objects.filter(user=self.user).count(), 3)
+
+    def test_rows_missing_from_the_backup_are_soft_deleted(self):
+        data = self.export()
+        dropped = data["expenses"].pop()
+        changed = data["expenses"][0]
+        changed["amount"] = 99
+        data["expenses"].append({"name": "New", "amount": 1, "date": "2026-02-01"})
+
+        diff = self.merge(data)
+
+        self.assertEqual(
+            diff["expenses"], {"created": 1, "updated": 1, "deleted": 1, "unchanged": 1}
+        )
+        self.assertTrue(Expense.all_objects.get(pk=dropped["id"]).is_deleted)
+        self.assertEqual(Expense.objects.get(pk=changed["id"]).amount, 99)
+        self.assertTrue(Expense.objects.filter(user=self.user, name="New").exists())
+
+        # Merging the same backup again finds nothing left to do
+        again = self.merge(data)["expenses"]
+        self.assertEqual((again["created"], again["updated"], again["deleted"]), (0, 0, 0))
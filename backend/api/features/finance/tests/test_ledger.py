@@ -0,0 +1,151 @@
+import json
+from datetime import date
+from decimal import Decimal
+
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.test import TestCase, TransactionTestCase
+
+from api.features.finance.models import (
+    BalanceLedgerEntry,
+    BalanceSnapshot,
+    FinanceAccount,
+    SavingsAccount,
+)
+from api.features.finance.services.ledger_service import LedgerService
+from api.features.finance.services.savings_transaction_service import SavingsTransactionService
+from api.features.finance.tests.utils import ApiClient, create_user, sample_backup
+from api.features.finance.utils import get_or_create_finance_account, get_or_create_savings_account
+
+
+class LedgerAssertions:
+    def assertLedgerReconciles(self, user, checking: str, savings: str):
+        """The ledger derives the stored balances, and those are the expected ones"""
+        self.assertEqual(LedgerService().reconcile(user.id), [])
+        ledger = LedgerService()
+        for model, account, expected in (
+            (FinanceAccount, BalanceLedgerEntry.Account.CHECKING, checking),
+            (SavingsAccount, BalanceLedgerEntry.Account.SAVINGS, savings),
+        ):
+            current = model.objects.get(user=user).current_balance
+            self.assertEqual(current, Decimal(expected))
+            self.assertEqual(ledger.balance(user.id, account), current)
+
+    def import_backup(self, data: dict, mode: str = "replace"):
+        response = self.client.post_json(f"/api/finance/import?mode={mode}", data)
+        self.assertEqual(response.status_code, 200, response.content)
+
+
+class LedgerReconciliationTests(LedgerAssertions, TestCase):
+    def setUp(self):
+        self.user = create_user()
+        self.client = ApiClient(self.user)
+
+    def transfer(self, transaction_type: str, amount: str):
+        return SavingsTransactionService().create(
+            self.user,
+            {"transaction_type": transaction_type, "amount": amount, "date": date(2026, 1, 1)},
+        )
+
+    def test_account_saves(self):
+        account = get_or_create_finance_account(self.user)
+        get_or_create_savings_account(self.user)
+        for balance in ("100.00", "75.25", "-20.00"):
+            account.current_balance = Decimal(balance)
+            account.save()
+        self.assertLedgerReconciles(self.user, "-20.00", "0.00")
+
+    def test_savings_transfers_and_deletes(self):
+        account = get_or_create_finance_account(self.user)
+        savings = get_or_create_savings_account(self.user)
+        for row in (account, savings):
+            row.current_balance = Decimal("100.00")
+            row.save()
+
+        deposit = self.transfer("deposit", "40.00")
+        withdrawal = self.transfer("transfer_to_checking", "25.00")
+        self.transfer("transfer_to_checking", "10.00")
+        self.assertLedgerReconciles(self.user, "95.00", "105.00")
+
+        SavingsTransactionService().delete(self.user, deposit.pk)
+        SavingsTransactionService().delete(self.user, withdrawal.pk)
+        self.assertLedgerReconciles(self.user, "110.00", "90.00")
+
+    def test_replace_imports_rewrite_the_ledger(self):
+        account = get_or_create_finance_account(self.user)
+        account.current_balance = Decimal("999.00")
+        account.save()
+
+        # Twice, so the second import wipes the entries the first one posted
+        for _ in range(2):
+            self.import_backup(sample_backup())
+            self.assertLedgerReconciles(self.user, "1250.50", "300.00")
+
+    def test_merge_import(self):
+        self.import_backup(sample_backup())
+        data = sample_backup()
+        data["account"]["currentBalance"] = 1400
+        data["savingsAccount"]["currentBalance"] = 120.75
+        self.import_backup(data, mode="merge")
+        self.assertLedgerReconciles(self.user, "1400.00", "120.75")
+
+    def test_stream_import(self):
+        self.import_backup(sample_backup())
+        data = sample_backup()
+        data["account"]["currentBalance"] = 80
+        upload = SimpleUploadedFile("backup.json", json.dumps(data).encode())
+        response = self.client.post("/api/finance/import/stream", {"file": upload})
+        self.assertEqual(response.status_code, 200, response.content)
+        self.assertLedgerReconciles(self.user, "80.00", "300.00")
+
+    def test_snapshots_then_more_changes(self):
+        account = get_or_create_finance_account(self.user)
+        get_or_create_savings_account(self.user)
+        for balance in ("10.00", "20.00", "30.00", "40.00"):
+            account.current_balance = Decimal(balance)
+            account.save()
+        LedgerService().snapshot(self.user.id, every=2)
+        self.assertTrue(BalanceSnapshot.objects.filter(user=self.user).exists())
+
+        # Balances are now read from the checkpoint plus the entries after it
+        account.current_balance = Decimal("55.55")
+        account.save()
+        self.transfer("deposit", "5.55")
+        self.assertLedgerReconciles(self.user, "50.00", "5.55")
+
+    def test_reconcile_reports_and_fixes_drift(self):
+        account = get_or_create_finance_account(self.user)
+        get_or_create_savings_account(self.user)
+        FinanceAccount.objects.filter(pk=account.pk).update(current_balance=Decimal("12.00"))
+
+        mismatches = LedgerService().reconcile(self.user.id)
+        self.assertEqual(len(mismatches), 1, mismatches)
+        # The ledger wins, so the untracked write is undone
+        LedgerService().reconcile(self.user.id, fix=True)
+        self.assertLedgerReconciles(self.user, "0.00", "0.00")
+
+
+class SnapshotImportLedgerTests(LedgerAssertions, TransactionTestCase):
+    # Snapshot files are ATTACHed, which SQLite refuses inside a transaction
+    def setUp(self):
+        self.user = create_user()
+        self.client = ApiClient(self.user)
+
+    def test_snapshot_restore_reopens_the_ledger(self):
+        self.import_backup(sample_backup())
+        response = self.client.get("/api/finance/export/sqlite")
+        self.assertEqual(response.status_code, 200)
+        snapshot = b"".join(response.streaming_content)
+
+        account = FinanceAccount.objects.get(user=self.user)
+        account.current_balance = Decimal("500.00")
+        account.save()
+        SavingsTransactionService().create(
+            self.user,
+            {"transaction_type": "deposit", "amount": "50.00", "date": date(2026, 1, 1)},
+        )
+        LedgerService().snapshot(self.user.id, every=1)
+
+        upload = SimpleUploadedFile("finance.sqlite3", snapshot)
+        response = self.client.post("/api/finance/import/sqlite", {"file": upload})
+        self.assertEqual(response.status_code, 200, response.content)
+        self.assertLedgerReconciles(self.user, "1250.50", "300.00")
@@ -0,0 +1,107 @@
+from datetime import date
+from decimal import Decimal
+from typing import List, Optional
+
+from django.test import TestCase
+
+from api.features.finance.models import Expense
+from api.features.finance.tests.utils import ApiClient, create_user
+
+LISTS = [
+    "/api/finance/expenses",
+    "/api/finance/paychecks",
+    "/api/finance/recurring-bills",
+    "/api/finance/savings/recurring-deposits",
+    "/api/finance/savings/transactions",
+]
+
+
+class CursorPaginationTests(TestCase):
+    def setUp(self):
+        self.user = create_user()
+        self.client = ApiClient(self.user)
+
+    def add(self, day: int, name: str = "Expense", user=None) -> Expense:
+        return Expense.objects.create(
+            user=user or self.user, name=name, amount=Decimal("1.00"), date=date(2026, 3, day)
+        )
+
+    def page(self, cursor: Optional[str] = None, limit: int = 3) -> dict:
+        path = f"/api/finance/expenses?limit={limit}"
+        if cursor is not None:
+            path += f"&cursor={cursor}"
+        response = self.client.get(path)
+        self.assertEqual(response.status_code, 200, response.content)
+        return response.json()
+
+    def walk(self, limit: int = 3) -> List[int]:
+        ids, cursor = [], None
+        while True:
+            page = self.page(cursor, limit)
+            ids += [row["id"] for row in page["items"]]
+            if not page["hasMore"]:
+                return ids
+            cursor = page["nextCursor"]
+
+    def test_rows_sharing_a_date_are_split_across_pages_exactly_once(self):
+        same_day = [self.add(10).pk for _ in range(7)]
+        newer, older = self.add(11).pk, self.add(9).pk
+
+        expected = [newer] + sorted(same_day, reverse=True) + [older]
+        for limit in (1, 2, 3, 4, 9):
+            self.assertEqual(self.walk(limit), expected, limit)
+        first = self.page()
+        self.assertEqual((first["total"], first["totalAmount"]), (9, 9.0))
+        second = self.page(first["nextCursor"])
+        self.assertEqual((second["total"], second["totalAmount"]), (None, None))
+
+    def test_writes_between_pages_never_shift_or_repeat_a_page(self):
+        rows = [self.add(10).pk for _ in range(6)]
+        first = self.page()
+        self.assertEqual([row["id"] for row in first["items"]], rows[:2:-1])
+
+        # Newer rows belong before the cursor, so they are left for the next refresh
+        self.add(12)
+        self.add(10)
+        # Deleting a row still to come, and the row the cursor names, shifts nothing
+        Expense.objects.get(pk=rows[1]).soft_delete()
+        Expense.objects.get(pk=rows[3]).soft_delete()
+        later = self.add(9).pk
+
+        second = self.page(first["nextCursor"])
+        self.assertEqual([row["id"] for row in second["items"]], [rows[2], rows[0], later])
+        self.assertFalse(second["hasMore"])
+
+    def test_cursor_only_reaches_the_users_own_rows(self):
+        mine = self.add(10).pk
+        other = create_user()
+        theirs = max(self.add(10, user=other).pk for _ in range(3))
+        # A cursor naming another user's row is only a position among this user's rows
+        page = self.page(f"2026-03-10:{theirs + 1}")
+        self.assertEqual([row["id"] for row in page["items"]], [mine])
+
+    def test_malformed_or_tampered_cursors_are_rejected(self):
+        self.add(10)
+        cursors = [
+            "",
+            "garbage",
+            "2026-03-10",
+            "2026-03-10:",
+            "2026-13-01:5",
+            "2026-03-10:five",
+            "2026-03-10:0",
+            "2026-03-10:-4",
+            "2026-03-10:9223372036854775808",
+            "2026-03-10:999999999999999999999999",
+            "9999999-03-10:5",
+        ]
+        for path in LISTS:
+            for cursor in cursors:
+                response = self.client.get(f"{path}?cursor={cursor}")
+                self.assertEqual(response.status_code, 400, (path, cursor, response.content))
+                self.assertEqual(response.json(), {"error": "Invalid cursor."})
+
+        # Well formed but naming no row is simply a position in the ordering
+        response = self.client.get("/api/finance/expenses?cursor=2026-03-10:9223372036854775807")
+        self.assertEqual(response.status_code, 200, response.content)
+        self.assertEqual(len(response.json()["items"]), 1)
@@ -0,0 +1,91 @@
+from typing import List
+
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+
+from api.features.finance.models import Expense, RecurringBill
+from api.features.finance.tests.utils import ApiClient, create_user, sample_backup
+
+
+class HotQueryPlanTests(TestCase):
+    """
+    The list and sync endpoints must read a user's rows through the partial indexes
+    on is_deleted, not by scanning the table or walking the plain user_id index
+    """
+
+    def setUp(self):
+        self.user = create_user()
+        self.client = ApiClient(self.user)
+        response = self.client.post_json("/api/finance/import", sample_backup(20))
+        self.assertEqual(response.status_code, 200, response.content)
+        for expense in Expense.objects.filter(user=self.user)[:3]:
+            expense.soft_delete()
+        if connection.vendor == "postgresql":
+            # PostgreSQL plans from the table statistics, and with only a page of rows the
+            # plain user_id index costs the same as the partial ones. Give the user the
+            # long tail of deleted rows a real account has, and statistics that know of it;
+            # both roll back with the test.
+            Expense.all_objects.bulk_create(
+                Expense(user=self.user, name="Old", amount=1, date="2020-01-01", is_deleted=True)
+                for _ in range(3000)
+            )
+            with connection.cursor() as cursor:
+                cursor.execute(f"ANALYZE {Expense._meta.db_table}, {RecurringBill._meta.db_table}")
+
+    def statements(self, path: str, table: str) -> List[str]:
+        """The SELECTs on `table` that a GET of `path` runs"""
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(path)
+        self.assertEqual(response.status_code, 200, response.content)
+        statements = [
+            query["sql"]
+            for query in queries
+            if query["sql"].startswith("SELECT") and f'FROM "{table}"' in query["sql"]
+        ]
+        self.assertTrue(statements, f"GET {path} did not read {table}")
+        return statements
+
+    def plan(self, sql: str) -> str:
+        with connection.cursor() as cursor:
+            if connection.vendor == "sqlite":
+                cursor.execute(f"EXPLAIN QUERY PLAN {sql}")
+                return "\n".join(row[-1] for row in cursor.fetchall())
+            # Test tables are tiny, so PostgreSQL would rightly prefer a sequential scan
+            cursor.execute("SET LOCAL enable_seqscan = off")
+            cursor.execute(f"EXPLAIN {sql}")
+            return "\n".join(row[0] for row in cursor.fetchall())
+
+    def assertUsesPartialIndex(self, sql: str, model, expected: str = None) -> str:
+        table = model._meta.db_table
+        partial = {index.name for index in model._meta.indexes if index.condition is not None}
+        plan = self.plan(sql)
+        self.assertNotRegex(plan, rf"\b(Seq Scan on|SCAN) {table}\b", f"{sql}\n{plan}")
+        self.assertNotIn(f"{table}_user_id_", plan, f"{sql}\n{plan}")
+        used = {name for name in partial if name in plan}
+        self.assertTrue(used, f"{sql}\n{plan}")
+        if expected:
+            self.assertIn(expected, used, f"{sql}\n{plan}")
+        return plan
+
+    def test_expenses_by_date(self):
+        first = "/api/finance/expenses?date_from=2026-01-01&date_to=2026-01-31&limit=5"
+        for sql in self.statements(first, Expense._meta.db_table):
+            self.assertUsesPartialIndex(sql, Expense)
+
+        cursor = self.client.get(first).json()["nextCursor"]
+        page = self.statements(f"{first}&cursor={cursor}", Expense._meta.db_table)
+        self.assertEqual(len(page), 1)
+        self.assertUsesPartialIndex(page[0], Expense, "expense_live_date_id_idx")
+
+    def test_recurring_bills(self):
+        for sql in self.statements("/api/finance/recurring-bills", RecurringBill._meta.db_table):
+            self.assertUsesPartialIndex(sql, RecurringBill)
+
+    def test_sync_since_revision(self):
+        since = Expense.all_objects.filter(user=self.user).order_by("revision")[5].revision
+        live, deleted = self.statements(
+            f"/api/finance/changes?since={since}", Expense._meta.db_table
+        )
+        self.assertUsesPartialIndex(live, Expense, "expense_live_rev_idx")
+        self.assertUsesPartialIndex(deleted, Expense, "expense_deleted_rev_idx")
@@ -0,0 +1,108 @@
+import copy
+import json
+import os
+import sqlite3
+import tempfile
+from unittest import skipUnless
+
+from django.conf import settings
+from django.db import connection, connections
+from django.test import TransactionTestCase, override_settings
+
+from api.features.finance.models import Expense
+from api.features.finance.tests.utils import ApiClient, create_user
+from api.features.finance.utils import report_database
+from core.db_router import REPLICA_ALIAS
+
+
+@skipUnless(connection.vendor == "sqlite", "copies the SQLite test database as its replica")
+class ReportDatabaseTests(TransactionTestCase):
+    """
+    A throwaway SQLite copy of the test database stands in for the replica, so it can
+    fall behind the primary the way a real one does between refreshes.
+    """
+
+    @classmethod
+    def setUpClass(cls):
+        fd, cls.replica_path = tempfile.mkstemp(suffix=".sqlite3")
+        os.close(fd)
+        replica = copy.deepcopy(connections.settings["default"])
+        replica["NAME"] = cls.replica_path
+        connections.settings[REPLICA_ALIAS] = replica
+        cls.replica_settings = override_settings(
+            DATABASES={**settings.DATABASES, REPLICA_ALIAS: replica},
+            DATABASE_ROUTERS=["core.db_router.PrimaryReplicaRouter"],
+        )
+        cls.replica_settings.enable()
+        # Set only now: the test runner picks the databases to create before any replica exists
+        cls.databases = {"default", REPLICA_ALIAS}
+        super().setUpClass()
+
+    @classmethod
+    def tearDownClass(cls):
+        super().tearDownClass()
+        connections[REPLICA_ALIAS].close()
+        cls.replica_settings.disable()
+        del connections[REPLICA_ALIAS]
+        connections.settings.pop(REPLICA_ALIAS)
+        os.unlink(cls.replica_path)
+
+    def setUp(self):
+        # Every test starts with a replica that has never been refreshed
+        connections[REPLICA_ALIAS].close()
+        open(self.replica_path, "wb").close()
+        self.user = create_user()
+        self.client = ApiClient(self.user)
+
+    def refresh_replica(self) -> None:
+        """Copy the primary into the replica, as refresh_replica does"""
+        connections[REPLICA_ALIAS].close()
+        connection.ensure_connection()
+        target = sqlite3.connect(self.replica_path)
+        try:
+            connection.connection.backup(target)
+        finally:
+            target.close()
+
+    def add_expense(self, name: str, user=None) -> int:
+        response = ApiClient(user or self.user).post_json(
+            "/api/finance/expenses", {"name": name, "amount": 10, "date": "2026-03-01"}
+        )
+        self.assertEqual(response.status_code, 201, response.content)
+        return response.json()["id"]
+
+    def exported_names(self) -> list:
+        response = self.client.get("/api/finance/export")
+        self.assertEqual(response.status_code, 200)
+        return [row["name"] for row in json.loads(b"".join(response.streaming_content))["expenses"]]
+
+    def test_reports_read_the_replica_only_once_it_has_the_users_writes(self):
+        first = self.add_expense("Lunch")
+        self.refresh_replica()
+        self.assertEqual(report_database(self.user), REPLICA_ALIAS)
+
+        # Reports really are served from the copy while it is current
+        Expense.objects.using(REPLICA_ALIAS).filter(pk=first).update(name="Lunch (replica)")
+        self.assertEqual(self.exported_names(), ["Lunch (replica)"])
+
+        # The user's next write is not in the copy yet, so their reports fall back
+        self.add_expense("Fuel")
+        self.assertIsNone(report_database(self.user))
+        self.assertEqual(self.exported_names(), ["Lunch", "Fuel"])
+
+        self.refresh_replica()
+        self.assertEqual(report_database(self.user), REPLICA_ALIAS)
+        # Other users' writes leave this user's reports on the replica
+        self.add_expense("Theirs", user=create_user())
+        self.assertEqual(report_database(self.user), REPLICA_ALIAS)
+
+    def test_users_without_finance_data_or_replica_tables_read_the_primary(self):
+        self.assertIsNone(report_database(self.user))
+        self.add_expense("Lunch")
+        # The replica file exists but has never been refreshed
+        self.assertIsNone(report_database(self.user))
+
+        self.refresh_replica()
+        self.assertEqual(report_database(self.user), REPLICA_ALIAS)
+        with override_settings(DATABASES={"default": settings.DATABASES["default"]}):
+            self.assertIsNone(report_database(self.user))
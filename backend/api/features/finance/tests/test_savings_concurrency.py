@@ -0,0 +1,138 @@
+import random
+import threading
+import time
+from datetime import date
+from decimal import Decimal
+from typing import Callable, List
+
+from django.db import OperationalError, connection
+from django.test import TransactionTestCase
+
+from api.features.finance.models import (
+    BalanceLedgerEntry,
+    FinanceAccount,
+    SavingsAccount,
+    SavingsTransaction,
+)
+from api.features.finance.services.ledger_service import LedgerService
+from api.features.finance.services.savings_transaction_service import SavingsTransactionService
+from api.features.finance.tests.utils import create_user
+from api.features.finance.utils import get_or_create_finance_account, get_or_create_savings_account
+
+# SQLite refuses a write while another connection holds the table instead of waiting
+# for it, so a locked attempt is simply made again
+ATTEMPTS = 1000
+
+
+class ConcurrentSavingsTransferTests(TransactionTestCase):
+    """
+    Transfers and deletes racing on one savings account, each on its own thread and
+    database connection. Every operation must end either committed in full or refused,
+    and the conditional UPDATE must keep the savings balance from going below zero.
+    """
+
+    def setUp(self):
+        self.user = create_user()
+        self.service = SavingsTransactionService()
+        get_or_create_finance_account(self.user)
+        savings = get_or_create_savings_account(self.user)
+        savings.current_balance = Decimal("60.00")
+        savings.save()
+
+    def transfer(self, amount: str = "10.00") -> SavingsTransaction:
+        return self.service.create(
+            self.user,
+            {
+                "transaction_type": "transfer_to_checking",
+                "amount": amount,
+                "date": date(2026, 1, 1),
+            },
+        )
+
+    def race(self, operations: List[Callable[[], None]]) -> List[str]:
+        """Run the operations at once, one thread each; returns how each one ended"""
+        outcomes = [""] * len(operations)
+        start = threading.Barrier(len(operations))
+
+        def run(index: int, operation: Callable[[], None]) -> None:
+            start.wait()
+            try:
+                for _ in range(ATTEMPTS):
+                    try:
+                        operation()
+                        outcomes[index] = "done"
+                        return
+                    except OperationalError:
+                        # Jittered, so the retries of colliding threads spread out
+                        time.sleep(random.uniform(0.001, 0.02))
+                outcomes[index] = "locked out"
+            except Exception as e:
+                outcomes[index] = type(e).__name__
+            finally:
+                connection.close()
+
+        threads = [
+            threading.Thread(target=run, args=(index, operation))
+            for index, operation in enumerate(operations)
+        ]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        return outcomes
+
+    def balances(self):
+        return (
+            FinanceAccount.objects.get(user=self.user).current_balance,
+            SavingsAccount.objects.get(user=self.user).current_balance,
+        )
+
+    def assertLedgerAgrees(self):
+        checking, savings = self.balances()
+        ledger = LedgerService()
+        self.assertEqual(
+            ledger.balance(self.user.id, BalanceLedgerEntry.Account.CHECKING), checking
+        )
+        self.assertEqual(ledger.balance(self.user.id, BalanceLedgerEntry.Account.SAVINGS), savings)
+        # Savings entries are posted while the account row is held, so replaying them in
+        # id order retraces every balance the account actually went through
+        running = Decimal("0")
+        for amount in (
+            BalanceLedgerEntry.objects.filter(
+                user=self.user, account=BalanceLedgerEntry.Account.SAVINGS
+            )
+            .order_by("id")
+            .values_list("amount", flat=True)
+        ):
+            running += amount
+            self.assertGreaterEqual(running, 0)
+
+    def test_parallel_transfers_never_overdraw_savings(self):
+        outcomes = self.race([self.transfer for _ in range(12)])
+
+        self.assertEqual(outcomes.count("done"), 6, outcomes)
+        self.assertEqual(outcomes.count("ValueError"), 6, outcomes)
+        self.assertEqual(self.balances(), (Decimal("60.00"), Decimal("0.00")))
+        self.assertEqual(SavingsTransaction.objects.filter(user=self.user).count(), 6)
+        self.assertLedgerAgrees()
+
+    def test_parallel_deletes_revert_each_transfer_once(self):
+        existing = [self.transfer().pk for _ in range(3)]
+        self.assertEqual(self.balances(), (Decimal("30.00"), Decimal("30.00")))
+
+        deletes = [lambda pk=pk: self.service.delete(self.user, pk) for pk in existing + existing]
+        outcomes = self.race(deletes + [self.transfer for _ in range(3)])
+
+        # Each transfer is reverted by exactly one of the two deletes racing for it
+        self.assertEqual(outcomes[:6].count("done"), 3, outcomes)
+        self.assertEqual(outcomes[:6].count("DoesNotExist"), 3, outcomes)
+        # Savings never held less than the 30.00 the new transfers take out
+        self.assertEqual(outcomes[6:], ["done"] * 3, outcomes)
+        self.assertEqual(self.balances(), (Decimal("30.00"), Decimal("30.00")))
+        self.assertEqual(
+            sorted(
+                SavingsTransaction.all_objects.filter(is_deleted=True).values_list("pk", flat=True)
+            ),
+            sorted(existing),
+        )
+        self.assertLedgerAgrees()
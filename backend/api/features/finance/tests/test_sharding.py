@@ -0,0 +1,163 @@
+import zlib
+from decimal import Decimal
+from itertools import combinations
+from types import SimpleNamespace
+from unittest import skipUnless
+
+from django.conf import settings
+from django.contrib.auth.models import AnonymousUser, User
+from django.db import DEFAULT_DB_ALIAS
+from django.test import SimpleTestCase, TestCase, override_settings
+
+from api.features.finance.models import Category, Expense, FinanceChangeCursor
+from api.features.finance.services.change_log_service import ChangeLogService
+from api.features.finance.tests.utils import ApiClient, create_user
+from api.middleware.shard_middleware import ShardMiddleware
+from core.db_router import (
+    SHARD_ID_SPAN,
+    UserShardRouter,
+    database_for_user,
+    id_floor,
+    request_scope,
+    reserve_id_range,
+    shard_for,
+    sharded_databases,
+    sharded_models,
+    using_shard,
+    using_user_shard,
+)
+
+SHARDS = ["shard_0", "shard_1", "shard_2"]
+
+
+@override_settings(DATABASE_SHARDS=SHARDS)
+class ShardRoutingTests(SimpleTestCase):
+    """Routing decisions only; nothing here touches a database"""
+
+    def setUp(self):
+        self.router = UserShardRouter()
+
+    def request_for(self, user_id: int):
+        return SimpleNamespace(user=SimpleNamespace(pk=user_id, is_authenticated=True))
+
+    def test_users_hash_to_a_stable_shard(self):
+        placed = {alias: 0 for alias in SHARDS}
+        for user_id in range(1, 301):
+            alias = shard_for(user_id)
+            self.assertEqual(alias, SHARDS[zlib.crc32(str(user_id).encode()) % len(SHARDS)])
+            self.assertEqual(database_for_user(user_id), alias)
+            placed[alias] += 1
+        # crc32 spreads consecutive ids over every shard
+        self.assertTrue(all(placed.values()), placed)
+
+    def test_sharded_databases_lists_every_shard(self):
+        self.assertEqual(sharded_databases(), SHARDS)
+        with override_settings(DATABASE_SHARDS=[]):
+            self.assertEqual(sharded_databases(), [DEFAULT_DB_ALIAS])
+            self.assertEqual(database_for_user(7), DEFAULT_DB_ALIAS)
+
+    def test_id_ranges_do_not_overlap(self):
+        ranges = [
+            (id_floor(alias), id_floor(alias) + SHARD_ID_SPAN)
+            for alias in [DEFAULT_DB_ALIAS, *SHARDS]
+        ]
+        self.assertEqual(ranges[0][0], 0)
+        for (low, high), (other_low, other_high) in combinations(ranges, 2):
+            self.assertTrue(high <= other_low or other_high <= low, ranges)
+
+    def test_router_follows_the_instance_then_the_block_then_the_request(self):
+        self.assertEqual(self.router.db_for_write(User), DEFAULT_DB_ALIAS)
+        self.assertEqual(
+            self.router.db_for_write(Expense, instance=Expense(user_id=41)), shard_for(41)
+        )
+        self.assertEqual(self.router.db_for_read(Expense, instance=User(pk=42)), shard_for(42))
+
+        with request_scope(self.request_for(43)):
+            self.assertEqual(self.router.db_for_read(Expense), shard_for(43))
+            with using_shard("shard_2"):
+                self.assertEqual(self.router.db_for_read(Expense), "shard_2")
+            with using_user_shard(44):
+                self.assertEqual(self.router.db_for_read(Category), shard_for(44))
+            self.assertEqual(self.router.db_for_read(Expense), shard_for(43))
+
+    def test_sharded_query_without_a_shard_raises(self):
+        with self.assertRaises(RuntimeError):
+            self.router.db_for_read(Expense)
+        anonymous = SimpleNamespace(user=AnonymousUser())
+        with request_scope(anonymous), self.assertRaises(RuntimeError):
+            self.router.db_for_read(Expense)
+
+    def test_request_scope_is_reset_after_the_request(self):
+        seen = []
+
+        def view(request):
+            seen.append(self.router.db_for_read(Expense))
+            return "response"
+
+        self.assertEqual(ShardMiddleware(view)(self.request_for(45)), "response")
+        self.assertEqual(seen, [shard_for(45)])
+        with self.assertRaises(RuntimeError):
+            self.router.db_for_read(Expense)
+
+    def test_request_scope_is_reset_after_an_exception(self):
+        def view(request):
+            with using_shard("shard_1"):
+                raise ValueError("boom")
+
+        with self.assertRaises(ValueError):
+            ShardMiddleware(view)(self.request_for(46))
+        with self.assertRaises(RuntimeError):
+            self.router.db_for_read(Expense)
+
+
+@skipUnless(settings.DATABASE_SHARDS, "needs database.shards in config.json")
+class ShardPlacementTests(TestCase):
+    """Rows written through the API land on the writer's shard, inside its id range"""
+
+    databases = "__all__"
+
+    def setUp(self):
+        # Test databases are migrated without migrate_shards, so the ranges are set here
+        for alias in settings.DATABASE_SHARDS:
+            reserve_id_range(alias, sharded_models())
+
+    def test_rows_land_on_the_users_shard_in_its_id_range(self):
+        users = []
+        while {shard_for(user.pk) for user in users} != set(settings.DATABASE_SHARDS):
+            users.append(create_user())
+        for user in users:
+            response = ApiClient(user).post_json(
+                "/api/finance/expenses",
+                {"name": "Lunch", "amount": "12.00", "date": "2026-03-01"},
+            )
+            self.assertEqual(response.status_code, 201, response.content)
+
+        for user in users:
+            alias = shard_for(user.pk)
+            with using_shard(alias):
+                expense = Expense.objects.get(user=user)
+            self.assertEqual(expense.amount, Decimal("12.00"))
+            self.assertGreaterEqual(expense.pk, id_floor(alias))
+            self.assertLess(expense.pk, id_floor(alias) + SHARD_ID_SPAN)
+            for other in settings.DATABASE_SHARDS:
+                if other != alias:
+                    with using_shard(other):
+                        self.assertFalse(Expense.objects.filter(user=user).exists())
+        self.assertFalse(Expense.objects.using(DEFAULT_DB_ALIAS).exists())
+
+    def test_change_log_consumers_need_no_shard_context(self):
+        user = create_user()
+        response = ApiClient(user).post_json(
+            "/api/finance/expenses",
+            {"name": "Lunch", "amount": "12.00", "date": "2026-03-01"},
+        )
+        self.assertEqual(response.status_code, 201, response.content)
+
+        # As a background consumer would, outside any request or using_shard block
+        service = ChangeLogService()
+        pending = service.pending(user.pk, "rollup")
+        self.assertTrue(pending)
+        self.assertEqual(service.consume(user.pk, "rollup", lambda batch: None), len(pending))
+        self.assertEqual(service.position(user.pk, "rollup"), pending[-1].id)
+        cursors = FinanceChangeCursor.objects.using(shard_for(user.pk))
+        self.assertEqual(cursors.get(user=user, consumer="rollup").position, pending[-1].id)
@@ -0,0 +1,85 @@
+from datetime import date
+from decimal import Decimal
+from unittest import mock
+
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.test import TransactionTestCase
+
+from api.features.finance.models import Expense, FinanceArchive
+from api.features.finance.services import sqlite_snapshot_service
+from api.features.finance.services.archive_service import ArchiveService
+from api.features.finance.tests.utils import ApiClient, create_user, sample_backup
+
+
+class SqliteSnapshotIdTests(TransactionTestCase):
+    # Snapshot files are ATTACHed, which SQLite refuses inside a transaction
+    def setUp(self):
+        self.user = create_user()
+        self.client = ApiClient(self.user)
+        response = self.client.post_json("/api/finance/import", sample_backup(3))
+        self.assertEqual(response.status_code, 200, response.content)
+
+    def export_snapshot(self) -> bytes:
+        response = self.client.get("/api/finance/export/sqlite")
+        self.assertEqual(response.status_code, 200)
+        return b"".join(response.streaming_content)
+
+    def import_snapshot(self, snapshot: bytes):
+        upload = SimpleUploadedFile("finance.sqlite3", snapshot)
+        response = self.client.post("/api/finance/import/sqlite", {"file": upload})
+        self.assertEqual(response.status_code, 200, response.content)
+
+    def add_expense(self, user, name: str) -> Expense:
+        return Expense.objects.create(
+            user=user, name=name, amount=Decimal("5.00"), date=date(2026, 2, 1)
+        )
+
+    def test_import_never_reuses_ids_of_wiped_rows(self):
+        snapshot = self.export_snapshot()
+        # The newest row is deleted outright, so only the sequence remembers its id
+        newest = self.add_expense(self.user, "Newest")
+        Expense.all_objects.filter(pk=newest.pk).delete()
+
+        self.import_snapshot(snapshot)
+
+        imported = Expense.objects.filter(user=self.user).values_list("id", flat=True)
+        self.assertEqual(len(imported), 3)
+        self.assertGreater(min(imported), newest.pk)
+        self.assertGreater(self.add_expense(self.user, "After").pk, max(imported))
+
+    def test_import_leaves_archived_ids_free(self):
+        snapshot = self.export_snapshot()
+        other = create_user()
+        archived = self.add_expense(other, "Archived")
+        archived.soft_delete()
+        ArchiveService().archive(older_than_days=-1, user_id=other.id)
+        self.assertTrue(FinanceArchive.objects.filter(object_id=archived.pk).exists())
+        Expense.all_objects.filter(user=self.user).delete()
+
+        self.import_snapshot(snapshot)
+
+        imported = Expense.objects.filter(user=self.user).values_list("id", flat=True)
+        self.assertGreater(min(imported), archived.pk)
+        self.assertGreater(self.add_expense(self.user, "After").pk, max(imported))
+        self.assertEqual(ArchiveService().restore(other)["restored"], 1)
+        self.assertTrue(Expense.all_objects.filter(pk=archived.pk, user=other).exists())
+
+    def test_ids_are_reserved_before_any_row_is_copied(self):
+        snapshot = self.export_snapshot()
+        other = create_user()
+        reserve = sqlite_snapshot_service.reserve_id_block
+        inserted = []
+
+        def reserve_then_insert(database, model, above, count):
+            start = reserve(database, model, above, count)
+            if model is Expense:
+                # Another user's insert lands while the import is still copying
+                inserted.append(self.add_expense(other, "Meanwhile").pk)
+            return start
+
+        with mock.patch.object(sqlite_snapshot_service, "reserve_id_block", reserve_then_insert):
+            self.import_snapshot(snapshot)
+
+        imported = Expense.objects.filter(user=self.user).values_list("id", flat=True)
+        self.assertEqual(len(imported), 3)
+        self.assertGreater(inserted[0], max(imported))
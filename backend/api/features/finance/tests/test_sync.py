@@ -0,0 +1,74 @@
+from django.test import TestCase
+
+from api.features.finance.tests.utils import ApiClient, create_user, sample_backup
+from api.features.finance.utils import get_or_create_finance_account
+
+LUNCH = {"name": "Lunch", "amount": 12.5, "date": "2026-03-01"}
+FUEL = {"name": "Fuel", "amount": 40, "date": "2026-03-04"}
+
+
+class SyncChangesTests(TestCase):
+    def setUp(self):
+        self.user = create_user()
+        self.client = ApiClient(self.user)
+        get_or_create_finance_account(self.user)
+
+    def changes(self, since: int = 0) -> dict:
+        response = self.client.get(f"/api/finance/changes?since={since}")
+        self.assertEqual(response.status_code, 200, response.content)
+        return response.json()
+
+    def create(self, data: dict) -> int:
+        response = self.client.post_json("/api/finance/expenses", data)
+        self.assertEqual(response.status_code, 201, response.content)
+        return response.json()["id"]
+
+    def test_deletes_are_synced_as_tombstones(self):
+        lunch, fuel = self.create(LUNCH), self.create(FUEL)
+        synced = self.changes()["revision"]
+
+        self.assertEqual(self.client.delete(f"/api/finance/expenses/{lunch}").status_code, 204)
+        response = self.client.patch_json(f"/api/finance/expenses/{fuel}", {**FUEL, "amount": 45})
+        self.assertEqual(response.status_code, 200, response.content)
+        # Another user's writes never show up
+        ApiClient(create_user()).post_json("/api/finance/expenses", LUNCH)
+
+        changes = self.changes(synced)
+        self.assertFalse(changes["reset"])
+        self.assertEqual([(row["id"], row["amount"]) for row in changes["expenses"]], [(fuel, 45)])
+        tombstones = changes["deleted"]["expenses"]
+        self.assertEqual([row["id"] for row in tombstones], [lunch])
+        self.assertGreater(tombstones[0]["revision"], synced)
+        self.assertIsNotNone(tombstones[0]["deletedAt"])
+
+        # A fresh client never sees the deleted row as live
+        everything = self.changes()
+        self.assertEqual([row["id"] for row in everything["expenses"]], [fuel])
+        caught_up = self.changes(changes["revision"])
+        self.assertEqual((caught_up["expenses"], caught_up["deleted"]["expenses"]), ([], []))
+
+    def test_a_wipe_makes_older_replicas_reset(self):
+        before_import = self.create(LUNCH)
+        stale = self.changes()["revision"]
+
+        response = self.client.post_json("/api/finance/import", sample_backup(2))
+        self.assertEqual(response.status_code, 200, response.content)
+
+        # The wiped row left no tombstone, so the replica has to start over
+        changes = self.changes(stale)
+        self.assertTrue(changes["reset"])
+        ids = [row["id"] for row in changes["expenses"]]
+        self.assertEqual(len(ids), 2)
+        self.assertNotIn(before_import, ids)
+        self.assertEqual(changes["deleted"]["expenses"], [])
+        self.assertEqual(changes, self.changes(0) | {"reset": True})
+
+        synced = changes["revision"]
+        self.assertFalse(self.changes(synced)["reset"])
+        self.create(FUEL)
+        self.assertFalse(self.changes(synced)["reset"])
+
+        # A second wipe invalidates replicas synced after the first one
+        response = self.client.post_json("/api/finance/import", sample_backup(1))
+        self.assertEqual(response.status_code, 200, response.content)
+        self.assertTrue(self.changes(synced)["reset"])
@@ -0,0 +1,93 @@
+import json
+import uuid
+from typing import Any, Optional
+
+from django.contrib.auth.models import User
+from django.test import Client
+from ninja_jwt.tokens import AccessToken
+
+from api.features.users.models import Profile
+
+
+def create_user(username: Optional[str] = None) -> User:
+    """An active, approved user, as the finance endpoints require"""
+    user = User.objects.create_user(username or f"user-{uuid.uuid4().hex[:8]}", password="x")
+    user.profile.status = Profile.Status.APPROVED
+    user.is_active = True
+    user.save()
+    return user
+
+
+class ApiClient(Client):
+    """Test client that authenticates as `user` and speaks JSON"""
+
+    def __init__(self, user: User, **defaults: Any):
+        super().__init__(HTTP_AUTHORIZATION=f"Bearer {AccessToken.for_user(user)}", **defaults)
+
+    def post_json(self, path: str, data: Any, **extra: Any):
+        return self.post(path, json.dumps(data), content_type="application/json", **extra)
+
+    def patch_json(self, path: str, data: Any, **extra: Any):
+        return self.patch(path, json.dumps(data), content_type="application/json", **extra)
+
+
+def sample_backup(expenses: int = 3) -> dict:
+    """A small backup in the /finance/export format, with ids as an export would have them"""
+    food = {"id": 1, "name": "Food", "type": "expense", "color": "red-500"}
+    salary = {"id": 2, "name": "Salary", "type": "income", "color": "green-500"}
+    return {
+        "categories": [food, salary],
+        "account": {
+            "startingBalance": 1000,
+            "currentBalance": 1250.5,
+            "balanceAsOfDate": "2026-01-01",
+        },
+        "savingsAccount": {
+            "startingBalance": 200,
+            "currentBalance": 300,
+            "balanceAsOfDate": "2026-01-01",
+        },
+        "recurringBills": [
+            {
+                "id": 10,
+                "name": "Rent",
+                "amount": 900,
+                "frequency": "monthly",
+                "startDate": "2026-01-01",
+                "dueDay": 1,
+                "category": food,
+            }
+        ],
+        "paychecks": [
+            {
+                "id": 20,
+                "amount": 2000,
+                "date": "2026-01-02",
+                "frequency": "biweekly",
+                "category": salary,
+            }
+        ],
+        "expenses": [
+            {
+                "id": 30 + i,
+                "name": f"Groceries {i}",
+                "amount": 10 + i,
+                "date": f"2026-01-{i % 28 + 1:02d}",
+                "category": food,
+                "relatedBillId": 10 if i == 0 else None,
+            }
+            for i in range(expenses)
+        ],
+        "savingsRecurringDeposits": [
+            {
+                "id": 40,
+                "name": "Rainy day",
+                "amount": 50,
+                "frequency": "monthly",
+                "startDate": "2026-01-05",
+            }
+        ],
+        "savingsTransactions": [
+            {"id": 50, "transactionType": "deposit", "amount": 25, "date": "2026-01-06"}
+        ],
+    }
@@ -1,8 +1,13 @@
 from decimal import Decimal
+from typing import Optional
 
+from django.conf import settings
+from django.db import DEFAULT_DB_ALIAS, DatabaseError
 from django.utils import timezone
 
-from .models import FinanceAccount, SavingsAccount
+from core.db_router import REPLICA_ALIAS
+
+from .models import FinanceAccount, FinanceRevision, SavingsAccount
 
 
 def get_or_create_finance_account(user):
@@ -35,3 +40,24 @@ def get_or_create_savings_account(user):
         },
     )
     return account
+
+
+def report_database(user) -> Optional[str]:
+    """
+    Database alias for a user's report reads: the replica once it has caught up with
+    the user's latest write (so they always see their own changes), else None for
+    the primary.
+    """
+    if REPLICA_ALIAS not in settings.DATABASES:
+        return None
+
+    revisions = FinanceRevision.objects.filter(user_id=user.id).values_list("revision", flat=True)
+    primary = revisions.using(DEFAULT_DB_ALIAS).first()
+    if primary is None:
+        return None
+    try:
+        replica = revisions.using(REPLICA_ALIAS).first()
+    except DatabaseError:
+        # Replica missing or not refreshed yet
+        return None
+    return REPLICA_ALIAS if replica == primary else None
@@ -0,0 +1,59 @@
+from typing import List
+
+from django.conf import settings
+from django.http import Http404
+from django.shortcuts import get_object_or_404
+from ninja import Query
+from ninja_extra import api_controller, route
+from ninja_jwt.authentication import JWTAuth
+
+from api.features.jobs.models import Job
+from api.features.jobs.schemas import JobDownloadURLSchema, JobSchema
+from api.features.jobs.services.artifact_service import ArtifactService
+from api.features.users.permissons import IsApproved
+
+
+@api_controller("/jobs", auth=JWTAuth(), tags=["Jobs"], permissions=[IsApproved])
+class JobController:
+    def __init__(self):
+        self.artifact_service = ArtifactService()
+
+    @route.get("", response=List[JobSchema])
+    def list_jobs(self, request, limit: int = Query(50, ge=1, le=200)):
+        """List the current user's most recent background jobs"""
+        return Job.objects.filter(user=request.user).order_by("-created_at")[:limit]
+
+    @route.get("/{job_id}", response=JobSchema)
+    def get_job(self, request, job_id: int):
+        """Poll the status and progress of a background job"""
+        return get_object_or_404(Job, id=job_id, user=request.user)
+
+    @route.get("/{job_id}/download")
+    def download_job_output(self, request, job_id: int):
+        """Download the file produced by a finished export job"""
+        job = get_object_or_404(self.artifact_service.available(), id=job_id, user=request.user)
+        return self.artifact_service.serve(job)
+
+    @route.get("/{job_id}/download-url", response=JobDownloadURLSchema)
+    def get_job_download_url(self, request, job_id: int):
+        """Get a short-lived link to the job's output that works without an auth header"""
+        job = get_object_or_404(self.artifact_service.available(), id=job_id, user=request.user)
+        token = self.artifact_service.signed_token(job)
+        return {
+            "url": request.build_absolute_uri(f"/api/jobs/artifacts/{token}"),
+            "expiresIn": settings.JOB_ARTIFACT_URL_MAX_AGE,
+        }
+
+
+@api_controller("/jobs/artifacts", tags=["Jobs"])
+class JobArtifactController:
+    def __init__(self):
+        self.artifact_service = ArtifactService()
+
+    @route.get("/{token}")
+    def download_artifact(self, request, token: str):
+        """Public endpoint; the signed token is the credential"""
+        job = self.artifact_service.job_for_token(token)
+        if job is None:
+            raise Http404("Download link is invalid or has expired")
+        return self.artifact_service.serve(job)
@@ -0,0 +1,60 @@
+from django.contrib.auth.models import User
+from django.db import models
+from django.utils import timezone
+
+
+class Job(models.Model):
+    """
+    A unit of background work picked up by the run_jobs command.
+    Workers claim queued jobs with a conditional UPDATE, so any number of
+    worker threads or processes can share the table without double-running a job.
+    """
+
+    class Kind(models.TextChoices):
+        EXPORT = "export", "Finance export"
+        IMPORT = "import", "Finance import"
+        EXPORT_CSV = "export_csv", "CSV balance report"
+        IMPORT_CSV = "import_csv", "CSV bill import"
+        EXPORT_COLUMNAR = "export_columnar", "Columnar table export"
+
+    class Status(models.TextChoices):
+        QUEUED = "queued", "Queued"
+        RUNNING = "running", "Running"
+        SUCCEEDED = "succeeded", "Succeeded"
+        FAILED = "failed", "Failed"
+
+    user = models.ForeignKey(User, on_delete=models.CASCADE, related_name="jobs")
+    kind = models.CharField(max_length=32, choices=Kind.choices)
+    status = models.CharField(max_length=16, choices=Status.choices, default=Status.QUEUED)
+    payload = models.JSONField(default=dict, blank=True)
+    input_file = models.FileField(upload_to="jobs/input/", blank=True, null=True)
+    # Content-addressed artifact under MEDIA_ROOT/jobs/artifacts, shared by identical exports
+    output_file = models.FileField(upload_to="jobs/artifacts/", blank=True, null=True)
+    output_filename = models.CharField(max_length=255, blank=True)
+    output_content_type = models.CharField(max_length=100, blank=True)
+    expires_at = models.DateTimeField(null=True, blank=True, db_index=True)
+    result = models.JSONField(null=True, blank=True)
+    error = models.TextField(blank=True)
+
+    progress = models.PositiveSmallIntegerField(default=0)
+    progress_message = models.CharField(max_length=255, blank=True)
+
+    attempts = models.PositiveSmallIntegerField(default=0)
+    max_attempts = models.PositiveSmallIntegerField(default=3)
+    run_after = models.DateTimeField(default=timezone.now)
+    locked_by = models.CharField(max_length=64, blank=True)
+    locked_at = models.DateTimeField(null=True, blank=True)
+
+    created_at = models.DateTimeField(auto_now_add=True)
+    started_at = models.DateTimeField(null=True, blank=True)
+    finished_at = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        indexes = [models.Index(fields=["status", "run_after"])]
+
+    def __str__(self):
+        return f"{self.user.username}'s {self.get_kind_display()} job ({self.status})"
+
+    @property
+    def is_finished(self) -> bool:
+        return self.status in (self.Status.SUCCEEDED, self.Status.FAILED)
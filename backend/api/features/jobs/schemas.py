@@ -0,0 +1,41 @@
+from datetime import datetime
+from typing import Any, Optional
+
+from ninja import Schema
+from pydantic import Field
+
+
+class JobSchema(Schema):
+    id: int
+    kind: str
+    status: str
+    progress: int
+    progressMessage: str = Field(alias="progress_message")
+    result: Optional[Any] = None
+    error: str
+    attempts: int
+    maxAttempts: int = Field(alias="max_attempts")
+    runAfter: datetime = Field(alias="run_after")
+    createdAt: datetime = Field(alias="created_at")
+    startedAt: Optional[datetime] = Field(default=None, alias="started_at")
+    finishedAt: Optional[datetime] = Field(default=None, alias="finished_at")
+    hasOutput: bool = False
+    outputFilename: str = Field(default="", alias="output_filename")
+    expiresAt: Optional[datetime] = Field(default=None, alias="expires_at")
+
+    class Config:
+        populate_by_name = True
+
+    @staticmethod
+    def resolve_hasOutput(obj):
+        return bool(obj.output_file)
+
+
+class JobCreatedSchema(Schema):
+    jobId: int
+    status: str
+
+
+class JobDownloadURLSchema(Schema):
+    url: str
+    expiresIn: int
@@ -0,0 +1,3 @@
+from .job_service import JobService
+
+__all__ = ["JobService"]
@@ -0,0 +1,123 @@
+import hashlib
+import os
+import tempfile
+from datetime import timedelta
+from typing import Any, Callable, Dict, Iterable, Optional
+
+from django.conf import settings
+from django.core import signing
+from django.core.files.base import File
+from django.core.files.storage import default_storage
+from django.http import FileResponse, HttpResponse
+from django.utils import timezone
+
+from api.features.jobs.models import Job
+
+ARTIFACT_DIR = "jobs/artifacts"
+
+SIGNING_SALT = "jobs.artifact"
+
+# Report progress roughly every this many bytes written
+PROGRESS_INTERVAL = 4 * 1024 * 1024
+
+
+class ArtifactService:
+    """
+    Stores job output under MEDIA_ROOT with content-hash names and hands it out
+    through short-lived signed URLs, optionally served by nginx via X-Accel-Redirect.
+    """
+
+    def save(
+        self,
+        job: Job,
+        chunks: Iterable[bytes],
+        filename: str,
+        content_type: str,
+        progress: Optional[Callable[[int, str], None]] = None,
+    ) -> Dict[str, Any]:
+        """Spool chunks to disk while hashing them, then file the result by its digest"""
+        digest = hashlib.sha256()
+        size = 0
+        reported = 0
+
+        with tempfile.TemporaryFile() as spool:
+            for chunk in chunks:
+                spool.write(chunk)
+                digest.update(chunk)
+                size += len(chunk)
+                if progress and size - reported >= PROGRESS_INTERVAL:
+                    reported = size
+                    # Total size is unknown while streaming, so only the message moves
+                    progress(50, f"Writing {filename}: {size // 1024} KB")
+
+            sha256 = digest.hexdigest()
+            extension = (
+                ".json.gz" if filename.endswith(".json.gz") else os.path.splitext(filename)[1]
+            )
+            name = f"{ARTIFACT_DIR}/{sha256[:2]}/{sha256}{extension}"
+            # Identical exports share one file instead of being stored twice
+            if not default_storage.exists(name):
+                spool.seek(0)
+                name = default_storage.save(name, File(spool))
+
+        job.output_file.name = name
+        job.output_filename = filename
+        job.output_content_type = content_type
+        job.expires_at = timezone.now() + timedelta(hours=settings.JOB_ARTIFACT_TTL_HOURS)
+        return {"filename": filename, "size": size, "sha256": sha256}
+
+    def signed_token(self, job: Job) -> str:
+        return signing.TimestampSigner(salt=SIGNING_SALT).sign(str(job.id))
+
+    def job_for_token(self, token: str) -> Optional[Job]:
+        """Resolve a signed download token, or None if it is forged, expired or unavailable"""
+        try:
+            job_id = signing.TimestampSigner(salt=SIGNING_SALT).unsign(
+                token, max_age=settings.JOB_ARTIFACT_URL_MAX_AGE
+            )
+        except signing.BadSignature:
+            return None
+        return self.available().filter(id=job_id).first()
+
+    def available(self):
+        """Finished jobs whose artifact has not expired yet"""
+        return (
+            Job.objects.filter(status=Job.Status.SUCCEEDED, expires_at__gt=timezone.now())
+            .exclude(output_file="")
+            .exclude(output_file__isnull=True)
+        )
+
+    def serve(self, job: Job) -> HttpResponse:
+        if settings.JOB_ARTIFACT_ACCEL_REDIRECT:
+            # nginx resolves this internal location and streams the file itself
+            response = HttpResponse(content_type=job.output_content_type)
+            response["X-Accel-Redirect"] = f"{settings.MEDIA_URL}{job.output_file.name}"
+            response["Content-Disposition"] = f'attachment; filename="{job.output_filename}"'
+            return response
+
+        return FileResponse(
+            job.output_file.open("rb"),
+            as_attachment=True,
+            filename=job.output_filename,
+            content_type=job.output_content_type,
+        )
+
+    def cleanup(self) -> Dict[str, int]:
+        """Detach expired artifacts from their jobs and delete files nothing else uses"""
+        now = timezone.now()
+        expired = (
+            Job.objects.filter(expires_at__lte=now)
+            .exclude(output_file="")
+            .exclude(output_file__isnull=True)
+        )
+        names = set(expired.values_list("output_file", flat=True))
+        jobs = expired.update(output_file="", expires_at=None)
+
+        files = 0
+        for name in names:
+            if Job.objects.filter(output_file=name).exists():
+                continue
+            if default_storage.exists(name):
+                default_storage.delete(name)
+                files += 1
+        return {"jobs": jobs, "files": files}
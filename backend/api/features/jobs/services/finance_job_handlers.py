@@ -0,0 +1,123 @@
+from datetime import date
+from typing import Any, Dict, Optional
+
+from api.features.finance.schemas import ExportCSVRequestSchema, ExportDataSchema
+from api.features.finance.services.columnar_export_service import (
+    CONTENT_TYPES,
+    ColumnarExportService,
+)
+from api.features.finance.services.csv_service import CSVService
+from api.features.finance.services.export_service import ExportService
+from api.features.finance.services.import_service import (
+    DEFAULT_BATCH_SIZE,
+    SECTIONS,
+    ImportService,
+)
+from api.features.finance.utils import report_database
+from api.features.jobs.services.artifact_service import ArtifactService
+from core.db_router import reading_from, streamed_from
+
+
+class FinanceJobHandlers:
+    """One handler per Job.Kind; each receives the job and a progress callback"""
+
+    def __init__(self):
+        self.export_service = ExportService()
+        self.import_service = ImportService()
+        self.csv_service = CSVService()
+        self.columnar_export_service = ColumnarExportService()
+        self.artifact_service = ArtifactService()
+
+    def get(self, kind: str):
+        return {
+            "export": self.export_backup,
+            "import": self.import_backup,
+            "export_csv": self.export_csv,
+            "import_csv": self.import_csv,
+            "export_columnar": self.export_columnar,
+        }[kind]
+
+    def export_backup(self, job, progress) -> Dict[str, Any]:
+        compress = bool(job.payload.get("compress"))
+        alias = report_database(job.user)
+        chunks = streamed_from(
+            alias,
+            self.export_service.stream_finance_data(
+                user=job.user,
+                compress=compress,
+                include_archived=bool(job.payload.get("include_archived")),
+            ),
+        )
+        if compress:
+            filename, content_type = "finance-export.json.gz", "application/gzip"
+        else:
+            filename, content_type = "finance-export.json", "application/json"
+        return self.artifact_service.save(job, chunks, filename, content_type, progress)
+
+    def export_csv(self, job, progress) -> Dict[str, Any]:
+        data = ExportCSVRequestSchema.model_validate(job.payload)
+        alias = report_database(job.user)
+        rows = self.csv_service.generate_export_csv(
+            user=job.user,
+            start_date=data.startDate,
+            end_date=data.endDate,
+            months_to_show=data.monthsToShow,
+            include_all_days=data.includeAllDays,
+            summary_first=data.summaryFirst,
+        )
+        filename = f"balance-report-{data.startDate}-to-{data.endDate}.csv"
+        chunks = streamed_from(alias, (row.encode("utf-8") for row in rows))
+        return self.artifact_service.save(job, chunks, filename, "text/csv", progress)
+
+    def export_columnar(self, job, progress) -> Dict[str, Any]:
+        table = job.payload.get("table", "")
+        file_format = job.payload.get("format", "arrow")
+        alias = report_database(job.user)
+        with reading_from(alias):
+            chunks = self.columnar_export_service.stream_table(
+                user=job.user,
+                table=table,
+                file_format=file_format,
+                start_date=self._date(job.payload.get("startDate")),
+                end_date=self._date(job.payload.get("endDate")),
+            )
+        chunks = streamed_from(alias, chunks)
+        extension = "arrows" if file_format == "arrow" else "parquet"
+        return self.artifact_service.save(
+            job, chunks, f"{table}.{extension}", CONTENT_TYPES[file_format], progress
+        )
+
+    def import_backup(self, job, progress) -> Dict[str, Any]:
+        mode = job.payload.get("mode", "replace")
+        batch_size = job.payload.get("batch_size", DEFAULT_BATCH_SIZE)
+
+        with job.input_file.open("rb") as stream:
+            if mode == "merge":
+                progress(10, "Validating backup")
+                data = ExportDataSchema.model_validate_json(stream.read())
+                progress(40, "Merging")
+                return self.import_service.merge(user=job.user, data=data, batch_size=batch_size)
+
+            sections = list(SECTIONS)
+
+            def on_section(section: str, rows: int) -> None:
+                done = sections.index(section) + 1
+                progress(done * 100 // len(sections), f"Restored {rows} {section}")
+
+            return self.import_service.restore_stream(
+                user=job.user, stream=stream, batch_size=batch_size, on_section=on_section
+            )
+
+    def import_csv(self, job, progress) -> Dict[str, Any]:
+        progress(10, "Importing bills")
+        with job.input_file.open("rb") as upload:
+            result = self.csv_service.import_bills_from_csv(file=upload, user=job.user)
+        return {
+            "imported_count": len(result["bills"]),
+            "bills": result["bills"],
+            "skipped_count": len(result["errors"]),
+            "errors": result["errors"],
+        }
+
+    def _date(self, value: Optional[str]) -> Optional[date]:
+        return date.fromisoformat(value) if value else None
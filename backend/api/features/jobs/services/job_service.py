@@ -0,0 +1,161 @@
+import logging
+from datetime import timedelta
+from typing import IO, Any, Dict, Optional
+
+from django.contrib.auth.models import User
+from django.core.files.base import File
+from django.db.models import F
+from django.utils import timezone
+
+from api.features.jobs.models import Job
+from api.features.jobs.schemas import JobSchema
+from api.features.jobs.services.finance_job_handlers import FinanceJobHandlers
+from api.features.users.services import NotificationService
+from core.db_router import using_user_shard
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_MAX_ATTEMPTS = 3
+
+# Retry n waits RETRY_BACKOFF_SECONDS * 2 ** (n - 1)
+RETRY_BACKOFF_SECONDS = 30
+
+
+class JobProgress:
+    """Callable handed to job handlers for reporting how far along they are"""
+
+    def __init__(self, service: "JobService", job: Job):
+        self.service = service
+        self.job = job
+
+    def __call__(self, percent: int, message: str = "") -> None:
+        self.service.report_progress(self.job, percent, message)
+
+
+class JobService:
+    def __init__(self):
+        self.handlers = FinanceJobHandlers()
+        self.notification_service = NotificationService()
+
+    def enqueue(
+        self,
+        user: User,
+        kind: str,
+        payload: Optional[Dict[str, Any]] = None,
+        input_file: Optional[IO[bytes]] = None,
+        max_attempts: int = DEFAULT_MAX_ATTEMPTS,
+    ) -> Job:
+        """Queue a job for the run_jobs workers and return it immediately"""
+        if kind not in Job.Kind.values:
+            raise ValueError(f"Unknown job kind '{kind}'")
+
+        job = Job(user=user, kind=kind, payload=payload or {}, max_attempts=max_attempts)
+        if input_file is not None:
+            job.input_file.save(getattr(input_file, "name", kind), File(input_file), save=False)
+        job.save()
+        self._notify(job)
+        return job
+
+    def claim_next(self, worker_id: str) -> Optional[Job]:
+        """
+        Atomically take the oldest runnable job.
+        The UPDATE only succeeds while the row is still queued, so when two
+        workers race for the same job exactly one of them gets it.
+        """
+        while True:
+            now = timezone.now()
+            candidate = (
+                Job.objects.filter(status=Job.Status.QUEUED, run_after__lte=now)
+                .order_by("run_after", "id")
+                .values_list("id", flat=True)
+                .first()
+            )
+            if candidate is None:
+                return None
+
+            claimed = Job.objects.filter(id=candidate, status=Job.Status.QUEUED).update(
+                status=Job.Status.RUNNING,
+                locked_by=worker_id,
+                locked_at=now,
+                started_at=now,
+                attempts=F("attempts") + 1,
+                progress=0,
+                progress_message="",
+            )
+            if claimed:
+                job = Job.objects.select_related("user").get(id=candidate)
+                self._notify(job)
+                return job
+
+    def run(self, job: Job) -> None:
+        handler = self.handlers.get(job.kind)
+        try:
+            # Workers run outside any request, so the job owner's shard is set explicitly
+            with using_user_shard(job.user_id):
+                result = handler(job, JobProgress(self, job))
+        except ValueError as e:
+            # Bad input fails the same way every time, so don't retry it
+            self._finish(job, Job.Status.FAILED, error=str(e))
+        except Exception as e:
+            logger.exception(f"Job {job.id} ({job.kind}) failed on attempt {job.attempts}")
+            self._retry_or_fail(job, e)
+        else:
+            self._finish(job, Job.Status.SUCCEEDED, result=result)
+
+    def report_progress(self, job: Job, percent: int, message: str = "") -> None:
+        job.progress = max(0, min(100, int(percent)))
+        job.progress_message = message[:255]
+        Job.objects.filter(id=job.id).update(
+            progress=job.progress, progress_message=job.progress_message
+        )
+        self._notify(job)
+
+    def requeue_stale(self, timeout: timedelta) -> int:
+        """
+        Put back jobs whose worker died mid-run (e.g. the process was killed).
+        A job that has used up its attempts fails instead, so one that keeps killing
+        its worker is not run forever. Returns the number of jobs requeued.
+        """
+        stale = Job.objects.filter(
+            status=Job.Status.RUNNING, locked_at__lt=timezone.now() - timeout
+        )
+        for job in stale.filter(attempts__gte=F("max_attempts")).select_related("user"):
+            logger.warning(f"Job {job.id} ({job.kind}) stalled on its last attempt")
+            self._finish(job, Job.Status.FAILED, error="The worker running this job stopped")
+        return stale.filter(attempts__lt=F("max_attempts")).update(
+            status=Job.Status.QUEUED, locked_by="", locked_at=None
+        )
+
+    def _retry_or_fail(self, job: Job, error: Exception) -> None:
+        if job.attempts >= job.max_attempts:
+            self._finish(job, Job.Status.FAILED, error=str(error))
+            return
+
+        job.status = Job.Status.QUEUED
+        job.error = str(error)
+        job.locked_by = ""
+        job.locked_at = None
+        job.run_after = timezone.now() + timedelta(
+            seconds=RETRY_BACKOFF_SECONDS * 2 ** (job.attempts - 1)
+        )
+        job.save(update_fields=["status", "error", "locked_by", "locked_at", "run_after"])
+        self._notify(job)
+
+    def _finish(self, job: Job, status: str, result: Any = None, error: str = "") -> None:
+        job.status = status
+        job.result = result
+        job.error = error
+        job.finished_at = timezone.now()
+        job.locked_by = ""
+        job.locked_at = None
+        if status == Job.Status.SUCCEEDED:
+            job.progress = 100
+            job.progress_message = "Completed"
+        # Uploaded input is only needed for retries
+        if job.input_file:
+            job.input_file.delete(save=False)
+        job.save()
+        self._notify(job)
+
+    def _notify(self, job: Job) -> None:
+        self.notification_service.send(job.user_id, "job", JobSchema.from_orm(job).model_dump())
@@ -0,0 +1,93 @@
+import shutil
+import tempfile
+import time
+from datetime import timedelta
+from unittest import mock
+
+from django.conf import settings
+from django.core import signing
+from django.core.files.storage import default_storage
+from django.test import Client, TestCase, override_settings
+from django.utils import timezone
+
+from api.features.finance.tests.utils import ApiClient, create_user
+from api.features.jobs.models import Job
+from api.features.jobs.services.artifact_service import ArtifactService
+
+
+class ArtifactTests(TestCase):
+    def setUp(self):
+        media_root = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, media_root)
+        media = override_settings(MEDIA_ROOT=media_root)
+        media.enable()
+        self.addCleanup(media.disable)
+
+        self.service = ArtifactService()
+        self.user = create_user()
+        self.other = create_user()
+
+    def finished_job(self, user, content: bytes = b'{"expenses": []}') -> Job:
+        job = Job(user=user, kind=Job.Kind.EXPORT, status=Job.Status.SUCCEEDED)
+        self.service.save(job, [content], "finance-export.json", "application/json")
+        job.save()
+        return job
+
+    def download(self, token: str):
+        """Fetch a token's artifact as an anonymous client would"""
+        return Client().get(f"/api/jobs/artifacts/{token}")
+
+    def test_a_valid_token_downloads_the_artifact(self):
+        job = self.finished_job(self.user)
+        response = ApiClient(self.user).get(f"/api/jobs/{job.id}/download-url")
+        self.assertEqual(response.status_code, 200, response.content)
+        token = response.json()["url"].rsplit("/", 1)[1]
+
+        response = self.download(token)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(b"".join(response.streaming_content), b'{"expenses": []}')
+
+    def test_expired_tokens_and_artifacts_are_refused(self):
+        job = self.finished_job(self.user)
+        token = self.service.signed_token(job)
+        later = time.time() + settings.JOB_ARTIFACT_URL_MAX_AGE + 1
+        with mock.patch("django.core.signing.time.time", return_value=later):
+            self.assertEqual(self.download(token).status_code, 404)
+
+        # A fresh token is no use once the artifact itself has expired
+        Job.objects.filter(id=job.id).update(expires_at=timezone.now() - timedelta(seconds=1))
+        self.assertEqual(self.download(token).status_code, 404)
+
+    def test_forged_tokens_are_refused(self):
+        job = self.finished_job(self.user)
+        theirs = self.finished_job(self.other, b"theirs")
+        token = self.service.signed_token(job)
+        # The id swapped for another user's job, under the original signature
+        swapped = f"{theirs.id}{token[len(str(job.id)) :]}"
+        other_salt = signing.TimestampSigner(salt="another.purpose").sign(str(job.id))
+
+        for forged in (swapped, other_salt, token[:-1], str(job.id), "garbage"):
+            self.assertEqual(self.download(forged).status_code, 404, forged)
+        self.assertEqual(self.download(token).status_code, 200)
+
+    def test_users_only_get_links_to_their_own_jobs(self):
+        job = self.finished_job(self.user)
+        client = ApiClient(self.other)
+        self.assertEqual(client.get(f"/api/jobs/{job.id}/download-url").status_code, 404)
+        self.assertEqual(client.get(f"/api/jobs/{job.id}/download").status_code, 404)
+
+    def test_cleanup_keeps_files_a_live_job_still_uses(self):
+        # Identical exports share one file
+        expired, live = self.finished_job(self.user), self.finished_job(self.other)
+        alone = self.finished_job(self.user, b"only this job")
+        self.assertEqual(expired.output_file.name, live.output_file.name)
+        Job.objects.filter(id__in=[expired.id, alone.id]).update(
+            expires_at=timezone.now() - timedelta(hours=1)
+        )
+
+        self.assertEqual(self.service.cleanup(), {"jobs": 2, "files": 1})
+        self.assertTrue(default_storage.exists(live.output_file.name))
+        self.assertFalse(default_storage.exists(alone.output_file.name))
+        expired.refresh_from_db()
+        self.assertEqual((expired.output_file.name, expired.expires_at), ("", None))
+        self.assertEqual(self.download(self.service.signed_token(live)).status_code, 200)
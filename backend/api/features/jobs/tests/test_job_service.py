@@ -0,0 +1,161 @@
+import random
+import threading
+import time
+from datetime import timedelta
+from typing import List
+from unittest import mock
+
+from django.db import OperationalError, connection
+from django.test import TestCase, TransactionTestCase
+from django.utils import timezone
+
+from api.features.finance.tests.utils import ApiClient, create_user
+from api.features.jobs.models import Job
+from api.features.jobs.services.job_service import RETRY_BACKOFF_SECONDS, JobService
+
+# SQLite refuses a write while another connection holds the table instead of waiting
+# for it, so a locked attempt is simply made again
+ATTEMPTS = 1000
+
+
+def job_service(handler=None) -> JobService:
+    """A JobService that runs `handler` for every kind and sends no notifications"""
+    service = JobService()
+    service.notification_service = mock.Mock()
+    service.handlers = mock.Mock()
+    service.handlers.get.return_value = handler
+    return service
+
+
+class JobClaimRaceTests(TransactionTestCase):
+    def test_racing_workers_claim_each_job_exactly_once(self):
+        user = create_user()
+        jobs = [Job.objects.create(user=user, kind=Job.Kind.EXPORT) for _ in range(4)]
+        claimed: List[int] = []
+        lock = threading.Lock()
+        start = threading.Barrier(6)
+
+        def work(worker_id: str) -> None:
+            service = job_service()
+            start.wait()
+            try:
+                for _ in range(ATTEMPTS):
+                    try:
+                        job = service.claim_next(worker_id)
+                    except OperationalError:
+                        time.sleep(random.uniform(0.001, 0.02))
+                        continue
+                    if job is None:
+                        return
+                    with lock:
+                        claimed.append(job.id)
+            finally:
+                connection.close()
+
+        threads = [threading.Thread(target=work, args=(f"worker-{n}",)) for n in range(6)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        self.assertEqual(sorted(claimed), [job.id for job in jobs])
+        for job in Job.objects.all():
+            self.assertEqual((job.status, job.attempts), (Job.Status.RUNNING, 1))
+            self.assertTrue(job.locked_by.startswith("worker-"))
+
+
+class JobServiceTests(TestCase):
+    def setUp(self):
+        self.user = create_user()
+
+    def run_once(self, service: JobService) -> Job:
+        job = service.claim_next("worker")
+        self.assertIsNotNone(job)
+        service.run(job)
+        job.refresh_from_db()
+        return job
+
+    def test_failures_are_retried_with_backoff_until_attempts_run_out(self):
+        service = job_service(mock.Mock(side_effect=RuntimeError("disk full")))
+        job = Job.objects.create(user=self.user, kind=Job.Kind.EXPORT, max_attempts=3)
+
+        for attempt in (1, 2):
+            before = timezone.now()
+            job = self.run_once(service)
+            self.assertEqual((job.status, job.attempts), (Job.Status.QUEUED, attempt))
+            self.assertEqual((job.error, job.locked_by), ("disk full", ""))
+            delay = timedelta(seconds=RETRY_BACKOFF_SECONDS * 2 ** (attempt - 1))
+            self.assertGreaterEqual(job.run_after, before + delay)
+            self.assertLessEqual(job.run_after, timezone.now() + delay)
+            # Not runnable again until the backoff has passed
+            self.assertIsNone(service.claim_next("worker"))
+            Job.objects.filter(id=job.id).update(run_after=timezone.now())
+
+        job = self.run_once(service)
+        self.assertEqual((job.status, job.attempts), (Job.Status.FAILED, 3))
+        self.assertEqual(job.error, "disk full")
+        self.assertIsNotNone(job.finished_at)
+        self.assertIsNone(service.claim_next("worker"))
+
+    def test_bad_input_fails_without_a_retry(self):
+        handler = mock.Mock(side_effect=ValueError("Unknown column 'amount'"))
+        service = job_service(handler)
+        Job.objects.create(user=self.user, kind=Job.Kind.IMPORT_CSV, max_attempts=3)
+
+        job = self.run_once(service)
+        self.assertEqual((job.status, job.attempts), (Job.Status.FAILED, 1))
+        self.assertEqual(job.error, "Unknown column 'amount'")
+        self.assertIsNone(service.claim_next("worker"))
+        handler.assert_called_once()
+
+    def test_success_stores_the_result(self):
+        service = job_service(mock.Mock(return_value={"rows": 3}))
+        Job.objects.create(user=self.user, kind=Job.Kind.EXPORT)
+
+        job = self.run_once(service)
+        self.assertEqual(
+            (job.status, job.result, job.progress), (Job.Status.SUCCEEDED, {"rows": 3}, 100)
+        )
+
+    def test_requeue_stale_fails_jobs_that_used_up_their_attempts(self):
+        service = job_service()
+        long_ago = timezone.now() - timedelta(hours=1)
+
+        def running(attempts: int, locked_at) -> Job:
+            return Job.objects.create(
+                user=self.user,
+                kind=Job.Kind.EXPORT,
+                status=Job.Status.RUNNING,
+                attempts=attempts,
+                max_attempts=3,
+                locked_by="dead-worker",
+                locked_at=locked_at,
+            )
+
+        retried = running(1, long_ago)
+        exhausted = running(3, long_ago)
+        alive = running(1, timezone.now())
+
+        self.assertEqual(service.requeue_stale(timedelta(minutes=10)), 1)
+        for job in (retried, exhausted, alive):
+            job.refresh_from_db()
+        self.assertEqual((retried.status, retried.locked_by), (Job.Status.QUEUED, ""))
+        self.assertEqual((exhausted.status, exhausted.locked_by), (Job.Status.FAILED, ""))
+        self.assertTrue(exhausted.error)
+        self.assertEqual((alive.status, alive.locked_by), (Job.Status.RUNNING, "dead-worker"))
+        self.assertEqual(service.claim_next("worker").id, retried.id)
+
+
+class JobListTests(TestCase):
+    def test_limit_is_validated(self):
+        user = create_user()
+        for _ in range(3):
+            Job.objects.create(user=user, kind=Job.Kind.EXPORT)
+        client = ApiClient(user)
+
+        response = client.get("/api/jobs?limit=2")
+        self.assertEqual(response.status_code, 200, response.content)
+        self.assertEqual(len(response.json()), 2)
+        for limit in (-1, 0, 201):
+            response = client.get(f"/api/jobs?limit={limit}")
+            self.assertEqual(response.status_code, 422, (limit, response.content))
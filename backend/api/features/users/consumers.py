@@ -1,7 +1,14 @@
+import asyncio
 import json
 
+from channels.db import database_sync_to_async
 from channels.generic.websocket import AsyncWebsocketConsumer
 
+from api.features.finance.services.calendar_push_service import calendar_push_service
+
+# Updates arriving within this window are sent to the client as one frame
+BATCH_TICK_SECONDS = 0.1
+
 
 class UserConsumer(AsyncWebsocketConsumer):
     async def connect(self):
@@ -13,6 +20,9 @@ class UserConsumer(AsyncWebsocketConsumer):
 
         # Each user gets their own channel based on user ID
         self.user_group_name = f"user_{user.id}"
+        # Pending updates keyed so that newer ones replace older ones of the same kind
+        self.pending_updates = {}
+        self.flush_handle = None
 
         # Join user's personal group
         await self.channel_layer.group_add(self.user_group_name, self.channel_name)
@@ -21,8 +31,54 @@ class UserConsumer(AsyncWebsocketConsumer):
 
     async def disconnect(self, code):
         if hasattr(self, "user_group_name"):
+            if self.flush_handle:
+                self.flush_handle.cancel()
             await self.channel_layer.group_discard(self.user_group_name, self.channel_name)
+            # The next calendar push after a reconnect should carry the full window
+            await database_sync_to_async(calendar_push_service.forget)(self.scope["user"].id)
 
     async def user_update(self, event):
         """Handle user-specific updates"""
-        await self.send(text_data=json.dumps({"type": event["update_type"], "data": event["data"]}))
+        update_type, data = event["update_type"], event["data"]
+        key = self._coalesce_key(update_type, data)
+
+        previous = self.pending_updates.pop(key, None)
+        if previous and update_type == "calendar_delta":
+            data = self._merge_calendar_deltas(previous["data"], data)
+        # Re-inserting moves the update to the end, so the batch keeps arrival order
+        self.pending_updates[key] = {"type": update_type, "data": data}
+
+        if self.flush_handle is None:
+            self.flush_handle = asyncio.get_running_loop().call_later(
+                BATCH_TICK_SECONDS, lambda: asyncio.ensure_future(self._flush_updates())
+            )
+
+    async def _flush_updates(self):
+        self.flush_handle = None
+        updates = list(self.pending_updates.values())
+        self.pending_updates = {}
+        if not updates:
+            return
+
+        if len(updates) == 1:
+            await self.send(text_data=json.dumps(updates[0]))
+        else:
+            await self.send(text_data=json.dumps({"type": "batch", "updates": updates}))
+
+    def _coalesce_key(self, update_type, data):
+        # Only the latest state of a job matters; everything else is kept in order
+        if update_type == "job" and isinstance(data, dict) and "id" in data:
+            return ("job", data["id"])
+        if update_type == "calendar_delta":
+            return ("calendar_delta",)
+        return (update_type, id(data))
+
+    def _merge_calendar_deltas(self, older, newer):
+        days = {day["date"]: day for day in older.get("days", [])}
+        days.update({day["date"]: day for day in newer.get("days", [])})
+        return {
+            **newer,
+            "start": min(older.get("start", newer["start"]), newer["start"]),
+            "end": max(older.get("end", newer["end"]), newer["end"]),
+            "days": [days[iso_date] for iso_date in sorted(days)],
+        }
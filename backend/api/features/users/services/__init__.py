@@ -1,3 +1,4 @@
+from .notification_service import NotificationService
 from .user_helper_service import UserHelperService
 
-__all__ = ["UserHelperService"]
+__all__ = ["NotificationService", "UserHelperService"]
@@ -0,0 +1,29 @@
+import json
+import logging
+from typing import Any, Dict
+
+from asgiref.sync import async_to_sync
+from channels.layers import get_channel_layer
+from django.core.serializers.json import DjangoJSONEncoder
+
+logger = logging.getLogger(__name__)
+
+
+class NotificationService:
+    """Push updates to a user's open websockets through UserConsumer.user_update"""
+
+    def send(self, user_id: int, update_type: str, data: Dict[str, Any]) -> None:
+        channel_layer = get_channel_layer()
+        if channel_layer is None:
+            return
+
+        # Round-trip through JSON so dates and decimals survive any channel layer backend
+        payload = json.loads(json.dumps(data, cls=DjangoJSONEncoder))
+        try:
+            async_to_sync(channel_layer.group_send)(
+                f"user_{user_id}",
+                {"type": "user_update", "update_type": update_type, "data": payload},
+            )
+        except Exception as e:
+            # A missed push is recoverable by polling, so never fail the caller over it
+            logger.warning(f"Failed to notify user {user_id}: {e}")
@@ -0,0 +1,117 @@
+import asyncio
+import tempfile
+import threading
+from decimal import Decimal
+from unittest import mock
+
+from asgiref.sync import async_to_sync, sync_to_async
+from channels.layers import get_channel_layer
+from channels.testing import WebsocketCommunicator
+from django.test import SimpleTestCase, TransactionTestCase, override_settings
+from django.utils import timezone
+from ninja_jwt.tokens import AccessToken
+
+from api.features.finance.models import Expense
+from api.features.finance.services import calendar_push_service as push_module
+from api.features.finance.tests.utils import create_user
+from api.features.finance.utils import get_or_create_finance_account
+from config.asgi import application
+from core.channel_layers import SQLiteChannelLayer
+
+
+class UserConsumerTests(TransactionTestCase):
+    """
+    Finance writes reach the writer's open websockets through the SQLite channel layer,
+    and never anyone else's. Transactional, since pushes are sent once the write commits.
+    """
+
+    def setUp(self):
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        layers = override_settings(
+            CHANNEL_LAYERS={
+                "default": {
+                    "BACKEND": "core.channel_layers.SQLiteChannelLayer",
+                    "CONFIG": {"path": f"{directory.name}/channels.sqlite3"},
+                }
+            }
+        )
+        layers.enable()
+        self.addCleanup(layers.disable)
+
+        # Accounts are created before anyone listens, without queueing pushes of their own
+        with mock.patch.object(push_module.calendar_push_service, "schedule"):
+            self.user = create_user()
+            self.other = create_user()
+            for user in (self.user, self.other):
+                get_or_create_finance_account(user)
+
+        debounce = mock.patch.object(push_module, "DEBOUNCE_SECONDS", 0.05)
+        debounce.start()
+        self.addCleanup(debounce.stop)
+
+    async def connect(self, user) -> WebsocketCommunicator:
+        communicator = WebsocketCommunicator(
+            application,
+            f"/ws/user/?token={AccessToken.for_user(user)}",
+            headers=[(b"origin", b"http://localhost")],
+        )
+        connected, _ = await communicator.connect()
+        self.assertTrue(connected)
+        return communicator
+
+    async def test_write_reaches_only_the_writers_sockets(self):
+        mine = await self.connect(self.user)
+        second_tab = await self.connect(self.user)
+        theirs = await self.connect(self.other)
+        try:
+            await sync_to_async(Expense.objects.create)(
+                user=self.user,
+                name="Groceries",
+                amount=Decimal("42.00"),
+                date=timezone.now().date(),
+            )
+
+            for communicator in (mine, second_tab):
+                update = await communicator.receive_json_from(timeout=5)
+                self.assertEqual(update["type"], "calendar_delta")
+                days = {day["date"]: day for day in update["data"]["days"]}
+                self.assertIn(timezone.now().date().isoformat(), days)
+            self.assertTrue(await theirs.receive_nothing(timeout=1))
+        finally:
+            for communicator in (mine, second_tab, theirs):
+                await communicator.disconnect()
+            await get_channel_layer().close()
+
+
+class SQLiteChannelLayerTests(SimpleTestCase):
+    def test_event_loops_of_one_process_each_get_their_own_messages(self):
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        layer = SQLiteChannelLayer(path=f"{directory.name}/channels.sqlite3")
+        channels, received = {}, {}
+        listening = threading.Barrier(3)
+
+        async def listen(name: str):
+            channels[name] = await layer.new_channel()
+            receive = asyncio.ensure_future(layer.receive(channels[name]))
+            # Let the receive start this loop's poller before anything is sent
+            await asyncio.sleep(0.2)
+            await asyncio.to_thread(listening.wait)
+            try:
+                received[name] = (await asyncio.wait_for(receive, timeout=5))["text"]
+            finally:
+                await layer.close()
+
+        threads = [
+            threading.Thread(target=asyncio.run, args=(listen(name),)) for name in ("a", "b")
+        ]
+        for thread in threads:
+            thread.start()
+        listening.wait()
+        for name in ("a", "b"):
+            async_to_sync(layer.send)(channels[name], {"type": "test", "text": name})
+        for thread in threads:
+            thread.join()
+
+        self.assertEqual(received, {"a": "a", "b": "b"})
@@ -0,0 +1,28 @@
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+from api.features.finance.services.archive_service import DEFAULT_BATCH_SIZE, ArchiveService
+
+
+class Command(BaseCommand):
+    help = "Move finance rows soft-deleted long ago into the cold archive"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--days",
+            type=int,
+            default=settings.FINANCE_ARCHIVE_AFTER_DAYS,
+            help="Archive rows soft-deleted more than this many days ago",
+        )
+        parser.add_argument("--user", type=int, help="Only archive this user's rows")
+        parser.add_argument(
+            "--batch-size", type=int, default=DEFAULT_BATCH_SIZE, help="Rows moved per transaction"
+        )
+
+    def handle(self, *args, **options):
+        stats = ArchiveService().archive(
+            options["days"], user_id=options["user"], batch_size=options["batch_size"]
+        )
+        for key, count in stats.items():
+            self.stdout.write(f"  {key:<26} {count}")
+        self.stdout.write(self.style.SUCCESS(f"Archived {sum(stats.values())} rows"))
@@ -0,0 +1,15 @@
+from django.core.management.base import BaseCommand
+
+from api.features.jobs.services.artifact_service import ArtifactService
+
+
+class Command(BaseCommand):
+    help = "Delete export artifacts whose download window has expired"
+
+    def handle(self, *args, **options):
+        stats = ArtifactService().cleanup()
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Expired {stats['jobs']} job outputs and deleted {stats['files']} files"
+            )
+        )
@@ -0,0 +1,37 @@
+from django.contrib.auth.models import User
+from django.core.management.base import BaseCommand, CommandError
+
+from api.features.finance.services.sqlite_snapshot_service import SqliteSnapshotService
+from core.db_router import using_user_shard
+
+
+class Command(BaseCommand):
+    help = "Export or import one user's finance data as a standalone SQLite snapshot"
+
+    def add_arguments(self, parser):
+        parser.add_argument("action", choices=["export", "import"])
+        parser.add_argument("username")
+        parser.add_argument("path", help="Snapshot file to write or read")
+
+    def handle(self, *args, **options):
+        try:
+            user = User.objects.get(username=options["username"])
+        except User.DoesNotExist:
+            raise CommandError(f'User "{options["username"]}" does not exist')
+
+        service = SqliteSnapshotService()
+        try:
+            with using_user_shard(user.id):
+                if options["action"] == "export":
+                    stats = service.write_snapshot(user, options["path"])
+                else:
+                    stats = service.import_snapshot(user, options["path"])
+        except ValueError as e:
+            raise CommandError(str(e))
+
+        for table, rows in stats["tables"].items():
+            self.stdout.write(f"{table}: {rows} rows")
+        verb = "Exported" if options["action"] == "export" else "Imported"
+        self.stdout.write(
+            self.style.SUCCESS(f"{verb} {stats['total_rows']} rows for {user.username}")
+        )
@@ -0,0 +1,29 @@
+from django.contrib.auth.models import User
+from django.core.management import call_command
+from django.core.management.base import BaseCommand, CommandError
+
+from core.db_router import mirror_row, reserve_id_range, shard_aliases, shard_for, sharded_models
+
+
+class Command(BaseCommand):
+    help = "Apply migrations to every finance shard and copy the users into their shards"
+
+    def handle(self, *args, **options):
+        aliases = shard_aliases()
+        if not aliases:
+            raise CommandError("Sharding is off; set database.shards in config.json")
+
+        models = sharded_models()
+        for alias in aliases:
+            self.stdout.write(f"Migrating {alias}")
+            call_command("migrate", database=alias, interactive=False, verbosity=0)
+            reserve_id_range(alias, models)
+
+        # Finance rows reference the user, so every user needs a copy in their shard
+        mirrored = 0
+        for user in User.objects.order_by("pk").iterator():
+            mirror_row(user, shard_for(user.pk))
+            mirrored += 1
+        self.stdout.write(
+            self.style.SUCCESS(f"Migrated {len(aliases)} shards, mirrored {mirrored} users")
+        )
@@ -0,0 +1,16 @@
+from django.core.management.base import BaseCommand
+
+from api.features.finance.services.change_log_service import ChangeLogService
+
+
+class Command(BaseCommand):
+    help = "Delete finance change log entries every consumer has already processed"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--days", type=int, default=30, help="Keep entries newer than this many days"
+        )
+
+    def handle(self, *args, **options):
+        stats = ChangeLogService().prune(options["days"])
+        self.stdout.write(self.style.SUCCESS(f"Deleted {stats['deleted']} change log entries"))
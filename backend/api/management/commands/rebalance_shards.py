@@ -0,0 +1,96 @@
+from typing import List
+
+from django.contrib.auth.models import User
+from django.core.management.base import BaseCommand, CommandError
+from django.db import DEFAULT_DB_ALIAS, transaction
+
+from core.db_router import mirror_row, reserve_id_range, shard_aliases, shard_for, sharded_models
+
+DEFAULT_BATCH_SIZE = 500
+
+
+class Command(BaseCommand):
+    help = (
+        "Move each user's finance rows to the shard their id hashes to, e.g. after "
+        "turning sharding on or changing the number of shards"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--dry-run", action="store_true", help="Only report which users would move"
+        )
+        parser.add_argument(
+            "--batch-size", type=int, default=DEFAULT_BATCH_SIZE, help="Rows inserted per query"
+        )
+
+    def handle(self, *args, **options):
+        aliases = shard_aliases()
+        if not aliases:
+            raise CommandError("Sharding is off; set database.shards in config.json")
+
+        models = self._parents_first(sharded_models())
+        moved = 0
+        for source in [DEFAULT_DB_ALIAS, *aliases]:
+            user_ids = set()
+            for model in models:
+                user_ids.update(
+                    model._base_manager.using(source).values_list("user_id", flat=True).distinct()
+                )
+            for user_id in sorted(user_ids):
+                target = shard_for(user_id)
+                if target == source:
+                    continue
+                self.stdout.write(f"  user {user_id}: {source} -> {target}")
+                if not options["dry_run"]:
+                    self._move(user_id, source, target, models, options["batch_size"])
+                moved += 1
+
+        if options["dry_run"]:
+            self.stdout.write(f"{moved} users would move")
+            return
+        for alias in aliases:
+            reserve_id_range(alias, models)
+        self.stdout.write(self.style.SUCCESS(f"Moved {moved} users"))
+
+    def _move(self, user_id: int, source: str, target: str, models: List, batch_size: int):
+        user = User.objects.filter(pk=user_id).first()
+        if user is None:
+            self.stderr.write(f"  user {user_id} no longer exists; leaving their rows in {source}")
+            return
+        mirror_row(user, target)
+
+        # Rows keep their ids: every database hands out ids from its own range.
+        # Conflicts are rows a previous, interrupted run already copied.
+        with transaction.atomic(using=target):
+            for model in models:
+                rows = model._base_manager.using(source).filter(user_id=user_id).order_by("pk")
+                batch = []
+                for row in rows.iterator(chunk_size=batch_size):
+                    batch.append(row)
+                    if len(batch) >= batch_size:
+                        model._base_manager.using(target).bulk_create(batch, ignore_conflicts=True)
+                        batch = []
+                model._base_manager.using(target).bulk_create(batch, ignore_conflicts=True)
+
+        with transaction.atomic(using=source):
+            for model in reversed(models):
+                model._base_manager.using(source).filter(user_id=user_id).delete()
+
+    def _parents_first(self, models: List) -> List:
+        """Order models so every model comes after the sharded models it references"""
+        ordered: List = []
+        remaining = list(models)
+        while remaining:
+            for model in remaining:
+                parents = {
+                    field.related_model
+                    for field in model._meta.concrete_fields
+                    if field.is_relation and field.related_model in models
+                }
+                if parents <= set(ordered) | {model}:
+                    ordered.append(model)
+                    remaining.remove(model)
+                    break
+            else:
+                raise CommandError("Sharded models reference each other in a cycle")
+        return ordered
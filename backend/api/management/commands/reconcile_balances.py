@@ -0,0 +1,27 @@
+from django.core.management.base import BaseCommand
+
+from api.features.finance.services.ledger_service import LedgerService
+
+
+class Command(BaseCommand):
+    help = "Compare account balances with the balance ledger, optionally fixing them"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--user", type=int, help="Only check this user's accounts")
+        parser.add_argument(
+            "--fix", action="store_true", help="Overwrite mismatched balances with the ledger's"
+        )
+
+    def handle(self, *args, **options):
+        mismatches = LedgerService().reconcile(user_id=options["user"], fix=options["fix"])
+        for row in mismatches:
+            self.stdout.write(
+                f"  user {row['user_id']} {row['account']:<8} "
+                f"balance {row['current_balance']} ledger {row['ledger_balance']}"
+            )
+        if not mismatches:
+            self.stdout.write(self.style.SUCCESS("All balances match the ledger"))
+        elif options["fix"]:
+            self.stdout.write(self.style.SUCCESS(f"Fixed {len(mismatches)} balances"))
+        else:
+            self.stdout.write(self.style.WARNING(f"{len(mismatches)} balances differ"))
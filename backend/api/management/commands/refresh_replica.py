@@ -0,0 +1,26 @@
+import time
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connections
+
+from core.db_router import REPLICA_ALIAS
+from core.sqlite import refresh_sqlite_replica
+
+
+class Command(BaseCommand):
+    help = "Refresh the SQLite report replica from the primary database"
+
+    def handle(self, *args, **options):
+        if REPLICA_ALIAS not in settings.DATABASES:
+            raise CommandError("No replica is configured (database.replica in config.json)")
+        if connections["default"].vendor != "sqlite":
+            raise CommandError("The replica is maintained by PostgreSQL replication, not here")
+
+        started = time.perf_counter()
+        refresh_sqlite_replica(
+            str(settings.DATABASES["default"]["NAME"]), str(settings.DATABASE_REPLICA_PATH)
+        )
+        self.stdout.write(
+            self.style.SUCCESS(f"Refreshed the replica in {time.perf_counter() - started:.2f}s")
+        )
@@ -0,0 +1,160 @@
+import os
+import signal
+import socket
+import threading
+import time
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.db import close_old_connections, connections
+
+from api.features.finance.services.archive_service import ArchiveService
+from api.features.finance.services.ledger_service import LedgerService
+from api.features.jobs.services import JobService
+from api.features.jobs.services.artifact_service import ArtifactService
+from core.sqlite import refresh_sqlite_replica
+
+
+class Command(BaseCommand):
+    help = "Run queued background jobs (exports, imports) with a pool of worker threads"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--workers", type=int, default=2, help="Number of worker threads")
+        parser.add_argument(
+            "--poll-interval", type=float, default=2.0, help="Seconds to sleep when idle"
+        )
+        parser.add_argument(
+            "--stale-after",
+            type=int,
+            default=3600,
+            help="Requeue running jobs locked for longer than this many seconds",
+        )
+        parser.add_argument(
+            "--cleanup-interval",
+            type=int,
+            default=3600,
+            help="Seconds between sweeps for expired export artifacts (0 disables)",
+        )
+        parser.add_argument(
+            "--replica-interval",
+            type=int,
+            default=settings.DATABASE_REPLICA_REFRESH_SECONDS,
+            help="Seconds between refreshes of the SQLite report replica (0 disables)",
+        )
+        parser.add_argument(
+            "--archive-interval",
+            type=int,
+            default=86400,
+            help="Seconds between sweeps moving long soft-deleted rows to the archive (0 disables)",
+        )
+        parser.add_argument(
+            "--ledger-interval",
+            type=int,
+            default=3600,
+            help="Seconds between balance ledger snapshot sweeps (0 disables)",
+        )
+        parser.add_argument(
+            "--once", action="store_true", help="Exit once the queue is empty instead of polling"
+        )
+
+    def handle(self, *args, **options):
+        self.stopping = threading.Event()
+        signal.signal(signal.SIGTERM, lambda *_: self.stopping.set())
+        signal.signal(signal.SIGINT, lambda *_: self.stopping.set())
+
+        requeued = JobService().requeue_stale(timedelta(seconds=options["stale_after"]))
+        if requeued:
+            self.stdout.write(self.style.WARNING(f"Requeued {requeued} stale jobs"))
+
+        prefix = f"{socket.gethostname()}:{os.getpid()}"
+        threads = [
+            threading.Thread(
+                target=self.work,
+                args=(f"{prefix}:{n}", options["poll_interval"], options["once"]),
+                daemon=True,
+            )
+            for n in range(options["workers"])
+        ]
+        for thread in threads:
+            thread.start()
+        self.stdout.write(self.style.SUCCESS(f"Started {len(threads)} job workers"))
+
+        last_cleanup = last_replica_refresh = last_archive = last_ledger = 0.0
+        for thread in threads:
+            while thread.is_alive():
+                thread.join(timeout=1)
+                interval = options["cleanup_interval"]
+                if interval and time.monotonic() - last_cleanup >= interval:
+                    last_cleanup = time.monotonic()
+                    self.cleanup()
+                interval = options["replica_interval"]
+                if interval and time.monotonic() - last_replica_refresh >= interval:
+                    last_replica_refresh = time.monotonic()
+                    self.refresh_replica()
+                interval = options["archive_interval"]
+                if interval and time.monotonic() - last_archive >= interval:
+                    last_archive = time.monotonic()
+                    self.archive()
+                interval = options["ledger_interval"]
+                if interval and time.monotonic() - last_ledger >= interval:
+                    last_ledger = time.monotonic()
+                    self.snapshot_ledger()
+
+        self.stdout.write(self.style.SUCCESS("Job workers stopped"))
+
+    def cleanup(self) -> None:
+        try:
+            stats = ArtifactService().cleanup()
+        except Exception as e:
+            self.stderr.write(f"Artifact cleanup failed: {e}")
+            return
+        if stats["files"]:
+            self.stdout.write(f"Deleted {stats['files']} expired artifacts")
+
+    def refresh_replica(self) -> None:
+        try:
+            refresh_sqlite_replica(
+                str(settings.DATABASES["default"]["NAME"]), str(settings.DATABASE_REPLICA_PATH)
+            )
+        except Exception as e:
+            self.stderr.write(f"Replica refresh failed: {e}")
+
+    def archive(self) -> None:
+        try:
+            stats = ArchiveService().archive(settings.FINANCE_ARCHIVE_AFTER_DAYS)
+        except Exception as e:
+            self.stderr.write(f"Archive sweep failed: {e}")
+            return
+        archived = sum(stats.values())
+        if archived:
+            self.stdout.write(f"Archived {archived} soft-deleted rows")
+
+    def snapshot_ledger(self) -> None:
+        try:
+            taken = LedgerService().snapshot()
+        except Exception as e:
+            self.stderr.write(f"Ledger snapshot sweep failed: {e}")
+            return
+        if taken:
+            self.stdout.write(f"Took {taken} balance snapshots")
+
+    def work(self, worker_id: str, poll_interval: float, once: bool) -> None:
+        service = JobService()
+        try:
+            while not self.stopping.is_set():
+                close_old_connections()
+                job = service.claim_next(worker_id)
+                if job is None:
+                    if once:
+                        return
+                    self.stopping.wait(poll_interval)
+                    continue
+
+                self.stdout.write(f"[{worker_id}] running job {job.id} ({job.kind})")
+                service.run(job)
+                job.refresh_from_db(fields=["status"])
+                self.stdout.write(f"[{worker_id}] job {job.id} {job.status}")
+        finally:
+            # The worker thread ends here, so its connections are closed for good
+            connections.close_all()
@@ -0,0 +1,21 @@
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+from api.features.finance.services.ledger_service import LedgerService
+
+
+class Command(BaseCommand):
+    help = "Checkpoint account balance ledgers so balance lookups only sum a short tail"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--user", type=int, help="Only snapshot this user's accounts")
+        parser.add_argument(
+            "--every",
+            type=int,
+            default=settings.FINANCE_LEDGER_SNAPSHOT_EVERY,
+            help="Snapshot after this many entries; months that have ended always get one",
+        )
+
+    def handle(self, *args, **options):
+        taken = LedgerService().snapshot(user_id=options["user"], every=options["every"])
+        self.stdout.write(self.style.SUCCESS(f"Took {taken} balance snapshots"))
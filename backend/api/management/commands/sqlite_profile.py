@@ -0,0 +1,120 @@
+import statistics
+import threading
+import time
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.db import OperationalError, connection, connections, transaction
+
+from core.sqlite import SQLITE_PROFILE_PRAGMAS
+
+BENCHMARK_TABLES = ("benchmark_sqlite_accounts", "benchmark_sqlite_entries")
+
+
+class Command(BaseCommand):
+    help = "Show the active SQLite pragmas and optionally benchmark concurrent writers"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--benchmark", action="store_true", help="Run the concurrent-writer benchmark"
+        )
+        parser.add_argument("--writers", type=int, default=8, help="Concurrent writer threads")
+        parser.add_argument(
+            "--seconds", type=float, default=5.0, help="How long each writer keeps writing"
+        )
+
+    def handle(self, *args, **options):
+        if connection.vendor != "sqlite":
+            raise CommandError(f"The default database is {connection.vendor}, not SQLite")
+
+        self.report_pragmas()
+        if options["benchmark"]:
+            self.benchmark(options["writers"], options["seconds"])
+
+    def report_pragmas(self):
+        profile = "on" if settings.SQLITE_PRAGMAS else "off"
+        mode = settings.DATABASES["default"]["OPTIONS"].get("transaction_mode", "DEFERRED")
+        self.stdout.write(f"Performance profile: {profile} (transaction mode {mode})")
+        with connection.cursor() as cursor:
+            for name in SQLITE_PROFILE_PRAGMAS:
+                cursor.execute(f"PRAGMA {name}")
+                value = cursor.fetchone()[0]
+                self.stdout.write(f"  {name:<14} {value}")
+
+    def benchmark(self, writers: int, seconds: float):
+        with connection.cursor() as cursor:
+            self._drop_tables(cursor)
+            cursor.execute(
+                "CREATE TABLE benchmark_sqlite_accounts (id INTEGER PRIMARY KEY, balance INTEGER)"
+            )
+            cursor.execute(
+                "CREATE TABLE benchmark_sqlite_entries "
+                "(id INTEGER PRIMARY KEY, account_id INTEGER, amount INTEGER)"
+            )
+            cursor.executemany(
+                "INSERT INTO benchmark_sqlite_accounts (id, balance) VALUES (%s, 0)",
+                [(n,) for n in range(writers)],
+            )
+
+        latencies, failures = [], []
+        lock = threading.Lock()
+        deadline = time.monotonic() + seconds
+
+        def write(account_id: int):
+            done, failed = [], 0
+            try:
+                while time.monotonic() < deadline:
+                    started = time.perf_counter()
+                    try:
+                        # Read-then-write, like a savings transfer checking the balance first
+                        with transaction.atomic(), connection.cursor() as cursor:
+                            cursor.execute(
+                                "SELECT balance FROM benchmark_sqlite_accounts WHERE id = %s",
+                                [account_id],
+                            )
+                            balance = cursor.fetchone()[0]
+                            cursor.execute(
+                                "UPDATE benchmark_sqlite_accounts SET balance = %s WHERE id = %s",
+                                [balance + 1, account_id],
+                            )
+                            cursor.execute(
+                                "INSERT INTO benchmark_sqlite_entries (account_id, amount) "
+                                "VALUES (%s, 1)",
+                                [account_id],
+                            )
+                        done.append(time.perf_counter() - started)
+                    except OperationalError:
+                        failed += 1
+            finally:
+                connections.close_all()
+            with lock:
+                latencies.extend(done)
+                failures.append(failed)
+
+        threads = [threading.Thread(target=write, args=(n,)) for n in range(writers)]
+        started = time.perf_counter()
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        elapsed = time.perf_counter() - started
+
+        with connection.cursor() as cursor:
+            self._drop_tables(cursor)
+
+        failed = sum(failures)
+        self.stdout.write(f"Benchmark: {writers} writers for {seconds:g}s")
+        self.stdout.write(f"  commits        {len(latencies)} ({len(latencies) / elapsed:.0f}/s)")
+        if latencies:
+            ordered = sorted(latencies)
+            p95 = ordered[min(len(ordered) - 1, int(len(ordered) * 0.95))]
+            self.stdout.write(
+                f"  latency        p50 {statistics.median(ordered) * 1000:.2f} ms, "
+                f"p95 {p95 * 1000:.2f} ms, max {ordered[-1] * 1000:.2f} ms"
+            )
+        style = self.style.ERROR if failed else self.style.SUCCESS
+        self.stdout.write(style(f"  locked errors  {failed}"))
+
+    def _drop_tables(self, cursor):
+        for table in BENCHMARK_TABLES:
+            cursor.execute(f"DROP TABLE IF EXISTS {table}")
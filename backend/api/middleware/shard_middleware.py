@@ -0,0 +1,16 @@
+from core.db_router import request_scope
+
+
+class ShardMiddleware:
+    """
+    Makes the request visible to core.db_router, so finance queries go to the shard of
+    request.user. Ninja only authenticates inside the view, which is why the router
+    reads the user lazily instead of this middleware resolving it up front.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        with request_scope(request):
+            return self.get_response(request)
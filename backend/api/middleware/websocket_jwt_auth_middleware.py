@@ -1,3 +1,6 @@
+import threading
+import time
+from typing import Dict, Tuple
 from urllib.parse import parse_qs
 
 from channels.db import database_sync_to_async
@@ -6,15 +9,55 @@ from django.contrib.auth.models import AnonymousUser, User
 from jwt.exceptions import InvalidTokenError
 from ninja_jwt.tokens import AccessToken
 
+# Reconnect storms reuse the same token, so remember the user briefly instead of
+# querying for it on every connect. Kept short so deactivations apply quickly.
+TOKEN_CACHE_TTL = 60
+TOKEN_CACHE_MAX_SIZE = 10000
+
+_token_cache: Dict[str, Tuple[float, User]] = {}
+_token_cache_lock = threading.Lock()
+
+
+def _cached_user(token_string: str):
+    now = time.monotonic()
+    with _token_cache_lock:
+        cached = _token_cache.get(token_string)
+        if cached and cached[0] > now:
+            return cached[1]
+        _token_cache.pop(token_string, None)
+    return None
+
+
+def _cache_user(token_string: str, user: User, token_exp: float) -> None:
+    # Never cache past the token's own expiry
+    ttl = min(TOKEN_CACHE_TTL, token_exp - time.time())
+    if ttl <= 0:
+        return
+    with _token_cache_lock:
+        if len(_token_cache) >= TOKEN_CACHE_MAX_SIZE:
+            now = time.monotonic()
+            for key in [k for k, (expires, _) in _token_cache.items() if expires <= now]:
+                del _token_cache[key]
+            if len(_token_cache) >= TOKEN_CACHE_MAX_SIZE:
+                _token_cache.clear()
+        _token_cache[token_string] = (time.monotonic() + ttl, user)
+
 
 @database_sync_to_async
 def get_user_from_token(token_string):
     """Validate JWT token and return user"""
     try:
+        # Signature and expiry are checked on every connect; only the lookup is cached
         access_token = AccessToken(token_string)
+        user = _cached_user(token_string)
+        if user is not None:
+            return user
+
         user_id = access_token.payload.get("user_id")
         if user_id:
-            return User.objects.get(id=user_id)
+            user = User.objects.get(id=user_id)
+            _cache_user(token_string, user, access_token.payload.get("exp", 0))
+            return user
     except (InvalidTokenError, User.DoesNotExist):
         pass
     return AnonymousUser()
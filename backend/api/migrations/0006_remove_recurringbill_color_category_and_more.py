@@ -9,28 +9,30 @@ def migrate_categories(apps, schema_editor):
     Category = apps.get_model("api", "Category")
     RecurringBill = apps.get_model("api", "RecurringBill")
     Expense = apps.get_model("api", "Expense")
+    # Explicit so the migration also runs against the finance shards
+    database = schema_editor.connection.alias
 
     # Migrate RecurringBill categories
-    for bill in RecurringBill.objects.all():
+    for bill in RecurringBill.objects.using(database):
         if hasattr(bill, "category_old") and bill.category_old:
             cat_name = bill.category_old.strip()
             if cat_name:
-                category, _ = Category.objects.get_or_create(
-                    user=bill.user, name=cat_name, defaults={"type": "bill"}
+                category, _ = Category.objects.using(database).get_or_create(
+                    user_id=bill.user_id, name=cat_name, defaults={"type": "bill"}
                 )
                 bill.category = category
-                bill.save()
+                bill.save(using=database)
 
     # Migrate Expense categories
-    for expense in Expense.objects.all():
+    for expense in Expense.objects.using(database):
         if hasattr(expense, "category_old") and expense.category_old:
             cat_name = expense.category_old.strip()
             if cat_name:
-                category, _ = Category.objects.get_or_create(
-                    user=expense.user, name=cat_name, defaults={"type": "expense"}
+                category, _ = Category.objects.using(database).get_or_create(
+                    user_id=expense.user_id, name=cat_name, defaults={"type": "expense"}
                 )
                 expense.category = category
-                expense.save()
+                expense.save(using=database)
 
 
 class Migration(migrations.Migration):
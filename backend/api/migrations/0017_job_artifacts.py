@@ -0,0 +1,46 @@
+# Generated by Django 5.2.18 on 2026-10-19 17:26
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("api", "0016_job"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="job",
+            name="expires_at",
+            field=models.DateTimeField(blank=True, db_index=True, null=True),
+        ),
+        migrations.AddField(
+            model_name="job",
+            name="output_content_type",
+            field=models.CharField(blank=True, max_length=100),
+        ),
+        migrations.AddField(
+            model_name="job",
+            name="output_filename",
+            field=models.CharField(blank=True, max_length=255),
+        ),
+        migrations.AlterField(
+            model_name="job",
+            name="kind",
+            field=models.CharField(
+                choices=[
+                    ("export", "Finance export"),
+                    ("import", "Finance import"),
+                    ("export_csv", "CSV balance report"),
+                    ("import_csv", "CSV bill import"),
+                    ("export_columnar", "Columnar table export"),
+                ],
+                max_length=32,
+            ),
+        ),
+        migrations.AlterField(
+            model_name="job",
+            name="output_file",
+            field=models.FileField(blank=True, null=True, upload_to="jobs/artifacts/"),
+        ),
+    ]
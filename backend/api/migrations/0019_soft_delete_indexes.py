@@ -0,0 +1,99 @@
+# Generated by Django 5.2.18 on 2026-10-19 17:45
+
+import django.db.models.manager
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("api", "0018_finance_change_log"),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AlterModelManagers(
+            name="category",
+            managers=[
+                ("all_objects", django.db.models.manager.Manager()),
+            ],
+        ),
+        migrations.AlterModelManagers(
+            name="expense",
+            managers=[
+                ("all_objects", django.db.models.manager.Manager()),
+            ],
+        ),
+        migrations.AlterModelManagers(
+            name="paycheck",
+            managers=[
+                ("all_objects", django.db.models.manager.Manager()),
+            ],
+        ),
+        migrations.AlterModelManagers(
+            name="recurringbill",
+            managers=[
+                ("all_objects", django.db.models.manager.Manager()),
+            ],
+        ),
+        migrations.AlterModelManagers(
+            name="savingsrecurringdeposit",
+            managers=[
+                ("all_objects", django.db.models.manager.Manager()),
+            ],
+        ),
+        migrations.AlterModelManagers(
+            name="savingstransaction",
+            managers=[
+                ("all_objects", django.db.models.manager.Manager()),
+            ],
+        ),
+        migrations.AddIndex(
+            model_name="category",
+            index=models.Index(
+                condition=models.Q(("is_deleted", False)),
+                fields=["user"],
+                name="category_live_user_idx",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="expense",
+            index=models.Index(
+                condition=models.Q(("is_deleted", False)),
+                fields=["user", "date"],
+                name="expense_live_user_date_idx",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="paycheck",
+            index=models.Index(
+                condition=models.Q(("is_deleted", False)),
+                fields=["user", "date"],
+                name="paycheck_live_user_date_idx",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="recurringbill",
+            index=models.Index(
+                condition=models.Q(("is_deleted", False)),
+                fields=["user"],
+                name="recurringbill_live_user_idx",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="savingsrecurringdeposit",
+            index=models.Index(
+                condition=models.Q(("is_deleted", False)),
+                fields=["user"],
+                name="savingsdeposit_live_user_idx",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="savingstransaction",
+            index=models.Index(
+                condition=models.Q(("is_deleted", False)),
+                fields=["user", "date"],
+                name="savingstx_live_user_date_idx",
+            ),
+        ),
+    ]
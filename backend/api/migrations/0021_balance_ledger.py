@@ -0,0 +1,120 @@
+# Generated by Django 5.2.18 on 2026-10-19 18:06
+
+import django.db.models.deletion
+import django.utils.timezone
+from django.conf import settings
+from django.db import migrations, models
+
+
+def open_ledgers(apps, schema_editor):
+    """Start every account's ledger with its current balance"""
+    BalanceLedgerEntry = apps.get_model("api", "BalanceLedgerEntry")
+    database = schema_editor.connection.alias
+    entries = []
+    for model_name, account in (("FinanceAccount", "checking"), ("SavingsAccount", "savings")):
+        model = apps.get_model("api", model_name)
+        for user_id, balance in (
+            model.objects.using(database)
+            .exclude(current_balance=0)
+            .values_list("user_id", "current_balance")
+        ):
+            entries.append(
+                BalanceLedgerEntry(user_id=user_id, account=account, kind="opening", amount=balance)
+            )
+    BalanceLedgerEntry.objects.using(database).bulk_create(entries, batch_size=500)
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("api", "0020_finance_archive"),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="BalanceLedgerEntry",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True, primary_key=True, serialize=False, verbose_name="ID"
+                    ),
+                ),
+                (
+                    "account",
+                    models.CharField(
+                        choices=[("checking", "Checking"), ("savings", "Savings")], max_length=8
+                    ),
+                ),
+                (
+                    "kind",
+                    models.CharField(
+                        choices=[
+                            ("opening", "Opening balance"),
+                            ("adjustment", "Adjustment"),
+                            ("transfer", "Transfer"),
+                            ("reversal", "Reversal"),
+                        ],
+                        max_length=10,
+                    ),
+                ),
+                ("amount", models.DecimalField(decimal_places=2, max_digits=14)),
+                ("model", models.CharField(blank=True, max_length=32)),
+                ("object_id", models.BigIntegerField(blank=True, null=True)),
+                ("created_at", models.DateTimeField(default=django.utils.timezone.now)),
+                (
+                    "user",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="balance_ledger",
+                        to=settings.AUTH_USER_MODEL,
+                    ),
+                ),
+            ],
+            options={
+                "indexes": [
+                    models.Index(
+                        fields=["user", "account", "id"], name="api_balance_user_id_33043b_idx"
+                    )
+                ],
+            },
+        ),
+        migrations.CreateModel(
+            name="BalanceSnapshot",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True, primary_key=True, serialize=False, verbose_name="ID"
+                    ),
+                ),
+                (
+                    "account",
+                    models.CharField(
+                        choices=[("checking", "Checking"), ("savings", "Savings")], max_length=8
+                    ),
+                ),
+                ("last_entry_id", models.BigIntegerField()),
+                ("balance", models.DecimalField(decimal_places=2, max_digits=14)),
+                ("as_of", models.DateTimeField()),
+                ("created_at", models.DateTimeField(auto_now_add=True)),
+                (
+                    "user",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="balance_snapshots",
+                        to=settings.AUTH_USER_MODEL,
+                    ),
+                ),
+            ],
+            options={
+                "indexes": [
+                    models.Index(
+                        fields=["user", "account", "as_of"], name="api_balance_user_id_176a7f_idx"
+                    )
+                ],
+                "unique_together": {("user", "account", "last_entry_id")},
+            },
+        ),
+        migrations.RunPython(open_ledgers, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,106 @@
+# Generated by Django 5.2.18 on 2026-10-19 18:13
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("api", "0021_balance_ledger"),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.RemoveIndex(
+            model_name="expense",
+            name="expense_live_user_date_idx",
+        ),
+        migrations.RemoveIndex(
+            model_name="paycheck",
+            name="paycheck_live_user_date_idx",
+        ),
+        migrations.RemoveIndex(
+            model_name="recurringbill",
+            name="recurringbill_live_user_idx",
+        ),
+        migrations.RemoveIndex(
+            model_name="savingsrecurringdeposit",
+            name="savingsdeposit_live_user_idx",
+        ),
+        migrations.RemoveIndex(
+            model_name="savingstransaction",
+            name="savingstx_live_user_date_idx",
+        ),
+        migrations.AddIndex(
+            model_name="expense",
+            index=models.Index(
+                condition=models.Q(("is_deleted", False)),
+                fields=["user", "date", "id"],
+                name="expense_live_date_id_idx",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="expense",
+            index=models.Index(
+                condition=models.Q(("is_deleted", False)),
+                fields=["user", "category", "date", "id"],
+                name="expense_live_cat_date_idx",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="expense",
+            index=models.Index(
+                condition=models.Q(("is_deleted", False)),
+                fields=["user", "related_bill", "date", "id"],
+                name="expense_live_bill_date_idx",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="paycheck",
+            index=models.Index(
+                condition=models.Q(("is_deleted", False)),
+                fields=["user", "date", "id"],
+                name="paycheck_live_date_id_idx",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="paycheck",
+            index=models.Index(
+                condition=models.Q(("is_deleted", False)),
+                fields=["user", "category", "date", "id"],
+                name="paycheck_live_cat_date_idx",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="recurringbill",
+            index=models.Index(
+                condition=models.Q(("is_deleted", False)),
+                fields=["user", "start_date", "id"],
+                name="recurringbill_live_date_idx",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="recurringbill",
+            index=models.Index(
+                condition=models.Q(("is_deleted", False)),
+                fields=["user", "category", "start_date", "id"],
+                name="recurringbill_live_cat_idx",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="savingsrecurringdeposit",
+            index=models.Index(
+                condition=models.Q(("is_deleted", False)),
+                fields=["user", "start_date", "id"],
+                name="savingsdeposit_live_date_idx",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="savingstransaction",
+            index=models.Index(
+                condition=models.Q(("is_deleted", False)),
+                fields=["user", "date", "id"],
+                name="savingstx_live_date_id_idx",
+            ),
+        ),
+    ]
@@ -0,0 +1,150 @@
+# Generated by Django 5.2.18 on 2026-10-19 18:31
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("api", "0022_keyset_list_indexes"),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name="category",
+            name="revision",
+            field=models.BigIntegerField(default=0),
+        ),
+        migrations.AlterField(
+            model_name="expense",
+            name="revision",
+            field=models.BigIntegerField(default=0),
+        ),
+        migrations.AlterField(
+            model_name="financeaccount",
+            name="revision",
+            field=models.BigIntegerField(default=0),
+        ),
+        migrations.AlterField(
+            model_name="paycheck",
+            name="revision",
+            field=models.BigIntegerField(default=0),
+        ),
+        migrations.AlterField(
+            model_name="recurringbill",
+            name="revision",
+            field=models.BigIntegerField(default=0),
+        ),
+        migrations.AlterField(
+            model_name="savingsaccount",
+            name="revision",
+            field=models.BigIntegerField(default=0),
+        ),
+        migrations.AlterField(
+            model_name="savingsrecurringdeposit",
+            name="revision",
+            field=models.BigIntegerField(default=0),
+        ),
+        migrations.AlterField(
+            model_name="savingstransaction",
+            name="revision",
+            field=models.BigIntegerField(default=0),
+        ),
+        migrations.AddIndex(
+            model_name="category",
+            index=models.Index(
+                condition=models.Q(("is_deleted", False)),
+                fields=["user", "revision"],
+                name="category_live_rev_idx",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="category",
+            index=models.Index(
+                condition=models.Q(("is_deleted", True)),
+                fields=["user", "revision"],
+                name="category_deleted_rev_idx",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="expense",
+            index=models.Index(
+                condition=models.Q(("is_deleted", False)),
+                fields=["user", "revision"],
+                name="expense_live_rev_idx",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="expense",
+            index=models.Index(
+                condition=models.Q(("is_deleted", True)),
+                fields=["user", "revision"],
+                name="expense_deleted_rev_idx",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="paycheck",
+            index=models.Index(
+                condition=models.Q(("is_deleted", False)),
+                fields=["user", "revision"],
+                name="paycheck_live_rev_idx",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="paycheck",
+            index=models.Index(
+                condition=models.Q(("is_deleted", True)),
+                fields=["user", "revision"],
+                name="paycheck_deleted_rev_idx",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="recurringbill",
+            index=models.Index(
+                condition=models.Q(("is_deleted", False)),
+                fields=["user", "revision"],
+                name="recurringbill_live_rev_idx",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="recurringbill",
+            index=models.Index(
+                condition=models.Q(("is_deleted", True)),
+                fields=["user", "revision"],
+                name="recurringbill_deleted_rev_idx",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="savingsrecurringdeposit",
+            index=models.Index(
+                condition=models.Q(("is_deleted", False)),
+                fields=["user", "revision"],
+                name="savingsdeposit_live_rev_idx",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="savingsrecurringdeposit",
+            index=models.Index(
+                condition=models.Q(("is_deleted", True)),
+                fields=["user", "revision"],
+                name="savingsdeposit_deleted_rev_idx",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="savingstransaction",
+            index=models.Index(
+                condition=models.Q(("is_deleted", False)),
+                fields=["user", "revision"],
+                name="savingstx_live_rev_idx",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="savingstransaction",
+            index=models.Index(
+                condition=models.Q(("is_deleted", True)),
+                fields=["user", "revision"],
+                name="savingstx_deleted_rev_idx",
+            ),
+        ),
+    ]
@@ -1,21 +1,37 @@
 from api.features.finance.models import (
+    BalanceLedgerEntry,
+    BalanceSnapshot,
     Expense,
     FinanceAccount,
+    FinanceArchive,
+    FinanceChangeCursor,
+    FinanceChangeLog,
+    FinanceRevision,
     Paycheck,
     RecurringBill,
     SavingsAccount,
     SavingsRecurringDeposit,
     SavingsTransaction,
+    TransactionFingerprint,
 )
+from api.features.jobs.models import Job
 from api.features.users.models import Profile
 
 __all__ = [
     "Profile",
     "FinanceAccount",
+    "FinanceRevision",
+    "FinanceChangeLog",
+    "FinanceChangeCursor",
+    "FinanceArchive",
+    "BalanceLedgerEntry",
+    "BalanceSnapshot",
     "RecurringBill",
     "Paycheck",
     "Expense",
     "SavingsAccount",
     "SavingsRecurringDeposit",
     "SavingsTransaction",
+    "TransactionFingerprint",
+    "Job",
 ]
@@ -14,7 +14,9 @@ import decimal
 import os
 from pathlib import Path
 
+from core.db_router import REPLICA_ALIAS, SHARD_ALIAS_PREFIX
 from core.services import config_service
+from core.sqlite import SQLITE_PROFILE_PRAGMAS
 
 # Set global decimal precision to handle large financial calculations and long-term projections
 # without triggering InvalidOperation (which can happen at the default 28 precision
@@ -93,6 +95,7 @@ MIDDLEWARE = [
     "django.contrib.messages.middleware.MessageMiddleware",
     "django.middleware.clickjacking.XFrameOptionsMiddleware",
     "api.middleware.logging_middleware.LoggingMiddleware",
+    "api.middleware.shard_middleware.ShardMiddleware",
 ]
 
 CORS_ALLOWED_ORIGINS = [
@@ -117,7 +120,14 @@ TEMPLATES = [
     },
 ]
 
-CHANNEL_LAYERS = {"default": {"BACKEND": "channels.layers.InMemoryChannelLayer"}}
+# Backed by a SQLite file next to the database, so every daphne process and the run_jobs
+# workers on this host share websocket groups without needing Redis
+CHANNEL_LAYERS = {
+    "default": {
+        "BACKEND": "core.channel_layers.SQLiteChannelLayer",
+        "CONFIG": {"path": BASE_DIR / "db" / "channels.sqlite3"},
+    }
+}
 
 WSGI_APPLICATION = "config.wsgi.application"
 
@@ -125,12 +135,107 @@ WSGI_APPLICATION = "config.wsgi.application"
 # Database
 # https://docs.djangoproject.com/en/5.2/ref/settings/#databases
 
-DATABASES = {
-    "default": {
+# Configured through the "database" section of config.json; SQLite unless told otherwise
+DATABASE_CONFIG = CONFIG.database if CONFIG else config_service.DatabaseConfig()
+_database_pooled = DATABASE_CONFIG.engine == "postgresql" and DATABASE_CONFIG.pool
+
+if DATABASE_CONFIG.engine == "postgresql":
+    _database_options = dict(DATABASE_CONFIG.options)
+    if _database_pooled:
+        _database_options["pool"] = {
+            "min_size": DATABASE_CONFIG.pool_min_size,
+            "max_size": DATABASE_CONFIG.pool_max_size,
+        }
+    _default_database = {
+        "ENGINE": "django.db.backends.postgresql",
+        "NAME": DATABASE_CONFIG.name or "bruhfinance",
+        "USER": DATABASE_CONFIG.user,
+        # The password may come from the environment instead, like SECRET_KEY
+        "PASSWORD": os.environ.get("DATABASE_PASSWORD") or DATABASE_CONFIG.password,
+        "HOST": DATABASE_CONFIG.host,
+        "PORT": DATABASE_CONFIG.port,
+        "OPTIONS": _database_options,
+    }
+else:
+    _default_database = {
         "ENGINE": "django.db.backends.sqlite3",
-        "NAME": BASE_DIR / "db" / "db.sqlite3",
+        "NAME": BASE_DIR / (DATABASE_CONFIG.name or "db/db.sqlite3"),
+        "OPTIONS": dict(DATABASE_CONFIG.options),
     }
-}
+    if DATABASE_CONFIG.sqlite_profile:
+        # Take the write lock when a transaction starts, so concurrent writers queue on
+        # busy_timeout instead of failing when a read transaction tries to upgrade
+        _default_database["OPTIONS"].setdefault("transaction_mode", "IMMEDIATE")
+
+# Applied to every new SQLite connection by core.sqlite.apply_sqlite_pragmas
+SQLITE_PRAGMAS = (
+    {**SQLITE_PROFILE_PRAGMAS, **DATABASE_CONFIG.sqlite_pragmas}
+    if DATABASE_CONFIG.engine == "sqlite" and DATABASE_CONFIG.sqlite_profile
+    else {}
+)
+
+# Pooled connections go back to the pool after each request, so Django must not also
+# hold them open itself
+_default_database["CONN_MAX_AGE"] = 0 if _database_pooled else DATABASE_CONFIG.conn_max_age
+_default_database["CONN_HEALTH_CHECKS"] = DATABASE_CONFIG.conn_health_checks
+
+DATABASES = {"default": _default_database}
+
+# Optional read alias that report endpoints use once it has caught up with the user's
+# writes (see core.db_router and api.features.finance.utils.report_database)
+DATABASE_REPLICA_REFRESH_SECONDS = 0
+if DATABASE_CONFIG.replica:
+    _replica = DATABASE_CONFIG.replica
+    if DATABASE_CONFIG.engine == "postgresql":
+        _replica_database = {
+            **_default_database,
+            "NAME": _replica.name or _default_database["NAME"],
+            "USER": _replica.user or _default_database["USER"],
+            "PASSWORD": os.environ.get("DATABASE_REPLICA_PASSWORD")
+            or _replica.password
+            or _default_database["PASSWORD"],
+            "HOST": _replica.host or _default_database["HOST"],
+            "PORT": _replica.port or _default_database["PORT"],
+            "OPTIONS": dict(_default_database["OPTIONS"]),
+        }
+    else:
+        # A backup copy that is replaced wholesale on refresh, never modified in place,
+        # so it can be opened read-only and immutable (no locking at all)
+        DATABASE_REPLICA_PATH = BASE_DIR / (_replica.name or "db/replica.sqlite3")
+        DATABASE_REPLICA_REFRESH_SECONDS = _replica.refresh_seconds
+        _replica_database = {
+            **_default_database,
+            "NAME": f"file:{DATABASE_REPLICA_PATH}?mode=ro&immutable=1",
+            "OPTIONS": {"uri": True},
+            # Reopen per request so a refreshed copy is picked up straight away
+            "CONN_MAX_AGE": 0,
+        }
+    _replica_database["TEST"] = {"MIRROR": "default"}
+    DATABASES[REPLICA_ALIAS] = _replica_database
+    DATABASE_ROUTERS = ["core.db_router.PrimaryReplicaRouter"]
+
+# Optional per-user shards for finance rows (see core.db_router.UserShardRouter). Auth,
+# profiles and jobs stay on the default database; migrate_shards prepares the shards.
+DATABASE_SHARDS = []
+DATABASE_SHARDED_MODULES = ["api.features.finance.models"]
+if DATABASE_CONFIG.shards:
+    if DATABASE_CONFIG.replica:
+        raise ValueError("A read replica cannot be combined with database shards")
+    for _index in range(DATABASE_CONFIG.shards):
+        _alias = f"{SHARD_ALIAS_PREFIX}{_index}"
+        if DATABASE_CONFIG.engine == "postgresql":
+            _shard_name = f"{_default_database['NAME']}_shard_{_index}"
+        else:
+            _shard_name = _default_database["NAME"].with_name(
+                f"{_default_database['NAME'].stem}_shard_{_index}.sqlite3"
+            )
+        DATABASES[_alias] = {
+            **_default_database,
+            "NAME": _shard_name,
+            "OPTIONS": dict(_default_database["OPTIONS"]),
+        }
+        DATABASE_SHARDS.append(_alias)
+    DATABASE_ROUTERS = ["core.db_router.UserShardRouter"]
 
 STORAGES = {
     "default": {
@@ -179,10 +284,28 @@ USE_TZ = True
 STATIC_URL = "static/"
 MEDIA_URL = "/media/"
 
-FILE_UPLOAD_MAX_MEMORY_SIZE = 100 * 1024 * 1024  # 100MB
+# Uploaded files above this size are spooled to a temporary file on disk instead of memory,
+# which lets /finance/import/stream restore backups far larger than the in-memory limit
+FILE_UPLOAD_MAX_MEMORY_SIZE = 5 * 1024 * 1024  # 5MB
 DATA_UPLOAD_MAX_MEMORY_SIZE = 100 * 1024 * 1024  # 100MB
 
 MEDIA_ROOT = CONFIG.media_root if CONFIG else (BASE_DIR / "media")
+
+# Files produced by background export jobs expire and are removed by cleanup_artifacts
+JOB_ARTIFACT_TTL_HOURS = 24
+# Signed download links are short-lived so they are safe to hand to the browser
+JOB_ARTIFACT_URL_MAX_AGE = 300
+# When true, downloads are answered with X-Accel-Redirect and nginx streams the file
+JOB_ARTIFACT_ACCEL_REDIRECT = CONFIG.accel_redirect if CONFIG else False
+# Rows soft-deleted longer ago than this are moved to the cold archive by run_jobs
+FINANCE_ARCHIVE_AFTER_DAYS = 90
+# run_jobs checkpoints an account's balance ledger after this many entries (and monthly)
+FINANCE_LEDGER_SNAPSHOT_EVERY = 500
+# Most creates, updates and deletes one /bulk request may carry
+FINANCE_BULK_MAX_ITEMS = 1000
+# Rows per page of the finance list endpoints, unless the client asks for fewer or more
+FINANCE_PAGE_SIZE = 200
+FINANCE_MAX_PAGE_SIZE = 1000
 STATIC_ROOT = os.path.join(BASE_DIR, "static")
 
 # Default primary key field type
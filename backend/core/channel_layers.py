@@ -0,0 +1,271 @@
+import asyncio
+import json
+import os
+import sqlite3
+import threading
+import time
+import uuid
+import weakref
+from typing import Any, Dict, List, Tuple
+
+from channels.exceptions import ChannelFull
+from channels.layers import BaseChannelLayer
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS channel_messages (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    channel TEXT NOT NULL,
+    body TEXT NOT NULL,
+    expires REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS channel_messages_channel ON channel_messages (channel, id);
+CREATE TABLE IF NOT EXISTS channel_groups (
+    group_name TEXT NOT NULL,
+    channel TEXT NOT NULL,
+    expires REAL NOT NULL,
+    PRIMARY KEY (group_name, channel)
+);
+"""
+
+
+class SQLiteChannelLayer(BaseChannelLayer):
+    """
+    Channel layer backed by a SQLite file, so several daphne processes and the
+    run_jobs workers on one host can reach each other's websockets without Redis.
+
+    Messages for this process's specific channels are fetched by a single poller
+    per event loop, which only queries the table when PRAGMA data_version says
+    another connection has committed something. Specific channel names carry a
+    prefix of the loop that created them, so each poller claims only its own loop's
+    messages; such a channel must be received on the loop that created it.
+    """
+
+    extensions = ["groups", "flush"]
+
+    def __init__(
+        self,
+        path: str = "channels.sqlite3",
+        expiry: int = 60,
+        group_expiry: int = 86400,
+        capacity: int = 100,
+        channel_capacity=None,
+        poll_interval: float = 0.05,
+        **kwargs,
+    ):
+        super().__init__(expiry=expiry, capacity=capacity, channel_capacity=channel_capacity)
+        self.channel_capacity = self.compile_capacities(channel_capacity or {})
+        self.path = str(path)
+        self.group_expiry = group_expiry
+        self.poll_interval = poll_interval
+        self.client_prefix = f"{os.getpid()}{uuid.uuid4().hex[:8]}"
+        self._local = threading.local()
+        self._schema_ready = False
+        self._schema_lock = threading.Lock()
+        # event loop -> (poller task, {channel: queue})
+        self._pollers: Dict[Any, Tuple[asyncio.Task, Dict[str, asyncio.Queue]]] = {}
+        # event loop -> the part of its specific channel names before the "!"
+        self._loop_prefixes: "weakref.WeakKeyDictionary[Any, str]" = weakref.WeakKeyDictionary()
+
+    # Channel layer API
+
+    async def send(self, channel: str, message: Dict[str, Any]) -> None:
+        assert isinstance(message, dict), "message is not a dict"
+        self.require_valid_channel_name(channel)
+        assert "__asgi_channel__" not in message
+        await asyncio.to_thread(self._insert, [channel], message, True)
+
+    async def receive(self, channel: str) -> Dict[str, Any]:
+        self.require_valid_channel_name(channel)
+
+        if "!" in channel:
+            queue = self._local_queue(channel)
+            try:
+                return await queue.get()
+            except asyncio.CancelledError:
+                # The consumer went away, so stop routing messages to it
+                self._release_queue(channel, queue)
+                raise
+
+        # Shared channels may have receivers in other processes, so claim rows directly
+        while True:
+            messages = await asyncio.to_thread(self._claim, channel, False, 1)
+            if messages:
+                return messages[0][1]
+            await asyncio.sleep(self.poll_interval)
+
+    async def new_channel(self, prefix: str = "specific") -> str:
+        return f"{prefix}.{self._loop_prefix()}!{uuid.uuid4().hex[:12]}"
+
+    async def flush(self) -> None:
+        await asyncio.to_thread(self._execute, "DELETE FROM channel_messages")
+        await asyncio.to_thread(self._execute, "DELETE FROM channel_groups")
+
+    async def close(self) -> None:
+        # Only this loop's poller: the others belong to loops still running elsewhere
+        entry = self._pollers.pop(asyncio.get_running_loop(), None)
+        if entry:
+            entry[0].cancel()
+
+    async def group_add(self, group: str, channel: str) -> None:
+        self.require_valid_group_name(group)
+        self.require_valid_channel_name(channel)
+        await asyncio.to_thread(
+            self._execute,
+            "INSERT OR REPLACE INTO channel_groups (group_name, channel, expires) VALUES (?, ?, ?)",
+            (group, channel, time.time() + self.group_expiry),
+        )
+
+    async def group_discard(self, group: str, channel: str) -> None:
+        self.require_valid_group_name(group)
+        self.require_valid_channel_name(channel)
+        await asyncio.to_thread(
+            self._execute,
+            "DELETE FROM channel_groups WHERE group_name = ? AND channel = ?",
+            (group, channel),
+        )
+
+    async def group_send(self, group: str, message: Dict[str, Any]) -> None:
+        assert isinstance(message, dict), "Message is not a dict"
+        self.require_valid_group_name(group)
+        await asyncio.to_thread(self._group_send, group, message)
+
+    # Local fan-out
+
+    def _loop_prefix(self) -> str:
+        loop = asyncio.get_running_loop()
+        prefix = self._loop_prefixes.get(loop)
+        if prefix is None:
+            prefix = self._loop_prefixes[loop] = f"{self.client_prefix}.{uuid.uuid4().hex[:8]}"
+        return prefix
+
+    def _local_queue(self, channel: str) -> asyncio.Queue:
+        loop = asyncio.get_running_loop()
+        entry = self._pollers.get(loop)
+        if entry is None or entry[0].done():
+            queues: Dict[str, asyncio.Queue] = entry[1] if entry else {}
+            entry = (loop.create_task(self._poll(self._loop_prefix(), queues)), queues)
+            self._pollers[loop] = entry
+        return entry[1].setdefault(channel, asyncio.Queue())
+
+    def _release_queue(self, channel: str, queue: asyncio.Queue) -> None:
+        entry = self._pollers.get(asyncio.get_running_loop())
+        if entry and entry[1].get(channel) is queue:
+            entry[1].pop(channel, None)
+
+    async def _poll(self, loop_prefix: str, queues: Dict[str, asyncio.Queue]) -> None:
+        # A dedicated connection, so commits from this process's other connections
+        # still bump the data_version it sees
+        connection = await asyncio.to_thread(self._open, False)
+        try:
+            last_version = None
+            last_claim = 0.0
+            while True:
+                version = await asyncio.to_thread(self._data_version, connection)
+                # Re-check every second too, in case a version change was coalesced
+                if version != last_version or time.monotonic() - last_claim > 1:
+                    claimed = await asyncio.to_thread(
+                        self._claim, f"specific.{loop_prefix}!", True, 500, connection
+                    )
+                    for channel, message in claimed:
+                        # Messages for channels whose consumer has gone are dropped
+                        if channel in queues:
+                            queues[channel].put_nowait(message)
+                    last_claim = time.monotonic()
+                    # A full batch means more may be waiting, so look again right away
+                    last_version = None if len(claimed) == 500 else version
+                    if last_version is None:
+                        continue
+                await asyncio.sleep(self.poll_interval)
+        finally:
+            connection.close()
+
+    # Storage
+
+    def _open(self, check_same_thread: bool = True) -> sqlite3.Connection:
+        connection = sqlite3.connect(
+            self.path, timeout=30, isolation_level=None, check_same_thread=check_same_thread
+        )
+        connection.execute("PRAGMA journal_mode=WAL")
+        connection.execute("PRAGMA synchronous=NORMAL")
+        with self._schema_lock:
+            if not self._schema_ready:
+                connection.executescript(SCHEMA)
+                self._schema_ready = True
+        return connection
+
+    def _connection(self) -> sqlite3.Connection:
+        connection = getattr(self._local, "connection", None)
+        if connection is None:
+            connection = self._local.connection = self._open()
+        return connection
+
+    def _execute(self, sql: str, params: tuple = ()) -> None:
+        self._connection().execute(sql, params)
+
+    def _data_version(self, connection: sqlite3.Connection) -> int:
+        return connection.execute("PRAGMA data_version").fetchone()[0]
+
+    def _insert(self, channels: List[str], message: Dict[str, Any], strict: bool = False) -> None:
+        connection = self._connection()
+        body = json.dumps(message)
+        now = time.time()
+        connection.execute("BEGIN IMMEDIATE")
+        try:
+            for channel in channels:
+                queued = connection.execute(
+                    "SELECT COUNT(*) FROM channel_messages WHERE channel = ? AND expires > ?",
+                    (channel, now),
+                ).fetchone()[0]
+                if queued >= self.get_capacity(channel):
+                    if strict:
+                        raise ChannelFull(channel)
+                    # Group sends skip full channels, like the other layers do
+                    continue
+                connection.execute(
+                    "INSERT INTO channel_messages (channel, body, expires) VALUES (?, ?, ?)",
+                    (channel, body, now + self.expiry),
+                )
+            connection.execute("DELETE FROM channel_messages WHERE expires <= ?", (now,))
+            connection.execute("COMMIT")
+        except BaseException:
+            connection.execute("ROLLBACK")
+            raise
+
+    def _group_send(self, group: str, message: Dict[str, Any]) -> None:
+        channels = [
+            row[0]
+            for row in self._connection().execute(
+                "SELECT channel FROM channel_groups WHERE group_name = ? AND expires > ?",
+                (group, time.time()),
+            )
+        ]
+        if channels:
+            self._insert(channels, message)
+
+    def _claim(
+        self, channel: str, prefix: bool, limit: int, connection: sqlite3.Connection = None
+    ) -> List[Tuple[str, Dict]]:
+        """Delete and return the oldest messages for a channel (or channel name prefix)"""
+        connection = connection or self._connection()
+        if prefix:
+            condition, value = "channel >= ? AND channel < ?", (channel, channel + "\uffff")
+        else:
+            condition, value = "channel = ?", (channel,)
+
+        connection.execute("BEGIN IMMEDIATE")
+        try:
+            rows = connection.execute(
+                f"SELECT id, channel, body FROM channel_messages "
+                f"WHERE {condition} AND expires > ? ORDER BY id LIMIT ?",
+                (*value, time.time(), limit),
+            ).fetchall()
+            if rows:
+                connection.execute(
+                    f"DELETE FROM channel_messages WHERE id IN ({', '.join('?' * len(rows))})",
+                    [row[0] for row in rows],
+                )
+            connection.execute("COMMIT")
+        except BaseException:
+            connection.execute("ROLLBACK")
+            raise
+        return [(row[1], json.loads(row[2])) for row in rows]
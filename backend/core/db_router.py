@@ -0,0 +1,287 @@
+import zlib
+from contextlib import contextmanager
+from contextvars import ContextVar, copy_context
+from typing import Any, Iterable, Iterator, List, Optional, TypeVar
+
+from django.apps import apps
+from django.conf import settings
+from django.db import DEFAULT_DB_ALIAS, connections
+
+REPLICA_ALIAS = "replica"
+SHARD_ALIAS_PREFIX = "shard_"
+# Each shard hands out ids from its own range (the default database keeps the first),
+# so a rebalance can move rows between databases without renumbering them
+SHARD_ID_SPAN = 10**12
+
+T = TypeVar("T")
+
+# Alias that reads in the current context go to; None means the primary
+_read_alias: ContextVar[Optional[str]] = ContextVar("read_alias", default=None)
+# Shard that sharded models use in the current context, when no instance says otherwise
+_shard_alias: ContextVar[Optional[str]] = ContextVar("shard_alias", default=None)
+# The request being handled; its user picks the shard once authentication has run
+_request: ContextVar[Any] = ContextVar("shard_request", default=None)
+
+
+class PrimaryReplicaRouter:
+    """
+    Sends every write, and every read by default, to the primary. Report code opts
+    its reads into the replica with reading_from()/streamed_from().
+    """
+
+    def db_for_read(self, model, **hints):
+        return _read_alias.get()
+
+    def db_for_write(self, model, **hints):
+        return "default"
+
+    def allow_relation(self, obj1, obj2, **hints):
+        # The replica holds copies of the primary's rows, so relations across them are fine
+        return True
+
+    def allow_migrate(self, db, app_label, model_name=None, **hints):
+        # The replica is a copy of the primary; its schema arrives with the data
+        return False if db == REPLICA_ALIAS else None
+
+
+@contextmanager
+def reading_from(alias: Optional[str]):
+    """Route reads inside the block to `alias` (None keeps them on the primary)"""
+    token = _read_alias.set(alias)
+    try:
+        yield
+    finally:
+        _read_alias.reset(token)
+
+
+def streamed_from(alias: Optional[str], iterable: Iterable[T]) -> Iterator[T]:
+    """
+    Route the reads a lazy iterable makes to `alias`. Streaming responses are consumed
+    after the view returns, so the alias (and the request's shard) is applied around
+    each step instead of once.
+    """
+    iterator = iter(iterable)
+    # Captured now, while the view's context is still active, not on the first step
+    context = copy_context()
+
+    def step() -> T:
+        with reading_from(alias):
+            return next(iterator)
+
+    def steps() -> Iterator[T]:
+        while True:
+            try:
+                item = context.run(step)
+            except StopIteration:
+                return
+            yield item
+
+    return steps()
+
+
+def shard_aliases() -> List[str]:
+    """Aliases of the shard databases, empty when sharding is off"""
+    return getattr(settings, "DATABASE_SHARDS", [])
+
+
+def shard_for(user_id: int) -> str:
+    """The shard holding a user's rows; crc32 keeps the choice stable across processes"""
+    aliases = shard_aliases()
+    return aliases[zlib.crc32(str(user_id).encode()) % len(aliases)]
+
+
+def sharded_databases() -> List[str]:
+    """Every database that holds sharded rows: the shards, or just the default database"""
+    return shard_aliases() or [DEFAULT_DB_ALIAS]
+
+
+def database_for_user(user_id: int) -> str:
+    """Alias holding a user's sharded rows: their shard, or the default database"""
+    return shard_for(user_id) if shard_aliases() else DEFAULT_DB_ALIAS
+
+
+def id_floor(alias: str) -> int:
+    """Lowest id the database hands out for sharded tables"""
+    if not alias.startswith(SHARD_ALIAS_PREFIX):
+        return 0
+    return (int(alias[len(SHARD_ALIAS_PREFIX) :]) + 1) * SHARD_ID_SPAN
+
+
+def sharded_models() -> List[Any]:
+    """Models whose rows live on the user's shard"""
+    return [
+        model
+        for model in apps.get_models()
+        if model.__module__ in settings.DATABASE_SHARDED_MODULES
+    ]
+
+
+def reserve_id_range(alias: str, models: Iterable[Any]) -> None:
+    """
+    Point the id sequences of `models` on `alias` past the highest id within the
+    database's own range. Rows moved in from another shard keep their foreign ids
+    and must not drag the sequence into that shard's range. A sequence is never
+    moved back within the range: ids it already handed out may belong to rows that
+    were deleted or archived since, and must not be handed out again.
+    """
+    floor = id_floor(alias)
+    ceiling = floor + SHARD_ID_SPAN
+    connection = connections[alias]
+    with connection.cursor() as cursor:
+        for model in models:
+            table = model._meta.db_table
+            quoted = connection.ops.quote_name(table)
+            cursor.execute(
+                f"SELECT COALESCE(MAX(id), %s) FROM {quoted} WHERE id >= %s AND id < %s",
+                [floor, floor, ceiling],
+            )
+            highest = cursor.fetchone()[0]
+            current = _sequence_value(cursor, connection, table)
+            if floor <= current < ceiling and current >= highest:
+                continue
+            if connection.vendor == "sqlite":
+                # AUTOINCREMENT keeps its counter in sqlite_sequence, one row per table
+                cursor.execute("DELETE FROM sqlite_sequence WHERE name = %s", [table])
+                cursor.execute(
+                    "INSERT INTO sqlite_sequence (name, seq) VALUES (%s, %s)", [table, highest]
+                )
+            else:
+                # A sequence cannot hold 0, so an empty table restarts it at 1 instead
+                cursor.execute(
+                    "SELECT setval(pg_get_serial_sequence(%s, 'id'), %s, %s)",
+                    [table, max(highest, 1), highest > 0],
+                )
+
+
+def reserve_id_block(alias: str, model: Any, above: int, count: int) -> int:
+    """
+    Take `count` consecutive ids for `model` on `alias`, all above `above` and above
+    every id its sequence has handed out, and move the sequence past them before any
+    row uses them. Returns the first id of the block.
+    """
+    table = model._meta.db_table
+    connection = connections[alias]
+    if connection.vendor == "sqlite":
+        # SQLite has a single writer, so the caller's open transaction keeps this safe
+        with connection.cursor() as cursor:
+            start = max(_sequence_value(cursor, connection, table), above) + 1
+            cursor.execute("DELETE FROM sqlite_sequence WHERE name = %s", [table])
+            cursor.execute(
+                "INSERT INTO sqlite_sequence (name, seq) VALUES (%s, %s)",
+                [table, start + count - 1],
+            )
+        return start
+
+    # setval() is not transactional, so other sessions' nextval() sees the block at once.
+    # ALTER SEQUENCE holds off their nextval() until this commits, which a separate
+    # connection does right away rather than at the end of the caller's transaction.
+    reserver = connections.create_connection(alias)
+    try:
+        with reserver.cursor() as cursor:
+            cursor.execute("BEGIN")
+            cursor.execute("SELECT pg_get_serial_sequence(%s, 'id')", [table])
+            sequence = cursor.fetchone()[0]
+            cursor.execute(f"ALTER SEQUENCE {sequence} INCREMENT BY 1")
+            start = max(_sequence_value(cursor, reserver, table), above) + 1
+            cursor.execute("SELECT setval(%s::regclass, %s)", [sequence, start + count - 1])
+            cursor.execute("COMMIT")
+    finally:
+        reserver.close()
+    return start
+
+
+def _sequence_value(cursor, connection, table: str) -> int:
+    if connection.vendor == "sqlite":
+        cursor.execute("SELECT seq FROM sqlite_sequence WHERE name = %s", [table])
+        row = cursor.fetchone()
+        return row[0] if row else 0
+    cursor.execute("SELECT pg_get_serial_sequence(%s, 'id')", [table])
+    sequence = cursor.fetchone()[0]
+    cursor.execute(f"SELECT last_value, is_called FROM {sequence}")
+    last_value, is_called = cursor.fetchone()
+    return last_value if is_called else last_value - 1
+
+
+def mirror_row(instance, alias: str) -> None:
+    """Copy a row into another database as-is, bypassing save() and its signals"""
+    model = type(instance)
+    values = {
+        field.attname: getattr(instance, field.attname) for field in model._meta.concrete_fields
+    }
+    rows = model._base_manager.using(alias)
+    if not rows.filter(pk=instance.pk).update(**values):
+        rows.bulk_create([model(**values)])
+
+
+@contextmanager
+def using_shard(alias: Optional[str]):
+    """Send sharded models to `alias` inside the block"""
+    token = _shard_alias.set(alias)
+    try:
+        yield
+    finally:
+        _shard_alias.reset(token)
+
+
+def using_user_shard(user_id: int):
+    """Send sharded models to the user's shard inside the block (no-op without shards)"""
+    return using_shard(shard_for(user_id) if shard_aliases() else None)
+
+
+@contextmanager
+def request_scope(request):
+    """Let sharded queries made while handling `request` follow request.user"""
+    token = _request.set(request)
+    try:
+        yield
+    finally:
+        _request.reset(token)
+
+
+class UserShardRouter:
+    """
+    Keeps the models listed in settings.DATABASE_SHARDED_MODULES on one shard per user
+    and everything else (auth, profiles, jobs) on the default database. The shard comes
+    from the instance involved, an explicit using_shard() block or the current request's
+    user, in that order; a sharded query with none of them is a bug and raises.
+    """
+
+    def db_for_read(self, model, **hints):
+        return self._route(model, hints)
+
+    def db_for_write(self, model, **hints):
+        return self._route(model, hints)
+
+    def allow_relation(self, obj1, obj2, **hints):
+        # Sharded rows point at the user's mirror in their own shard
+        return True
+
+    def allow_migrate(self, db, app_label, model_name=None, **hints):
+        # Every database gets the full schema; shards simply leave unsharded tables empty
+        return None
+
+    def _route(self, model, hints) -> str:
+        if model.__module__ not in settings.DATABASE_SHARDED_MODULES:
+            return DEFAULT_DB_ALIAS
+
+        instance = hints.get("instance")
+        if instance is not None:
+            if instance._meta.label == settings.AUTH_USER_MODEL and instance.pk:
+                return shard_for(instance.pk)
+            if getattr(instance, "user_id", None):
+                return shard_for(instance.user_id)
+            if instance._state.db in shard_aliases():
+                return instance._state.db
+
+        alias = _shard_alias.get()
+        if alias:
+            return alias
+
+        request = _request.get()
+        user = getattr(request, "user", None)
+        if user is not None and user.is_authenticated:
+            return shard_for(user.pk)
+
+        raise RuntimeError(
+            f"No shard selected for {model.__name__}; wrap the call in using_user_shard()"
+        )
@@ -1,3 +1,3 @@
-from .config_service import Config, ConfigService, get_config
+from .config_service import Config, ConfigService, DatabaseConfig, ReplicaConfig, get_config
 
-__all__ = ["get_config", "Config", "ConfigService"]
+__all__ = ["get_config", "Config", "ConfigService", "DatabaseConfig", "ReplicaConfig"]
@@ -1,9 +1,50 @@
 import json
 from functools import lru_cache
 from pathlib import Path
-from typing import List, Optional
+from typing import Any, Dict, List, Literal, Optional
 
-from pydantic import BaseModel
+from pydantic import BaseModel, Field
+
+
+class ReplicaConfig(BaseModel):
+    # PostgreSQL: the replica's connection settings, where they differ from the primary.
+    # SQLite: `name` is the path of the backup copy (default db/replica.sqlite3).
+    name: Optional[str] = None
+    user: Optional[str] = None
+    password: Optional[str] = None
+    host: Optional[str] = None
+    port: Optional[str] = None
+    # SQLite: seconds between refreshes of the backup copy by run_jobs
+    refresh_seconds: int = 60
+
+
+class DatabaseConfig(BaseModel):
+    engine: Literal["sqlite", "postgresql"] = "sqlite"
+    # SQLite file path (relative to the backend directory) or PostgreSQL database name
+    name: Optional[str] = None
+    user: str = ""
+    password: str = ""
+    host: str = ""
+    port: str = ""
+    # Seconds to keep a connection open between requests; ignored when pooling. Under
+    # ASGI each request may run on a different thread, so persistent connections pile
+    # up; leave this at 0 there and enable `pool` instead.
+    conn_max_age: int = 0
+    conn_health_checks: bool = True
+    # Use psycopg's connection pool (PostgreSQL only, needs psycopg[pool])
+    pool: bool = False
+    pool_min_size: int = 2
+    pool_max_size: int = 10
+    # SQLite only: WAL and tuned pragmas for concurrent writers (see core.sqlite)
+    sqlite_profile: bool = False
+    # Overrides for individual pragmas of that profile, e.g. {"mmap_size": 0}
+    sqlite_pragmas: Dict[str, Any] = Field(default_factory=dict)
+    # Read alias for heavy reports (calendar, summaries, exports); None disables routing
+    replica: Optional[ReplicaConfig] = None
+    # Spread each user's finance rows over this many shard databases (0 keeps one database).
+    # SQLite shards sit next to the main file; PostgreSQL ones are "<name>_shard_<n>".
+    shards: int = 0
+    options: Dict[str, Any] = Field(default_factory=dict)
 
 
 class Config(BaseModel):
@@ -11,6 +52,9 @@ class Config(BaseModel):
     media_root: str
     secret_key: Optional[str] = None
     debug: bool = False
+    # Hand export downloads to the nginx frontend with X-Accel-Redirect
+    accel_redirect: bool = False
+    database: DatabaseConfig = Field(default_factory=DatabaseConfig)
 
 
 class ConfigService:
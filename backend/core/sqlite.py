@@ -0,0 +1,70 @@
+import os
+import re
+import sqlite3
+import tempfile
+from typing import Any, Dict
+
+from django.conf import settings
+
+# Tuned for many concurrent short writers (savings transfers, imports) on one file:
+# WAL lets readers run alongside the writer, NORMAL only fsyncs at checkpoints, and
+# busy_timeout makes writers wait for the lock instead of failing with "database is locked"
+SQLITE_PROFILE_PRAGMAS: Dict[str, Any] = {
+    "journal_mode": "WAL",
+    "synchronous": "NORMAL",
+    "busy_timeout": 5000,
+    "mmap_size": 256 * 1024 * 1024,
+    # Negative values are in KiB, so this is a 64 MB page cache per connection
+    "cache_size": -64 * 1024,
+    "temp_store": "MEMORY",
+}
+
+# The subset that still applies to read-only connections such as the report replica
+READ_ONLY_PRAGMAS = ("mmap_size", "cache_size", "temp_store")
+
+_PRAGMA_NAME = re.compile(r"^[a-z_]+$")
+_PRAGMA_VALUE = re.compile(r"^(-?\d+|[A-Za-z]+)$")
+
+
+def apply_sqlite_pragmas(sender, connection, **kwargs) -> None:
+    """connection_created receiver applying settings.SQLITE_PRAGMAS to new SQLite connections"""
+    pragmas = getattr(settings, "SQLITE_PRAGMAS", None)
+    if connection.vendor != "sqlite" or not pragmas:
+        return
+
+    if "mode=ro" in str(connection.settings_dict["NAME"]):
+        pragmas = {name: value for name, value in pragmas.items() if name in READ_ONLY_PRAGMAS}
+
+    with connection.cursor() as cursor:
+        for name, value in pragmas.items():
+            # Pragmas cannot take bound parameters, so only plain names and values get through
+            if not _PRAGMA_NAME.match(name) or not _PRAGMA_VALUE.match(str(value)):
+                raise ValueError(f"Invalid SQLite pragma {name}={value!r}")
+            cursor.execute(f"PRAGMA {name} = {value}")
+
+
+def refresh_sqlite_replica(source: str, replica: str) -> None:
+    """
+    Copy the primary database into a new file with the online backup API and move it
+    over the replica atomically. Connections already open keep reading the old copy
+    until they reconnect, so readers never see a half-written file.
+    """
+    directory = os.path.dirname(os.path.abspath(replica))
+    os.makedirs(directory, exist_ok=True)
+    fd, temp_path = tempfile.mkstemp(dir=directory, suffix=".tmp")
+    os.close(fd)
+    try:
+        source_connection = sqlite3.connect(source, timeout=30)
+        target_connection = sqlite3.connect(temp_path)
+        try:
+            source_connection.backup(target_connection)
+            # The copy must not depend on -wal/-shm files, which would not move with it
+            target_connection.execute("PRAGMA journal_mode=DELETE")
+        finally:
+            target_connection.close()
+            source_connection.close()
+        os.replace(temp_path, replica)
+    except BaseException:
+        if os.path.exists(temp_path):
+            os.unlink(temp_path)
+        raise
@@ -1,24 +1,16 @@
 import type { Expense } from "@/lib/finance-api";
 import { CreditCard, DollarSign, Calendar } from "lucide-react";
-import { startOfMonth, endOfMonth, isWithinInterval } from "date-fns";
 
 interface ExpensesSummaryProps {
-  expenses: Expense[];
+  // Summed by the server, since the table only holds the pages loaded so far
+  totalAmount: number;
+  thisMonthExpenses: Expense[];
 }
 
-export function ExpensesSummary({ expenses }: ExpensesSummaryProps) {
-  const now = new Date();
-  const startOfThisMonth = startOfMonth(now);
-  const endOfThisMonth = endOfMonth(now);
-
-  const thisMonthExpenses = expenses.filter((e) =>
-    isWithinInterval(new Date(e.date), {
-      start: startOfThisMonth,
-      end: endOfThisMonth,
-    }),
-  );
-
-  const totalAmount = expenses.reduce((sum, e) => sum + e.amount, 0);
+export function ExpensesSummary({
+  totalAmount,
+  thisMonthExpenses,
+}: ExpensesSummaryProps) {
   const thisMonthAmount = thisMonthExpenses.reduce(
     (sum, e) => sum + e.amount,
     0,
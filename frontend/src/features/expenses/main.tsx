@@ -10,7 +10,9 @@ import {
 } from "@/lib/finance-api";
 import { CreditCard, Plus } from "lucide-react";
 import {
-  useExpenses,
+  expenseKeys,
+  useExpensePages,
+  useExpensesBetween,
   useUpdateExpense,
   useDeleteExpense,
 } from "@/hooks/use-expenses";
@@ -18,9 +20,30 @@ import { Loader2, RefreshCw } from "lucide-react";
 import { PageContentLayout } from "@/components/common/page-content-layout";
 import { useState, useEffect } from "react";
 import { Button } from "@/components/ui/button";
+import { endOfMonth, format, startOfMonth } from "date-fns";
+import { useQueryClient } from "@tanstack/react-query";
 
 export default function ExpensesPage() {
-  const { data: expenses, isLoading, isError, error, refetch } = useExpenses();
+  const {
+    data,
+    isLoading,
+    isError,
+    error,
+    fetchNextPage,
+    hasNextPage,
+    isFetchingNextPage,
+  } = useExpensePages();
+  const now = new Date();
+  const { data: thisMonthExpenses = [] } = useExpensesBetween(
+    format(startOfMonth(now), "yyyy-MM-dd"),
+    format(endOfMonth(now), "yyyy-MM-dd"),
+  );
+  const expenses = data?.pages.flatMap((page) => page.items);
+  const totalAmount = data?.pages[0]?.totalAmount ?? 0;
+  const queryClient = useQueryClient();
+  // Reloads the loaded pages and this month's expenses together
+  const refresh = () =>
+    queryClient.invalidateQueries({ queryKey: expenseKeys.lists() });
   const { mutate: updateExpense } = useUpdateExpense();
   const { mutate: deleteExpense } = useDeleteExpense();
   const [isAddDialogOpen, setIsAddDialogOpen] = useState(false);
@@ -69,7 +92,7 @@ export default function ExpensesPage() {
           <Button
             variant="outline"
             size="sm"
-            onClick={() => refetch()}
+            onClick={() => refresh()}
             className="h-8 w-8 p-0"
           >
             <RefreshCw className="h-4 w-4" />
@@ -89,21 +112,38 @@ export default function ExpensesPage() {
       {expenses && expenses.length > 0 ? (
         <>
           <div className="shrink-0 mb-6">
-            <ExpensesSummary expenses={expenses} />
+            <ExpensesSummary
+              totalAmount={totalAmount}
+              thisMonthExpenses={thisMonthExpenses}
+            />
           </div>
 
           <div className="flex-1 min-h-0 overflow-hidden flex flex-col">
+            {/* The API returns pages newest first, so rows are already in order */}
             <ExpensesTable
-              expenses={[...expenses].sort(
-                (a, b) =>
-                  new Date(b.date).getTime() - new Date(a.date).getTime(),
-              )}
+              expenses={expenses}
               onUpdate={(expense: Expense) =>
                 updateExpense({ id: expense.id, expense: expense })
               }
               onDelete={(expenseId: number) => deleteExpense(expenseId)}
             />
           </div>
+
+          {hasNextPage && (
+            <div className="shrink-0 mt-4 flex justify-center">
+              <Button
+                variant="outline"
+                size="sm"
+                onClick={() => fetchNextPage()}
+                disabled={isFetchingNextPage}
+              >
+                {isFetchingNextPage && (
+                  <Loader2 className="h-4 w-4 mr-2 animate-spin" />
+                )}
+                Load more
+              </Button>
+            </div>
+          )}
         </>
       ) : (
         <div className="text-center py-10 text-muted-foreground">
@@ -117,7 +157,7 @@ export default function ExpensesPage() {
         categories={categories}
         recurringBills={recurringBills}
         onSuccess={async () => {
-          await refetch();
+          await refresh();
         }}
         showTrigger={false}
       />
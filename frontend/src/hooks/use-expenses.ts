@@ -1,6 +1,13 @@
-import { useQuery, useMutation, useQueryClient } from "@tanstack/react-query";
+import {
+  useQuery,
+  useInfiniteQuery,
+  useMutation,
+  useQueryClient,
+} from "@tanstack/react-query";
 import {
   getExpenses,
+  getExpensePage,
+  getExpensesBetween,
   getExpense,
   addExpense,
   updateExpense,
@@ -24,6 +31,24 @@ export function useExpenses() {
   });
 }
 
+// Pages are fetched one at a time as the view asks for more
+export function useExpensePages() {
+  return useInfiniteQuery({
+    queryKey: expenseKeys.list("pages"),
+    queryFn: ({ pageParam }) => getExpensePage(pageParam),
+    initialPageParam: null as string | null,
+    getNextPageParam: (lastPage) =>
+      lastPage.hasMore ? lastPage.nextCursor : undefined,
+  });
+}
+
+export function useExpensesBetween(dateFrom: string, dateTo: string) {
+  return useQuery({
+    queryKey: expenseKeys.list(`${dateFrom}..${dateTo}`),
+    queryFn: () => getExpensesBetween(dateFrom, dateTo),
+  });
+}
+
 export function useExpense(id: number) {
   return useQuery({
     queryKey: expenseKeys.detail(id),
@@ -165,6 +165,17 @@ export interface CategoryChoices {
   types: CategoryChoice[];
 }
 
+export interface Page<T> {
+  items: T[];
+  nextCursor: string | null;
+  hasMore: boolean;
+  total: number | null;
+}
+
+export interface ExpensePage extends Page<Expense> {
+  totalAmount: number | null;
+}
+
 // Helper function to normalize date/datetime objects from backend
 function normalizeAccount(account: FinanceAccount): FinanceAccount {
   return account;
@@ -174,6 +185,25 @@ function normalizeSavingsAccount(account: SavingsAccount): SavingsAccount {
   return account;
 }
 
+// List endpoints are paginated; follow the cursor to collect every row
+async function getAllPages<T>(
+  endpoint: string,
+  filters: Record<string, string> = {},
+) {
+  const items: T[] = [];
+  let cursor: string | null = null;
+  do {
+    const params: Record<string, string> = { ...filters, limit: "1000" };
+    if (cursor) {
+      params.cursor = cursor;
+    }
+    const page: Page<T> = await api.get<Page<T>>(endpoint, params);
+    items.push(...page.items);
+    cursor = page.hasMore ? page.nextCursor : null;
+  } while (cursor);
+  return items;
+}
+
 // API Functions
 export async function getFinanceData() {
   const data = await api.get<FinanceData>("/finance");
@@ -280,8 +310,7 @@ export async function updateSavingsAccount(account: Partial<SavingsAccount>) {
 
 // Recurring Bills
 export async function getRecurringBills() {
-  const response = await api.get<RecurringBill[]>("/finance/recurring-bills");
-  return response;
+  return await getAllPages<RecurringBill>("/finance/recurring-bills");
 }
 
 export async function getRecurringBill(id: number) {
@@ -318,8 +347,7 @@ export async function deleteRecurringBill(id: number) {
 
 // Paychecks
 export async function getPaychecks() {
-  const response = await api.get<Paycheck[]>("/finance/paychecks");
-  return response;
+  return await getAllPages<Paycheck>("/finance/paychecks");
 }
 
 export async function getPaycheck(id: number) {
@@ -352,8 +380,24 @@ export async function deletePaycheck(id: number) {
 
 // Expenses
 export async function getExpenses() {
-  const response = await api.get<Expense[]>("/finance/expenses");
-  return response;
+  return await getAllPages<Expense>("/finance/expenses");
+}
+
+// Every expense dated between the two days, both inclusive
+export async function getExpensesBetween(dateFrom: string, dateTo: string) {
+  return await getAllPages<Expense>("/finance/expenses", {
+    date_from: dateFrom,
+    date_to: dateTo,
+  });
+}
+
+// One page of expenses, newest first; pass the previous page's nextCursor
+export async function getExpensePage(cursor: string | null, limit = 50) {
+  const params: Record<string, string> = { limit: String(limit) };
+  if (cursor) {
+    params.cursor = cursor;
+  }
+  return await api.get<ExpensePage>("/finance/expenses", params);
 }
 
 export async function getExpense(id: number) {
@@ -377,10 +421,9 @@ export async function deleteExpense(id: number) {
 
 // Savings Recurring Deposits
 export async function getSavingsRecurringDeposits() {
-  const response = await api.get<SavingsRecurringDeposit[]>(
+  return await getAllPages<SavingsRecurringDeposit>(
     "/finance/savings/recurring-deposits",
   );
-  return response;
 }
 
 export async function addSavingsRecurringDeposit(
@@ -410,10 +453,9 @@ export async function deleteSavingsRecurringDeposit(id: number) {
 
 // Savings Transactions
 export async function getSavingsTransactions() {
-  const response = await api.get<SavingsTransaction[]>(
+  return await getAllPages<SavingsTransaction>(
     "/finance/savings/transactions",
   );
-  return response;
 }
 
 export async function addSavingsTransaction(